@@ -81,6 +81,9 @@ STRING: 'string';
 VOID: 'void';
 TRUE: 'true';
 FALSE: 'false';
+LET: 'let';
+FUNCTION: 'function';
+PRINT: 'print';
 IDENTIFIER: [a-zA-Z_][a-zA-Z0-9_]*;
 NUMBER: [0-9]+;
 FLOAT_LITERAL: [0-9]*'.'[0-9]+;
@@ -114,3 +117,5 @@ RBRACKET: ']';
 SEMICOLON: ';';
 COMMA: ',';
 WS: [ \t\n\r]+ -> skip;
+LINE_COMMENT: '//' ~[\n]* -> skip;
+HASH_COMMENT: '#' ~[\n]* -> skip;
@@ -0,0 +1,309 @@
+class SourceOffset:
+    """Base offset shared by the spans of every node in one top-level statement.
+
+    The spans are stored relative to it, so a statement that moves in the
+    source (see incremental.py) is shifted with one update here instead of
+    one per node below it.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value=0):
+        self.value = value
+
+
+NO_OFFSET = SourceOffset()
+
+
+class ASTNode:
+    # The [start, end) offsets of the node's text in the source are
+    # `relative_start` and `relative_end` plus `base.value`; the parser sets
+    # them, nodes built by hand have no span.
+    base = NO_OFFSET
+    relative_start = None
+    relative_end = None
+    # Set by resolver.py on expressions too tall to evaluate by recursion.
+    deep = False
+
+    @property
+    def start(self):
+        if self.relative_start is None:
+            return None
+        return self.relative_start + self.base.value
+
+    @start.setter
+    def start(self, value):
+        self.relative_start = value - self.base.value
+
+    @property
+    def end(self):
+        if self.relative_end is None:
+            return None
+        return self.relative_end + self.base.value
+
+    @end.setter
+    def end(self, value):
+        self.relative_end = value - self.base.value
+
+    def accept(self, visitor):
+        raise NotImplementedError("Accept method not implemented in base class")
+
+class ProgramNode(ASTNode):
+    def __init__(self, statements):
+        self.statements = statements
+
+    def accept(self, visitor):
+        return visitor.visit_program_node(self)
+
+class ExpressionNode(ASTNode):
+    def __init__(self, value):
+        self.value = value
+
+    def accept(self, visitor):
+        return visitor.visit_expression_node(self)
+
+class LiteralNode(ExpressionNode):
+    def accept(self, visitor):
+        return visitor.visit_literal_node(self)
+
+class VariableNode(ExpressionNode):
+    def __init__(self, name):
+        self.name = name
+
+    def accept(self, visitor):
+        return visitor.visit_variable_node(self)
+
+class BinaryOpNode(ExpressionNode):
+    # The fast path of quickening.py, once the node has one, the
+    # evaluations in a row towards one, and its sites by operand type.
+    quickened = None
+    warmth = 0
+    sites = None
+
+    def __init__(self, left, operator, right):
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    def accept(self, visitor):
+        return visitor.visit_binary_op_node(self)
+
+class UnaryOpNode(ExpressionNode):
+    def __init__(self, operator, operand):
+        self.operator = operator
+        self.operand = operand
+
+    def accept(self, visitor):
+        return visitor.visit_unary_op_node(self)
+
+class FunctionCallNode(ExpressionNode):
+    def __init__(self, callee, arguments):
+        self.callee = callee
+        self.arguments = arguments
+
+    def accept(self, visitor):
+        return visitor.visit_function_call_node(self)
+
+class ArrayAccessNode(ExpressionNode):
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+
+    def accept(self, visitor):
+        return visitor.visit_array_access_node(self)
+
+class AssignmentNode(ASTNode):
+    def __init__(self, target, value):
+        self.target = target
+        self.value = value
+
+    def accept(self, visitor):
+        return visitor.visit_assignment_node(self)
+
+class IfNode(ASTNode):
+    def __init__(self, condition, then_body, else_body):
+        self.condition = condition
+        self.then_body = then_body
+        self.else_body = else_body
+
+    def accept(self, visitor):
+        return visitor.visit_if_node(self)
+
+class WhileNode(ASTNode):
+    def __init__(self, condition, body):
+        self.condition = condition
+        self.body = body
+
+    def accept(self, visitor):
+        return visitor.visit_while_node(self)
+
+class ForNode(ASTNode):
+    def __init__(self, init, condition, increment, body):
+        self.init = init
+        self.condition = condition
+        self.increment = increment
+        self.body = body
+
+    def accept(self, visitor):
+        return visitor.visit_for_node(self)
+
+class PrintNode(ASTNode):
+    def __init__(self, expression):
+        self.expression = expression
+
+    def accept(self, visitor):
+        return visitor.visit_print_node(self)
+
+class TryCatchNode(ASTNode):
+    def __init__(self, try_body, catch_body):
+        self.try_body = try_body
+        self.catch_body = catch_body
+
+    def accept(self, visitor):
+        return visitor.visit_try_catch_node(self)
+
+class FunctionDefinitionNode(ASTNode):
+    # Set by purity.memoize(): how many results the engines cache for the
+    # function, 0 for none.
+    memo_size = 0
+
+    def __init__(self, function_name, parameters, body):
+        self.function_name = function_name
+        self.parameters = parameters
+        self.body = body
+
+    def accept(self, visitor):
+        return visitor.visit_function_definition_node(self)
+
+class ReturnNode(ASTNode):
+    def __init__(self, value=None):
+        self.value = value
+
+    def accept(self, visitor):
+        return visitor.visit_return_node(self)
+
+
+class ASTVisitor:
+    def visit_program_node(self, node):
+        raise NotImplementedError
+
+    def visit_expression_node(self, node):
+        raise NotImplementedError
+
+    def visit_literal_node(self, node):
+        raise NotImplementedError
+
+    def visit_variable_node(self, node):
+        raise NotImplementedError
+
+    def visit_binary_op_node(self, node):
+        raise NotImplementedError
+
+    def visit_unary_op_node(self, node):
+        raise NotImplementedError
+
+    def visit_function_call_node(self, node):
+        raise NotImplementedError
+
+    def visit_array_access_node(self, node):
+        raise NotImplementedError
+
+    def visit_assignment_node(self, node):
+        raise NotImplementedError
+
+    def visit_if_node(self, node):
+        raise NotImplementedError
+
+    def visit_while_node(self, node):
+        raise NotImplementedError
+
+    def visit_for_node(self, node):
+        raise NotImplementedError
+
+    def visit_print_node(self, node):
+        raise NotImplementedError
+
+    def visit_try_catch_node(self, node):
+        raise NotImplementedError
+
+    def visit_function_definition_node(self, node):
+        raise NotImplementedError
+
+    def visit_return_node(self, node):
+        raise NotImplementedError
+
+
+SPAN_FIELDS = ('base', 'relative_start', 'relative_end')
+
+# Annotations resolver.py adds to the nodes it resolves.
+RESOLVER_FIELDS = ('slot', 'bound', 'slot_names', 'unset_names', 'vector_loop', 'deep')
+
+# Annotations purity.py adds.
+PURITY_FIELDS = ('memo_size',)
+
+# Annotations the tree-walking interpreter adds (see quickening.py).
+QUICKENING_FIELDS = ('quickened', 'warmth', 'sites')
+
+ANNOTATION_FIELDS = frozenset(SPAN_FIELDS + RESOLVER_FIELDS + PURITY_FIELDS + QUICKENING_FIELDS)
+
+
+def iter_fields(node):
+    """Yield the (name, value) pairs of `node`'s fields, without its span or
+    resolver annotations.
+    """
+    for name, value in vars(node).items():
+        if name not in ANNOTATION_FIELDS:
+            yield name, value
+
+
+def iter_child_nodes(node):
+    """Yield the nodes directly below `node`, including those in body lists."""
+    for _, value in iter_fields(node):
+        if isinstance(value, ASTNode):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, ASTNode):
+                    yield item
+
+
+def walk(node):
+    """Yield `node` and every node below it, parents before children."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(iter_child_nodes(node))
+
+
+def dump(node, spans=False):
+    """Return a nested tuple/list form of `node`, handy for comparing trees.
+
+    Source spans are left out unless `spans` is true, so that trees parsed
+    from differently laid out text compare equal. Built on an explicit
+    stack, so trees of any depth dump.
+    """
+    # Each entry is a value and where its dump goes once done: a slot of
+    # the list `dump` of its parent's fields.
+    result = [None]
+    stack = [(node, result, 0)]
+    # The nodes whose fields are dumped into lists, to turn into tuples
+    # after all of them are filled in; parents before children.
+    pending = []
+    while stack:
+        value, parent, index = stack.pop()
+        if isinstance(value, ASTNode):
+            fields = [field for _, field in iter_fields(value)]
+            dumped = [type(value).__name__, *fields]
+            if spans:
+                dumped.append((value.start, value.end))
+            pending.append((dumped, parent, index))
+            stack.extend((field, dumped, position) for position, field in enumerate(fields, 1))
+        elif isinstance(value, list):
+            dumped = [None] * len(value)
+            parent[index] = dumped
+            stack.extend((item, dumped, position) for position, item in enumerate(value))
+        else:
+            parent[index] = value
+    for dumped, parent, index in reversed(pending):
+        parent[index] = tuple(dumped)
+    return result[0]
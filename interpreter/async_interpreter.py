@@ -0,0 +1,234 @@
+"""Run programs as asyncio coroutines, many at a time in one thread.
+
+`run_async()` walks the tree like the `Interpreter`, but the statements that
+loop, call, or print are generator methods in the style of traversal.py:
+they yield the nodes below them, and `Suspend(awaitable)` where they have to
+wait. A driver coroutine runs them on an explicit stack, awaits what they
+suspend on, and gives the event loop a turn every `yield_every` steps, so
+that a busy program cannot starve the others. Everything else, such as an
+expression without calls, is evaluated by the `Interpreter` in one go.
+
+Printing waits on the output: a `write` returning an awaitable is
+awaited, and so is the `drain()` of an output that has one, like an
+`asyncio.StreamWriter`. So is the result of a builtin passed in `builtins`
+when it is awaitable, which is how a host adds I/O to the language.
+"""
+import asyncio
+import inspect
+import sys
+from types import GeneratorType
+
+from ast_nodes import FunctionCallNode, FunctionDefinitionNode, ForNode, PrintNode, WhileNode, iter_child_nodes, walk
+from interpreter import Interpreter, ReturnValue
+from resolver import resolve
+from runtime import (
+    BUILTINS, MAX_CALL_DEPTH, UNSET, Function, call_depth_exceeded, check_arguments, check_callable, format_value,
+)
+
+
+# Steps (generator resumptions) a program runs before the others get a turn.
+YIELD_EVERY = 1000
+
+# What makes a statement or an expression run on the driver.
+SUSPENDING_TYPES = (FunctionCallNode, WhileNode, ForNode, PrintNode)
+
+
+class Suspend:
+    """Yielded by a step to have the driver await `awaitable` for it."""
+
+    def __init__(self, awaitable):
+        self.awaitable = awaitable
+
+
+class AsyncInterpreter(Interpreter):
+    """An `Interpreter` whose `step_<ClassName>` generator methods run
+    the nodes that may wait or run long, on `drive()`. Calls nest at most
+    `max_depth` deep.
+    """
+
+    max_depth = MAX_CALL_DEPTH
+
+    def __init__(self, output=None, builtins=None):
+        super().__init__(None, output)
+        self.depth = 0
+        if builtins:
+            self.builtins = {**BUILTINS, **builtins}
+        # The ids of the nodes that run on the driver.
+        self.suspending = set()
+
+    def classify(self, program):
+        """Find the nodes of `program` that run on the driver: those with a
+        call, a loop or a print in them. A function definition runs at
+        once, whatever its body does.
+        """
+        for node in reversed(list(walk(program))):
+            if isinstance(node, FunctionDefinitionNode):
+                continue
+            if isinstance(node, SUSPENDING_TYPES) or any(
+                    id(child) in self.suspending for child in iter_child_nodes(node)):
+                self.suspending.add(id(node))
+
+    def dispatch(self, node):
+        if id(node) in self.suspending:
+            return getattr(self, 'step_' + type(node).__name__)(node)
+        return self.visit(node)
+
+    def step_body(self, statements):
+        for statement in statements:
+            yield statement
+
+    def step_ProgramNode(self, node):
+        resolve(node)
+        self.classify(node)
+        try:
+            yield self.step_body(node.statements)
+        except ReturnValue:
+            raise Exception("'return' outside a function") from None
+
+    def step_AssignmentNode(self, node):
+        self.assign(node, node.target, (yield node.value))
+
+    def step_FunctionCallNode(self, node):
+        function = self.lookup_function(node, node.callee)
+        arguments = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+        if not isinstance(function, Function):
+            check_callable(node.callee, function)
+            result = function(*arguments)
+            if inspect.isawaitable(result):
+                result = yield Suspend(result)
+            return result
+
+        check_arguments(function, arguments)
+        cache = function.cache
+        key = cache.key(arguments) if cache is not None else None
+        if key is not None:
+            result = cache.lookup(key)
+            if result is not UNSET:
+                return result
+        if self.depth >= self.max_depth:
+            raise call_depth_exceeded(self.max_depth)
+        saved_scope = self.local_scope
+        self.local_scope = arguments + [UNSET] * (function.frame_size - len(arguments))
+        self.depth += 1
+        try:
+            yield self.step_body(function.body)
+            result = None
+        except ReturnValue as returned:
+            result = returned.value
+        finally:
+            self.local_scope = saved_scope
+            self.depth -= 1
+        if key is not None:
+            cache.store(key, result)
+        return result
+
+    def step_ReturnNode(self, node):
+        raise ReturnValue((yield node.value))
+
+    def step_IfNode(self, node):
+        if (yield node.condition):
+            yield self.step_body(node.then_body)
+        else:
+            yield self.step_body(node.else_body)
+
+    def step_WhileNode(self, node):
+        while (yield node.condition):
+            yield self.step_body(node.body)
+
+    def step_ForNode(self, node):
+        loop = node.vector_loop
+        if loop is not None and loop.run(self.visit, lambda array: self.lookup(array, array.name),
+                                         lambda assignment, value: self.assign(assignment, assignment.target, value)):
+            return
+        yield node.init
+        while (yield node.condition):
+            yield self.step_body(node.body)
+            yield node.increment
+
+    def step_PrintNode(self, node):
+        output = self.output if self.output is not None else sys.stdout
+        written = output.write(format_value((yield node.expression)) + '\n')
+        if inspect.isawaitable(written):
+            yield Suspend(written)
+        drain = getattr(output, 'drain', None)
+        if drain is not None:
+            yield Suspend(drain())
+
+    def step_TryCatchNode(self, node):
+        try:
+            yield self.step_body(node.try_body)
+        except Exception:
+            yield self.step_body(node.catch_body)
+
+
+async def drive(root, dispatch, yield_every=YIELD_EVERY):
+    """traversal.py's `run` as a coroutine: return the result of `root`, a
+    node or a generator, awaiting the `Suspend`s its steps yield and
+    letting other tasks run every `yield_every` steps.
+    """
+    if type(root) is not GeneratorType:
+        root = dispatch(root)
+        if type(root) is not GeneratorType:
+            return root
+    stack = []
+    generator = root
+    value = None
+    error = None
+    steps = 0
+    while True:
+        steps += 1
+        if steps >= yield_every:
+            steps = 0
+            await asyncio.sleep(0)
+        try:
+            if error is None:
+                child = generator.send(value)
+            else:
+                raised, error = error, None
+                child = generator.throw(raised)
+        except StopIteration as stop:
+            if not stack:
+                return stop.value
+            generator = stack.pop()
+            value = stop.value
+            continue
+        except BaseException as exception:
+            if not stack:
+                raise
+            generator = stack.pop()
+            error = exception
+            continue
+        if type(child) is Suspend:
+            try:
+                value = await child.awaitable
+            except Exception as exception:
+                error = exception
+            continue
+        if type(child) is not GeneratorType:
+            try:
+                child = dispatch(child)
+            except BaseException as exception:
+                error = exception
+                continue
+            if type(child) is not GeneratorType:
+                value = child
+                continue
+        stack.append(generator)
+        generator = child
+        value = None
+
+
+async def run_async(program, output=None, builtins=None, yield_every=YIELD_EVERY):
+    """Run a parsed program as a coroutine; return its globals.
+
+    `builtins` adds functions to `BUILTINS`, or replaces them; results
+    they return that are awaitable are awaited. The program yields to the
+    event loop every `yield_every` steps.
+    """
+    if yield_every < 1:
+        raise ValueError('yield_every must be at least 1')
+    interpreter = AsyncInterpreter(output, builtins)
+    await drive(interpreter.step_ProgramNode(program), interpreter.dispatch, yield_every)
+    return interpreter.global_scope
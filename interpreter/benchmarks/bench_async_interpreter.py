@@ -0,0 +1,78 @@
+"""The asyncio mode against the tree-walking `Interpreter` it builds on: one
+program alone, then many at once on one event loop, with the time the
+slowest waited between turns.
+
+Usage: python benchmarks/bench_async_interpreter.py [concurrent programs]
+"""
+import asyncio
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_interpreter import run_async  # noqa: E402
+from bench_interpreter import best_of  # noqa: E402
+from interpreter import run_tree  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+SCRIPT = '''
+function collatz(n) {
+    let steps = 0;
+    while (n != 1) {
+        if (n % 2 == 0) { let n = n / 2; } else { let n = 3 * n + 1; }
+        let steps = steps + 1;
+    }
+    return steps;
+}
+let longest = 0;
+for (let i = 1; i < {n}; let i = i + 1;) { let longest = max(longest, collatz(i)); }
+print longest;
+'''
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+class Turns:
+    """An output noting the longest gap between two prints of a program."""
+
+    def __init__(self):
+        self.last = time.perf_counter()
+        self.longest = 0.0
+
+    def write(self, text):
+        now = time.perf_counter()
+        self.longest = max(self.longest, now - self.last)
+        self.last = now
+
+
+async def run_many(sources):
+    outputs = [Turns() for _ in sources]
+    await asyncio.gather(*(run_async(parse(source), output) for source, output in zip(sources, outputs)))
+    return max(output.longest for output in outputs)
+
+
+def run(count):
+    source = SCRIPT.replace('{n}', '300')
+    tree = best_of(3, lambda: run_tree(parse(source), io.StringIO()))
+    alone = best_of(3, lambda: asyncio.run(run_async(parse(source), io.StringIO())))
+    print(f'one program: tree {tree * 1000:.1f} ms, async {alone * 1000:.1f} ms ({alone / tree:.2f}x)')
+
+    # Each program prints as it goes, so the gaps show how fairly turns come.
+    chatty = SCRIPT.replace('{n}', '30').replace('let longest = max', 'print i; let longest = max')
+    single = best_of(3, lambda: asyncio.run(run_many([chatty])))
+    start = time.perf_counter()
+    longest_wait = asyncio.run(run_many([chatty] * count))
+    elapsed = time.perf_counter() - start
+    print(f'{count} programs at once: {elapsed:.2f} s, {elapsed / count * 1000:.2f} ms per program '
+          f'({single * 1000:.2f} ms alone), longest wait between prints {longest_wait * 1000:.0f} ms '
+          f'({longest_wait / count * 1000:.2f} ms per program waited for)')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
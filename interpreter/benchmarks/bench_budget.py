@@ -0,0 +1,78 @@
+"""What checking a `Budget` costs: loop-heavy and call-heavy scripts run
+without a budget, and within one whose limits they never reach, with every
+limit set or with only the step limit.
+
+Usage: python benchmarks/bench_budget.py [loop iterations]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from budget import Budget  # noqa: E402
+from interpreter import run_program  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+LOOP = '''
+let total = 0;
+let i = 0;
+while (i < {n}) {
+    let total = total + i % 7 * 2;
+    let i = i + 1;
+}
+print total;
+'''
+
+CALLS = '''
+function fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }
+print fib({depth});
+'''
+
+BUDGETS = [
+    ('none', None),
+    ('steps', Budget(max_steps=10 ** 12)),
+    ('all limits', Budget(max_steps=10 ** 12, seconds=3600, max_depth=10 ** 6, max_allocation=10 ** 9)),
+]
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+def time_runs(source, engine, rounds=9):
+    """Best time of every budget in `BUDGETS`, taking turns so that a slow
+    spell of the machine hits them all alike.
+    """
+    best = [float('inf')] * len(BUDGETS)
+    results = set()
+    for _ in range(rounds):
+        for index, (_, budget) in enumerate(BUDGETS):
+            output = io.StringIO()
+            program = parse(source)
+            start = time.perf_counter()
+            run_program(program, engine, output, memo_size=0, budget=budget)
+            best[index] = min(best[index], time.perf_counter() - start)
+            results.add(output.getvalue())
+    assert len(results) == 1, engine
+    return best
+
+
+def run(iterations):
+    depth = max(10, iterations.bit_length() + 4)
+    scripts = [(f'{iterations} loop iterations', LOOP.replace('{n}', str(iterations))),
+               (f'fib({depth}) calls', CALLS.replace('{depth}', str(depth)))]
+    for name, source in scripts:
+        print(name)
+        for engine in ['tree', 'closure']:
+            base, *budgeted = time_runs(source, engine)
+            cells = [f'{label} {elapsed * 1000:7.1f} ms ({(elapsed / base - 1) * 100:+5.1f}%)'
+                     for (label, _), elapsed in zip(BUDGETS[1:], budgeted)]
+            print(f'{engine:>8}: unbudgeted {base * 1000:7.1f} ms   ' + '   '.join(cells))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
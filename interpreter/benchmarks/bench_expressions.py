@@ -0,0 +1,162 @@
+"""Expression parsing: the precedence-climbing `Parser.parse_expression`
+against the seven-level recursive descent chain it replaced.
+
+Usage: python benchmarks/bench_expressions.py [operand_count ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ast_nodes import BinaryOpNode, dump  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+class DescentParser(Parser):
+    """The previous expression grammar, one method per precedence level."""
+
+    def parse_expression(self):
+        return self.parse_logical_or()
+
+    def parse_logical_or(self):
+        node = self.parse_logical_and()
+
+        while self.current_token.type == 'OR':
+            token = self.current_token
+            self.eat('OR')
+            node = BinaryOpNode(node, token.value, self.parse_logical_and())
+
+        return node
+
+    def parse_logical_and(self):
+        node = self.parse_equality()
+
+        while self.current_token.type == 'AND':
+            token = self.current_token
+            self.eat('AND')
+            node = BinaryOpNode(node, token.value, self.parse_equality())
+
+        return node
+
+    def parse_equality(self):
+        node = self.parse_comparison()
+
+        while self.current_token.type in ['EQUALS_EQUALS', 'NOT_EQUALS']:
+            token = self.current_token
+            if token.type == 'EQUALS_EQUALS':
+                self.eat('EQUALS_EQUALS')
+            elif token.type == 'NOT_EQUALS':
+                self.eat('NOT_EQUALS')
+            node = BinaryOpNode(node, token.value, self.parse_comparison())
+
+        return node
+
+    def parse_comparison(self):
+        node = self.parse_term()
+
+        while self.current_token.type in ['LESS_THAN', 'GREATER_THAN']:
+            token = self.current_token
+            if token.type == 'LESS_THAN':
+                self.eat('LESS_THAN')
+            elif token.type == 'GREATER_THAN':
+                self.eat('GREATER_THAN')
+            node = BinaryOpNode(node, token.value, self.parse_term())
+
+        return node
+
+    def parse_term(self):
+        node = self.parse_factor()
+
+        while self.current_token.type in ['PLUS', 'MINUS']:
+            token = self.current_token
+            if token.type == 'PLUS':
+                self.eat('PLUS')
+            elif token.type == 'MINUS':
+                self.eat('MINUS')
+            node = BinaryOpNode(node, token.value, self.parse_factor())
+
+        return node
+
+    def parse_factor(self):
+        node = self.parse_primary()
+
+        while self.current_token.type in ['MULTIPLY', 'DIVIDE']:
+            token = self.current_token
+            if token.type == 'MULTIPLY':
+                self.eat('MULTIPLY')
+            elif token.type == 'DIVIDE':
+                self.eat('DIVIDE')
+            node = BinaryOpNode(node, token.value, self.parse_primary())
+
+        return node
+
+
+# Expressions built only from operators both parsers understand, with the
+# number of operands in each.
+TERMS = 100
+EXPRESSIONS = {
+    'arithmetic': (' + '.join(f'{n} * x{n} - {n} / 3' for n in range(TERMS)), 4 * TERMS, 200),
+    'boolean': (' || '.join(f'a{n} < {n} && b{n} == {n} + 1 || c{n} > {n} && d{n} != 0' for n in range(TERMS)),
+                9 * TERMS, 200),
+    'bare literal': ('42', 1, 50000),
+}
+
+
+class ReplayLexer:
+    """Hands out pre-lexed tokens so that only parsing is timed."""
+
+    def __init__(self, tokens):
+        self.get_next_token = iter(tokens).__next__
+
+
+def lex(source):
+    lexer = RegexLexer(source)
+    tokens = [lexer.get_next_token()]
+    while tokens[-1].type != 'EOF':
+        tokens.append(lexer.get_next_token())
+    return tokens + tokens[-1:] * 2
+
+
+def count_calls(parser_class, source):
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event == 'call' and frame.f_code.co_name.startswith('parse_'):
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        parser_class(RegexLexer(source)).parse()
+    finally:
+        sys.setprofile(None)
+    return calls
+
+
+def best_time(function, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(name, expression, operands, statements):
+    source = ''.join(f'let r = {expression};\n' for _ in range(statements))
+    operands *= statements
+    old = dump(DescentParser(RegexLexer(source)).parse())
+    assert dump(Parser(RegexLexer(source)).parse()) == old, 'trees differ'
+    print(name)
+    tokens = lex(source)
+    for label, parser_class in [('descent chain', DescentParser), ('precedence climbing', Parser)]:
+        elapsed = best_time(lambda: parser_class(ReplayLexer(tokens)).parse(), repeat=10)
+        calls = count_calls(parser_class, source)
+        print(f'  {label:>19}: {elapsed:7.3f} s  {calls / operands:5.2f} parse calls per operand')
+
+
+if __name__ == '__main__':
+    for name, (expression, operands, statements) in EXPRESSIONS.items():
+        run(name, expression, operands, statements)
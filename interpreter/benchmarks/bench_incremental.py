@@ -0,0 +1,69 @@
+"""Latency of `IncrementalParser.edit()` against re-parsing the whole file,
+for single-token edits near the start, middle and end of a large source.
+
+Usage: python benchmarks/bench_incremental.py [line_count ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incremental import IncrementalParser  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+REPEAT = 20
+
+# Every line is a whole statement (or a comment), so any prefix parses.
+LINES = [
+    'let total_{n} = total_{n} + {n} * 3.5 - (count / 2) % 7;\n',
+    'if (total_{n} >= 100 && count != {n} || !done) {{ print total_{n}; }}\n',
+    'function step_{n}(a, b) {{ return a * b + {n}; }}   // helper\n',
+    '# generated line {n}\n',
+]
+
+
+def generate_source(line_count):
+    return ''.join(LINES[n % len(LINES)].format(n=n) for n in range(line_count))
+
+
+def best_of(repeat, function):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(line_count):
+    source = generate_source(line_count)
+    full = best_of(3, lambda: Parser(RegexLexer(source)).parse())
+    print(f'{line_count} lines, {len(source) / 1024:.0f} KiB: full parse {full * 1000:8.2f} ms')
+
+    parser = IncrementalParser(source)
+    for where in [0.0, 0.5, 1.0]:
+        # Turn a '3.5' into '4.5' and back, so the text is the same each round.
+        offset = source.find('3.5', int(len(source) * where) - 200 if where else 0)
+
+        def edit():
+            parser.edit(offset, offset + 1, '4')
+            parser.edit(offset, offset + 1, '3')
+
+        # Edits that change the length also shift every later span.
+        def resize():
+            parser.edit(offset, offset + 1, '44')
+            parser.edit(offset, offset + 2, '3')
+
+        same = best_of(REPEAT, edit) / 2
+        shifted = best_of(REPEAT, resize) / 2
+        print(f'  edit at {where:4.0%}: {same * 1000:7.3f} ms ({full / same:6.0f}x), '
+              f'resizing {shifted * 1000:7.3f} ms ({full / shifted:6.0f}x), '
+              f'{parser.reparsed} statements re-parsed')
+
+
+if __name__ == '__main__':
+    for count in [int(arg) for arg in sys.argv[1:]] or [10000, 50000]:
+        run(count)
@@ -0,0 +1,124 @@
+"""Loop-heavy scripts on every engine in `EXECUTION_ENGINES`, against the
+name-dispatching tree-walking `Interpreter`.
+
+Compiled engines compile each program once; "run" is the best of several
+re-runs of that one compilation, "compile" the one-off cost. "per node" is
+the run time divided by the number of nodes the tree-walker visits for the
+same program, i.e. the cost of one source-level operation on each engine.
+
+Usage: python benchmarks/bench_interpreter.py [scale]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bytecode import compile_bytecode  # noqa: E402
+from closure_compiler import compile_program  # noqa: E402
+from interpreter import Interpreter, run_tree  # noqa: E402
+from ir_interpreter import IRInterpreter, compile_ir  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+from python_compiler import compile_python  # noqa: E402
+from vm import VM  # noqa: E402
+
+
+SCRIPTS = {
+    'fib': '''
+function fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }
+print fib({fib});
+''',
+    'loops': '''
+let total = 0;
+for (let i = 0; i < {loops}; let i = i + 1;) {
+    let j = 0;
+    while (j < 10) {
+        if ((i + j) % 3 == 0 && j != 5) { let total = total + i * j; } else { let total = total - 1; }
+        let j = j + 1;
+    }
+}
+print total;
+''',
+    'primes': '''
+function is_prime(n) {
+    if (n < 2) { return 0; }
+    let d = 2;
+    while (d * d <= n) { if (n % d == 0) { return 0; } let d = d + 1; }
+    return 1;
+}
+let count = 0;
+let n = 0;
+while (n < {primes}) { let count = count + is_prime(n); let n = n + 1; }
+print count;
+''',
+}
+
+# Other engines register here as (name, compile(program) -> run(output)).
+COMPILED_ENGINES = [
+    ('closure', lambda program: compile_program(program).run),
+    ('bytecode', lambda program: compile_vm(program)),
+    ('python', lambda program: compile_python(program).run),
+    ('ir', lambda program: compile_ir_interpreter(program)),
+]
+
+
+def compile_vm(program):
+    code = compile_bytecode(program)
+    return lambda output: VM(output).run(code)
+
+
+def compile_ir_interpreter(program):
+    function = compile_ir(program)
+    return lambda output: IRInterpreter(output).run(function)
+
+
+class CountingInterpreter(Interpreter):
+    def __init__(self, output):
+        super().__init__(None, output)
+        self.visits = 0
+
+    def visit(self, node):
+        self.visits += 1
+        return super().visit(node)
+
+
+def count_visits(program):
+    interpreter = CountingInterpreter(io.StringIO())
+    interpreter.visit(program)
+    return interpreter.visits
+
+
+def best_of(repeat, function):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(scale):
+    sizes = {'fib': 18 + scale, 'loops': 2000 * 2 ** scale, 'primes': 3000 * 2 ** scale}
+    for name, template in SCRIPTS.items():
+        source = template.replace('{' + name + '}', str(sizes[name]))
+        program = Parser(RegexLexer(source)).parse()
+        expected = io.StringIO()
+        walk = best_of(3, lambda: run_tree(program, expected))
+        nodes = count_visits(program)
+        print(f'{name:>8}: tree-walking   run {walk * 1000:8.1f} ms  {walk / nodes * 1e9:6.0f} ns/node  '
+              f'({nodes} nodes)')
+        for engine, compile_ in COMPILED_ENGINES:
+            start = time.perf_counter()
+            execute = compile_(program)
+            compiled = time.perf_counter() - start
+            output = io.StringIO()
+            elapsed = best_of(3, lambda: execute(output))
+            assert output.getvalue() == expected.getvalue(), engine
+            print(f'{"":>8}  {engine:<13} run {elapsed * 1000:8.1f} ms  {elapsed / nodes * 1e9:6.0f} ns/node  '
+                  f'({walk / elapsed:5.2f}x)  compile {compiled * 1000:6.2f} ms')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
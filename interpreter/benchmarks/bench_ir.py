@@ -0,0 +1,99 @@
+"""The IR and its loop passes: instructions per program before and after
+each pass, run time on the IR interpreter with and without them, and the
+same programs compiled ahead of time to C++ with g++.
+
+Usage: python benchmarks/bench_ir.py [scale]
+"""
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_interpreter import SCRIPTS, best_of  # noqa: E402
+from bench_optimizer import SCRIPT as CONSTANTS_SCRIPT  # noqa: E402
+from cpp_backend import CppGenerator, build_executable  # noqa: E402
+from interpreter import run_tree  # noqa: E402
+from ir import lower_program  # noqa: E402
+from ir_interpreter import IRInterpreter  # noqa: E402
+from ir_passes import optimize_ir  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+# Nested loops recomputing invariant and repeated subexpressions, and
+# scaling induction variables.
+LOOPS_SCRIPT = '''
+let stride = 7;
+let base = 3;
+let total = 0;
+for (let i = 0; i < {nested}; let i = i + 1;) {
+    let j = 0;
+    while (j < 50) {
+        let offset = (base * stride + 1) * (base * stride + 1);
+        let total = total + (i * stride + j * 4) % 97 + offset % 13 + (i * stride + j * 4) % 89;
+        let j = j + 1;
+    }
+}
+print total;
+'''
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+def instruction_count(function):
+    return sum(len(block.instructions) for nested in function.walk() for block in nested.blocks)
+
+
+def run(scale):
+    sizes = {'fib': 18 + scale, 'loops': 2000 * 2 ** scale, 'primes': 3000 * 2 ** scale,
+             'constants': 20000 * 2 ** scale, 'nested': 400 * 2 ** scale}
+    scripts = dict(SCRIPTS, constants=CONSTANTS_SCRIPT.replace('{iterations}', '{constants}'), nested=LOOPS_SCRIPT)
+    compiler = shutil.which('g++')
+    directory = tempfile.mkdtemp()
+    for name, template in scripts.items():
+        source = template.replace('{' + name + '}', str(sizes[name]))
+        program = parse(source)
+        expected = io.StringIO()
+        walk = best_of(3, lambda: run_tree(program, expected))
+
+        plain = lower_program(parse(source))
+        optimized = lower_program(parse(source))
+        optimizer = optimize_ir(optimized)
+        changes = ', '.join(f'{stats.name} {stats.changes}' for stats in optimizer.stats.values())
+        print(f'{name:>9}: {instruction_count(plain)} instructions, {instruction_count(optimized)} optimized '
+              f'({changes})')
+
+        for label, function in [('plain', plain), ('optimized', optimized)]:
+            output = io.StringIO()
+            elapsed = best_of(3, lambda: IRInterpreter(output).run(function))
+            assert output.getvalue().splitlines()[-1] == expected.getvalue().splitlines()[-1], (name, label)
+            print(f'{"":>9}  ir {label:<10} {elapsed * 1000:8.1f} ms  ({walk / elapsed:5.2f}x tree-walking)')
+
+        if compiler is None:
+            continue
+        try:
+            cpp = CppGenerator(optimized).generate()
+        except Exception as error:
+            print(f'{"":>9}  c++: {error}')
+            continue
+        executable = os.path.join(directory, name)
+        start = time.perf_counter()
+        build_executable(cpp, executable)
+        built = time.perf_counter() - start
+        result = []
+        elapsed = best_of(3, lambda: result.append(subprocess.run([executable], capture_output=True, text=True)))
+        assert result[-1].stdout.splitlines()[-1] == expected.getvalue().splitlines()[-1], name
+        print(f'{"":>9}  c++ -O2       {elapsed * 1000:8.1f} ms  ({walk / elapsed:5.2f}x tree-walking)  '
+              f'g++ {built:.2f} s')
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
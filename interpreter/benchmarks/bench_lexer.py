@@ -0,0 +1,56 @@
+"""Lexer throughput of every engine in `LEXER_ENGINES` against the classic
+character-walking `Lexer`.
+
+Usage: python benchmarks/bench_lexer.py [size_in_kib ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import LEXER_ENGINES  # noqa: E402
+
+
+BLOCK = '''# generated block {n}
+let total_{n} = total_{n} + {n} * 3.5 - (count / 2) % 7;
+if (total_{n} >= 100 && count != {n} || !done) {{ print "value {n}"; }}
+function step_{n}(a, b) {{ return a * b + {n}; }}   // helper
+'''
+
+
+def generate_source(size):
+    parts = []
+    length = 0
+    n = 0
+    while length < size:
+        block = BLOCK.format(n=n)
+        parts.append(block)
+        length += len(block)
+        n += 1
+    return ''.join(parts)
+
+
+def count_tokens(lexer):
+    count = 0
+    while lexer.get_next_token().type != 'EOF':
+        count += 1
+    return count
+
+
+def run(size):
+    source = generate_source(size)
+    results = {}
+    for name, lexer_class in LEXER_ENGINES.items():
+        start = time.perf_counter()
+        tokens = count_tokens(lexer_class(source))
+        elapsed = time.perf_counter() - start
+        results[name] = elapsed
+        print(f'{name:>8}: {len(source) / 1024:8.0f} KiB  {tokens:9d} tokens  '
+              f'{elapsed:7.3f} s  {len(source) / elapsed / 2 ** 20:6.2f} MiB/s  '
+              f'{results["classic"] / elapsed:5.2f}x')
+
+
+if __name__ == '__main__':
+    for kib in [int(arg) for arg in sys.argv[1:]] or [256, 1024, 4096]:
+        run(kib * 1024)
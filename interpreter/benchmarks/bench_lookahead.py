@@ -0,0 +1,79 @@
+"""Parsing identifier-heavy expressions with the ring-buffered `TokenStream`
+lookahead against a lexer that re-scans the source to peek.
+
+Usage: python benchmarks/bench_lookahead.py [statement_count ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer, RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+STATEMENT = 'let r_{n} = alpha + beta * f(gamma, delta) - items[idx + {n}] + g(h[j], k) / total;\n'
+
+
+class CountingLexer(Lexer):
+    def __init__(self, text):
+        super().__init__(text)
+        self.scanned = 0
+
+    def get_next_token(self):
+        self.scanned += 1
+        return super().get_next_token()
+
+
+class RescanningLexer(CountingLexer):
+    """The "quick fix": look ahead by lexing forward and rewinding."""
+
+    def peek_token(self):
+        pos, char = self.pos, self.current_char
+        token = self.get_next_token()
+        self.pos, self.current_char = pos, char
+        return token
+
+
+class RescanningParser(Parser):
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self.tokens = lexer
+        self.current_token = lexer.get_next_token()
+
+    def peek_token(self, k=1):
+        return self.lexer.peek_token()
+
+
+def tokens_scanned(parser_class, lexer_class, text):
+    lexer = lexer_class(text)
+    parser_class(lexer).parse()
+    return lexer.scanned
+
+
+def best_time(function, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(statements):
+    text = ''.join(STATEMENT.format(n=n) for n in range(statements))
+    rescan = best_time(lambda: RescanningParser(RescanningLexer(text)).parse())
+    ring = best_time(lambda: Parser(Lexer(text)).parse())
+    ring_regex = best_time(lambda: Parser(RegexLexer(text)).parse())
+    print(f'{statements} statements, tokens lexed: '
+          f'{tokens_scanned(RescanningParser, RescanningLexer, text)} re-scanning, '
+          f'{tokens_scanned(Parser, CountingLexer, text)} ring buffer')
+    print(f'  re-scanning peek       : {rescan:7.3f} s')
+    print(f'  TokenStream over Lexer : {ring:7.3f} s  ({rescan / ring:.2f}x)')
+    print(f'  TokenStream over Regex : {ring_regex:7.3f} s  ({rescan / ring_regex:.2f}x)')
+
+
+if __name__ == '__main__':
+    for count in [int(arg) for arg in sys.argv[1:]] or [5000, 20000]:
+        run(count)
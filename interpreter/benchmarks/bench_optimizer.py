@@ -0,0 +1,59 @@
+"""Optimization passes on a loop full of constants and debug branches:
+tree size, time spent in each pass, and run time with and without them.
+
+Usage: python benchmarks/bench_optimizer.py [iterations]
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ast_nodes import walk  # noqa: E402
+from bench_interpreter import best_of  # noqa: E402
+from interpreter import run_program  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from optimizer import DEFAULT_PASSES, optimize  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+SCRIPT = '''
+let debug = 0;
+let width = 16;
+let height = 4 * 4;
+let cells = width * height;
+let scale = 60 * 60 / 2;
+let total = 0;
+let i = 0;
+while (i < {iterations}) {
+    if (debug) { print "cell " + str(i); }
+    if (debug && i % 100 == 0) { print i; }
+    let total = total + (i % cells) * scale / (width * 2 + 1 - 1) + (3 * 7 - 20);
+    let i = i + 1;
+}
+print total;
+'''
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+def run(iterations):
+    source = SCRIPT.replace('{iterations}', str(iterations))
+    before = sum(1 for _ in walk(parse(source)))
+    program = parse(source)
+    optimizer = optimize(program)
+    after = sum(1 for _ in walk(program))
+    print(f'{before} nodes before, {after} after, {optimizer.rounds} rounds')
+    for stats in optimizer.stats.values():
+        print(f'  {stats.name:<14} {stats.changes:4d} changes  {stats.seconds * 1e6:8.1f} us')
+    for engine in ['tree', 'closure']:
+        plain = best_of(3, lambda: run_program(parse(source), engine, io.StringIO()))
+        optimized = best_of(3, lambda: run_program(parse(source), engine, io.StringIO(), DEFAULT_PASSES))
+        print(f'{engine:>8}: {plain * 1000:7.1f} ms plain, {optimized * 1000:7.1f} ms optimized '
+              f'({plain / optimized:4.2f}x)')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,43 @@
+"""Start-up cost of a large script with and without the on-disk `ParseCache`.
+
+Usage: python benchmarks/bench_parse_cache.py [line_count ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_incremental import best_of, generate_source  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parse_cache import ParseCache  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+def run(line_count):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'main.wmzl')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(generate_source(line_count))
+        cache_directory = os.path.join(directory, 'cache')
+
+        def uncached():
+            with open(path, encoding='utf-8') as handle:
+                Parser(RegexLexer(handle.read())).parse()
+
+        start = time.perf_counter()
+        ParseCache(cache_directory).parse_file(path)
+        cold = time.perf_counter() - start
+
+        parse = best_of(3, uncached)
+        warm = best_of(5, lambda: ParseCache(cache_directory).parse_file(path))
+        size = ParseCache(cache_directory).size()
+        print(f'{line_count} lines, {os.path.getsize(path) / 1024:.0f} KiB: '
+              f'parse {parse * 1000:7.1f} ms, first cached run {cold * 1000:7.1f} ms, '
+              f'cache hit {warm * 1000:6.1f} ms ({parse / warm:4.1f}x), entry {size / 1024:.0f} KiB')
+
+
+if __name__ == '__main__':
+    for count in [int(arg) for arg in sys.argv[1:]] or [10000, 50000]:
+        run(count)
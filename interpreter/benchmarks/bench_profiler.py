@@ -0,0 +1,66 @@
+"""What profiling costs a run: tracing on the tree engine, and sampling at a
+few intervals on the tree and closure engines, against plain runs.
+
+Usage: python benchmarks/bench_profiler.py [calls]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter import run_program  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+from profiler import profile, sample  # noqa: E402
+
+
+# Distinct arguments, so that no call is memoized away.
+SCRIPT = '''
+function spin(k) {
+    let t = 0;
+    let i = 0;
+    while (i < k) { let t = t + i % 3; let i = i + 1; }
+    return t;
+}
+let total = 0;
+let j = 0;
+while (j < {calls}) { let total = total + spin(1000 + j); let j = j + 1; }
+print total;
+'''
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+def best_times(runs, rounds=5):
+    """Best time of each of `runs`, taking turns."""
+    best = [float('inf')] * len(runs)
+    for _ in range(rounds):
+        for index, run in enumerate(runs):
+            start = time.perf_counter()
+            run()
+            best[index] = min(best[index], time.perf_counter() - start)
+    return best
+
+
+def run(calls):
+    source = SCRIPT.replace('{calls}', str(calls))
+    for engine in ['tree', 'closure']:
+        runs = [lambda: run_program(parse(source), engine, io.StringIO())]
+        labels = []
+        if engine == 'tree':
+            runs.append(lambda: profile(parse(source), io.StringIO(), source))
+            labels.append('traced')
+        for interval in (0.01, 0.005, 0.001):
+            runs.append(lambda interval=interval: sample(parse(source), engine, io.StringIO(), source, interval))
+            labels.append(f'sampled every {interval * 1000:g} ms')
+        plain, *profiled = best_times(runs)
+        print(f'{engine:>8}: plain {plain * 1000:7.1f} ms   ' + '   '.join(
+            f'{label} {elapsed / plain:5.2f}x' for label, elapsed in zip(labels, profiled)))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
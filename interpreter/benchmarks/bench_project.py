@@ -0,0 +1,41 @@
+"""Whole-project check throughput for increasing worker counts.
+
+Usage: python benchmarks/bench_project.py [file_count [lines_per_file]]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_incremental import generate_source  # noqa: E402
+from project import check_project  # noqa: E402
+
+
+def run(file_count, lines_per_file):
+    with tempfile.TemporaryDirectory() as root:
+        source = generate_source(lines_per_file)
+        for n in range(file_count):
+            path = os.path.join(root, f'module_{n // 100}', f'file_{n}.wmzl')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(source)
+
+        print(f'{file_count} files of {lines_per_file} lines on {os.cpu_count()} cores')
+        baseline = None
+        jobs = 1
+        while jobs <= max(1, os.cpu_count() or 1):
+            start = time.perf_counter()
+            reports = list(check_project([root], jobs=jobs))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            slowest = max(report.seconds for report in reports)
+            print(f'  {jobs:3d} jobs: {elapsed:7.2f} s  {len(reports) / elapsed:8.1f} files/s  '
+                  f'{baseline / elapsed:5.2f}x  (slowest file {slowest * 1000:.1f} ms)')
+            jobs *= 2
+
+
+if __name__ == '__main__':
+    arguments = [int(arg) for arg in sys.argv[1:]]
+    run(*(arguments + [2000, 200][len(arguments):]))
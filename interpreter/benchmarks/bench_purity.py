@@ -0,0 +1,56 @@
+"""Pure functions with and without their result caches, on the engines that
+memoize: a recursive fib, which repeats its arguments, and a loop calling
+a function with arguments that never repeat, which only pays for the
+misses.
+
+Usage: python benchmarks/bench_purity.py [fib argument]
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_interpreter import best_of  # noqa: E402
+from interpreter import run_program  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+from purity import MEMO_SIZE  # noqa: E402
+
+
+FIB = '''
+function fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }
+print fib({n});
+'''
+
+DISTINCT = '''
+function square(x) { return x * x; }
+let total = 0;
+for (let i = 0; i < 20000; let i = i + 1;) { let total = total + square(i); }
+print total;
+'''
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+def time_engine(engine, source, memo_size):
+    output = io.StringIO()
+    elapsed = best_of(3, lambda: run_program(parse(source), engine, output, memo_size=memo_size))
+    return elapsed, output.getvalue().splitlines()[-1]
+
+
+def run(n):
+    for name, source in [(f'fib({n})', FIB.replace('{n}', str(n))), ('20000 distinct calls', DISTINCT)]:
+        print(name)
+        for engine in ['tree', 'closure']:
+            plain, plain_output = time_engine(engine, source, 0)
+            cached, cached_output = time_engine(engine, source, MEMO_SIZE)
+            assert plain_output == cached_output, engine
+            print(f'{engine:>8}: uncached {plain * 1000:9.1f} ms  memoized {cached * 1000:8.1f} ms  '
+                  f'({plain / cached:6.1f}x)')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 22)
@@ -0,0 +1,77 @@
+"""The tree-walking `Interpreter` with and without quickening of its binary
+operations, on loops of int, float and string arithmetic, with how often
+the quickened sites' guards let operands through.
+
+Usage: python benchmarks/bench_quickening.py [iterations]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter import Interpreter  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+from quickening import counters  # noqa: E402
+
+
+# While loops: for loops like these would be vectorized.
+SCRIPTS = {
+    'int': '''
+function f(n) {
+    let total = 0; let i = 0;
+    while (i < n) { let total = total + i * 3 % 7; let i = i + 1; }
+    return total;
+}
+print f({n});
+''',
+    'float': '''
+let x = 0.5; let i = 0;
+while (i < {n}) { let x = x * 0.999 + 1.5 / 2.0; let i = i + 1; }
+print x;
+''',
+    'str': '''
+function f(n) {
+    let s = ""; let i = 0;
+    while (i < n) { if (s == "abcabc") { let s = ""; } let s = s + "abc"; let i = i + 1; }
+    return s;
+}
+print f({n});
+''',
+}
+
+
+class GenericInterpreter(Interpreter):
+    quicken_after = None
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+def time_run(interpreter_class, source):
+    interpreter = interpreter_class(None, io.StringIO())
+    program = parse(source)
+    start = time.perf_counter()
+    interpreter.visit(program)
+    return time.perf_counter() - start, interpreter
+
+
+def run(iterations, rounds=5):
+    for name, script in SCRIPTS.items():
+        source = script.replace('{n}', str(iterations))
+        generic = quickened = float('inf')
+        for _ in range(rounds):
+            generic = min(generic, time_run(GenericInterpreter, source)[0])
+            elapsed, interpreter = time_run(Interpreter, source)
+            quickened = min(quickened, elapsed)
+        print(f'{name:>6}: generic {generic * 1000:7.1f} ms   quickened {quickened * 1000:7.1f} ms   '
+              f'{generic / quickened:5.2f}x')
+        for operation, total in counters(interpreter.sites).items():
+            print(f'        {operation:<16} {total["sites"]:2d} sites {total["hits"]:9d} hits {total["misses"]:3d} misses')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,51 @@
+"""Peak memory and throughput of `StreamLexer` against lexing the whole text.
+
+Usage: python benchmarks/bench_stream_lexer.py [size_in_mib ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_lexer import generate_source  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from stream_lexer import StreamLexer  # noqa: E402
+
+
+def measure(make_lexer):
+    tracemalloc.start()
+    start = time.perf_counter()
+    lexer = make_lexer()
+    tokens = 0
+    while lexer.get_next_token().type != 'EOF':
+        tokens += 1
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return tokens, elapsed, peak
+
+
+def read_whole(path):
+    with open(path, encoding='utf-8') as handle:
+        return RegexLexer(handle.read())
+
+
+def run(size):
+    with tempfile.NamedTemporaryFile('w', suffix='.wmzl', encoding='utf-8', delete=False) as handle:
+        handle.write(generate_source(size))
+    try:
+        for name, make_lexer in [('whole', lambda: read_whole(handle.name)),
+                                 ('stream', lambda: StreamLexer(handle.name))]:
+            tokens, elapsed, peak = measure(make_lexer)
+            print(f'{name:>7}: {size / 2 ** 20:6.1f} MiB  {tokens:9d} tokens  '
+                  f'{elapsed:7.3f} s  peak {peak / 2 ** 20:8.2f} MiB')
+    finally:
+        os.remove(handle.name)
+
+
+if __name__ == '__main__':
+    for mib in [int(arg) for arg in sys.argv[1:]] or [1, 8]:
+        run(mib * 2 ** 20)
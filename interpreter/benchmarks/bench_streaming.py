@@ -0,0 +1,60 @@
+"""Time to first output and peak memory when regenerating a large script,
+parsing it whole with `parse()` versus streaming it through
+`StreamLexer` and `Parser.iter_statements()`.
+
+Usage: python benchmarks/bench_streaming.py [line_count ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_incremental import generate_source  # noqa: E402
+from code_generator import generate_code  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+from stream_lexer import StreamLexer  # noqa: E402
+
+
+def whole(path):
+    with open(path, encoding='utf-8') as handle:
+        return Parser(RegexLexer(handle.read())).parse().statements
+
+
+def streamed(path):
+    return Parser(StreamLexer(path)).iter_statements()
+
+
+def measure(path, statements_of):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    with open(os.devnull, 'w') as sink:
+        for code in generate_code(statements_of(path)):
+            if first is None:
+                first = time.perf_counter() - start
+            sink.write(code)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first, total, peak
+
+
+def run(line_count):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'main.wmzl')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(generate_source(line_count))
+        print(f'{line_count} lines, {os.path.getsize(path) / 1024:.0f} KiB')
+        for name, statements_of in [('parse()', whole), ('iter_statements()', streamed)]:
+            first, total, peak = measure(path, statements_of)
+            print(f'  {name:>18}: first output {first * 1000:8.2f} ms, total {total:6.2f} s, '
+                  f'peak memory {peak / 2 ** 20:7.2f} MiB')
+
+
+if __name__ == '__main__':
+    for count in [int(arg) for arg in sys.argv[1:]] or [10000, 100000]:
+        run(count)
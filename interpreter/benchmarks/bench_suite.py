@@ -0,0 +1,274 @@
+"""The front end and the back end phase by phase on generated corpora, with a
+JSON baseline to catch regressions.
+
+Each corpus is a WordMaze program grown by a generator to a number of units
+(statements, blocks or functions). For each size the suite times lexing,
+parsing from the already lexed tokens, generating source back from the tree
+with `CodeGeneratorVisitor`, and running the program, each on its own. Times
+are the best of `--rounds` runs; the peak memory of a phase comes from one
+more run under tracemalloc, which would slow the timed runs down. Throughput
+is bytes of source per second for every phase, so the phases compare.
+
+The first run, or one with `--save`, writes the results as the baseline.
+Later runs compare against it and exit with status 1 when any phase at any
+size lost more than `--threshold` of its throughput or grew its peak memory
+by more than that, in a second measurement as well as in the first; the
+baseline is only comparable on the machine, engine and lexer it was
+recorded with.
+
+Usage: python benchmarks/bench_suite.py [--sizes 250,500,1000] [--threshold 0.25]
+                                         [--baseline FILE] [--save]
+"""
+import argparse
+import gc
+import io
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_generator import CodeGeneratorVisitor  # noqa: E402
+from interpreter import EXECUTION_ENGINES, run_program  # noqa: E402
+from lexer import LEXER_ENGINES  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'suite_baseline.json')
+SIZES = [250, 500, 1000]
+THRESHOLD = 0.25
+PHASES = ['lex', 'parse', 'generate', 'execute']
+
+# Nesting of each deep expression; the parser recurses on it, so it stays
+# well inside Python's recursion limit.
+DEPTH = 40
+
+
+def deep_expressions(n):
+    """`n` assignments, each of an expression nested `DEPTH` parentheses
+    deep on the one before it."""
+    lines = []
+    for k in range(n):
+        expression = f'x_{k - 1}' if k else '1'
+        for level in range(DEPTH):
+            operator = '+*%-'[level % 4]
+            expression = f'({expression} {operator} {97 if operator == "%" else level % 9 + 1})'
+        lines.append(f'let x_{k} = {expression};\n')
+    lines.append(f'print x_{n - 1};\n')
+    return ''.join(lines)
+
+
+STATEMENT = '''let a_{k} = {k} * 3 + total % 7;
+if (a_{k} > total) {{ let total = total + a_{k}; }} else {{ let total = total - 1; }}
+let s_{k} = "item" + "_" + "{k}";
+print a_{k} - total;
+'''
+
+
+def statements(n):
+    """A flat list of `n` blocks of assignments, branches and prints."""
+    return 'let total = 0;\n' + ''.join(STATEMENT.format(k=k) for k in range(n))
+
+
+LOOPS = '''let acc_{k} = 0;
+for (let i = 0; i < 4; let i = i + 1;) {{
+    for (let j = 0; j < 4; let j = j + 1;) {{
+        let m = 0;
+        while (m < 4) {{ let acc_{k} = acc_{k} + i * j + m; let m = m + 1; }}
+    }}
+}}
+'''
+
+
+def nested_loops(n):
+    """`n` loop nests, three deep, of 64 iterations each."""
+    return ''.join(LOOPS.format(k=k) for k in range(n)) + f'print acc_{n - 1};\n'
+
+
+FUNCTION = '''function f_{k}(a, b) {{
+    if (a > b) {{ return a - b + {k}; }}
+    let c = a * {k} % 11;
+    return c + b;
+}}
+'''
+
+
+def functions(n):
+    """`n` function definitions, then a call to each."""
+    definitions = ''.join(FUNCTION.format(k=k) for k in range(n))
+    calls = ''.join(f'let total = total + f_{k}({k % 13}, total % 10);\n' for k in range(n))
+    return definitions + 'let total = 0;\n' + calls + 'print total;\n'
+
+
+CORPORA = {
+    'deep_expressions': deep_expressions,
+    'statements': statements,
+    'nested_loops': nested_loops,
+    'functions': functions,
+}
+
+
+def lex(lexer_class, source):
+    lexer = lexer_class(source)
+    tokens = []
+    while True:
+        token = lexer.get_next_token()
+        tokens.append(token)
+        if token.type == 'EOF':
+            return tokens
+
+
+class Replay:
+    """A lexer handing out tokens lexed before, so parsing times alone."""
+
+    def __init__(self, tokens):
+        self.get_next_token = itertools.chain(tokens, itertools.repeat(tokens[-1])).__next__
+
+
+def time_call(function, argument):
+    """Seconds `function(argument)` takes.
+
+    As with timeit, the collector is off while timing: a collection would
+    walk every tree and token list still alive, which says more about what
+    ran before than about the phase.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        function(argument)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def peak_memory(function, argument):
+    """Peak bytes allocated during `function(argument)`."""
+    tracemalloc.start()
+    try:
+        function(argument)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def phases_of(source, lexer_class, engine):
+    """Each phase of `source`, as a function and the setup making its
+    argument."""
+    tokens = lex(lexer_class, source)
+    program = Parser(Replay(tokens)).parse()
+    return {
+        'lex': (lambda _: lex(lexer_class, source), lambda: None),
+        'parse': (lambda tokens: Parser(Replay(tokens)).parse(), lambda: tokens),
+        'generate': (lambda program: CodeGeneratorVisitor().generate(program), lambda: program),
+        # Running memoizes and may optimize the tree in place: each run gets a fresh one.
+        'execute': (lambda program: run_program(program, engine, io.StringIO()),
+                    lambda: Parser(Replay(tokens)).parse()),
+    }
+
+
+def run_suite(sizes, lexer, engine, rounds):
+    """Time every phase of every corpus once a round, keeping the best
+    time of each; taking turns spreads any slow spell of the machine over
+    all of them instead of one. Peak memory comes from the first round."""
+    sources = {(name, size): generate(size) for name, generate in CORPORA.items() for size in sizes}
+    results = {}
+    for round in range(rounds):
+        for (name, size), source in sources.items():
+            phases = phases_of(source, LEXER_ENGINES[lexer], engine)
+            measured = results.setdefault(name, {}).setdefault(str(size), {})
+            for phase in PHASES:
+                function, setup = phases[phase]
+                seconds = time_call(function, setup())
+                if not round:
+                    measured[phase] = {'seconds': seconds, 'peak_bytes': peak_memory(function, setup())}
+                measured[phase]['seconds'] = min(measured[phase]['seconds'], seconds)
+                measured[phase]['throughput'] = len(source) / measured[phase]['seconds']
+    for (name, size), source in sources.items():
+        measured = results[name][str(size)]
+        print(f'{name:>16} {size:6d} ({len(source) / 1024:6.0f} KiB): ' + '  '.join(
+            f'{phase} {measured[phase]["throughput"] / 2 ** 20:6.2f} MiB/s '
+            f'{measured[phase]["peak_bytes"] / 2 ** 20:6.1f} MiB' for phase in PHASES))
+    return {'python': platform.python_version(), 'lexer': lexer, 'engine': engine, 'results': results}
+
+
+def best_of_runs(first, second):
+    """`first` with the better time and the smaller peak memory of each
+    phase from either run."""
+    for name, sizes in second['results'].items():
+        for size, phases in sizes.items():
+            for phase, measured in phases.items():
+                kept = first['results'][name][size][phase]
+                if measured['seconds'] < kept['seconds']:
+                    kept['seconds'] = measured['seconds']
+                    kept['throughput'] = measured['throughput']
+                kept['peak_bytes'] = min(kept['peak_bytes'], measured['peak_bytes'])
+    return first
+
+
+def regressions(baseline, current, threshold):
+    """Describe every phase of `current` slower or bigger than in
+    `baseline` by more than the fraction `threshold`."""
+    found = []
+    for name, sizes in current['results'].items():
+        for size, phases in sizes.items():
+            for phase, measured in phases.items():
+                before = baseline['results'].get(name, {}).get(size, {}).get(phase)
+                if before is None:
+                    continue
+                lost = 1 - measured['throughput'] / before['throughput']
+                if lost > threshold:
+                    found.append(f'{name} {size} {phase}: throughput down {lost:.0%}')
+                bigger = measured['peak_bytes'] / max(before['peak_bytes'], 1) - 1
+                if bigger > threshold:
+                    found.append(f'{name} {size} {phase}: peak memory up {bigger:.0%}')
+    return found
+
+
+def main(argv):
+    arguments = argparse.ArgumentParser(description='Benchmark each phase on generated WordMaze corpora.')
+    arguments.add_argument('--sizes', type=lambda text: [int(size) for size in text.split(',')], default=SIZES,
+                           help='comma-separated corpus sizes (default: %(default)s)')
+    arguments.add_argument('--lexer', choices=sorted(LEXER_ENGINES), default='classic')
+    arguments.add_argument('--engine', choices=sorted(EXECUTION_ENGINES), default='closure')
+    arguments.add_argument('--rounds', type=int, default=5,
+                           help='timed runs of each phase, of which the best counts')
+    arguments.add_argument('--baseline', default=BASELINE, help='JSON file of the results to compare against')
+    arguments.add_argument('--save', action='store_true', help='record this run as the baseline, not compare it')
+    arguments.add_argument('--threshold', type=float, default=THRESHOLD,
+                           help='fraction of throughput lost or peak memory gained that fails the run')
+    options = arguments.parse_args(argv)
+    if options.rounds < 1:
+        arguments.error('--rounds must be at least 1')
+
+    current = run_suite(options.sizes, options.lexer, options.engine, options.rounds)
+    if options.save or not os.path.exists(options.baseline):
+        with open(options.baseline, 'w') as file:
+            json.dump(current, file, indent=2)
+        print(f'Baseline written to {options.baseline}')
+        return 0
+
+    with open(options.baseline) as file:
+        baseline = json.load(file)
+    if (baseline['lexer'], baseline['engine']) != (current['lexer'], current['engine']):
+        print(f'The baseline was recorded with the {baseline["lexer"]} lexer and the {baseline["engine"]} engine')
+        return 2
+    found = regressions(baseline, current, options.threshold)
+    if found:
+        print(f'{len(found)} regressions; measuring again to rule out a slow spell')
+        current = best_of_runs(current, run_suite(options.sizes, options.lexer, options.engine, options.rounds))
+        found = regressions(baseline, current, options.threshold)
+    for regression in found:
+        print(f'REGRESSION {regression}')
+    if found:
+        return 1
+    print(f'No phase regressed by more than {options.threshold:.0%} against {options.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,104 @@
+"""Per-token memory and parser speed: `Token` objects, with `__slots__` and
+with a `__dict__` as they had before, vs `TokenBuffer`.
+
+Usage: python benchmarks/bench_token_buffer.py [statement_count ...]
+"""
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lexer  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+from token_buffer import TokenBuffer  # noqa: E402
+
+
+STATEMENT = 'let value_{n} = ({n} + 3.5) * 2 - {n} / 4 == 1 && 2 < 3 || 1 > 0;\n'
+
+
+def generate_source(statements):
+    return ''.join(STATEMENT.format(n=n) for n in range(statements))
+
+
+class DictToken:
+    """`Token` as it was before it had `__slots__`."""
+
+    def __init__(self, type, value, start=None, end=None):
+        self.type = type
+        self.value = value
+        self.start = start
+        self.end = end
+
+
+@contextlib.contextmanager
+def dict_tokens():
+    """Have the lexers build `DictToken`s instead of `Token`s."""
+    slotted = lexer.Token
+    lexer.Token = DictToken
+    try:
+        yield
+    finally:
+        lexer.Token = slotted
+
+
+def token_list(text):
+    lexer = RegexLexer(text)
+    tokens = []
+    while True:
+        token = lexer.get_next_token()
+        tokens.append(token)
+        if token.type == 'EOF':
+            return tokens
+
+
+def traced_size(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def best_time(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(statements):
+    text = generate_source(statements)
+    with dict_tokens():
+        _, dict_size = traced_size(lambda: token_list(text))
+        dict_time = best_time(lambda: Parser(RegexLexer(text)).parse())
+    tokens, list_size = traced_size(lambda: token_list(text))
+    buffer, buffer_size = traced_size(lambda: TokenBuffer(text))
+    count = len(tokens)
+    print(f'{statements} statements, {count} tokens')
+    print(f'  Token list, __dict__ : {dict_size / count:6.1f} bytes/token')
+    print(f'  Token list, __slots__: {list_size / count:6.1f} bytes/token')
+    print(f'  TokenBuffer          : {buffer_size / count:6.1f} bytes/token')
+
+    lexer_time = best_time(lambda: Parser(RegexLexer(text)).parse())
+    pack_time = best_time(lambda: TokenBuffer(text))
+
+    def parse_buffer():
+        buffer.rewind()
+        Parser(buffer).parse()
+
+    buffer_time = best_time(parse_buffer)
+    print(f'  lex + parse, Token __dict__ : {dict_time:7.3f} s')
+    print(f'  lex + parse, Token __slots__: {lexer_time:7.3f} s')
+    print(f'  pack TokenBuffer            : {pack_time:7.3f} s')
+    print(f'  parse packed TokenBuffer    : {buffer_time:7.3f} s')
+
+
+if __name__ == '__main__':
+    for count in [int(arg) for arg in sys.argv[1:]] or [20000]:
+        run(count)
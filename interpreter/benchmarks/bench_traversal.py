@@ -0,0 +1,68 @@
+"""Traversals of left-deep `a + a + ... + a` chains on traversal.py's explicit
+stack: code generation against a recursive `accept` visitor like the one
+it replaced, and resolving, compiling to bytecode and lowering to IR per
+node as the chains grow.
+
+The recursive visitor gets a raised recursion limit and a large thread
+stack, which is what deep trees otherwise take.
+
+Usage: python benchmarks/bench_traversal.py [longest chain]
+"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ast_nodes import ASTVisitor  # noqa: E402
+from bench_interpreter import best_of  # noqa: E402
+from bytecode import compile_bytecode  # noqa: E402
+from code_generator import CodeGeneratorVisitor, format_literal  # noqa: E402
+from ir import lower_program  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+from resolver import resolve  # noqa: E402
+
+
+class RecursiveCodeGenerator(ASTVisitor):
+    """Expression code generation returning each node's code from `accept`."""
+
+    def visit_literal_node(self, node):
+        return format_literal(node.value)
+
+    def visit_variable_node(self, node):
+        return node.name
+
+    def visit_binary_op_node(self, node):
+        return f"({node.left.accept(self)} {node.operator} {node.right.accept(self)})"
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+def run(longest):
+    sizes = [size for size in (100, 1000, 10000, 100000) if size < longest] + [longest]
+    print(f'{"terms":>8} {"recursive":>10} {"explicit":>9}   {"resolve":>8} {"bytecode":>9} {"ir":>8}  (us per term)')
+    for size in sizes:
+        program = parse('let a = 1; print ' + ' + '.join(['a'] * size) + ';')
+        expression = program.statements[1].expression
+        generator = CodeGeneratorVisitor()
+        explicit = best_of(3, lambda: generator.generate(expression))
+        try:
+            recursive = best_of(3, lambda: expression.accept(RecursiveCodeGenerator()))
+            recursive = f'{recursive * 1000:8.2f}ms'
+        except RecursionError:
+            recursive = 'too deep'
+        per_term = [best_of(3, lambda: step(program)) / size * 1e6 for step in (resolve, compile_bytecode, lower_program)]
+        print(f'{size:>8} {recursive:>10} {explicit * 1000:7.2f}ms   '
+              + ' '.join(f'{cost:8.2f}' for cost in per_term))
+
+
+if __name__ == '__main__':
+    longest = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * longest))
+    threading.stack_size(512 * 1024 * 1024)
+    thread = threading.Thread(target=run, args=(longest,))
+    thread.start()
+    thread.join()
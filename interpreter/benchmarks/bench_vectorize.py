@@ -0,0 +1,73 @@
+"""Counted loops over arrays run as whole-array NumPy operations against the
+same loops run one iteration at a time, on the engines that vectorize.
+
+Usage: python benchmarks/bench_vectorize.py [log10 of the array length]
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vectorize  # noqa: E402
+from bench_interpreter import best_of  # noqa: E402
+from interpreter import run_program  # noqa: E402
+from lexer import RegexLexer  # noqa: E402
+from parser import Parser  # noqa: E402
+
+
+# A dot product and an integer sum over the same loop.
+SCRIPT = '''
+let n = {length};
+let a = array(n, 1.5);
+let b = array(n, 2);
+let dot = 0.0;
+let total = 0;
+for (let i = 0; i < n; let i = i + 1;) {
+    let dot = dot + a[i] * b[i];
+    let total = total + (b[i] * i) % 7;
+}
+print dot;
+print total;
+'''
+
+# The same arrays, without the loop, to take their creation out of the
+# loop times.
+SETUP = SCRIPT[:SCRIPT.index('for')]
+
+
+def parse(source):
+    return Parser(RegexLexer(source)).parse()
+
+
+def time_engine(engine, source, repeat=3):
+    output = io.StringIO()
+    elapsed = best_of(repeat, lambda: run_program(parse(source), engine, output))
+    return elapsed, output.getvalue().splitlines()[-2:]
+
+
+def run(exponent):
+    length = 10 ** exponent
+    source = SCRIPT.replace('{length}', str(length))
+    setup = SETUP.replace('{length}', str(length))
+    if vectorize.numpy is None:
+        print('NumPy is not installed: every loop runs one iteration at a time')
+    print(f'{length} elements')
+    for engine in ['tree', 'closure']:
+        overhead, _ = time_engine(engine, setup)
+        vector, vector_output = time_engine(engine, source)
+        threshold = vectorize.MIN_VECTOR_LENGTH
+        vectorize.MIN_VECTOR_LENGTH = float('inf')
+        try:
+            scalar, scalar_output = time_engine(engine, source, 1)
+        finally:
+            vectorize.MIN_VECTOR_LENGTH = threshold
+        assert vector_output == scalar_output, engine
+        vector -= overhead
+        scalar -= overhead
+        print(f'{engine:>8}: scalar {scalar * 1000:9.1f} ms  vectorized {vector * 1000:8.1f} ms  '
+              f'({scalar / vector:6.1f}x)')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 6)
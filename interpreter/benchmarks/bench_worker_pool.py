@@ -0,0 +1,47 @@
+"""Small scripts run one fresh Python process each, as a pipeline step would,
+against the same scripts submitted to a warm `WorkerPool`.
+
+Usage: python benchmarks/bench_worker_pool.py [jobs]
+"""
+import os
+import subprocess
+import sys
+import time
+
+DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORY)
+
+from worker_pool import WorkerPool, run_job  # noqa: E402
+
+
+SCRIPT = 'function sq(x) { return x * x; } let total = 0; ' \
+         'for (let i = 0; i < 100; let i = i + 1;) { let total = total + sq(i); } print total;'
+
+FRESH = 'import sys; from worker_pool import run_job; print(run_job(sys.argv[1], "closure").output, end="")'
+
+
+def run(jobs):
+    expected = run_job(SCRIPT, 'closure').output
+    start = time.perf_counter()
+    for _ in range(jobs):
+        result = subprocess.run([sys.executable, '-c', FRESH, SCRIPT], cwd=DIRECTORY,
+                                capture_output=True, text=True, check=True)
+        assert result.stdout == expected
+    fresh = (time.perf_counter() - start) / jobs
+
+    start = time.perf_counter()
+    pool = WorkerPool(max_jobs=jobs)
+    started = time.perf_counter() - start
+    start = time.perf_counter()
+    with pool:
+        futures = [pool.submit(SCRIPT) for _ in range(jobs)]
+        assert all(future.result().output == expected for future in futures)
+    pooled = (time.perf_counter() - start) / jobs
+
+    print(f'{jobs} jobs: fresh process {fresh * 1000:7.2f} ms per job, '
+          f'warm pool {pooled * 1000:6.2f} ms per job ({fresh / pooled:.0f}x), '
+          f'pool started in {started * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,134 @@
+"""Limits on what one run of a script may use, for running scripts nobody
+has checked: steps, wall-clock time, call depth and the size of what a
+single operation allocates.
+
+A script can only run for long by looping or calling, so the engines that
+take a `Budget` charge a step at every loop iteration (the back-edge) and
+every call, and nowhere else. The clock is read every `CLOCK_INTERVAL`
+steps, so a deadline is noticed that many steps late at most. Allocation
+is checked where a script can build something large in one operation:
+`array()`, and `+` and `*` on strings and arrays.
+
+Running out raises `LimitExceeded`. A `try`/`catch` in the script can
+catch it, but the steps and time limits stay exceeded: the next step
+raises again, until the error leaves the script.
+"""
+import time
+
+from runtime import BINARY_OPERATORS, BUILTINS, make_array
+
+
+CLOCK_INTERVAL = 1024
+
+SEQUENCE_TYPES = (str, list)
+
+
+class LimitExceeded(Exception):
+    """A run went past one of the limits of its `Budget`; `limit` names
+    which: 'steps', 'seconds', 'depth' or 'allocation'.
+    """
+
+    def __init__(self, limit, message):
+        super().__init__(message)
+        self.limit = limit
+
+
+class Budget:
+    """What one run may use: `max_steps` loop iterations and calls,
+    `seconds` of wall-clock time, `max_depth` nested calls and
+    `max_allocation` elements of a string or array built by one operation.
+    A limit of None is no limit.
+
+    `start()` resets the counters, so a budget applies afresh to each run
+    given it; `steps` and `depth` count what the run in progress has used.
+    """
+
+    def __init__(self, max_steps=None, seconds=None, max_depth=None, max_allocation=None):
+        for name, limit in [('max_steps', max_steps), ('seconds', seconds), ('max_depth', max_depth),
+                            ('max_allocation', max_allocation)]:
+            if limit is not None and limit < 0:
+                raise ValueError(f'{name} must not be negative')
+        self.max_steps = max_steps
+        self.seconds = seconds
+        self.max_depth = max_depth
+        self.max_allocation = max_allocation
+        # Engines compare against these on every step and call.
+        self.depth_limit = max_depth if max_depth is not None else float('inf')
+        self.start()
+
+    def start(self):
+        self.steps = 0
+        self.depth = 0
+        self.deadline = time.perf_counter() + self.seconds if self.seconds is not None else None
+        self.checkpoint = 0
+
+    def tick(self):
+        """Charge a step. Engines inline this on their hot paths."""
+        self.steps += 1
+        if self.steps >= self.checkpoint:
+            self.check()
+
+    def check(self):
+        """The slow path of `tick`: enforce the steps and time limits, then
+        set the step at which to come back.
+        """
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise LimitExceeded('steps', f'Step limit of {self.max_steps} exceeded')
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise LimitExceeded('seconds', f'Time limit of {self.seconds} s exceeded')
+        checkpoint = self.steps + CLOCK_INTERVAL
+        if self.max_steps is not None:
+            checkpoint = min(checkpoint, self.max_steps + 1)
+        self.checkpoint = checkpoint
+
+    def enter(self):
+        """Charge a call about to be made, one level deeper."""
+        self.tick()
+        if self.depth >= self.depth_limit:
+            self.too_deep()
+        self.depth += 1
+
+    def leave(self):
+        self.depth -= 1
+
+    def too_deep(self):
+        raise LimitExceeded('depth', f'Call depth limit of {self.max_depth} exceeded')
+
+    def allocate(self, size):
+        if size > self.max_allocation:
+            raise LimitExceeded('allocation', f'Allocation of {size} elements exceeds the limit of '
+                                              f'{self.max_allocation}')
+
+    def make_array(self, size, fill=0):
+        self.allocate(size)
+        return make_array(size, fill)
+
+    def add(self, left, right):
+        if isinstance(left, SEQUENCE_TYPES) and isinstance(right, SEQUENCE_TYPES):
+            self.allocate(len(left) + len(right))
+        return left + right
+
+    def multiply(self, left, right):
+        if isinstance(left, SEQUENCE_TYPES) and isinstance(right, int):
+            self.allocate(len(left) * right)
+        elif isinstance(right, SEQUENCE_TYPES) and isinstance(left, int):
+            self.allocate(len(right) * left)
+        return left * right
+
+    def binary_operators(self):
+        """`BINARY_OPERATORS`, with checked allocation if it is limited."""
+        if self.max_allocation is None:
+            return BINARY_OPERATORS
+        return {**BINARY_OPERATORS, '+': self.add, '*': self.multiply}
+
+    def builtins(self):
+        """`BUILTINS`, with checked allocation if it is limited."""
+        if self.max_allocation is None:
+            return BUILTINS
+        return {**BUILTINS, 'array': self.make_array}
+
+    def __repr__(self):
+        limits = [f'{name}={limit}' for name, limit in [
+            ('max_steps', self.max_steps), ('seconds', self.seconds), ('max_depth', self.max_depth),
+            ('max_allocation', self.max_allocation)] if limit is not None]
+        return f'<Budget {" ".join(limits) or "unlimited"}: {self.steps} steps used>'
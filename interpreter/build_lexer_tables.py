@@ -0,0 +1,485 @@
+"""Generate lexer_tables.py from the lexer rules of WordMaze.g4.
+
+The lexer rules (and any literal tokens that parser rules introduce
+implicitly, as ANTLR does) are compiled to an NFA, turned into a minimal DFA
+over character classes, and written out as plain Python tuples that
+`TableLexer` runs. Re-run this script whenever the grammar changes:
+
+    python build_lexer_tables.py [grammar.g4] [output.py]
+"""
+import os
+import re
+import sys
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GRAMMAR_PATH = os.path.join(HERE, os.pardir, 'Lexer and Parser Development using YACC', 'WordMaze.g4')
+OUTPUT_PATH = os.path.join(HERE, 'lexer_tables.py')
+
+# Grammar rule names whose `Token.type` is spelled differently by the
+# WordMaze lexers (which predate the grammar).
+TOKEN_TYPES = {
+    'IDENTIFIER': 'WORD',
+    'FLOAT_LITERAL': 'NUMBER',
+    'STRING_LITERAL': 'STRING',
+    'STRING': 'STRING_TYPE',
+    'EQ': 'EQUALS_EQUALS',
+    'NEQ': 'NOT_EQUALS',
+    'LE': 'LESS_THAN_EQUALS',
+    'GE': 'GREATER_THAN_EQUALS',
+    'LT': 'LESS_THAN',
+    'GT': 'GREATER_THAN',
+    'ASSIGN': 'EQUALS',
+    'MUL': 'MULTIPLY',
+    'DIV': 'DIVIDE',
+    'MOD': 'MODULO',
+    'INC': 'INCREMENT',
+    'DEC': 'DECREMENT',
+}
+
+# Names for punctuation that only appears as a literal inside parser rules.
+IMPLICIT_TOKEN_NAMES = {
+    ':': 'COLON',
+}
+
+# Symbols are the 128 ASCII code points plus OTHER, which stands for every
+# non-ASCII character.
+OTHER = 128
+ALPHABET = frozenset(range(OTHER + 1))
+
+ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f'}
+
+GRAMMAR_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<literal>'(?:[^'\\]|\\.)*')
+  | (?P<set>\[(?:[^\]\\]|\\.)*\])
+  | (?P<arrow>->)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<escape>\\.)
+  | (?P<punct>[:;|()*+?~.])
+''', re.VERBOSE | re.DOTALL)
+
+
+class GrammarError(Exception):
+    pass
+
+
+def tokenize_grammar(text):
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = GRAMMAR_TOKEN.match(text, pos)
+        if match is None:
+            raise GrammarError(f'Unexpected character {text[pos]!r} in grammar')
+        pos = match.end()
+        if match.lastgroup not in ('space', 'comment'):
+            tokens.append((match.lastgroup, match.group()))
+    return tokens
+
+
+def unescape(text):
+    chars = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == '\\':
+            i += 1
+            char = text[i]
+            if char == 'u':
+                chars.append(chr(int(text[i + 1:i + 5], 16)))
+                i += 5
+                continue
+            char = ESCAPES.get(char, char)
+        chars.append(char)
+        i += 1
+    return chars
+
+
+def symbol(char):
+    code = ord(char)
+    return code if code < OTHER else OTHER
+
+
+def parse_set(text):
+    body = text[1:-1]
+    negate = body.startswith('^')
+    if negate:
+        body = body[1:]
+    chars = unescape(body)
+    symbols = set()
+    i = 0
+    while i < len(chars):
+        if i + 2 < len(chars) and chars[i + 1] == '-':
+            symbols.update(symbol(chr(code)) for code in range(ord(chars[i]), ord(chars[i + 2]) + 1))
+            i += 3
+        else:
+            symbols.add(symbol(chars[i]))
+            i += 1
+    return ALPHABET - symbols if negate else frozenset(symbols)
+
+
+class RuleParser:
+    """Recursive descent over the right-hand side of one lexer rule."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.parse_alternatives()
+        if self.pos != len(self.tokens):
+            raise GrammarError(f'Unexpected {self.peek()[1]!r} in lexer rule')
+        return node
+
+    def parse_alternatives(self):
+        alternatives = [self.parse_sequence()]
+        while self.peek() == ('punct', '|'):
+            self.take()
+            alternatives.append(self.parse_sequence())
+        return alternatives[0] if len(alternatives) == 1 else ('alt', alternatives)
+
+    def parse_sequence(self):
+        items = []
+        while self.peek()[0] is not None and self.peek() not in (('punct', '|'), ('punct', ')')):
+            item = self.parse_atom()
+            while self.peek() in (('punct', '*'), ('punct', '+'), ('punct', '?')):
+                item = ({'*': 'star', '+': 'plus', '?': 'opt'}[self.take()[1]], item)
+            items.append(item)
+        return items[0] if len(items) == 1 else ('seq', items)
+
+    def parse_atom(self):
+        kind, text = self.take()
+        if kind == 'literal':
+            return ('seq', [('chars', frozenset([symbol(char)])) for char in unescape(text[1:-1])])
+        if kind == 'set':
+            return ('chars', parse_set(text))
+        if kind == 'escape':
+            return ('chars', frozenset([symbol(unescape(text)[0])]))
+        if kind == 'name':
+            return ('ref', text)
+        if (kind, text) == ('punct', '.'):
+            return ('chars', ALPHABET)
+        if (kind, text) == ('punct', '~'):
+            operand = self.parse_atom()
+            if operand[0] != 'chars':
+                operand = ('chars', frozenset().union(*(item[1] for item in operand[1])))
+            return ('chars', ALPHABET - operand[1])
+        if (kind, text) == ('punct', '('):
+            node = self.parse_alternatives()
+            if self.take() != ('punct', ')'):
+                raise GrammarError("Missing ')' in lexer rule")
+            return node
+        raise GrammarError(f'Unexpected {text!r} in lexer rule')
+
+
+def literal_text(node):
+    """The fixed string a rule matches, or None if it matches more than one."""
+    if node[0] == 'seq':
+        parts = [literal_text(item) for item in node[1]]
+        return None if None in parts else ''.join(parts)
+    if node[0] == 'chars' and len(node[1]) == 1:
+        (code,) = node[1]
+        return chr(code) if code != OTHER else None
+    return None
+
+
+def read_grammar(text):
+    """Split a grammar into lexer rules and implicit parser-rule literals.
+
+    Returns `(rules, implicit)`: `rules` is a list of
+    `(name, node, is_fragment, is_skip)` in file order and `implicit` the
+    quoted literals used by parser rules, in order of first appearance.
+    """
+    tokens = tokenize_grammar(text)
+    rules = []
+    implicit = []
+    pos = 0
+    while pos < len(tokens):
+        end = pos
+        while tokens[end] != ('punct', ';'):
+            end += 1
+        statement = tokens[pos:end]
+        pos = end + 1
+
+        if statement[0] == ('name', 'grammar'):
+            continue
+        is_fragment = statement[0] == ('name', 'fragment')
+        if is_fragment:
+            statement = statement[1:]
+        name = statement[0][1]
+        if statement[1] != ('punct', ':'):
+            raise GrammarError(f'Expected ":" after rule {name}')
+        body = statement[2:]
+
+        if not name[0].isupper():
+            for kind, value in body:
+                if kind == 'literal' and value not in implicit:
+                    implicit.append(value)
+            continue
+
+        is_skip = False
+        if ('arrow', '->') in body:
+            arrow = body.index(('arrow', '->'))
+            is_skip = body[arrow + 1:] == [('name', 'skip')]
+            body = body[:arrow]
+        rules.append((name, RuleParser(body).parse(), is_fragment, is_skip))
+    return rules, implicit
+
+
+class NFA:
+    def __init__(self):
+        self.edges = []
+        self.accepts = {}
+
+    def new_state(self):
+        self.edges.append([])
+        return len(self.edges) - 1
+
+    def add(self, node, fragments):
+        """Thompson construction; returns the (start, end) states of `node`."""
+        kind = node[0]
+        start = self.new_state()
+        if kind == 'chars':
+            end = self.new_state()
+            self.edges[start].append((node[1], end))
+        elif kind == 'seq':
+            end = start
+            for item in node[1]:
+                item_start, item_end = self.add(item, fragments)
+                self.edges[end].append((None, item_start))
+                end = item_end
+        elif kind == 'alt':
+            end = self.new_state()
+            for item in node[1]:
+                item_start, item_end = self.add(item, fragments)
+                self.edges[start].append((None, item_start))
+                self.edges[item_end].append((None, end))
+        elif kind == 'ref':
+            if node[1] not in fragments:
+                raise GrammarError(f'Unknown lexer rule {node[1]}')
+            return self.add(fragments[node[1]], fragments)
+        else:
+            item_start, item_end = self.add(node[1], fragments)
+            end = self.new_state()
+            self.edges[start].append((None, item_start))
+            self.edges[item_end].append((None, end))
+            if kind in ('star', 'opt'):
+                self.edges[start].append((None, end))
+            if kind in ('star', 'plus'):
+                self.edges[item_end].append((None, item_start))
+        return start, end
+
+    def closure(self, states):
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            for label, target in self.edges[stack.pop()]:
+                if label is None and target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+
+def char_classes(nfa):
+    """Partition the alphabet into symbols no edge label can tell apart."""
+    labels = {label for edges in nfa.edges for label, _ in edges if label is not None}
+    signatures = {}
+    for code in sorted(ALPHABET):
+        signature = frozenset(index for index, label in enumerate(labels) if code in label)
+        signatures.setdefault(signature, []).append(code)
+    classes = [0] * (OTHER + 1)
+    for index, codes in enumerate(sorted(signatures.values())):
+        for code in codes:
+            classes[code] = index
+    return classes, len(signatures)
+
+
+def build_dfa(nfa, start, classes, class_count):
+    representatives = [classes.index(index) for index in range(class_count)]
+    initial = nfa.closure([start])
+    states = [None, initial]
+    numbers = {initial: 1}
+    transitions = [[0] * class_count]
+    accepts = [None]
+    pending = [initial]
+    while pending:
+        current = pending.pop(0)
+        row = []
+        for code in representatives:
+            targets = [target for state in current for label, target in nfa.edges[state]
+                       if label is not None and code in label]
+            if not targets:
+                row.append(0)
+                continue
+            target = nfa.closure(targets)
+            if target not in numbers:
+                numbers[target] = len(states)
+                states.append(target)
+                pending.append(target)
+            row.append(numbers[target])
+        transitions.append(row)
+        candidates = [nfa.accepts[state] for state in current if state in nfa.accepts]
+        accepts.append(min(candidates)[1] if candidates else None)
+    return transitions, accepts
+
+
+def minimize(transitions, accepts):
+    """Merge equivalent states (Moore's partition refinement)."""
+    groups = {}
+    block = [groups.setdefault((accept, index == 0), len(groups)) for index, accept in enumerate(accepts)]
+    while True:
+        signatures = {}
+        refined = [signatures.setdefault((block[state], tuple(block[target] for target in row)), len(signatures))
+                   for state, row in enumerate(transitions)]
+        if len(signatures) == len(set(block)):
+            break
+        block = refined
+
+    # Renumber so that the dead state is 0 and the start state is 1.
+    order = {}
+    for state in [0, 1] + list(range(2, len(transitions))):
+        order.setdefault(block[state], len(order))
+    new_transitions = [None] * len(order)
+    new_accepts = [None] * len(order)
+    for state, row in enumerate(transitions):
+        new_transitions[order[block[state]]] = tuple(order[block[target]] for target in row)
+        new_accepts[order[block[state]]] = accepts[state]
+    return new_transitions, new_accepts
+
+
+def build_tables(text):
+    rules, implicit = read_grammar(text)
+    fragments = {name: node for name, node, _, _ in rules}
+
+    literal_names = {}
+    for name, node, is_fragment, _ in rules:
+        literal = literal_text(node)
+        if literal is not None and not is_fragment:
+            literal_names.setdefault(literal, name)
+
+    # As in ANTLR, literals introduced by parser rules become tokens that
+    # take priority over every explicit lexer rule.
+    token_rules = []
+    for quoted in implicit:
+        literal = ''.join(unescape(quoted[1:-1]))
+        if literal not in literal_names:
+            name = IMPLICIT_TOKEN_NAMES.get(literal) or literal.upper()
+            if not name.isidentifier():
+                raise GrammarError(f'No token name for implicit literal {quoted}')
+            literal_names[literal] = name
+            token_rules.append((name, ('seq', [('chars', frozenset([symbol(char)])) for char in literal]), False))
+    token_rules += [(name, node, is_skip) for name, node, is_fragment, is_skip in rules if not is_fragment]
+
+    nfa = NFA()
+    start = nfa.new_state()
+    skip = set()
+    for priority, (name, node, is_skip) in enumerate(token_rules):
+        token_type = TOKEN_TYPES.get(name, name)
+        rule_start, rule_end = nfa.add(node, fragments)
+        nfa.edges[start].append((None, rule_start))
+        nfa.accepts[rule_end] = (priority, token_type)
+        if is_skip:
+            skip.add(token_type)
+
+    classes, class_count = char_classes(nfa)
+    transitions, accepts = minimize(*build_dfa(nfa, start, classes, class_count))
+    literals = {literal: TOKEN_TYPES.get(name, name) for literal, name in literal_names.items()}
+    return {
+        'literals': literals,
+        'skip': skip,
+        'classes': classes,
+        'class_count': class_count,
+        'transitions': transitions,
+        'accepts': accepts,
+    }
+
+
+def wrap(items, indent='    ', width=79):
+    lines = []
+    line = indent
+    for item in items:
+        piece = f'{item}, '
+        if len(line) + len(piece.rstrip()) > width:
+            lines.append(line.rstrip())
+            line = indent
+        line += piece
+    if line.strip():
+        lines.append(line.rstrip())
+    return lines
+
+
+def render(tables, grammar_name):
+    classes = tables['classes']
+    lines = [
+        f'# Generated by build_lexer_tables.py from {grammar_name}. Do not edit;',
+        '# re-run the script after changing the grammar.',
+        '',
+        '# Token type of every rule that matches exactly one fixed string.',
+        'LITERAL_TOKENS = {',
+    ]
+    lines += [f'    {literal!r}: {token_type!r},' for literal, token_type in sorted(tables['literals'].items())]
+    lines += [
+        '}',
+        '',
+        '# Tokens that are matched but never handed to the parser.',
+        f'SKIP_TOKENS = frozenset({sorted(tables["skip"])!r})',
+        '',
+        f'CLASS_COUNT = {tables["class_count"]}',
+        '',
+        '# Character class of every non-ASCII character.',
+        f'OTHER_CLASS = {classes[OTHER]}',
+        '',
+        '# Character class of each ASCII code point.',
+        'CHAR_CLASSES = (',
+    ]
+    lines += wrap(classes[:OTHER])
+    lines += [
+        ')',
+        '',
+        'DEAD_STATE = 0',
+        'START_STATE = 1',
+        '',
+        '# TRANSITIONS[state][char_class] is the next state.',
+        'TRANSITIONS = (',
+    ]
+    for row in tables['transitions']:
+        lines.append('    (')
+        lines += wrap(row, indent='        ')
+        lines.append('    ),')
+    lines += [
+        ')',
+        '',
+        '# Token type recognised in each state, or None.',
+        'ACCEPTS = (',
+    ]
+    lines += [f'    {accept!r},' for accept in tables['accepts']]
+    lines += [')', '']
+    return '\n'.join(lines)
+
+
+def generate(grammar_path=GRAMMAR_PATH):
+    with open(grammar_path, encoding='utf-8') as handle:
+        tables = build_tables(handle.read())
+    return render(tables, os.path.basename(grammar_path))
+
+
+def main(argv):
+    grammar_path = argv[1] if len(argv) > 1 else GRAMMAR_PATH
+    output_path = argv[2] if len(argv) > 2 else OUTPUT_PATH
+    source = generate(grammar_path)
+    with open(output_path, 'w', encoding='utf-8') as handle:
+        handle.write(source)
+    print(f'Wrote {output_path}')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
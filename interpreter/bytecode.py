@@ -0,0 +1,276 @@
+import operator
+
+from resolver import local_names
+from runtime import BINARY_OPERATORS, UNARY_OPERATORS
+from traversal import run
+
+
+# Every instruction is two slots of the flat `instructions` list, an opcode
+# and an argument (0 when unused), so the VM always advances by 2 and jump
+# targets are slot indices.
+OPNAMES = (
+    'LOAD_NAME',       # push frame[name], else globals[name]; arg: name index
+    'LOAD_GLOBAL',     # push globals[name]; arg: name index
+    'LOAD_CONST',      # arg: constant index
+    'STORE_NAME',      # frame[name] = pop(); arg: name index
+    'BINARY_OP',       # arg: index into BINARY_FUNCTIONS
+    'JUMP_IF_FALSE',   # pop(); jump to arg if it is false
+    'JUMP_IF_TRUE',    # pop(); jump to arg if it is true
+    'JUMP',            # arg: target
+    'LOAD_FUNCTION',   # push callee: frame, globals, then builtins; arg: name index
+    'CALL',            # arg: argument count | callee name index << CALL_NAME_SHIFT
+    'RETURN',          # return pop() to the caller
+    'INDEX',           # index = pop(); push pop()[index]
+    'UNARY_OP',        # arg: index into UNARY_FUNCTIONS
+    'PRINT',           # write pop()
+    'MAKE_FUNCTION',   # push a Function; arg: index of its CodeObject constant
+    'SETUP_TRY',       # arg: handler target
+    'POP_TRY',
+    'HALT',            # end of the program
+)
+
+(LOAD_NAME, LOAD_GLOBAL, LOAD_CONST, STORE_NAME, BINARY_OP, JUMP_IF_FALSE,
+ JUMP_IF_TRUE, JUMP, LOAD_FUNCTION, CALL, RETURN, INDEX, UNARY_OP, PRINT,
+ MAKE_FUNCTION, SETUP_TRY, POP_TRY, HALT) = range(len(OPNAMES))
+
+NAME_OPS = {LOAD_NAME, LOAD_GLOBAL, STORE_NAME, LOAD_FUNCTION}
+JUMP_OPS = {JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, SETUP_TRY}
+ARGUMENT_OPS = NAME_OPS | JUMP_OPS | {LOAD_CONST, BINARY_OP, UNARY_OP, CALL, MAKE_FUNCTION}
+
+CALL_NAME_SHIFT = 8
+CALL_COUNT_MASK = (1 << CALL_NAME_SHIFT) - 1
+
+BINARY_NAMES = tuple(BINARY_OPERATORS)
+BINARY_FUNCTIONS = tuple(BINARY_OPERATORS.values())
+UNARY_NAMES = (*UNARY_OPERATORS, 'bool')
+UNARY_FUNCTIONS = (*UNARY_OPERATORS.values(), operator.truth)
+TO_BOOL = UNARY_NAMES.index('bool')
+
+
+class CodeObject:
+    """Bytecode for a program or a function body, with the constant and name
+    pools its arguments index into.
+    """
+
+    def __init__(self, name, parameters, instructions, constants, names):
+        self.name = name
+        self.parameters = parameters
+        self.instructions = instructions
+        self.constants = constants
+        self.names = names
+
+
+class BytecodeCompiler:
+    """Compiles a tree into a `CodeObject` per program and function body.
+
+    Scoping follows the other engines (see `ClosureCompiler`): names a
+    function may bind use LOAD_NAME, everything else LOAD_GLOBAL. The
+    `compile_<ClassName>` methods yield the nodes below them to
+    traversal.py's `run`, so trees of any depth compile.
+    """
+
+    def __init__(self, name='<program>', parameters=(), locals=None):
+        self.name = name
+        self.parameters = tuple(parameters)
+        self.locals = locals
+        self.instructions = []
+        self.constants = []
+        self.constant_indexes = {}
+        self.names = []
+        self.name_indexes = {}
+
+    def compile_program(self, program):
+        run(self.compile_body(program.statements), self.compile)
+        self.emit(HALT)
+        return self.code_object()
+
+    def compile_function(self, body):
+        run(self.compile_body(body), self.compile)
+        self.emit(LOAD_CONST, self.constant(None))
+        self.emit(RETURN)
+        return self.code_object()
+
+    def code_object(self):
+        return CodeObject(self.name, self.parameters, self.instructions, tuple(self.constants), tuple(self.names))
+
+    def emit(self, opcode, argument=0):
+        self.instructions += (opcode, argument)
+        return len(self.instructions) - 1
+
+    def patch(self, slot, target=None):
+        self.instructions[slot] = len(self.instructions) if target is None else target
+
+    def constant(self, value):
+        # Keyed by type too, so that 1, 1.0 and true stay distinct.
+        key = (type(value), value) if not isinstance(value, CodeObject) else id(value)
+        if key not in self.constant_indexes:
+            self.constant_indexes[key] = len(self.constants)
+            self.constants.append(value)
+        return self.constant_indexes[key]
+
+    def name_index(self, name):
+        if name not in self.name_indexes:
+            self.name_indexes[name] = len(self.names)
+            self.names.append(name)
+        return self.name_indexes[name]
+
+    def compile(self, node):
+        method = getattr(self, 'compile_' + type(node).__name__, None)
+        if method is None:
+            raise Exception(f'No compile_{type(node).__name__} method')
+        return method(node)
+
+    def compile_body(self, statements):
+        for statement in statements:
+            yield statement
+
+    def compile_LiteralNode(self, node):
+        self.emit(LOAD_CONST, self.constant(node.value))
+
+    compile_ExpressionNode = compile_LiteralNode
+
+    def load(self, name):
+        local = self.locals is not None and name in self.locals
+        self.emit(LOAD_NAME if local else LOAD_GLOBAL, self.name_index(name))
+
+    def compile_VariableNode(self, node):
+        self.load(node.name)
+
+    def compile_BinaryOpNode(self, node):
+        if node.operator in ('&&', '||'):
+            # a && b: a; JUMP_IF_FALSE short; b; TO_BOOL; JUMP end; short: false
+            yield node.left
+            short = self.emit(JUMP_IF_FALSE if node.operator == '&&' else JUMP_IF_TRUE)
+            yield node.right
+            self.emit(UNARY_OP, TO_BOOL)
+            end = self.emit(JUMP)
+            self.patch(short)
+            self.emit(LOAD_CONST, self.constant(node.operator == '||'))
+            self.patch(end)
+            return
+        yield node.left
+        yield node.right
+        self.emit(BINARY_OP, BINARY_NAMES.index(node.operator))
+
+    def compile_UnaryOpNode(self, node):
+        yield node.operand
+        self.emit(UNARY_OP, UNARY_NAMES.index(node.operator))
+
+    def compile_ArrayAccessNode(self, node):
+        self.load(node.name)
+        yield node.index
+        self.emit(INDEX)
+
+    def compile_FunctionCallNode(self, node):
+        self.emit(LOAD_FUNCTION, self.name_index(node.callee))
+        for argument in node.arguments:
+            yield argument
+        if len(node.arguments) > CALL_COUNT_MASK:
+            raise Exception(f'Too many arguments in call to {node.callee}')
+        self.emit(CALL, len(node.arguments) | self.name_index(node.callee) << CALL_NAME_SHIFT)
+
+    def compile_AssignmentNode(self, node):
+        yield node.value
+        self.emit(STORE_NAME, self.name_index(node.target))
+
+    def compile_FunctionDefinitionNode(self, node):
+        compiler = BytecodeCompiler(node.function_name, node.parameters,
+                                    local_names(node.parameters, node.body))
+        code = compiler.compile_function(node.body)
+        self.emit(MAKE_FUNCTION, self.constant(code))
+        self.emit(STORE_NAME, self.name_index(node.function_name))
+
+    def compile_ReturnNode(self, node):
+        if node.value is None:
+            self.emit(LOAD_CONST, self.constant(None))
+        else:
+            yield node.value
+        self.emit(RETURN)
+
+    def compile_IfNode(self, node):
+        yield node.condition
+        skip_then = self.emit(JUMP_IF_FALSE)
+        yield from self.compile_body(node.then_body)
+        if node.else_body:
+            skip_else = self.emit(JUMP)
+            self.patch(skip_then)
+            yield from self.compile_body(node.else_body)
+            self.patch(skip_else)
+        else:
+            self.patch(skip_then)
+
+    def compile_WhileNode(self, node):
+        top = len(self.instructions)
+        yield node.condition
+        exit_ = self.emit(JUMP_IF_FALSE)
+        yield from self.compile_body(node.body)
+        self.emit(JUMP, top)
+        self.patch(exit_)
+
+    def compile_ForNode(self, node):
+        yield node.init
+        top = len(self.instructions)
+        yield node.condition
+        exit_ = self.emit(JUMP_IF_FALSE)
+        yield from self.compile_body(node.body)
+        yield node.increment
+        self.emit(JUMP, top)
+        self.patch(exit_)
+
+    def compile_PrintNode(self, node):
+        yield node.expression
+        self.emit(PRINT)
+
+    def compile_TryCatchNode(self, node):
+        handler = self.emit(SETUP_TRY)
+        yield from self.compile_body(node.try_body)
+        self.emit(POP_TRY)
+        end = self.emit(JUMP)
+        self.patch(handler)
+        yield from self.compile_body(node.catch_body)
+        self.patch(end)
+
+
+def compile_bytecode(program):
+    return BytecodeCompiler().compile_program(program)
+
+
+def describe_argument(code, opcode, argument):
+    if opcode in NAME_OPS:
+        return code.names[argument]
+    if opcode == LOAD_CONST:
+        return repr(code.constants[argument])
+    if opcode == MAKE_FUNCTION:
+        return f'<code {code.constants[argument].name}>'
+    if opcode == BINARY_OP:
+        return BINARY_NAMES[argument]
+    if opcode == UNARY_OP:
+        return UNARY_NAMES[argument]
+    if opcode in JUMP_OPS:
+        return f'to {argument}'
+    if opcode == CALL:
+        return f'{argument & CALL_COUNT_MASK} arguments to {code.names[argument >> CALL_NAME_SHIFT]}'
+    return ''
+
+
+def disassemble(code):
+    """Return a listing of `code` and of the functions it defines."""
+    if code.name == '<program>':
+        lines = [f'code {code.name}:']
+    else:
+        lines = [f'code {code.name}({", ".join(code.parameters)}):']
+    instructions = code.instructions
+    for slot in range(0, len(instructions), 2):
+        opcode, argument = instructions[slot], instructions[slot + 1]
+        described = describe_argument(code, opcode, argument)
+        line = f'  {slot:5d} {OPNAMES[opcode]:<14}'
+        if opcode in ARGUMENT_OPS:
+            line += f' {argument:<4}'
+        if described:
+            line += f' ({described})'
+        lines.append(line.rstrip())
+    for constant in code.constants:
+        if isinstance(constant, CodeObject):
+            lines.append('')
+            lines.append(disassemble(constant))
+    return '\n'.join(lines)
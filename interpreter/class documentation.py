@@ -6,48 +6,66 @@ class Parser:
 
     Attributes:
         lexer (Lexer): The lexer that provides tokens for parsing.
+        tokens (TokenStream): Ring buffer over the lexer used for lookahead.
         current_token (Token): The current token being parsed.
+        previous_end (int): End offset of the last token consumed, where the next finished node ends.
+        base (SourceOffset): Offset the spans of the current top-level statement are relative to.
 
     Methods:
         parse(): Starts the parsing process and returns the AST.
+        finish(node, start): Sets the source span of a node and returns it.
+        iter_statements(): Yields each top-level statement as soon as it is parsed.
+        parse_top_level_statement(): Parses a statement with its own span base.
         parse_statements(): Parses a series of statements.
         parse_statement(): Parses a single statement.
         parse_assignment(): Parses an assignment statement.
         parse_expression(): Parses an expression.
-        parse_logical_or(): Parses logical OR expressions.
-        parse_logical_and(): Parses logical AND expressions.
-        parse_equality(): Parses equality expressions.
-        parse_comparison(): Parses comparison expressions.
-        parse_term(): Parses term expressions (addition and subtraction).
-        parse_factor(): Parses factor expressions (multiplication and division).
-        parse_primary(): Parses primary expressions (numbers, variables, etc.).
+        parse_binary(left, min_precedence): Parses binary operators by precedence climbing over BINARY_PRECEDENCE.
+        parse_primary(): Parses primary expressions (numbers, variables, unary operators, etc.).
         parse_function_call(identifier): Parses a function call.
         parse_array_access(identifier): Parses an array access.
+        peek_token(k): Returns the k-th token after the current one without consuming it.
     """
 
 class Interpreter:
     """
     The Interpreter class is responsible for executing the abstract syntax tree (AST)
-    generated by the Parser. It evaluates expressions and executes statements.
+    generated by the Parser. It evaluates expressions and executes statements,
+    with the operators, builtins and value formatting of runtime.py, which the
+    other execution engines share.
 
     Attributes:
         parser (Parser): The parser that provides the AST.
+        output (file or None): Where print statements write; None means sys.stdout.
         global_scope (dict): The global variable scope.
-        local_scope (dict or None): The local variable scope for function execution.
+        local_scope (list or None): The frame of the running function call, indexed by
+            the slots resolver.py assigns to its parameters and locals.
+        sites (list): The quickening.py sites of this run, with their hit counters.
 
     Methods:
         interpret(): Starts the interpretation process.
         visit(node): Visits a node in the AST and executes it.
         generic_visit(node): A generic visit method for unsupported nodes.
+        execute_body(statements): Executes a list of statements in order.
+        lookup(node, name): Returns the value of a variable, local slot first.
+        lookup_function(node, name): Like lookup, falling back to the builtins.
+        assign(node, name, value): Binds a variable in its slot, or globally at top level.
         visit_ProgramNode(node): Visits a program node and executes its statements.
         visit_AssignmentNode(node): Visits an assignment node and assigns a value to a variable.
         visit_VariableNode(node): Visits a variable node and retrieves its value.
-        visit_BinaryOpNode(node): Visits a binary operation node and evaluates the operation.
+        visit_BinaryOpNode(node): Visits a binary operation node and evaluates the operation,
+            through the node's quickened site once it has one.
         visit_UnaryOpNode(node): Visits a unary operation node and evaluates the operation.
         visit_LiteralNode(node): Visits a literal node and returns its value.
+        visit_ArrayAccessNode(node): Visits an array access node and returns the element.
         visit_FunctionCallNode(node): Visits a function call node and executes the function.
-        call_function(function, arguments): Calls a function with the given arguments.
+        call_function(function, arguments): Calls a function with the given arguments, through its cache if it has one.
+        run_function(function, arguments): Runs a function's body in a new frame and returns its result.
+        visit_FunctionDefinitionNode(node): Visits a function definition and binds the function.
+        visit_IfNode(node): Visits an if node and executes the branch selected by its condition.
+        visit_WhileNode(node): Visits a while loop node and executes its body.
         visit_ForNode(node): Visits a for loop node and executes its body.
+        visit_PrintNode(node): Visits a print node and writes its expression's value.
         visit_TryCatchNode(node): Visits a try-catch node and executes its body with error handling.
-        visit_ReturnNode(node): Visits a return node and returns its expression's value.
+        visit_ReturnNode(node): Visits a return node and raises ReturnValue with its expression's value.
     """
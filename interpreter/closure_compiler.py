@@ -0,0 +1,469 @@
+import sys
+
+from ast_nodes import LiteralNode
+from budget import SEQUENCE_TYPES
+from resolver import resolve
+from runtime import (
+    BINARY_OPERATORS, BUILTINS, UNARY_OPERATORS, UNSET, Function, MemoCache, check_arguments,
+    check_callable, format_value, undefined_function, undefined_variable,
+)
+from traversal import run
+
+
+class RunState:
+    """What compiled code needs from the run in progress."""
+
+    def __init__(self):
+        self.output = sys.stdout
+
+
+class CompiledProgram:
+    """A program compiled by `ClosureCompiler`, ready to run any number of
+    times. Runs start from empty globals; one run at a time.
+    """
+
+    def __init__(self, body, global_scope, state, budget=None):
+        self.body = body
+        self.global_scope = global_scope
+        self.state = state
+        self.budget = budget
+
+    def run(self, output=None):
+        """Run the program and return its global scope."""
+        self.global_scope.clear()
+        self.state.output = output if output is not None else sys.stdout
+        if self.budget is not None:
+            self.budget.start()
+        if self.body(self.global_scope) is not None:
+            raise Exception("'return' outside a function")
+        return self.global_scope
+
+
+class ClosureCompiler:
+    """Compiles a tree, once, into nested Python closures.
+
+    Every node becomes a function of the current call's `frame` with its
+    operator, operands and children already resolved, so running it
+    dispatches on nothing. Frames are lists indexed by the slots `resolve`
+    assigns (at top level, where there are no locals, the frame is the
+    global scope). Statement functions return None, or a 1-tuple holding the
+    value of a `return`, which blocks and loops pass straight up to the call.
+
+    Scoping is the tree-walking `Interpreter`'s: a function's own slots,
+    then the globals, then `BUILTINS` for calls. Names a function never binds
+    are looked up in the globals directly, and locals certainly bound by the
+    time they are read straight from their slot.
+
+    Given a `Budget` (see budget.py), loops charge it a step per iteration
+    and calls a step and a level of depth; loops are then never vectorized,
+    so that each iteration is charged. Without one, none of that is
+    compiled in.
+
+    Expressions compile on traversal.py's explicit stack. A deep one (see
+    resolver.py) would nest a Python call per node when it runs, so its deep
+    nodes compile to generator functions of the frame instead, yielding
+    what they evaluate, and `evaluate_deep` runs them.
+    """
+
+    def __init__(self, budget=None):
+        self.global_scope = {}
+        self.state = RunState()
+        self.budget = budget
+        self.builtins = budget.builtins() if budget is not None else BUILTINS
+        self.binary_operators = budget.binary_operators() if budget is not None else BINARY_OPERATORS
+
+    def compile_program(self, program):
+        resolve(program)
+        return CompiledProgram(self.compile_body(program.statements), self.global_scope, self.state, self.budget)
+
+    def compile(self, node):
+        """Return the function of the frame that runs `node`."""
+        compiled = run(node, self.compile_node)
+        if node.deep:
+            return evaluate_deep(compiled)
+        return compiled
+
+    def compile_node(self, node):
+        method = getattr(self, 'compile_' + type(node).__name__, None)
+        if method is None:
+            raise Exception(f'No compile_{type(node).__name__} method')
+        return method(node)
+
+    def compile_body(self, statements):
+        compiled = tuple(self.compile(statement) for statement in statements)
+        if not compiled:
+            return nothing
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def body(frame):
+            for statement in compiled:
+                result = statement(frame)
+                if result is not None:
+                    return result
+        return body
+
+    def compile_LiteralNode(self, node):
+        value = node.value
+        return lambda frame: value
+
+    compile_ExpressionNode = compile_LiteralNode
+
+    def compile_VariableNode(self, node):
+        return self.compile_lookup(node, node.name, undefined_variable, None)
+
+    def compile_lookup(self, node, name, undefined, fallback):
+        global_scope = self.global_scope
+        if fallback is not None and name in fallback:
+            default = fallback[name]
+
+            def lookup_global(frame):
+                return global_scope.get(name, default)
+        else:
+            def lookup_global(frame):
+                try:
+                    return global_scope[name]
+                except KeyError:
+                    raise undefined(name) from None
+
+        slot = node.slot
+        if slot is None:
+            return lookup_global
+        if node.bound:
+            return lambda frame: frame[slot]
+
+        def lookup(frame):
+            value = frame[slot]
+            if value is UNSET:
+                return lookup_global(frame)
+            return value
+        return lookup
+
+    def compile_BinaryOpNode(self, node):
+        left = yield node.left
+        right = yield node.right
+        if node.deep:
+            return self.step_binary(node.operator, left, right)
+        if node.operator == '&&':
+            return lambda frame: bool(left(frame) and right(frame))
+        if node.operator == '||':
+            return lambda frame: bool(left(frame) or right(frame))
+
+        budget = self.budget
+        if budget is not None and budget.max_allocation is not None and node.operator in ('+', '*'):
+            # Adding a number to a string or an array fails before it allocates.
+            numbers = [operand for operand in (node.left, node.right)
+                       if isinstance(operand, LiteralNode) and not isinstance(operand.value, str)]
+            if node.operator == '*' or not numbers:
+                return self.compile_allocating(node.operator, left, right)
+
+        operation = BINARY_OPERATORS[node.operator]
+        if isinstance(node.right, LiteralNode):
+            constant = node.right.value
+            return lambda frame: operation(left(frame), constant)
+        if isinstance(node.left, LiteralNode):
+            constant = node.left.value
+            return lambda frame: operation(constant, right(frame))
+        return lambda frame: operation(left(frame), right(frame))
+
+    def step_binary(self, operator, left, right):
+        if operator == '&&':
+            def step(frame):
+                return bool((yield left) and (yield right))
+        elif operator == '||':
+            def step(frame):
+                return bool((yield left) or (yield right))
+        else:
+            operation = self.binary_operators[operator]
+
+            def step(frame):
+                return operation((yield left), (yield right))
+        return step
+
+    def compile_allocating(self, operator, left, right):
+        # Checked here rather than through `Budget.add` and `Budget.multiply`
+        # so that arithmetic on numbers costs no extra call.
+        if operator == '+':
+            add = self.budget.add
+
+            def checked_add(frame):
+                a = left(frame)
+                b = right(frame)
+                if type(a) in SEQUENCE_TYPES:
+                    return add(a, b)
+                return a + b
+            return checked_add
+        multiply = self.budget.multiply
+
+        def checked_multiply(frame):
+            a = left(frame)
+            b = right(frame)
+            if type(a) in SEQUENCE_TYPES or type(b) in SEQUENCE_TYPES:
+                return multiply(a, b)
+            return a * b
+        return checked_multiply
+
+    def compile_UnaryOpNode(self, node):
+        operation = UNARY_OPERATORS[node.operator]
+        operand = yield node.operand
+        if node.deep:
+            def step(frame):
+                return operation((yield operand))
+            return step
+        return lambda frame: operation(operand(frame))
+
+    def compile_ArrayAccessNode(self, node):
+        array = self.compile_lookup(node, node.name, undefined_variable, None)
+        index = yield node.index
+        if node.deep:
+            def step(frame):
+                values = array(frame)
+                return values[(yield index)]
+            return step
+        return lambda frame: array(frame)[index(frame)]
+
+    def compile_FunctionCallNode(self, node):
+        name = node.callee
+        lookup = self.compile_lookup(node, name, undefined_function, self.builtins)
+        arguments = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+        arguments = tuple(arguments)
+        if node.deep:
+            apply = self.compile_apply(name)
+
+            def step(frame):
+                function = lookup(frame)
+                values = []
+                for argument in arguments:
+                    values.append((yield argument))
+                return apply(function, values)
+            return step
+
+        def call(frame):
+            function = lookup(frame)
+            values = [argument(frame) for argument in arguments]
+            if type(function) is Function:
+                if len(values) != len(function.parameters):
+                    check_arguments(function, values)
+                if function.cache is not None:
+                    return call_memoized(function, values)
+                if function.frame_size > len(values):
+                    values += [UNSET] * (function.frame_size - len(values))
+                result = function.body(values)
+                return result[0] if result is not None else None
+            check_callable(name, function)
+            return function(*values)
+
+        budget = self.budget
+        if budget is None:
+            return call
+        depth_limit = budget.depth_limit
+
+        # `call` again, charging calls to WordMaze functions to the budget;
+        # builtins run in bounded time and return straight away.
+        def budgeted_call(frame):
+            function = lookup(frame)
+            values = [argument(frame) for argument in arguments]
+            if type(function) is not Function:
+                check_callable(name, function)
+                return function(*values)
+            if len(values) != len(function.parameters):
+                check_arguments(function, values)
+            budget.steps += 1
+            if budget.steps >= budget.checkpoint:
+                budget.check()
+            if budget.depth >= depth_limit:
+                budget.too_deep()
+            budget.depth += 1
+            try:
+                if function.cache is not None:
+                    return call_memoized(function, values)
+                if function.frame_size > len(values):
+                    values += [UNSET] * (function.frame_size - len(values))
+                result = function.body(values)
+            finally:
+                budget.depth -= 1
+            return result[0] if result is not None else None
+        return budgeted_call
+
+    def compile_apply(self, name):
+        """A function calling a function named `name` with a list of
+        argument values, as the closures of calls do, for deep calls.
+        """
+        budget = self.budget
+
+        def apply(function, values):
+            if type(function) is not Function:
+                check_callable(name, function)
+                return function(*values)
+            if len(values) != len(function.parameters):
+                check_arguments(function, values)
+            if budget is not None:
+                budget.enter()
+            try:
+                if function.cache is not None:
+                    return call_memoized(function, values)
+                if function.frame_size > len(values):
+                    values += [UNSET] * (function.frame_size - len(values))
+                result = function.body(values)
+            finally:
+                if budget is not None:
+                    budget.leave()
+            return result[0] if result is not None else None
+        return apply
+
+    def compile_AssignmentNode(self, node):
+        target = node.target if node.slot is None else node.slot
+        value = self.compile(node.value)
+
+        def assign(frame):
+            frame[target] = value(frame)
+        return assign
+
+    def compile_FunctionDefinitionNode(self, node):
+        name = node.function_name
+        target = name if node.slot is None else node.slot
+        parameters = node.parameters
+        frame_size = len(node.slot_names)
+        body = self.compile_body(node.body)
+        memo_size = node.memo_size
+
+        def define(frame):
+            frame[target] = Function(name, parameters, body, frame_size, MemoCache(memo_size) if memo_size else None)
+        return define
+
+    def compile_ReturnNode(self, node):
+        if node.value is None:
+            return lambda frame: (None,)
+        value = self.compile(node.value)
+        return lambda frame: (value(frame),)
+
+    def compile_IfNode(self, node):
+        condition = self.compile(node.condition)
+        then_body = self.compile_body(node.then_body)
+        else_body = self.compile_body(node.else_body)
+
+        def if_(frame):
+            if condition(frame):
+                return then_body(frame)
+            return else_body(frame)
+        return if_
+
+    def compile_WhileNode(self, node):
+        condition = self.compile(node.condition)
+        body = self.compile_body(node.body)
+
+        budget = self.budget
+        if budget is not None:
+            def budgeted_while(frame):
+                while condition(frame):
+                    budget.steps += 1
+                    if budget.steps >= budget.checkpoint:
+                        budget.check()
+                    result = body(frame)
+                    if result is not None:
+                        return result
+            return budgeted_while
+
+        def while_(frame):
+            while condition(frame):
+                result = body(frame)
+                if result is not None:
+                    return result
+        return while_
+
+    def compile_ForNode(self, node):
+        init = self.compile(node.init)
+        condition = self.compile(node.condition)
+        increment = self.compile(node.increment)
+        body = self.compile_body(node.body)
+        budget = self.budget
+        if budget is not None:
+            def budgeted_for(frame):
+                init(frame)
+                while condition(frame):
+                    budget.steps += 1
+                    if budget.steps >= budget.checkpoint:
+                        budget.check()
+                    result = body(frame)
+                    if result is not None:
+                        return result
+                    increment(frame)
+            return budgeted_for
+
+        def for_(frame):
+            init(frame)
+            while condition(frame):
+                result = body(frame)
+                if result is not None:
+                    return result
+                increment(frame)
+
+        loop = node.vector_loop
+        if loop is None:
+            return for_
+        scalars = {id(scalar): self.compile(scalar) for scalar in loop.scalar_nodes()}
+        arrays = {id(array): self.compile_lookup(array, array.name, undefined_variable, None)
+                  for array in loop.array_nodes()}
+        targets = {id(assignment): assignment.target if assignment.slot is None else assignment.slot
+                   for assignment in [node.init] + [statement for statement, _, _ in loop.sums]}
+
+        def vector_for(frame):
+            def assign(assignment, value):
+                frame[targets[id(assignment)]] = value
+            # A vectorizable body only assigns, so neither path returns.
+            if not loop.run(lambda scalar: scalars[id(scalar)](frame), lambda array: arrays[id(array)](frame),
+                            assign):
+                for_(frame)
+        return vector_for
+
+    def compile_PrintNode(self, node):
+        expression = self.compile(node.expression)
+        state = self.state
+
+        def print_(frame):
+            state.output.write(format_value(expression(frame)) + '\n')
+        return print_
+
+    def compile_TryCatchNode(self, node):
+        try_body = self.compile_body(node.try_body)
+        catch_body = self.compile_body(node.catch_body)
+
+        def try_catch(frame):
+            try:
+                return try_body(frame)
+            except Exception:
+                return catch_body(frame)
+        return try_catch
+
+
+def nothing(frame):
+    return None
+
+
+def evaluate_deep(step):
+    """The function of the frame evaluating the deep expression compiled to
+    `step`, on traversal.py's explicit stack."""
+    def evaluate(frame):
+        return run(step(frame), lambda compiled: compiled(frame))
+    return evaluate
+
+
+def call_memoized(function, values):
+    """Call a compiled `function` through its `MemoCache`."""
+    cache = function.cache
+    key = cache.key(values)
+    result = cache.lookup(key) if key is not None else UNSET
+    if result is UNSET:
+        if function.frame_size > len(values):
+            values = values + [UNSET] * (function.frame_size - len(values))
+        result = function.body(values)
+        result = result[0] if result is not None else None
+        if key is not None:
+            cache.store(key, result)
+    return result
+
+
+def compile_program(program, budget=None):
+    return ClosureCompiler(budget).compile_program(program)
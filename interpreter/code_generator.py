@@ -0,0 +1,164 @@
+from decimal import Decimal
+
+from ast_nodes import ASTVisitor
+from traversal import traverse
+
+
+INDENT = '    '
+
+# Inverse of the parser's `ESCAPES`, plus the characters that must be escaped.
+ESCAPED = {'\\': '\\\\', '"': '\\"', '\n': '\\n', '\t': '\\t', '\r': '\\r', '\0': '\\0'}
+
+
+def format_literal(value):
+    """The source of a literal holding `value`."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, str):
+        return '"' + ''.join(ESCAPED.get(char, char) for char in value) + '"'
+    if isinstance(value, float):
+        # The lexer reads no exponents: write 1e-08 as 0.00000001, keeping
+        # the shortest digits that read back as the same float.
+        text = format(Decimal(repr(value)), 'f')
+        return text if '.' in text else text + '.0'
+    return repr(value)
+
+
+class CodeGeneratorVisitor(ASTVisitor):
+    """Turns a tree back into WordMaze source that parses to the same tree.
+
+    Binary and unary expressions are fully parenthesized, and bodies are
+    laid out one statement per line.
+
+    The visit methods append the code to `parts` in order, yielding the
+    nodes inside for traversal.py to visit, so that `generate` handles
+    trees of any depth in time linear in the size of the code.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.parts = []
+
+    def generate(self, node):
+        """Return the source of `node`."""
+        self.parts = []
+        traverse(node, self)
+        return ''.join(self.parts)
+
+    def visit_program_node(self, node):
+        for statement in node.statements:
+            yield statement
+            self.parts.append("\n")
+
+    def visit_expression_node(self, node):
+        self.parts.append(str(node.value))
+
+    def visit_literal_node(self, node):
+        self.parts.append(format_literal(node.value))
+
+    def visit_variable_node(self, node):
+        self.parts.append(node.name)
+
+    def visit_binary_op_node(self, node):
+        self.parts.append("(")
+        yield node.left
+        self.parts.append(f" {node.operator} ")
+        yield node.right
+        self.parts.append(")")
+
+    def visit_unary_op_node(self, node):
+        self.parts.append(f"({node.operator}")
+        yield node.operand
+        self.parts.append(")")
+
+    def visit_function_call_node(self, node):
+        self.parts.append(f"{node.callee}(")
+        for position, argument in enumerate(node.arguments):
+            if position:
+                self.parts.append(", ")
+            yield argument
+        self.parts.append(")")
+
+    def visit_array_access_node(self, node):
+        self.parts.append(f"{node.name}[")
+        yield node.index
+        self.parts.append("]")
+
+    def visit_assignment_node(self, node):
+        self.parts.append(f"let {node.target} = ")
+        yield node.value
+        self.parts.append(";")
+
+    def visit_if_node(self, node):
+        self.parts.append("if (")
+        yield node.condition
+        self.parts.append(") ")
+        yield from self.block(node.then_body)
+        if node.else_body:
+            self.parts.append(" else ")
+            yield from self.block(node.else_body)
+
+    def visit_while_node(self, node):
+        self.parts.append("while (")
+        yield node.condition
+        self.parts.append(") ")
+        yield from self.block(node.body)
+
+    def visit_for_node(self, node):
+        # Both clauses are full `let` statements, semicolon included.
+        self.parts.append("for (")
+        yield node.init
+        self.parts.append(" ")
+        yield node.condition
+        self.parts.append("; ")
+        yield node.increment
+        self.parts.append(") ")
+        yield from self.block(node.body)
+
+    def visit_print_node(self, node):
+        self.parts.append("print ")
+        yield node.expression
+        self.parts.append(";")
+
+    def visit_try_catch_node(self, node):
+        self.parts.append("try ")
+        yield from self.block(node.try_body)
+        self.parts.append(" catch ")
+        yield from self.block(node.catch_body)
+
+    def visit_function_definition_node(self, node):
+        parameters = ", ".join(node.parameters)
+        self.parts.append(f"function {node.function_name}({parameters}) ")
+        yield from self.block(node.body)
+
+    def visit_return_node(self, node):
+        if node.value is not None:
+            self.parts.append("return ")
+            yield node.value
+            self.parts.append(";")
+        else:
+            self.parts.append("return;")
+
+    def block(self, statements):
+        if not statements:
+            self.parts.append("{ }")
+            return
+        self.depth += 1
+        self.parts.append("{\n")
+        for statement in statements:
+            self.parts.append(INDENT * self.depth)
+            yield statement
+            self.parts.append("\n")
+        self.depth -= 1
+        self.parts.append(INDENT * self.depth + "}")
+
+
+def generate_code(statements):
+    """Yield the source of each statement in `statements`, one at a time.
+
+    `statements` may be `Parser.iter_statements()`, so output starts with the
+    first statement and no more than one statement is held at once.
+    """
+    generator = CodeGeneratorVisitor()
+    for statement in statements:
+        yield generator.generate(statement) + "\n"
@@ -0,0 +1,547 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from ir import Constant, is_temporary
+from ir_interpreter import compile_ir
+from lexer import Lexer
+from parser import Parser
+from runtime import BINARY_OPERATORS, BUILTINS
+
+
+CXX_FLAGS = ('-std=c++17', '-O2')
+
+# Builtins the generated code implements, with the arguments they take.
+CPP_BUILTINS = {'abs': 1, 'float': 1, 'int': 1, 'max': None, 'min': None}
+
+BINARY_FUNCTIONS = {
+    '+': 'add', '-': 'subtract', '*': 'multiply', '/': 'divide', '%': 'modulo',
+    '==': 'equal', '!=': 'not_equal', '<': 'less', '<=': 'less_equal', '>': 'greater', '>=': 'greater_equal',
+}
+
+UNARY_FUNCTIONS = {'-': 'negate', '!': 'logical_not'}
+
+
+def zero_division_message(operator, left, right):
+    """What Python says when `left <operator> right` divides by zero."""
+    try:
+        BINARY_OPERATORS[operator](left, right)
+    except ZeroDivisionError as error:
+        return str(error)
+
+
+# The generated code's constants for dividing by zero, in the words of the
+# Python running the other engines.
+ZERO_DIVISION_MESSAGES = {
+    'INT_DIVISION_BY_ZERO': zero_division_message('/', 1, 0),
+    'FLOAT_DIVISION_BY_ZERO': zero_division_message('/', 1.0, 0),
+    'INT_MODULO_BY_ZERO': zero_division_message('%', 1, 0),
+    'FLOAT_MODULO_BY_ZERO': zero_division_message('%', 1.0, 0),
+}
+
+# Values are tagged like the Python values the other engines use, and
+# operations fail with the same messages; those for dividing by zero vary
+# with the operands' types and the Python version, and are generated from
+# `ZERO_DIVISION_MESSAGES`. Integers are 64-bit and fail on overflow where
+# Python's would grow.
+CPP_RUNTIME = r'''#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <initializer_list>
+#include <stdexcept>
+#include <string>
+
+namespace {
+
+struct Error : std::runtime_error {
+    using std::runtime_error::runtime_error;
+};
+
+enum Kind { UNDEFINED, NONE, BOOL, INT, FLOAT, FUNCTION };
+
+struct Value {
+    Kind kind;
+    long long i;
+    double f;
+};
+
+extern const char *const FUNCTION_NAMES[];
+extern const char *const INT_DIVISION_BY_ZERO, *const FLOAT_DIVISION_BY_ZERO;
+extern const char *const INT_MODULO_BY_ZERO, *const FLOAT_MODULO_BY_ZERO;
+
+Value none() { return {NONE, 0, 0.0}; }
+Value boolean(bool b) { return {BOOL, b, 0.0}; }
+Value integer(long long i) { return {INT, i, 0.0}; }
+Value number(double f) { return {FLOAT, 0, f}; }
+Value function(int id) { return {FUNCTION, id, 0.0}; }
+
+const char *type_name(const Value &v) {
+    switch (v.kind) {
+    case NONE: return "NoneType";
+    case BOOL: return "bool";
+    case INT: return "int";
+    case FLOAT: return "float";
+    default: return "Function";
+    }
+}
+
+bool is_number(const Value &v) { return v.kind == BOOL || v.kind == INT || v.kind == FLOAT; }
+double as_double(const Value &v) { return v.kind == FLOAT ? v.f : static_cast<double>(v.i); }
+
+bool truthy(const Value &v) {
+    switch (v.kind) {
+    case BOOL: case INT: return v.i != 0;
+    case FLOAT: return v.f != 0.0;
+    case FUNCTION: return true;
+    default: return false;
+    }
+}
+
+[[noreturn]] void unsupported(const char *op, const Value &a, const Value &b) {
+    throw Error(std::string("unsupported operand type(s) for ") + op + ": '" + type_name(a) + "' and '" + type_name(b) + "'");
+}
+
+[[noreturn]] void not_comparable(const char *op, const Value &a, const Value &b) {
+    throw Error(std::string("'") + op + "' not supported between instances of '" + type_name(a) + "' and '" + type_name(b) + "'");
+}
+
+[[noreturn]] void overflow() { throw Error("integer overflow"); }
+
+Value add(const Value &a, const Value &b) {
+    if (!is_number(a) || !is_number(b)) unsupported("+", a, b);
+    if (a.kind == FLOAT || b.kind == FLOAT) return number(as_double(a) + as_double(b));
+    long long r;
+    if (__builtin_add_overflow(a.i, b.i, &r)) overflow();
+    return integer(r);
+}
+
+Value subtract(const Value &a, const Value &b) {
+    if (!is_number(a) || !is_number(b)) unsupported("-", a, b);
+    if (a.kind == FLOAT || b.kind == FLOAT) return number(as_double(a) - as_double(b));
+    long long r;
+    if (__builtin_sub_overflow(a.i, b.i, &r)) overflow();
+    return integer(r);
+}
+
+Value multiply(const Value &a, const Value &b) {
+    if (!is_number(a) || !is_number(b)) unsupported("*", a, b);
+    if (a.kind == FLOAT || b.kind == FLOAT) return number(as_double(a) * as_double(b));
+    long long r;
+    if (__builtin_mul_overflow(a.i, b.i, &r)) overflow();
+    return integer(r);
+}
+
+Value divide(const Value &a, const Value &b) {
+    if (!is_number(a) || !is_number(b)) unsupported("/", a, b);
+    if (as_double(b) == 0.0) throw Error(a.kind == FLOAT || b.kind == FLOAT ? FLOAT_DIVISION_BY_ZERO : INT_DIVISION_BY_ZERO);
+    return number(as_double(a) / as_double(b));
+}
+
+Value modulo(const Value &a, const Value &b) {
+    if (!is_number(a) || !is_number(b)) unsupported("%", a, b);
+    if (a.kind == FLOAT || b.kind == FLOAT) {
+        double y = as_double(b);
+        if (y == 0.0) throw Error(FLOAT_MODULO_BY_ZERO);
+        double r = std::fmod(as_double(a), y);
+        if (r != 0.0 && ((r < 0) != (y < 0))) r += y;
+        else if (r == 0.0) r = std::copysign(0.0, y);
+        return number(r);
+    }
+    if (b.i == 0) throw Error(INT_MODULO_BY_ZERO);
+    if (b.i == -1) return integer(0);
+    long long r = a.i % b.i;
+    if (r != 0 && ((r < 0) != (b.i < 0))) r += b.i;
+    return integer(r);
+}
+
+bool same(const Value &a, const Value &b) {
+    if (is_number(a) && is_number(b)) {
+        if (a.kind == FLOAT || b.kind == FLOAT) return as_double(a) == as_double(b);
+        return a.i == b.i;
+    }
+    return a.kind == b.kind && a.i == b.i;
+}
+
+Value equal(const Value &a, const Value &b) { return boolean(same(a, b)); }
+Value not_equal(const Value &a, const Value &b) { return boolean(!same(a, b)); }
+
+int compare(const char *op, const Value &a, const Value &b) {
+    if (!is_number(a) || !is_number(b)) not_comparable(op, a, b);
+    if (a.kind == FLOAT || b.kind == FLOAT) {
+        double x = as_double(a), y = as_double(b);
+        return x < y ? -1 : x > y ? 1 : x == y ? 0 : 2;
+    }
+    return a.i < b.i ? -1 : a.i > b.i ? 1 : 0;
+}
+
+Value less(const Value &a, const Value &b) { return boolean(compare("<", a, b) == -1); }
+Value less_equal(const Value &a, const Value &b) { int c = compare("<=", a, b); return boolean(c == -1 || c == 0); }
+Value greater(const Value &a, const Value &b) { return boolean(compare(">", a, b) == 1); }
+Value greater_equal(const Value &a, const Value &b) { int c = compare(">=", a, b); return boolean(c == 1 || c == 0); }
+
+Value negate(const Value &a) {
+    if (a.kind == FLOAT) return number(-a.f);
+    if (!is_number(a)) throw Error(std::string("bad operand type for unary -: '") + type_name(a) + "'");
+    if (a.i == -9223372036854775807LL - 1) overflow();
+    return integer(-a.i);
+}
+
+Value logical_not(const Value &a) { return boolean(!truthy(a)); }
+
+Value read_global(const Value &v, const char *name) {
+    if (v.kind == UNDEFINED) throw Error(std::string("Undefined variable: ") + name);
+    return v;
+}
+
+Value load_function(const Value &v, const char *name) {
+    if (v.kind == UNDEFINED) throw Error(std::string("Undefined function: ") + name);
+    return v;
+}
+
+Value builtin_abs(const Value &a) {
+    if (a.kind == FLOAT) return number(std::fabs(a.f));
+    if (!is_number(a)) throw Error(std::string("bad operand type for abs(): '") + type_name(a) + "'");
+    return a.i < 0 ? negate(a) : integer(a.i);
+}
+
+Value builtin_int(const Value &a) {
+    if (a.kind == FLOAT) {
+        if (std::isnan(a.f)) throw Error("cannot convert float NaN to integer");
+        if (std::isinf(a.f)) throw Error("cannot convert float infinity to integer");
+        if (std::fabs(a.f) >= 9223372036854775808.0) overflow();
+        return integer(static_cast<long long>(a.f));
+    }
+    if (!is_number(a)) throw Error(std::string("int() argument must be a string, a bytes-like object or a real number, not '") + type_name(a) + "'");
+    return integer(a.i);
+}
+
+Value builtin_float(const Value &a) {
+    if (!is_number(a)) throw Error(std::string("float() argument must be a string or a real number, not '") + type_name(a) + "'");
+    return number(as_double(a));
+}
+
+Value builtin_min(std::initializer_list<Value> values) {
+    const Value *result = values.begin();
+    for (const Value *v = result + 1; v != values.end(); ++v)
+        if (compare("<", *v, *result) == -1) result = v;
+    return *result;
+}
+
+Value builtin_max(std::initializer_list<Value> values) {
+    const Value *result = values.begin();
+    for (const Value *v = result + 1; v != values.end(); ++v)
+        if (compare(">", *v, *result) == 1) result = v;
+    return *result;
+}
+
+// The shortest text that reads back as x, laid out like Python's repr().
+std::string float_text(double x) {
+    if (std::isnan(x)) return "nan";
+    if (std::isinf(x)) return x > 0 ? "inf" : "-inf";
+    char buffer[40];
+    int precision = 1;
+    for (; precision < 17; ++precision) {
+        std::snprintf(buffer, sizeof buffer, "%.*e", precision - 1, x);
+        if (std::strtod(buffer, nullptr) == x) break;
+    }
+    std::snprintf(buffer, sizeof buffer, "%.*e", precision - 1, x);
+    int exponent = std::atoi(std::strchr(buffer, 'e') + 1);
+    if (exponent < -4 || exponent >= 16) return buffer;
+    int decimals = precision - 1 - exponent;
+    std::snprintf(buffer, sizeof buffer, "%.*f", decimals < 1 ? 1 : decimals, x);
+    return buffer;
+}
+
+void print(const Value &v) {
+    switch (v.kind) {
+    case NONE: std::fputs("null", stdout); break;
+    case BOOL: std::fputs(v.i ? "true" : "false", stdout); break;
+    case INT: std::printf("%lld", v.i); break;
+    case FLOAT: std::fputs(float_text(v.f).c_str(), stdout); break;
+    default: std::printf("<function %s>", FUNCTION_NAMES[v.i]); break;
+    }
+    std::fputc('\n', stdout);
+}
+
+'''
+
+CPP_MAIN = r'''
+int main() {
+    try {
+        run_program();
+    } catch (const Error &error) {
+        std::fflush(stdout);
+        std::fprintf(stderr, "%s\n", error.what());
+        return 1;
+    }
+    return 0;
+}
+'''
+
+
+def unsupported(what):
+    return Exception(f'The C++ backend does not support {what}')
+
+
+def c_string(text):
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class CppGenerator:
+    """Generates a C++ program from the optimized IR of a WordMaze program.
+
+    Each basic block becomes a label and each IR variable a `Value`: the
+    program's names are globals (`g_`), a function's are locals (`l_`), and
+    temporaries are `t` and their number. Functions become C++ functions
+    (`w_`) called directly, so the backend covers programs that define
+    functions only at top level, once each, and call them by name; it does
+    not support strings, arrays or try/catch.
+    """
+
+    def __init__(self, program):
+        self.program = program
+        self.functions = {}
+        self.global_names = set()
+        self.lines = []
+        self.callees = {}
+        assignments = {}
+        for block in program.blocks:
+            if block.handler is not None:
+                raise unsupported('try/catch')
+            for instruction in block.instructions:
+                if instruction.target is not None and not is_temporary(instruction.target):
+                    self.global_names.add(instruction.target)
+                    assignments[instruction.target] = assignments.get(instruction.target, 0) + 1
+                self.global_names.update(name for name in instruction.variables() if not is_temporary(name))
+                if instruction.opcode == 'define':
+                    if instruction.argument.name in self.functions:
+                        raise unsupported(f'defining {instruction.argument.name} more than once')
+                    self.functions[instruction.argument.name] = instruction.argument
+        self.assigned = set(assignments)
+        self.function_ids = {name: index for index, name in enumerate(self.functions)}
+        for function in self.functions.values():
+            if function.functions:
+                raise unsupported('nested functions')
+            for block in function.blocks:
+                for instruction in block.instructions:
+                    if instruction.opcode in ('global', 'fallback'):
+                        self.global_names.add(instruction.argument)
+        for name in self.functions:
+            # Calls go straight to the definition, so its name must not be
+            # rebound, nor fall back to a builtin before it is defined.
+            if assignments[name] > 1:
+                raise unsupported(f'assigning to the function name {name}')
+            if name in BUILTINS:
+                raise unsupported(f'redefining the builtin {name}')
+
+    def generate(self):
+        self.lines.append(CPP_RUNTIME.rstrip('\n'))
+        names = ', '.join(c_string(name) for name in self.functions) or '""'
+        self.lines.append(f'const char *const FUNCTION_NAMES[] = {{{names}}};')
+        for name, message in ZERO_DIVISION_MESSAGES.items():
+            self.lines.append(f'const char *const {name} = {c_string(message)};')
+        self.lines.append('')
+        for name in sorted(self.global_names):
+            self.lines.append(f'Value g_{name} = {{}};')
+        for function in self.functions.values():
+            self.lines.append(f'Value {self.signature(function)};')
+        for function in self.functions.values():
+            self.lines.append('')
+            self.function(function, 'Value ' + self.signature(function))
+        self.lines.append('')
+        self.function(self.program, 'void run_program()')
+        self.lines.append('')
+        self.lines.append('}  // namespace')
+        self.lines.append(CPP_MAIN.rstrip('\n'))
+        return '\n'.join(self.lines) + '\n'
+
+    def signature(self, function):
+        parameters = ', '.join(f'Value l_{parameter}' for parameter in function.parameters)
+        return f'w_{function.name}({parameters})'
+
+    def function(self, function, signature):
+        self.current = function
+        self.callees = {}
+        self.lines.append(f'{signature} {{')
+        variables = set()
+        for block in function.blocks:
+            if block.handler is not None:
+                raise unsupported('try/catch')
+            for instruction in block.instructions:
+                # The program's own names are globals, declared already.
+                if instruction.target is not None and (is_temporary(instruction.target) or not function.is_program):
+                    variables.add(self.variable(instruction.target))
+        variables -= {f'l_{parameter}' for parameter in function.parameters}
+        for variable in sorted(variables):
+            self.lines.append(f'    Value {variable} = {{}};')
+        for block in function.blocks:
+            self.lines.append(f'{block.label}:')
+            for instruction in block.instructions:
+                self.instruction(instruction)
+        self.lines.append('}')
+
+    def variable(self, name):
+        if is_temporary(name):
+            return 't' + name[1:]
+        return f'g_{name}' if self.current.is_program else f'l_{name}'
+
+    def operand(self, operand):
+        if isinstance(operand, Constant):
+            return self.constant(operand.value)
+        if self.current.is_program and not is_temporary(operand):
+            return f'read_global(g_{operand}, {c_string(operand)})'
+        return self.variable(operand)
+
+    def constant(self, value):
+        if value is None:
+            return 'none()'
+        if isinstance(value, bool):
+            return f'boolean({str(value).lower()})'
+        if isinstance(value, int):
+            if not -2 ** 63 < value < 2 ** 63:
+                raise unsupported(f'the integer {value}')
+            return f'integer({value}LL)'
+        if isinstance(value, float):
+            if value != value:
+                return 'number(NAN)'
+            if value in (float('inf'), float('-inf')):
+                return 'number(INFINITY)' if value > 0 else 'number(-INFINITY)'
+            return f'number({value!r})'
+        raise unsupported(f'{type(value).__name__} values')
+
+    def emit(self, text):
+        self.lines.append('    ' + text)
+
+    def instruction(self, instruction):
+        method = getattr(self, 'instruction_' + instruction.opcode, None)
+        if method is None:
+            raise unsupported(f"the '{instruction.opcode}' instruction")
+        method(instruction)
+
+    def assign(self, instruction, expression):
+        self.emit(f'{self.variable(instruction.target)} = {expression};')
+
+    def instruction_copy(self, instruction):
+        self.assign(instruction, self.operand(instruction.operands[0]))
+
+    def instruction_binary(self, instruction):
+        left, right = (self.operand(operand) for operand in instruction.operands)
+        self.assign(instruction, f'{BINARY_FUNCTIONS[instruction.argument]}({left}, {right})')
+
+    def instruction_unary(self, instruction):
+        self.assign(instruction, f'{UNARY_FUNCTIONS[instruction.argument]}({self.operand(instruction.operands[0])})')
+
+    def instruction_truth(self, instruction):
+        self.assign(instruction, f'boolean(truthy({self.operand(instruction.operands[0])}))')
+
+    def instruction_global(self, instruction):
+        name = instruction.argument
+        self.assign(instruction, f'read_global(g_{name}, {c_string(name)})')
+
+    def instruction_fallback(self, instruction):
+        name = instruction.argument
+        self.assign(instruction, f'l_{name}.kind != UNDEFINED ? l_{name} : read_global(g_{name}, {c_string(name)})')
+
+    def instruction_function(self, instruction):
+        name = instruction.argument
+        self.callees[instruction.target] = name
+        if name in self.functions:
+            self.assign(instruction, f'load_function(g_{name}, {c_string(name)})')
+        elif name in BUILTINS:
+            if name not in CPP_BUILTINS:
+                raise unsupported(f'the builtin {name}')
+        else:
+            if name in self.assigned:
+                raise unsupported(f'calling {name}, which is not a function definition')
+            self.emit(f'throw Error({c_string(f"Undefined function: {name}")});')
+
+    def instruction_call(self, instruction):
+        callee, *arguments = instruction.operands
+        name = self.callees.get(callee)
+        if name is None:
+            raise unsupported(f'calling {instruction.argument} through a local variable')
+        values = [self.operand(argument) for argument in arguments]
+        if name in self.functions:
+            parameters = self.functions[name].parameters
+            if len(values) != len(parameters):
+                message = f'{name}() takes {len(parameters)} arguments but {len(values)} were given'
+                self.emit(f'throw Error({c_string(message)});')
+                return
+            self.assign(instruction, f'w_{name}({", ".join(values)})')
+        elif name in CPP_BUILTINS:
+            count = CPP_BUILTINS[name]
+            if count is None:
+                if len(values) < 2:
+                    raise unsupported(f'{name}() with fewer than two arguments')
+                self.assign(instruction, f'builtin_{name}({{{", ".join(values)}}})')
+            elif len(values) != count:
+                raise unsupported(f'{name}() with {len(values)} arguments')
+            else:
+                self.assign(instruction, f'builtin_{name}({values[0]})')
+
+    def instruction_print(self, instruction):
+        self.emit(f'print({self.operand(instruction.operands[0])});')
+
+    def instruction_define(self, instruction):
+        if not self.current.is_program:
+            raise unsupported('nested functions')
+        self.assign(instruction, f'function({self.function_ids[instruction.argument.name]})')
+
+    def instruction_jump(self, instruction):
+        self.emit(f'goto {instruction.argument.label};')
+
+    def instruction_branch(self, instruction):
+        then_block, else_block = instruction.argument
+        self.emit(f'if (truthy({self.operand(instruction.operands[0])})) goto {then_block.label}; '
+                  f'else goto {else_block.label};')
+
+    def instruction_return(self, instruction):
+        if self.current.is_program:
+            self.emit('throw Error("\'return\' outside a function");')
+        else:
+            self.emit(f'return {self.operand(instruction.operands[0])};')
+
+    def instruction_halt(self, instruction):
+        self.emit('return;')
+
+
+def generate_cpp(program):
+    """Return C++ source for a parsed program, by way of its optimized IR."""
+    return CppGenerator(compile_ir(program)).generate()
+
+
+def build_executable(source, executable, compiler='g++', flags=CXX_FLAGS):
+    """Compile generated C++ `source` to `executable`."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'program.cpp')
+        with open(path, 'w') as file:
+            file.write(source)
+        result = subprocess.run([compiler, *flags, path, '-o', executable], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(f'{compiler} failed:\n{result.stderr}')
+    return executable
+
+
+def main(argv):
+    arguments = argparse.ArgumentParser(description='Compile a WordMaze program ahead of time with a C++ compiler.')
+    arguments.add_argument('source')
+    arguments.add_argument('--output', '-o', help='executable to write (default: the source without its suffix)')
+    arguments.add_argument('--emit-cpp', action='store_true', help='print the generated C++ instead of compiling it')
+    arguments.add_argument('--compiler', default='g++')
+    options = arguments.parse_args(argv[1:])
+
+    with open(options.source) as file:
+        program = Parser(Lexer(file.read())).parse()
+    source = generate_cpp(program)
+    if options.emit_cpp:
+        sys.stdout.write(source)
+        return 0
+    build_executable(source, options.output or os.path.splitext(options.source)[0], options.compiler)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,99 @@
+from bisect import bisect_left, bisect_right
+
+from ast_nodes import ProgramNode
+from lexer import RegexLexer
+from parser import Parser
+
+
+class IncrementalParser:
+    """Keeps a parse tree in step with a text buffer as it is edited.
+
+    `edit()` applies a text change and re-parses only the top-level
+    statements it can affect: statements that end before the change are kept
+    as they are, and parsing stops as soon as it reaches the start of an old
+    statement that lies entirely after the change, since from there on the
+    text (and so the parse) is the same as before. Those statements are
+    reused with their spans shifted by the change in length, so the nodes of
+    the previous tree are shared with (and updated for) the new one. Each
+    top-level statement keeps its spans relative to its own `SourceOffset`,
+    which makes the shift one update per statement.
+    """
+
+    def __init__(self, text, lexer_class=RegexLexer):
+        self.lexer_class = lexer_class
+        self.text = text
+        self.program = Parser(lexer_class(text)).parse()
+        self.starts = [statement.start for statement in self.program.statements]
+        self.ends = [statement.end for statement in self.program.statements]
+        # Statistics for the last edit.
+        self.reparsed = len(self.program.statements)
+        self.reused = 0
+
+    def edit(self, start, end, replacement):
+        """Replace `text[start:end]` by `replacement` and return the new tree.
+
+        If the new text does not parse, the error propagates and the parser
+        keeps the old text and tree.
+        """
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f'Edit range {start}:{end} is outside the text')
+
+        text = self.text[:start] + replacement + self.text[end:]
+        delta = len(replacement) - (end - start)
+        old = self.program.statements
+        starts = self.starts
+        ends = self.ends
+
+        # Re-parsing starts one statement before the first one that reaches
+        # the edit, since text typed after a statement can extend it (an
+        # `else` after an `if`). Lexing resumes at the end of the statement
+        # before that, which is always a token boundary; the edit itself may
+        # sit inside a comment or a string.
+        first = max(bisect_left(ends, start) - 1, 0)
+        resume = ends[first - 1] if first else 0
+        # Old statements from `reusable` on lie entirely after the edit, so
+        # the text from their start onwards is unchanged.
+        reusable = bisect_left(starts, end)
+
+        parser = Parser(self.lexer_class(text, resume))
+        statements = old[:first]
+        index = reusable
+        edit_end = start + len(replacement)
+        while parser.current_token.type != 'EOF':
+            position = parser.current_token.start
+            if position >= edit_end:
+                index = bisect_left(starts, position - delta, index)
+                if index < len(old) and starts[index] == position - delta:
+                    break
+            statements.append(parser.parse_top_level_statement())
+        else:
+            index = len(old)
+
+        reparsed = statements[first:]
+        reused = old[index:]
+        if delta:
+            for statement in reused:
+                statement.base.value += delta
+        statements += reused
+
+        program = ProgramNode(statements)
+        program.start = statements[0].start if statements else parser.current_token.start
+        program.end = statements[-1].end if statements else program.start
+        self.text = text
+        self.program = program
+        self.starts = starts[:first] + [statement.start for statement in reparsed] + [
+            position + delta for position in starts[index:]]
+        self.ends = ends[:first] + [statement.end for statement in reparsed] + [
+            position + delta for position in ends[index:]]
+        self.reparsed = len(reparsed)
+        self.reused = len(statements) - len(reparsed)
+        return program
+
+
+def statement_at(program, offset):
+    """Return the top-level statement of `program` whose span holds `offset`."""
+    statements = program.statements
+    index = bisect_right([statement.start for statement in statements], offset) - 1
+    if index >= 0 and offset < statements[index].end:
+        return statements[index]
+    return None
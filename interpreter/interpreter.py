@@ -0,0 +1,337 @@
+import sys
+
+from closure_compiler import compile_program
+from ir_interpreter import run_ir
+from optimizer import optimize
+from purity import MEMO_SIZE, memoize
+from python_compiler import run_python
+from quickening import QUICKEN_AFTER, QUICKENED_TYPES, quicken
+from resolver import resolve
+from traversal import run
+from vm import run_bytecode
+from runtime import (
+    BINARY_OPERATORS, BUILTINS, UNARY_OPERATORS, UNSET, Function, MemoCache, check_arguments,
+    check_callable, format_value, undefined_function, undefined_variable,
+)
+
+
+class ReturnValue(BaseException):
+    """Carries a `return` value up to the call that is returning.
+
+    It is a `BaseException` so that `try`/`catch`, which catches runtime
+    errors, lets it through.
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Interpreter:
+    """Runs a program by walking its tree, looking up a `visit_<ClassName>`
+    method for every node it evaluates. See class documentation.py.
+
+    Globals live in the `global_scope` dict, the locals of the running call
+    in `local_scope`, a list indexed by the slots `resolve` assigns.
+
+    The nodes of a deep expression (see resolver.py) are evaluated by
+    `step_<ClassName>` generator methods instead, which traversal.py's
+    `run` drives on an explicit stack, so expressions of any height
+    evaluate. The shallow expressions below them are visited as usual.
+    """
+
+    binary_operators = BINARY_OPERATORS
+    builtins = BUILTINS
+    # Evaluations with operands of one type after which a binary operation
+    # is quickened (see quickening.py); None never quickens.
+    quicken_after = QUICKEN_AFTER
+
+    def __init__(self, parser, output=None):
+        self.parser = parser
+        self.output = output
+        self.global_scope = {}
+        self.local_scope = None
+        # Every quickening.py `Site` of this run, including deoptimized ones:
+        # at most one for each node and operand type.
+        self.sites = []
+
+    def interpret(self):
+        return self.visit(self.parser.parse())
+
+    def visit(self, node):
+        method = getattr(self, 'visit_' + type(node).__name__, self.generic_visit)
+        return method(node)
+
+    def generic_visit(self, node):
+        raise Exception(f'No visit_{type(node).__name__} method')
+
+    def step(self, node):
+        """Dispatch for `run`: the step of a deep expression, the value of a
+        shallow one."""
+        if node.deep:
+            return getattr(self, 'step_' + type(node).__name__)(node)
+        return self.visit(node)
+
+    def execute_body(self, statements):
+        for statement in statements:
+            self.visit(statement)
+
+    def lookup(self, node, name):
+        if node.slot is not None:
+            value = self.local_scope[node.slot]
+            if value is not UNSET:
+                return value
+        if name in self.global_scope:
+            return self.global_scope[name]
+        raise undefined_variable(name)
+
+    def lookup_function(self, node, name):
+        if node.slot is not None:
+            value = self.local_scope[node.slot]
+            if value is not UNSET:
+                return value
+        if name in self.global_scope:
+            return self.global_scope[name]
+        if name in self.builtins:
+            return self.builtins[name]
+        raise undefined_function(name)
+
+    def assign(self, node, name, value):
+        if node.slot is not None:
+            self.local_scope[node.slot] = value
+        else:
+            self.global_scope[name] = value
+
+    def visit_ProgramNode(self, node):
+        resolve(node)
+        try:
+            self.execute_body(node.statements)
+        except ReturnValue:
+            raise Exception("'return' outside a function") from None
+
+    def visit_AssignmentNode(self, node):
+        self.assign(node, node.target, self.visit(node.value))
+
+    def visit_VariableNode(self, node):
+        return self.lookup(node, node.name)
+
+    def visit_BinaryOpNode(self, node):
+        site = node.quickened
+        if site is not None:
+            return site.evaluate(self)
+        if node.deep:
+            return run(node, self.step)
+        if node.operator == '&&':
+            return bool(self.visit(node.left) and self.visit(node.right))
+        if node.operator == '||':
+            return bool(self.visit(node.left) or self.visit(node.right))
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        kind = type(left)
+        if kind is type(right) and kind in QUICKENED_TYPES:
+            warmth = node.warmth + 1
+            if warmth == self.quicken_after:
+                quicken(self, node, kind)
+                warmth = 0
+            node.warmth = warmth
+        elif node.warmth:
+            node.warmth = 0
+        return self.binary_operators[node.operator](left, right)
+
+    def step_BinaryOpNode(self, node):
+        left = yield node.left
+        if node.operator == '&&':
+            return bool(left and (yield node.right))
+        if node.operator == '||':
+            return bool(left or (yield node.right))
+        return self.binary_operators[node.operator](left, (yield node.right))
+
+    def visit_UnaryOpNode(self, node):
+        if node.deep:
+            return run(node, self.step)
+        return UNARY_OPERATORS[node.operator](self.visit(node.operand))
+
+    def step_UnaryOpNode(self, node):
+        return UNARY_OPERATORS[node.operator]((yield node.operand))
+
+    def visit_LiteralNode(self, node):
+        return node.value
+
+    def visit_ExpressionNode(self, node):
+        return node.value
+
+    def visit_ArrayAccessNode(self, node):
+        if node.deep:
+            return run(node, self.step)
+        return self.lookup(node, node.name)[self.visit(node.index)]
+
+    def step_ArrayAccessNode(self, node):
+        array = self.lookup(node, node.name)
+        return array[(yield node.index)]
+
+    def visit_FunctionCallNode(self, node):
+        if node.deep:
+            return run(node, self.step)
+        function = self.lookup_function(node, node.callee)
+        arguments = [self.visit(argument) for argument in node.arguments]
+        return self.call_function(function, arguments, node.callee)
+
+    def step_FunctionCallNode(self, node):
+        function = self.lookup_function(node, node.callee)
+        arguments = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+        return self.call_function(function, arguments, node.callee)
+
+    def call_function(self, function, arguments, name=None):
+        if not isinstance(function, Function):
+            check_callable(name, function)
+            return function(*arguments)
+
+        check_arguments(function, arguments)
+        cache = function.cache
+        key = cache.key(arguments) if cache is not None else None
+        if key is None:
+            return self.run_function(function, arguments)
+        result = cache.lookup(key)
+        if result is UNSET:
+            result = self.run_function(function, arguments)
+            cache.store(key, result)
+        return result
+
+    def run_function(self, function, arguments):
+        saved_scope = self.local_scope
+        self.local_scope = arguments + [UNSET] * (function.frame_size - len(arguments))
+        try:
+            self.execute_body(function.body)
+        except ReturnValue as returned:
+            return returned.value
+        finally:
+            self.local_scope = saved_scope
+        return None
+
+    def visit_FunctionDefinitionNode(self, node):
+        cache = MemoCache(node.memo_size) if node.memo_size else None
+        function = Function(node.function_name, node.parameters, node.body, len(node.slot_names), cache)
+        self.assign(node, node.function_name, function)
+
+    def visit_ReturnNode(self, node):
+        raise ReturnValue(self.visit(node.value) if node.value is not None else None)
+
+    def visit_IfNode(self, node):
+        if self.visit(node.condition):
+            self.execute_body(node.then_body)
+        else:
+            self.execute_body(node.else_body)
+
+    def visit_WhileNode(self, node):
+        while self.visit(node.condition):
+            self.execute_body(node.body)
+
+    def visit_ForNode(self, node):
+        loop = node.vector_loop
+        if loop is not None and loop.run(self.visit, lambda array: self.lookup(array, array.name),
+                                         lambda assignment, value: self.assign(assignment, assignment.target, value)):
+            return
+        self.visit(node.init)
+        while self.visit(node.condition):
+            self.execute_body(node.body)
+            self.visit(node.increment)
+
+    def visit_PrintNode(self, node):
+        output = self.output if self.output is not None else sys.stdout
+        output.write(format_value(self.visit(node.expression)) + '\n')
+
+    def visit_TryCatchNode(self, node):
+        try:
+            self.execute_body(node.try_body)
+        except Exception:
+            self.execute_body(node.catch_body)
+
+
+class BudgetedInterpreter(Interpreter):
+    """An `Interpreter` charging its run to a `Budget` (see budget.py) at
+    every loop iteration and call. Loops run one iteration at a time, never
+    vectorized, so that each is charged.
+    """
+
+    def __init__(self, parser, output=None, budget=None):
+        super().__init__(parser, output)
+        self.budget = budget
+        self.binary_operators = budget.binary_operators()
+        self.builtins = budget.builtins()
+
+    def visit_WhileNode(self, node):
+        tick = self.budget.tick
+        while self.visit(node.condition):
+            tick()
+            self.execute_body(node.body)
+
+    def visit_ForNode(self, node):
+        tick = self.budget.tick
+        self.visit(node.init)
+        while self.visit(node.condition):
+            tick()
+            self.execute_body(node.body)
+            self.visit(node.increment)
+
+    def call_function(self, function, arguments, name=None):
+        self.budget.enter()
+        try:
+            return super().call_function(function, arguments, name)
+        finally:
+            self.budget.leave()
+
+
+def run_tree(program, output=None, budget=None):
+    if budget is None:
+        interpreter = Interpreter(None, output)
+    else:
+        budget.start()
+        interpreter = BudgetedInterpreter(None, output, budget)
+    interpreter.visit(program)
+    return interpreter.global_scope
+
+
+def run_closures(program, output=None, budget=None):
+    return compile_program(program, budget).run(output)
+
+
+EXECUTION_ENGINES = {
+    'tree': run_tree,
+    'closure': run_closures,
+    'bytecode': run_bytecode,
+    'python': run_python,
+    'ir': run_ir,
+}
+
+# The engines that can run a program within a `Budget`.
+BUDGETED_ENGINES = {'tree', 'closure'}
+
+
+def run_program(program, engine='closure', output=None, optimizations=(), memo_size=MEMO_SIZE, unmemoized=(),
+                budget=None):
+    """Run a parsed program on one of `EXECUTION_ENGINES`; return its globals.
+
+    `optimizations` names passes of optimizer.py to run over the tree first,
+    which changes it in place; `DEFAULT_PASSES` enables them all.
+
+    Pure functions (see purity.py) keep their last `memo_size` results,
+    but those named in `unmemoized`; 0 turns caching off. Only the tree
+    and closure engines cache: the others call without a Python frame
+    per call to hook into.
+
+    A `budget` (see budget.py) limits the run, which raises `LimitExceeded`
+    when it goes past one of its limits; only `BUDGETED_ENGINES` take one.
+    """
+    try:
+        run = EXECUTION_ENGINES[engine]
+    except KeyError:
+        raise ValueError(f'Unknown execution engine: {engine}') from None
+    if budget is not None and engine not in BUDGETED_ENGINES:
+        raise ValueError(f'The {engine} engine cannot run within a budget')
+    if optimizations:
+        optimize(program, optimizations)
+    memoize(program, memo_size, unmemoized)
+    if budget is not None:
+        return run(program, output, budget)
+    return run(program, output)
@@ -0,0 +1,527 @@
+from code_generator import format_literal
+from resolver import resolve
+from traversal import run
+
+
+# Instructions are three-address: at most one target and a few operands,
+# each a variable name or a `Constant`. Variables are the program's own
+# names and temporaries, whose names start with '%' so that they cannot
+# clash. At top level the program's names are its globals, copied into a
+# temporary where they are read; in a function they are its locals, and
+# globals are read with 'global'.
+#
+#   copy      target = a
+#   binary    target = a <argument> b
+#   unary     target = <argument> a
+#   truth     target = bool(a)
+#   global    target = the global named <argument>
+#   fallback  target = local a if it is bound, else the global of that name
+#   function  target = the global or builtin function named <argument>
+#   fallback_function  target = local a if bound, else like 'function'
+#   call      target = a(b, ...), <argument> naming the callee for errors
+#   index     target = a[b]
+#   print     write a
+#   define    target = a function value for the IRFunction <argument>
+#
+# Every block ends with exactly one terminator:
+#
+#   jump      to block <argument>
+#   branch    to <argument>[0] if a is true, else to <argument>[1]
+#   return    a from the function; at top level, an error
+#   halt      the end of the program
+PURE_OPCODES = {'binary', 'unary', 'truth', 'global'}
+TERMINATORS = {'jump', 'branch', 'return', 'halt'}
+
+
+class Constant:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        # 1, 1.0 and true are different constants.
+        return isinstance(other, Constant) and type(self.value) is type(other.value) and self.value == other.value
+
+    def __hash__(self):
+        return hash((type(self.value), self.value))
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+def is_temporary(operand):
+    return isinstance(operand, str) and operand.startswith('%')
+
+
+class Instruction:
+    __slots__ = ('opcode', 'target', 'operands', 'argument')
+
+    def __init__(self, opcode, target=None, operands=(), argument=None):
+        self.opcode = opcode
+        self.target = target
+        self.operands = list(operands)
+        self.argument = argument
+
+    def variables(self):
+        """The variables the instruction reads."""
+        return [operand for operand in self.operands if isinstance(operand, str)]
+
+    def __repr__(self):
+        return format_instruction(self)
+
+
+class BasicBlock:
+    """Straight-line instructions ending in a terminator. `handler` is the
+    block a failing instruction continues at, inside try/catch.
+    """
+
+    def __init__(self, index, handler=None):
+        self.index = index
+        self.instructions = []
+        self.handler = handler
+
+    @property
+    def label(self):
+        return f'B{self.index}'
+
+    @property
+    def terminator(self):
+        return self.instructions[-1]
+
+    def successors(self):
+        terminator = self.terminator
+        if terminator.opcode == 'jump':
+            successors = [terminator.argument]
+        elif terminator.opcode == 'branch':
+            successors = list(terminator.argument)
+        else:
+            successors = []
+        if self.handler is not None:
+            successors.append(self.handler)
+        return successors
+
+    def __repr__(self):
+        return f'<block {self.label}>'
+
+
+class IRFunction:
+    """The control-flow graph of a function, or of the program itself;
+    `blocks[0]` is the entry. `functions` are those it defines.
+    """
+
+    def __init__(self, name, parameters, is_program=False):
+        self.name = name
+        self.parameters = tuple(parameters)
+        self.is_program = is_program
+        self.blocks = []
+        self.functions = []
+        self.temporaries = 0
+
+    def temporary(self):
+        self.temporaries += 1
+        return f'%{self.temporaries}'
+
+    def new_block(self, handler=None):
+        block = BasicBlock(len(self.blocks), handler)
+        self.blocks.append(block)
+        return block
+
+    def predecessors(self):
+        predecessors = {block: [] for block in self.blocks}
+        for block in self.blocks:
+            for successor in block.successors():
+                predecessors[successor].append(block)
+        return predecessors
+
+    def remove_unreachable_blocks(self):
+        reachable = set()
+        stack = [self.blocks[0]]
+        while stack:
+            block = stack.pop()
+            if block not in reachable:
+                reachable.add(block)
+                stack.extend(block.successors())
+        self.blocks = [block for block in self.blocks if block in reachable]
+        for index, block in enumerate(self.blocks):
+            block.index = index
+
+    def walk(self):
+        """Yield this function and every function nested in it."""
+        yield self
+        for function in self.functions:
+            yield from function.walk()
+
+
+class Dominators:
+    """The dominator tree of a function, from the immediate dominators
+    Cooper, Harvey and Kennedy's iteration finds in reverse postorder.
+
+    Numbering the tree depth first makes `dominates` a comparison: a block
+    dominates the blocks numbered from its own number to its `last`.
+    Blocks the entry does not reach are dominated by none but themselves.
+    """
+
+    def __init__(self, function):
+        entry = function.blocks[0]
+        predecessors = function.predecessors()
+        order = reverse_postorder(entry)
+        position = {block: index for index, block in enumerate(order)}
+        idom = {entry: entry}
+        changed = True
+        while changed:
+            changed = False
+            for block in order[1:]:
+                new = None
+                for predecessor in predecessors[block]:
+                    if predecessor not in idom:
+                        continue
+                    if new is None:
+                        new = predecessor
+                        continue
+                    # Climb to the nearest common dominator of the two.
+                    other = predecessor
+                    while new is not other:
+                        while position[new] > position[other]:
+                            new = idom[new]
+                        while position[other] > position[new]:
+                            other = idom[other]
+                if idom.get(block) is not new:
+                    idom[block] = new
+                    changed = True
+        del idom[entry]
+        self.idom = idom
+
+        children = {block: [] for block in order}
+        for block in order[1:]:
+            children[idom[block]].append(block)
+        self.number = {}
+        self.last = {}
+        stack = [(entry, False)]
+        while stack:
+            block, done = stack.pop()
+            if done:
+                self.last[block] = len(self.number) - 1
+                continue
+            self.number[block] = len(self.number)
+            stack.append((block, True))
+            stack.extend((child, False) for child in children[block])
+
+    def dominates(self, dominator, block):
+        """Whether every path from the entry to `block` goes through
+        `dominator`."""
+        if dominator is block:
+            return True
+        number = self.number.get(block)
+        if number is None or dominator not in self.number:
+            return False
+        return self.number[dominator] <= number <= self.last[dominator]
+
+    def of(self, block):
+        """The blocks that dominate `block`, from `block` up to the entry."""
+        found = [block]
+        while block in self.idom:
+            block = self.idom[block]
+            found.append(block)
+        return found
+
+
+def reverse_postorder(entry):
+    """The blocks `entry` reaches, each before its successors but for the
+    back edges."""
+    postorder = []
+    seen = {entry}
+    stack = [(entry, iter(entry.successors()))]
+    while stack:
+        block, successors = stack[-1]
+        for successor in successors:
+            if successor not in seen:
+                seen.add(successor)
+                stack.append((successor, iter(successor.successors())))
+                break
+        else:
+            stack.pop()
+            postorder.append(block)
+    postorder.reverse()
+    return postorder
+
+
+def dominators(function):
+    """The `Dominators` of `function`'s blocks."""
+    return Dominators(function)
+
+
+class Loop:
+    """A natural loop: the blocks that reach one of its back edges' sources
+    without going through `header`.
+    """
+
+    def __init__(self, header, blocks):
+        self.header = header
+        self.blocks = blocks
+
+    def exits(self):
+        """Blocks inside the loop with a successor outside it."""
+        return [block for block in self.blocks
+                if any(successor not in self.blocks for successor in block.successors())]
+
+
+def natural_loops(function, dominated_by=None):
+    """Return the natural loops of `function`, innermost first."""
+    dominated_by = dominated_by or dominators(function)
+    predecessors = function.predecessors()
+    loops = {}
+    for block in function.blocks:
+        for successor in block.successors():
+            if dominated_by.dominates(successor, block):
+                body = loops.setdefault(successor, {successor})
+                stack = [block]
+                while stack:
+                    node = stack.pop()
+                    if node not in body:
+                        body.add(node)
+                        stack.extend(predecessors[node])
+    return sorted((Loop(header, body) for header, body in loops.items()), key=lambda loop: len(loop.blocks))
+
+
+class IRBuilder:
+    """Lowers a resolved tree to an `IRFunction`.
+
+    Loops are lowered rotated: the condition is tested once before the loop
+    and again at the end of the body, which jumps back to the body's first
+    block. The loop is entered through a block of its own, its preheader,
+    where loop passes put what they move out.
+
+    The `lower_<ClassName>` methods yield the nodes below them to
+    traversal.py's `run` for their operands, so trees of any depth lower.
+    """
+
+    def __init__(self, name='<program>', parameters=(), is_program=True):
+        self.function = IRFunction(name, parameters, is_program)
+        self.handler = None
+        self.block = self.function.new_block()
+
+    def lower_program(self, statements):
+        run(self.body(statements), self.lower)
+        self.terminate('halt')
+        return self.finish()
+
+    def lower_function(self, statements):
+        run(self.body(statements), self.lower)
+        self.terminate('return', [Constant(None)])
+        return self.finish()
+
+    def finish(self):
+        self.function.remove_unreachable_blocks()
+        return self.function
+
+    def new_block(self):
+        return self.function.new_block(self.handler)
+
+    def emit(self, opcode, target=None, operands=(), argument=None):
+        self.block.instructions.append(Instruction(opcode, target, operands, argument))
+
+    def terminate(self, opcode, operands=(), argument=None):
+        self.emit(opcode, None, operands, argument)
+        # Anything lowered next is unreachable until a block is started.
+        self.block = self.new_block()
+
+    def start(self, block):
+        self.block = block
+
+    def value(self, opcode, operands=(), argument=None):
+        target = self.function.temporary()
+        self.emit(opcode, target, operands, argument)
+        return target
+
+    def body(self, statements):
+        for statement in statements:
+            yield statement
+
+    def lower(self, node):
+        method = getattr(self, 'lower_' + type(node).__name__, None)
+        if method is None:
+            raise Exception(f'No lower_{type(node).__name__} method')
+        return method(node)
+
+    def read(self, node, name):
+        if self.function.is_program:
+            # Copied here, an undefined name fails before the rest of the
+            # expression runs, as in the other engines.
+            return self.value('copy', [name])
+        if node.slot is not None:
+            return name if node.bound else self.value('fallback', [name], name)
+        return self.value('global', (), name)
+
+    def lower_LiteralNode(self, node):
+        return Constant(node.value)
+
+    lower_ExpressionNode = lower_LiteralNode
+
+    def lower_VariableNode(self, node):
+        return self.read(node, node.name)
+
+    def lower_BinaryOpNode(self, node):
+        if node.operator in ('&&', '||'):
+            return (yield from self.lower_logical(node))
+        left = yield node.left
+        right = yield node.right
+        return self.value('binary', [left, right], node.operator)
+
+    def lower_logical(self, node):
+        result = self.function.temporary()
+        left = yield node.left
+        right_block, short_block, end = self.new_block(), self.new_block(), self.new_block()
+        targets = (right_block, short_block) if node.operator == '&&' else (short_block, right_block)
+        self.terminate('branch', [left], targets)
+        self.start(right_block)
+        right = yield node.right
+        self.emit('truth', result, [right])
+        self.terminate('jump', argument=end)
+        self.start(short_block)
+        self.emit('copy', result, [Constant(node.operator == '||')])
+        self.terminate('jump', argument=end)
+        self.start(end)
+        return result
+
+    def lower_UnaryOpNode(self, node):
+        operand = yield node.operand
+        return self.value('unary', [operand], node.operator)
+
+    def lower_ArrayAccessNode(self, node):
+        array = self.read(node, node.name)
+        index = yield node.index
+        return self.value('index', [array, index])
+
+    def lower_FunctionCallNode(self, node):
+        name = node.callee
+        if not self.function.is_program and node.slot is not None:
+            callee = name if node.bound else self.value('fallback_function', [name], name)
+        else:
+            callee = self.value('function', (), name)
+        arguments = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+        return self.value('call', [callee, *arguments], name)
+
+    def lower_AssignmentNode(self, node):
+        value = yield node.value
+        instructions = self.block.instructions
+        if is_temporary(value) and instructions and instructions[-1].target == value:
+            # Compute straight into the variable: `i = i + 1`, not `%1 = i + 1; i = %1`.
+            instructions[-1].target = node.target
+        else:
+            self.emit('copy', node.target, [value])
+
+    def lower_PrintNode(self, node):
+        value = yield node.expression
+        self.emit('print', None, [value])
+
+    def lower_ReturnNode(self, node):
+        value = (yield node.value) if node.value is not None else Constant(None)
+        self.terminate('return', [value])
+
+    def lower_FunctionDefinitionNode(self, node):
+        builder = IRBuilder(node.function_name, node.parameters, is_program=False)
+        function = builder.lower_function(node.body)
+        self.function.functions.append(function)
+        self.emit('define', node.function_name, (), function)
+
+    def lower_IfNode(self, node):
+        condition = yield node.condition
+        then_block, end = self.new_block(), self.new_block()
+        else_block = self.new_block() if node.else_body else end
+        self.terminate('branch', [condition], (then_block, else_block))
+        self.start(then_block)
+        yield from self.body(node.then_body)
+        self.terminate('jump', argument=end)
+        if node.else_body:
+            self.start(else_block)
+            yield from self.body(node.else_body)
+            self.terminate('jump', argument=end)
+        self.start(end)
+
+    def lower_loop(self, condition, body):
+        preheader, first, exit_ = self.new_block(), self.new_block(), self.new_block()
+        self.terminate('branch', [(yield condition)], (preheader, exit_))
+        self.start(preheader)
+        self.terminate('jump', argument=first)
+        self.start(first)
+        yield from self.body(body)
+        self.terminate('branch', [(yield condition)], (first, exit_))
+        self.start(exit_)
+
+    def lower_WhileNode(self, node):
+        yield from self.lower_loop(node.condition, node.body)
+
+    def lower_ForNode(self, node):
+        yield node.init
+        yield from self.lower_loop(node.condition, node.body + [node.increment])
+
+    def lower_TryCatchNode(self, node):
+        catch_block, end = self.new_block(), self.new_block()
+        saved = self.handler
+        self.handler = catch_block
+        first = self.new_block()
+        self.terminate('jump', argument=first)
+        self.start(first)
+        yield from self.body(node.try_body)
+        self.handler = saved
+        self.terminate('jump', argument=end)
+        self.start(catch_block)
+        yield from self.body(node.catch_body)
+        self.terminate('jump', argument=end)
+        self.start(end)
+
+
+def lower_program(program):
+    """Lower a parsed program to the `IRFunction` of its top level."""
+    resolve(program)
+    return IRBuilder().lower_program(program.statements)
+
+
+def format_operand(operand):
+    if not isinstance(operand, Constant):
+        return operand
+    if operand.value is None:
+        return 'null'
+    return format_literal(operand.value)
+
+
+def format_instruction(instruction):
+    opcode, argument = instruction.opcode, instruction.argument
+    operands = [format_operand(operand) for operand in instruction.operands]
+    if opcode == 'copy':
+        text = operands[0]
+    elif opcode == 'binary':
+        text = f'{operands[0]} {argument} {operands[1]}'
+    elif opcode == 'unary':
+        text = f'{argument}{operands[0]}'
+    elif opcode in ('global', 'function'):
+        text = f'{opcode} {argument}'
+    elif opcode == 'call':
+        text = f'call {operands[0]}({", ".join(operands[1:])})'
+    elif opcode == 'index':
+        text = f'{operands[0]}[{operands[1]}]'
+    elif opcode == 'define':
+        text = f'define {argument.name}'
+    elif opcode == 'jump':
+        text = f'jump {argument.label}'
+    elif opcode == 'branch':
+        text = f'branch {operands[0]}, {argument[0].label}, {argument[1].label}'
+    else:
+        text = ' '.join([opcode, *operands])
+    return text if instruction.target is None else f'{instruction.target} = {text}'
+
+
+def format_function(function):
+    """Return a listing of `function` and of the functions it defines."""
+    lines = [f'function {function.name}({", ".join(function.parameters)}):']
+    for block in function.blocks:
+        handler = f'  (catch: {block.handler.label})' if block.handler is not None else ''
+        lines.append(f'  {block.label}:{handler}')
+        lines.extend(f'    {format_instruction(instruction)}' for instruction in block.instructions)
+    for nested in function.functions:
+        lines.append('')
+        lines.append(format_function(nested))
+    return '\n'.join(lines)
@@ -0,0 +1,169 @@
+import sys
+
+from ir import lower_program
+from ir_passes import DEFAULT_IR_PASSES, optimize_ir
+from runtime import (
+    BINARY_OPERATORS, BUILTINS, UNARY_OPERATORS, Function, check_arguments, check_callable,
+    format_value, undefined_function, undefined_variable,
+)
+
+
+class ReturnOutsideFunction(BaseException):
+    """Raised by a top-level `return`; not an `Exception`, so that no
+    try/catch handler takes it.
+    """
+
+
+class IRInterpreter:
+    """Runs the IR of ir.py, one basic block at a time.
+
+    A frame is a dict of the variables of the running function, temporaries
+    included. The program's frame is `global_scope` itself; its
+    temporaries are dropped when it ends.
+    """
+
+    def __init__(self, output=None):
+        self.output = output
+        self.global_scope = {}
+
+    def run(self, function):
+        """Run the IR of a program; return the global scope."""
+        try:
+            self.execute(function, self.global_scope)
+        except ReturnOutsideFunction:
+            raise Exception("'return' outside a function") from None
+        for name in [name for name in self.global_scope if name.startswith('%')]:
+            del self.global_scope[name]
+        return self.global_scope
+
+    def execute(self, function, frame):
+        global_scope = self.global_scope
+        output = self.output if self.output is not None else sys.stdout
+        block = function.blocks[0]
+        while True:
+            try:
+                for instruction in block.instructions:
+                    opcode = instruction.opcode
+                    operands = instruction.operands
+
+                    if opcode == 'binary':
+                        left, right = operands
+                        left = frame[left] if type(left) is str else left.value
+                        right = frame[right] if type(right) is str else right.value
+                        frame[instruction.target] = BINARY_OPERATORS[instruction.argument](left, right)
+
+                    elif opcode == 'copy':
+                        value = operands[0]
+                        frame[instruction.target] = frame[value] if type(value) is str else value.value
+
+                    elif opcode == 'branch':
+                        value = operands[0]
+                        value = frame[value] if type(value) is str else value.value
+                        block = instruction.argument[0] if value else instruction.argument[1]
+                        break
+
+                    elif opcode == 'jump':
+                        block = instruction.argument
+                        break
+
+                    elif opcode == 'global':
+                        try:
+                            frame[instruction.target] = global_scope[instruction.argument]
+                        except KeyError:
+                            raise undefined_variable(instruction.argument) from None
+
+                    elif opcode == 'function':
+                        name = instruction.argument
+                        if name in global_scope:
+                            frame[instruction.target] = global_scope[name]
+                        elif name in BUILTINS:
+                            frame[instruction.target] = BUILTINS[name]
+                        else:
+                            raise undefined_function(name)
+
+                    elif opcode == 'call':
+                        values = [frame[value] if type(value) is str else value.value for value in operands]
+                        callee = values[0]
+                        arguments = values[1:]
+                        if type(callee) is Function:
+                            check_arguments(callee, arguments)
+                            body = callee.body
+                            result = self.execute(body, dict(zip(body.parameters, arguments)))
+                        else:
+                            check_callable(instruction.argument, callee)
+                            result = callee(*arguments)
+                        frame[instruction.target] = result
+
+                    elif opcode == 'return':
+                        if function.is_program:
+                            raise ReturnOutsideFunction()
+                        value = operands[0]
+                        return frame[value] if type(value) is str else value.value
+
+                    elif opcode == 'unary':
+                        value = operands[0]
+                        value = frame[value] if type(value) is str else value.value
+                        frame[instruction.target] = UNARY_OPERATORS[instruction.argument](value)
+
+                    elif opcode == 'truth':
+                        value = operands[0]
+                        frame[instruction.target] = bool(frame[value] if type(value) is str else value.value)
+
+                    elif opcode == 'index':
+                        array, index = operands
+                        array = frame[array] if type(array) is str else array.value
+                        index = frame[index] if type(index) is str else index.value
+                        frame[instruction.target] = array[index]
+
+                    elif opcode == 'print':
+                        value = operands[0]
+                        output.write(format_value(frame[value] if type(value) is str else value.value) + '\n')
+
+                    elif opcode == 'fallback':
+                        name = instruction.argument
+                        if name in frame:
+                            frame[instruction.target] = frame[name]
+                        elif name in global_scope:
+                            frame[instruction.target] = global_scope[name]
+                        else:
+                            raise undefined_variable(name)
+
+                    elif opcode == 'fallback_function':
+                        name = instruction.argument
+                        if name in frame:
+                            frame[instruction.target] = frame[name]
+                        elif name in global_scope:
+                            frame[instruction.target] = global_scope[name]
+                        elif name in BUILTINS:
+                            frame[instruction.target] = BUILTINS[name]
+                        else:
+                            raise undefined_function(name)
+
+                    elif opcode == 'define':
+                        body = instruction.argument
+                        frame[instruction.target] = Function(body.name, body.parameters, body)
+
+                    elif opcode == 'halt':
+                        return None
+
+                    else:
+                        raise Exception(f'Unknown IR opcode {opcode}')
+
+            except Exception as error:
+                if block.handler is None:
+                    # Only the program's own names can be missing from a frame.
+                    if type(error) is KeyError:
+                        raise undefined_variable(error.args[0]) from None
+                    raise
+                block = block.handler
+
+
+def compile_ir(program, passes=DEFAULT_IR_PASSES):
+    """Lower `program` to IR and run `passes` of ir_passes.py over it."""
+    function = lower_program(program)
+    optimize_ir(function, passes)
+    return function
+
+
+def run_ir(program, output=None):
+    return IRInterpreter(output).run(compile_ir(program))
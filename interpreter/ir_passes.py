@@ -0,0 +1,495 @@
+import time
+
+from ir import PURE_OPCODES, Constant, Instruction, dominators, is_temporary, natural_loops
+from optimizer import PassStats
+from runtime import BINARY_OPERATORS
+
+
+# What every operand of these is certainly known to be when it is an int,
+# or a float, as long as both are the same.
+NEVER_FAILING_OPERATORS = {'+', '-', '*', '<', '<=', '>', '>=', '==', '!='}
+
+# A variable whose assignments have not all been looked at yet.
+UNKNOWN = 'unknown'
+
+
+def value_types(function, dominated_by):
+    """Map the variables certainly assigned wherever they are read to what
+    they hold: int or float when every assignment certainly stores one,
+    object otherwise.
+
+    Temporaries are always assigned before they are read, and a function
+    only reads its locals where the resolver found them bound, so what is
+    left out is the program's names that may be read before they are
+    assigned (all of them, when the program has a try/catch, whose catch
+    block may start before the rest of a block ran).
+    """
+    definitions = {}
+    reads = []
+    for block in function.blocks:
+        for position, instruction in enumerate(block.instructions):
+            reads.extend((block, position, name) for name in instruction.variables())
+            if instruction.target is not None:
+                definitions.setdefault(instruction.target, []).append((block, position, instruction))
+
+    types = {name: UNKNOWN for name in definitions}
+    types.update({name: object for name in function.parameters})
+    changed = True
+    while changed:
+        changed = False
+        for name, found in definitions.items():
+            if name in function.parameters:
+                continue
+            kinds = {result_type(instruction, types) for _, _, instruction in found} - {UNKNOWN}
+            kind = (kinds.pop() if len(kinds) == 1 else object) if kinds else UNKNOWN
+            if kind != types[name]:
+                types[name] = kind
+                changed = True
+    types = {name: object if kind == UNKNOWN else kind for name, kind in types.items()}
+
+    if function.is_program:
+        has_handlers = any(block.handler is not None for block in function.blocks)
+        for block, position, name in reads:
+            if is_temporary(name) or name not in types:
+                continue
+            if has_handlers or not any(
+                    (found is block and index < position) or (found is not block and dominated_by.dominates(found, block))
+                    for found, index, _ in definitions[name]):
+                del types[name]
+    return types
+
+
+def operand_type(operand, types):
+    if isinstance(operand, Constant):
+        return type(operand.value)
+    return types.get(operand, UNKNOWN)
+
+
+def result_type(instruction, types):
+    """What the assignment `instruction` certainly stores: int, float,
+    object for anything, or UNKNOWN while `types` is still being worked out.
+    """
+    if instruction.opcode == 'copy':
+        kind = operand_type(instruction.operands[0], types)
+        return kind if kind in (int, float, UNKNOWN) else object
+    if instruction.opcode == 'binary' and instruction.argument in ('+', '-', '*'):
+        kinds = {operand_type(operand, types) for operand in instruction.operands}
+        if UNKNOWN in kinds:
+            kinds.discard(UNKNOWN)
+            return kinds.pop() if len(kinds) == 1 and kinds <= {int, float} else UNKNOWN if not kinds else object
+        return kinds.pop() if len(kinds) == 1 and kinds <= {int, float} else object
+    return object
+
+
+def can_raise(instruction, types):
+    """Whether running `instruction` might fail, as far as the
+    `value_types` of its function tell.
+    """
+    opcode, argument = instruction.opcode, instruction.argument
+    if opcode not in ('copy', 'truth', 'unary', 'binary'):
+        return True
+    kinds = [operand_type(operand, types) for operand in instruction.operands]
+    if UNKNOWN in kinds:
+        return True
+    if opcode in ('copy', 'truth') or (opcode == 'unary' and argument == '!'):
+        return False
+    if opcode == 'unary':
+        return kinds[0] not in (int, float)
+    if argument in ('==', '!='):
+        return False
+    left, right = instruction.operands
+    if isinstance(left, Constant) and isinstance(right, Constant):
+        try:
+            BINARY_OPERATORS[argument](left.value, right.value)
+        except Exception:
+            return True
+        return False
+    return not (argument in NEVER_FAILING_OPERATORS and kinds[0] is kinds[1] and kinds[0] in (int, float))
+
+
+def definition_counts(function):
+    counts = {parameter: 1 for parameter in function.parameters}
+    for block in function.blocks:
+        for instruction in block.instructions:
+            if instruction.target is not None:
+                counts[instruction.target] = counts.get(instruction.target, 0) + 1
+    return counts
+
+
+def rename_uses(instruction, renamed):
+    instruction.operands = [renamed.get(operand, operand) if isinstance(operand, str) else operand
+                            for operand in instruction.operands]
+
+
+def preheader(function, loop, predecessors):
+    """The block every entry into `loop` comes through, if it has one."""
+    outside = [block for block in predecessors[loop.header] if block not in loop.blocks]
+    if len(outside) == 1 and outside[0].successors() == [loop.header]:
+        return outside[0]
+    return None
+
+
+class IRPass:
+    """A rewrite of an IR function that keeps what the program does.
+
+    `run` rewrites a function and every function it defines, counting its
+    rewrites in `changes`; subclasses implement `run_function`.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.changes = 0
+
+    def run(self, function):
+        for nested in function.walk():
+            self.run_function(nested)
+
+    def run_function(self, function):
+        raise NotImplementedError
+
+
+class CommonSubexpressionElimination(IRPass):
+    """Computes a pure expression once per block: in `a * b + a * b`, the
+    second `a * b` reuses the first.
+
+    An expression stays available until one of its operands, or the
+    variable holding it, is assigned again. When both results are
+    temporaries, which are only ever assigned once, the second one's uses
+    read the first directly; otherwise it becomes a copy.
+    """
+
+    name = 'cse'
+
+    def run_function(self, function):
+        counts = definition_counts(function)
+        # The temporaries dropped for the one read in their place. Uses are
+        # renamed as they are reached, and those before it in one last pass.
+        renamed = {}
+        for block in function.blocks:
+            available = {}
+            # The keys of `available` each variable is an operand of, and
+            # those it holds; some of them stale.
+            readers = {}
+            held = {}
+            kept = []
+            for instruction in block.instructions:
+                if renamed:
+                    rename_uses(instruction, renamed)
+                key = None
+                if instruction.opcode in PURE_OPCODES:
+                    key = (instruction.opcode, instruction.argument, tuple(instruction.operands))
+                    previous = available.get(key)
+                    if previous is not None:
+                        self.changes += 1
+                        key = None
+                        target = instruction.target
+                        if is_temporary(target) and counts[target] == 1 and counts[previous] == 1:
+                            renamed[target] = previous
+                            continue
+                        instruction.opcode, instruction.operands, instruction.argument = 'copy', [previous], None
+                kept.append(instruction)
+                target = instruction.target
+                if target is None:
+                    continue
+                for stale in readers.pop(target, ()):
+                    available.pop(stale, None)
+                for stale in held.pop(target, ()):
+                    if available.get(stale) == target:
+                        del available[stale]
+                if key is not None and target not in key[2]:
+                    available[key] = target
+                    for operand in key[2]:
+                        if isinstance(operand, str):
+                            readers.setdefault(operand, []).append(key)
+                    held.setdefault(target, []).append(key)
+            block.instructions = kept
+        if renamed:
+            for block in function.blocks:
+                for instruction in block.instructions:
+                    rename_uses(instruction, renamed)
+
+
+class LoopInvariantCodeMotion(IRPass):
+    """Moves computations whose operands a loop never changes into the
+    loop's preheader, so that they run once instead of once per iteration.
+
+    Only computations into temporaries move, and only pure ones. One that
+    may fail also has to run in every iteration, and may only move if
+    nothing the program could notice happens before it in the loop, so that
+    failing early in the preheader looks the same as failing in the first
+    iteration.
+    """
+
+    name = 'licm'
+
+    def run_function(self, function):
+        dominated_by = dominators(function)
+        predecessors = function.predecessors()
+        counts = definition_counts(function)
+        self.types = value_types(function, dominated_by)
+        for loop in natural_loops(function, dominated_by):
+            entry = preheader(function, loop, predecessors)
+            if entry is not None:
+                self.hoist(function, loop, entry, dominated_by, predecessors, counts)
+
+    def hoist(self, function, loop, entry, dominated_by, predecessors, counts):
+        exits = [block for block in loop.blocks
+                 if block.terminator.opcode in ('return', 'halt')
+                 or any(successor not in loop.blocks for successor in block.successors())]
+        hoisted = []
+        changed = True
+        while changed:
+            changed = False
+            defined = {instruction.target for block in loop.blocks for instruction in block.instructions}
+            for block in sorted(loop.blocks, key=lambda block: block.index):
+                if block.handler is not entry.handler:
+                    continue
+                for position, instruction in enumerate(block.instructions):
+                    if not self.movable(instruction, defined, counts):
+                        continue
+                    if can_raise(instruction, self.types):
+                        if not all(dominated_by.dominates(block, exit_) for exit_ in exits):
+                            continue
+                        if not self.quiet_before(function, loop, block, position, predecessors):
+                            continue
+                    del block.instructions[position]
+                    hoisted.append(instruction)
+                    self.changes += 1
+                    changed = True
+                    break
+                if changed:
+                    break
+        entry.instructions[-1:-1] = hoisted
+
+    def movable(self, instruction, defined, counts):
+        if instruction.opcode not in PURE_OPCODES and instruction.opcode != 'copy':
+            return False
+        target = instruction.target
+        if not is_temporary(target) or counts.get(target) != 1:
+            return False
+        return all(isinstance(operand, Constant) or operand not in defined for operand in instruction.operands)
+
+    def quiet_before(self, function, loop, block, position, predecessors):
+        """Whether the instructions that may run before `block`'s instruction
+        at `position`, in a first iteration, neither fail nor do anything
+        that outlasts a failure.
+        """
+        instructions = [(instruction, block) for instruction in block.instructions[:position]]
+        seen = {block}
+        stack = [] if block is loop.header else list(predecessors[block])
+        while stack:
+            previous = stack.pop()
+            if previous in seen or previous not in loop.blocks:
+                continue
+            seen.add(previous)
+            instructions.extend((instruction, previous) for instruction in previous.instructions[:-1])
+            if previous is not loop.header:
+                stack.extend(predecessors[previous])
+        for instruction, owner in instructions:
+            if instruction.opcode not in PURE_OPCODES and instruction.opcode != 'copy':
+                return False
+            if can_raise(instruction, self.types):
+                return False
+            # A function's locals die with the call a failure leaves, but
+            # globals and what a catch block reads live on.
+            if not is_temporary(instruction.target) and (function.is_program or owner.handler is not None):
+                return False
+        return True
+
+
+class StrengthReduction(IRPass):
+    """Replaces multiplying an induction variable by a constant with a
+    running sum: for `i` stepping by `c`, `i * k` becomes a variable that
+    starts at `i * k` and steps by `c * k`.
+
+    `i` has to be an integer: every assignment to it outside the loop
+    stores an integer literal, one of them before the loop, and the loop
+    only adds or subtracts an integer literal.
+    """
+
+    name = 'strength-reduction'
+
+    def run_function(self, function):
+        dominated_by = dominators(function)
+        predecessors = function.predecessors()
+        for loop in natural_loops(function, dominated_by):
+            entry = preheader(function, loop, predecessors)
+            if entry is not None:
+                self.reduce(function, loop, entry, dominated_by)
+
+    def reduce(self, function, loop, entry, dominated_by):
+        counts = definition_counts(function)
+        steps = self.induction_variables(function, loop, entry, dominated_by)
+        reduced = {}
+        for block in loop.blocks:
+            for instruction in block.instructions:
+                if instruction.opcode != 'binary' or instruction.argument != '*':
+                    continue
+                if not is_temporary(instruction.target) or counts[instruction.target] != 1:
+                    continue
+                left, right = instruction.operands
+                variable, factor = (left, right) if isinstance(right, Constant) else (right, left)
+                if variable not in steps or not isinstance(factor, Constant) or type(factor.value) is not int:
+                    continue
+                key = (variable, factor.value)
+                if key not in reduced:
+                    reduced[key] = self.running_product(function, entry, variable, factor.value, steps[variable])
+                instruction.opcode, instruction.operands, instruction.argument = 'copy', [reduced[key]], None
+                self.changes += 1
+
+    def induction_variables(self, function, loop, entry, dominated_by):
+        """Map each integer induction variable of `loop` to the instruction
+        that steps it.
+        """
+        assignments = {}
+        for block in function.blocks:
+            for instruction in block.instructions:
+                if instruction.target is not None and not is_temporary(instruction.target):
+                    assignments.setdefault(instruction.target, []).append((block, instruction))
+        steps = {}
+        for variable, found in assignments.items():
+            if variable in function.parameters:
+                continue
+            inside = [instruction for block, instruction in found if block in loop.blocks]
+            outside = [(block, instruction) for block, instruction in found if block not in loop.blocks]
+            if len(inside) != 1 or not outside or not self.is_step(inside[0], variable):
+                continue
+            if not all(instruction.opcode == 'copy' and is_integer(instruction.operands[0])
+                       for _, instruction in outside):
+                continue
+            if any(dominated_by.dominates(block, entry) for block, _ in outside):
+                steps[variable] = inside[0]
+        return steps
+
+    def is_step(self, instruction, variable):
+        if instruction.opcode != 'binary' or instruction.argument not in ('+', '-'):
+            return False
+        left, right = instruction.operands
+        if left == variable and is_integer(right):
+            return True
+        return instruction.argument == '+' and right == variable and is_integer(left)
+
+    def running_product(self, function, entry, variable, factor, step):
+        left, right = step.operands
+        amount = (right if left == variable else left).value
+        if step.argument == '-':
+            amount = -amount
+        product = function.temporary()
+        entry.instructions.insert(-1, Instruction('binary', product, [variable, Constant(factor)], '*'))
+        for block in function.blocks:
+            if step in block.instructions:
+                position = block.instructions.index(step) + 1
+                block.instructions.insert(
+                    position, Instruction('binary', product, [product, Constant(amount * factor)], '+'))
+        return product
+
+
+def is_integer(operand):
+    return isinstance(operand, Constant) and type(operand.value) is int
+
+
+class CopyPropagation(IRPass):
+    """Reads the source of a copy into a temporary in place of the
+    temporary, for the rest of the block or until the source is assigned
+    again. Copies nothing reads any more are left for dead-code elimination.
+    """
+
+    name = 'copy-propagation'
+
+    def run_function(self, function):
+        counts = definition_counts(function)
+        for block in function.blocks:
+            copies = {}
+            # The copies of each variable, some of them stale.
+            sources = {}
+            for instruction in block.instructions:
+                operands = [copies.get(operand, operand) if isinstance(operand, str) else operand
+                            for operand in instruction.operands]
+                if operands != instruction.operands:
+                    self.changes += sum(1 for old, new in zip(instruction.operands, operands) if old != new)
+                    instruction.operands = operands
+                target = instruction.target
+                if target is None:
+                    continue
+                copies.pop(target, None)
+                for copy in sources.pop(target, ()):
+                    if copies.get(copy) == target:
+                        del copies[copy]
+                if (instruction.opcode == 'copy' and is_temporary(target) and counts[target] == 1
+                        and isinstance(instruction.operands[0], str) and instruction.operands[0] != target):
+                    copies[target] = instruction.operands[0]
+                    sources.setdefault(instruction.operands[0], []).append(target)
+
+
+class DeadCodeElimination(IRPass):
+    """Drops computations into temporaries that nothing reads, unless they
+    may fail.
+    """
+
+    name = 'dead-code'
+
+    def run_function(self, function):
+        types = value_types(function, dominators(function))
+        used = {operand for block in function.blocks for instruction in block.instructions
+                for operand in instruction.variables()}
+        for block in function.blocks:
+            kept = [instruction for instruction in block.instructions
+                    if not (is_temporary(instruction.target) and instruction.target not in used
+                            and instruction.opcode in PURE_OPCODES | {'copy'} and not can_raise(instruction, types))]
+            self.changes += len(block.instructions) - len(kept)
+            block.instructions = kept
+
+
+# In the order they run; each round runs every enabled pass once.
+IR_PASSES = {
+    optimization.name: optimization
+    for optimization in (CopyPropagation, CommonSubexpressionElimination, LoopInvariantCodeMotion,
+                         StrengthReduction, DeadCodeElimination)
+}
+
+DEFAULT_IR_PASSES = tuple(IR_PASSES)
+
+
+class IROptimizer:
+    """Runs a pipeline of `IR_PASSES` over an IR function and the functions
+    it defines, in place, in rounds like optimizer.py's `Optimizer`.
+    """
+
+    def __init__(self, passes=DEFAULT_IR_PASSES, max_rounds=4):
+        unknown = [name for name in passes if name not in IR_PASSES]
+        if unknown:
+            raise ValueError(f'Unknown IR pass: {", ".join(unknown)}')
+        self.passes = [name for name in IR_PASSES if name in passes]
+        self.max_rounds = max_rounds
+        self.stats = {name: PassStats(name) for name in self.passes}
+        self.rounds = 0
+
+    def optimize(self, function):
+        for _ in range(self.max_rounds):
+            self.rounds += 1
+            changed = False
+            for name in self.passes:
+                optimization = IR_PASSES[name]()
+                start = time.perf_counter()
+                optimization.run(function)
+                stats = self.stats[name]
+                stats.seconds += time.perf_counter() - start
+                stats.runs += 1
+                stats.changes += optimization.changes
+                changed = changed or optimization.changes > 0
+            if not changed:
+                break
+        return function
+
+
+def optimize_ir(function, passes=DEFAULT_IR_PASSES, disabled=()):
+    """Optimize `function` in place with `passes` except `disabled`; return
+    the `IROptimizer`, for its stats.
+    """
+    unknown = [name for name in disabled if name not in IR_PASSES]
+    if unknown:
+        raise ValueError(f'Unknown IR pass: {", ".join(unknown)}')
+    optimizer = IROptimizer([name for name in passes if name not in disabled])
+    optimizer.optimize(function)
+    return optimizer
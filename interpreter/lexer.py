@@ -1,12 +1,33 @@
+import re
+import sys
+
+from lexer_tables import (
+    ACCEPTS, CHAR_CLASSES, CLASS_COUNT, LITERAL_TOKENS, OTHER_CLASS,
+    SKIP_TOKENS, START_STATE, TRANSITIONS,
+)
+
+
 class Token:
-    def __init__(self, type, value):
+    """A token and the [start, end) offsets of its text in the source."""
+    __slots__ = ('type', 'value', 'start', 'end')
+
+    def __init__(self, type, value, start=None, end=None):
         self.type = type
         self.value = value
+        self.start = start
+        self.end = end
+
+
+WHITESPACE = ' \t\n\r'
+DIGITS = '0123456789'
+WORD_START = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_'
+WORD_CHARS = WORD_START + DIGITS
 
 class Lexer:
-    def __init__(self, text):
+    def __init__(self, text, pos=0):
         self.text = text
-        self.pos = 0
+        self.pos = pos
+        self.token_start = pos
         self.current_char = self.text[self.pos] if self.pos < len(self.text) else None
 
     def error(self):
@@ -27,47 +48,63 @@ class Lexer:
             return None
 
     def skip_whitespace(self):
-        while self.current_char is not None and self.current_char.isspace():
+        while self.current_char is not None and self.current_char in WHITESPACE:
             self.advance()
 
     def skip_comment(self):
         while self.current_char is not None and self.current_char != '\n':
             self.advance()
-        self.advance()  # Skip the newline character
+        if self.current_char == '\n':
+            self.advance()
 
     def get_number(self):
         num = ''
-        while self.current_char is not None and self.current_char.isdigit():
+        while self.current_char is not None and self.current_char in DIGITS:
             num += self.current_char
             self.advance()
-        if self.current_char == '.':
+        if self.current_char == '.' and self.peek() is not None and self.peek() in DIGITS:
             num += '.'
             self.advance()
-            while self.current_char is not None and self.current_char.isdigit():
+            while self.current_char is not None and self.current_char in DIGITS:
                 num += self.current_char
                 self.advance()
         return float(num) if '.' in num else int(num)
 
     def get_word(self):
         word = ''
-        while self.current_char is not None and (self.current_char.isalnum() or self.current_char == '_'):
+        while self.current_char is not None and self.current_char in WORD_CHARS:
             word += self.current_char
             self.advance()
         return word
 
     def get_string(self):
+        quote = self.current_char
         string = ''
         self.advance()  # Skip the opening quote
-        while self.current_char is not None and self.current_char != '"':
+        while self.current_char is not None and self.current_char != quote:
+            if self.current_char == '\\':
+                string += self.current_char
+                self.advance()
+                if self.current_char is None:
+                    break
             string += self.current_char
             self.advance()
+        if self.current_char is None:
+            self.error()  # Unterminated literal
         self.advance()  # Skip the closing quote
         return string
 
     def get_next_token(self):
+        token = self.scan_token()
+        token.start = self.token_start
+        token.end = self.pos
+        return token
+
+    def scan_token(self):
         while self.current_char is not None:
+            self.token_start = self.pos
 
-            if self.current_char.isspace():
+            if self.current_char in WHITESPACE:
                 self.skip_whitespace()
                 continue
 
@@ -75,24 +112,40 @@ class Lexer:
                 self.skip_comment()
                 continue
 
-            if self.current_char.isdigit():
+            if self.current_char in DIGITS:
                 return Token('NUMBER', self.get_number())
 
-            if self.current_char.isalpha() or self.current_char == '_':
+            if self.current_char == '.':
+                if self.peek() is not None and self.peek() in DIGITS:
+                    return Token('NUMBER', self.get_number())
+                self.advance()
+                return Token('DOT', '.')
+
+            if self.current_char in WORD_START:
                 word = self.get_word()
-                if word in ['let', 'if', 'else', 'while', 'for', 'try', 'catch', 'function', 'return', 'print']:
-                    return Token(word.upper(), word)
-                return Token('WORD', word)
+                return Token(KEYWORDS.get(word, 'WORD'), word)
 
             if self.current_char == '"':
                 return Token('STRING', self.get_string())
 
+            if self.current_char == "'":
+                return Token('CHAR_LITERAL', self.get_string())
+
             if self.current_char == '+':
                 self.advance()
+                if self.current_char == '+':
+                    self.advance()
+                    return Token('INCREMENT', '++')
                 return Token('PLUS', '+')
 
             if self.current_char == '-':
                 self.advance()
+                if self.current_char == '-':
+                    self.advance()
+                    return Token('DECREMENT', '--')
+                if self.current_char == '>':
+                    self.advance()
+                    return Token('ARROW', '->')
                 return Token('MINUS', '-')
 
             if self.current_char == '*':
@@ -120,11 +173,19 @@ class Lexer:
 
             if self.current_char == '{':
                 self.advance()
-                return Token('LCURLY', '{')
+                return Token('LBRACE', '{')
 
             if self.current_char == '}':
                 self.advance()
-                return Token('RCURLY', '}')
+                return Token('RBRACE', '}')
+
+            if self.current_char == '[':
+                self.advance()
+                return Token('LBRACKET', '[')
+
+            if self.current_char == ']':
+                self.advance()
+                return Token('RBRACKET', ']')
 
             if self.current_char == '=':
                 self.advance()
@@ -176,6 +237,179 @@ class Lexer:
                 self.advance()
                 return Token('SEMICOLON', ';')
 
+            if self.current_char == ':':
+                self.advance()
+                return Token('COLON', ':')
+
             self.error()
 
+        self.token_start = self.pos
         return Token('EOF', None)
+
+
+# Keywords and operators come from the lexer rules of WordMaze.g4 (see
+# build_lexer_tables.py), so every lexer here accepts the same tokens.
+KEYWORDS = {text: sys.intern(kind) for text, kind in LITERAL_TOKENS.items() if text[0].isalpha()}
+
+OPERATORS = {text: sys.intern(kind) for text, kind in LITERAL_TOKENS.items() if not text[0].isalpha()}
+
+TRIVIA = r'(?:[ \t\n\r]+|\#[^\n]*|//[^\n]*)*'
+
+TRIVIA_PATTERN = re.compile(TRIVIA)
+
+# Whitespace and comments are folded into the prefix of the master pattern so
+# that every token costs exactly one match. Longer operators come before
+# their prefixes in the OPERATOR alternative, and NUMBER before OPERATOR so
+# that '.5' is a number rather than a DOT.
+TOKEN_PATTERN = re.compile(TRIVIA + r"""
+    (?:
+        (?P<WORD>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<NUMBER>[0-9]*\.[0-9]+|[0-9]+)
+      | (?P<OPERATOR>""" + '|'.join(re.escape(text) for text in sorted(OPERATORS, key=len, reverse=True)) + r""")
+      | (?P<STRING>"(?:[^"\\]|\\.)*")
+      | (?P<CHAR_LITERAL>'(?:[^'\\]|\\.)*')
+      | (?P<EOF>\Z)
+      | (?P<MISMATCH>.)
+    )
+""", re.VERBOSE | re.DOTALL)
+
+
+class RegexLexer:
+    """Drop-in replacement for `Lexer` that scans with a single precompiled
+    pattern instead of walking the source one character at a time.
+
+    It produces exactly the same `Token` stream (and the same errors) as
+    `Lexer`, but each token is one regex match plus a slice of the source.
+    """
+
+    def __init__(self, text, pos=0):
+        self.text = text
+        self.tokens = tokens_from_matches(TOKEN_PATTERN.finditer(text, pos))
+
+    def get_next_token(self):
+        return next(self.tokens)
+
+
+def tokens_from_matches(matches):
+    """Turn successive `TOKEN_PATTERN` matches into `Token` objects."""
+    end = 0
+    for match in matches:
+        kind = match.lastgroup
+        value = match.group(kind)
+        start, end = match.span(kind)
+
+        if kind == 'WORD':
+            yield Token(KEYWORDS.get(value, 'WORD'), value, start, end)
+
+        elif kind == 'OPERATOR':
+            yield Token(OPERATORS[value], value, start, end)
+
+        elif kind == 'NUMBER':
+            yield Token('NUMBER', float(value) if '.' in value else int(value), start, end)
+
+        elif kind == 'STRING' or kind == 'CHAR_LITERAL':
+            yield Token(kind, value[1:-1], start, end)
+
+        elif kind == 'MISMATCH':
+            raise lex_error(match)
+
+        else:
+            break
+
+    while True:
+        yield Token('EOF', None, end, end)
+
+
+def lex_error(match):
+    """Build the error `Lexer` raises for a MISMATCH match.
+
+    Like the other lexers, it names the character at which no token could be
+    continued: the one after a lone '&' or '|', and the end of input (None)
+    for an unterminated string or character literal.
+    """
+    value = match.group('MISMATCH')
+    if value in '&|':
+        text = match.string
+        end = match.end()
+        value = text[end] if end < len(text) else None
+    elif value in '"\'':
+        value = None
+    return Exception(f'Invalid character: {value}')
+
+
+# The generated DFA, flattened so that one step is a single tuple index:
+# states are premultiplied by CLASS_COUNT and character classes are added on.
+TABLE_STEPS = tuple(target * CLASS_COUNT for row in TRANSITIONS for target in row)
+TABLE_ACCEPTS = tuple(accept for accept in ACCEPTS for _ in range(CLASS_COUNT))
+TABLE_START = START_STATE * CLASS_COUNT
+
+
+class CharClassMap(dict):
+    def __missing__(self, code):
+        return OTHER_CLASS_CHAR
+
+
+OTHER_CLASS_CHAR = chr(OTHER_CLASS)
+CHAR_CLASS_MAP = CharClassMap((code, chr(char_class)) for code, char_class in enumerate(CHAR_CLASSES))
+
+
+class TableLexer:
+    """Lexer that runs the DFA generated from WordMaze.g4 by
+    build_lexer_tables.py: one table lookup per character, longest match,
+    ties broken by rule order in the grammar.
+    """
+
+    def __init__(self, text, pos=0):
+        self.text = text
+        self.classes = text.translate(CHAR_CLASS_MAP).encode('ascii')
+        self.pos = pos
+
+    def get_next_token(self):
+        text = self.text
+        classes = self.classes
+        length = len(text)
+        pos = self.pos
+        while pos < length:
+            state = TABLE_START
+            token_type = None
+            token_end = i = pos
+            while i < length:
+                state = TABLE_STEPS[state + classes[i]]
+                if not state:
+                    break
+                i += 1
+                if TABLE_ACCEPTS[state] is not None:
+                    token_type = TABLE_ACCEPTS[state]
+                    token_end = i
+            if token_type is None:
+                raise Exception(f'Invalid character: {text[i] if i < length else None}')
+
+            start = pos
+            pos = token_end
+            if token_type in SKIP_TOKENS:
+                continue
+            self.pos = pos
+            value = text[start:pos]
+            if token_type == 'NUMBER':
+                return Token('NUMBER', float(value) if '.' in value else int(value), start, pos)
+            if token_type == 'STRING' or token_type == 'CHAR_LITERAL':
+                return Token(token_type, value[1:-1], start, pos)
+            return Token(token_type, value, start, pos)
+
+        self.pos = pos
+        return Token('EOF', None, pos, pos)
+
+
+LEXER_ENGINES = {
+    'classic': Lexer,
+    'regex': RegexLexer,
+    'table': TableLexer,
+}
+
+
+def create_lexer(text, engine='classic', pos=0):
+    try:
+        lexer_class = LEXER_ENGINES[engine]
+    except KeyError:
+        raise ValueError(f'Unknown lexer engine: {engine}') from None
+    return lexer_class(text, pos)
@@ -0,0 +1,333 @@
+import math
+import time
+
+import traversal
+from ast_nodes import ASTNode, IfNode, LiteralNode, ReturnNode, VariableNode, iter_fields
+from resolver import local_names
+from runtime import BINARY_OPERATORS, UNARY_OPERATORS
+
+
+# Folding never builds a string longer than this, so that `"ab" * 100000`
+# stays a small tree.
+MAX_FOLDED_LENGTH = 4096
+
+# Values a literal can hold; all immutable, so they can be copied freely.
+CONSTANT_TYPES = (bool, int, float, str, type(None))
+
+
+def literal(value, node):
+    """A `LiteralNode` for `value` with the span of the `node` it replaces."""
+    replacement = LiteralNode(value)
+    replacement.base = node.base
+    replacement.relative_start = node.relative_start
+    replacement.relative_end = node.relative_end
+    return replacement
+
+
+def is_constant(node):
+    return isinstance(node, LiteralNode) and isinstance(node.value, CONSTANT_TYPES)
+
+
+def always_returns(statements):
+    """Whether running `statements` certainly ends in a `return`."""
+    for statement in statements:
+        if isinstance(statement, ReturnNode):
+            return True
+        if (isinstance(statement, IfNode) and statement.else_body
+                and always_returns(statement.then_body) and always_returns(statement.else_body)):
+            return True
+    return False
+
+
+class OptimizationPass:
+    """A rewrite of the tree that keeps what the program does.
+
+    Passes change the tree in place and count their rewrites in `changes`.
+    The default traversal rebuilds every node bottom-up: a
+    `transform_<ClassName>` method returns the replacement for a node whose
+    children are already transformed, and in statement lists that may be a
+    list of statements to splice in, or None to drop the statement.
+    `transform` and `transform_list` yield what they descend into to
+    traversal.py's `run`, so trees of any depth can be optimized.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.changes = 0
+
+    def run(self, program):
+        program.statements = traversal.run(self.transform_list(program.statements), self.transform)
+
+    def transform(self, node):
+        for name, value in list(iter_fields(node)):
+            if isinstance(value, ASTNode):
+                setattr(node, name, (yield value))
+            elif isinstance(value, list):
+                setattr(node, name, (yield self.transform_list(value)))
+        method = getattr(self, 'transform_' + type(node).__name__, None)
+        return node if method is None else method(node)
+
+    def transform_list(self, nodes):
+        transformed = []
+        for node in nodes:
+            if not isinstance(node, ASTNode):
+                transformed.append(node)
+                continue
+            replacement = yield node
+            if isinstance(replacement, list):
+                transformed.extend(replacement)
+            elif replacement is not None:
+                transformed.append(replacement)
+        return transformed
+
+
+class ConstantFolding(OptimizationPass):
+    """Evaluates operators whose operands are literals: `5 + 3 * 2` is `11`.
+
+    Operations that fail (`1 / 0`) are left for the program to fail on.
+    """
+
+    name = 'fold'
+
+    def fold(self, node, compute):
+        try:
+            value = compute()
+        except Exception:
+            return node
+        if isinstance(value, str) and len(value) > MAX_FOLDED_LENGTH:
+            return node
+        # inf and nan have no literal to write them back as.
+        if isinstance(value, float) and not math.isfinite(value):
+            return node
+        self.changes += 1
+        return literal(value, node)
+
+    def transform_BinaryOpNode(self, node):
+        left, right = node.left, node.right
+        if node.operator in ('&&', '||'):
+            if not is_constant(left):
+                return node
+            # `false && x` and `true || x` never look at x.
+            if bool(left.value) == (node.operator == '||'):
+                return self.fold(node, lambda: bool(left.value))
+            if is_constant(right):
+                return self.fold(node, lambda: bool(right.value))
+            return node
+        if is_constant(left) and is_constant(right):
+            operation = BINARY_OPERATORS[node.operator]
+            return self.fold(node, lambda: operation(left.value, right.value))
+        return node
+
+    def transform_UnaryOpNode(self, node):
+        if is_constant(node.operand):
+            operation = UNARY_OPERATORS[node.operator]
+            return self.fold(node, lambda: operation(node.operand.value))
+        return node
+
+
+class ConstantPropagation(OptimizationPass):
+    """Replaces reads of a variable whose value is a known literal:
+    `let x = 5; print x * 2;` prints `5 * 2`, which folding then finishes.
+
+    What is known flows through each scope in statement order. Assignments
+    a loop or a try/catch makes are forgotten before it, those only one
+    branch of an `if` makes after it. Calls cannot change the caller's
+    variables (a function's `let` binds its own locals), but a function
+    body starts knowing nothing, since the globals it reads may have
+    changed by the time it is called.
+    """
+
+    name = 'propagate'
+
+    def run(self, program):
+        traversal.run(self.block(program.statements, {}), None)
+
+    def block(self, statements, known):
+        for statement in statements:
+            yield self.statement(statement, known)
+        return known
+
+    def forget(self, known, statements):
+        for name in local_names((), statements):
+            known.pop(name, None)
+
+    def statement(self, node, known):
+        method = getattr(self, 'statement_' + type(node).__name__)
+        return method(node, known)
+
+    def statement_AssignmentNode(self, node, known):
+        node.value = yield self.expression(node.value, known)
+        if is_constant(node.value):
+            known[node.target] = node.value.value
+        else:
+            known.pop(node.target, None)
+
+    def statement_PrintNode(self, node, known):
+        node.expression = yield self.expression(node.expression, known)
+
+    def statement_ReturnNode(self, node, known):
+        if node.value is not None:
+            node.value = yield self.expression(node.value, known)
+
+    def statement_FunctionDefinitionNode(self, node, known):
+        yield self.block(node.body, {})
+        known.pop(node.function_name, None)
+
+    def statement_IfNode(self, node, known):
+        node.condition = yield self.expression(node.condition, known)
+        then_known = yield self.block(node.then_body, dict(known))
+        else_known = yield self.block(node.else_body, dict(known))
+        known.clear()
+        for name, value in then_known.items():
+            if name in else_known and same_constant(value, else_known[name]):
+                known[name] = value
+
+    def statement_WhileNode(self, node, known):
+        self.forget(known, node.body)
+        node.condition = yield self.expression(node.condition, known)
+        yield self.block(node.body, dict(known))
+
+    def statement_ForNode(self, node, known):
+        yield self.statement(node.init, known)
+        self.forget(known, node.body + [node.increment])
+        node.condition = yield self.expression(node.condition, known)
+        body_known = yield self.block(node.body, dict(known))
+        yield self.statement(node.increment, body_known)
+
+    def statement_TryCatchNode(self, node, known):
+        yield self.block(node.try_body, dict(known))
+        self.forget(known, node.try_body)
+        yield self.block(node.catch_body, dict(known))
+        self.forget(known, node.catch_body)
+
+    def expression(self, node, known):
+        if isinstance(node, VariableNode):
+            if node.name in known:
+                self.changes += 1
+                return literal(known[node.name], node)
+            return node
+        for name, value in list(iter_fields(node)):
+            if isinstance(value, ASTNode):
+                setattr(node, name, (yield self.expression(value, known)))
+            elif isinstance(value, list):
+                items = []
+                for item in value:
+                    items.append((yield self.expression(item, known)))
+                setattr(node, name, items)
+        return node
+
+
+def same_constant(a, b):
+    # 1, 1.0 and true are equal but print differently.
+    return type(a) is type(b) and a == b
+
+
+class DeadBranchElimination(OptimizationPass):
+    """Keeps only the branch an `if` with a literal condition takes, and
+    drops loops whose condition is a false literal.
+    """
+
+    name = 'dead-branches'
+
+    def transform_IfNode(self, node):
+        if not is_constant(node.condition):
+            return node
+        self.changes += 1
+        return node.then_body if node.condition.value else node.else_body
+
+    def transform_WhileNode(self, node):
+        if not is_constant(node.condition) or node.condition.value:
+            return node
+        self.changes += 1
+        return None
+
+    def transform_ForNode(self, node):
+        if not is_constant(node.condition) or node.condition.value:
+            return node
+        self.changes += 1
+        return [node.init]
+
+
+class UnreachableCodeElimination(OptimizationPass):
+    """Drops the statements after a `return`, or after an `if` that returns
+    in both branches.
+    """
+
+    name = 'unreachable'
+
+    def transform_list(self, nodes):
+        nodes = yield from super().transform_list(nodes)
+        for index, node in enumerate(nodes):
+            if index + 1 < len(nodes) and always_returns([node]):
+                self.changes += len(nodes) - index - 1
+                return nodes[:index + 1]
+        return nodes
+
+
+# In the order they run; each round runs every enabled pass once.
+PASSES = {
+    optimization.name: optimization
+    for optimization in (ConstantPropagation, ConstantFolding, DeadBranchElimination, UnreachableCodeElimination)
+}
+
+DEFAULT_PASSES = tuple(PASSES)
+
+
+class PassStats:
+    def __init__(self, name):
+        self.name = name
+        self.runs = 0
+        self.changes = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return f'<{self.name}: {self.changes} changes in {self.runs} runs, {self.seconds * 1000:.2f} ms>'
+
+
+class Optimizer:
+    """Runs a pipeline of `PASSES` over a tree, in place.
+
+    Passes feed each other (propagating a constant lets it fold, folding a
+    condition lets its dead branch go), so the pipeline runs in rounds until
+    a round changes nothing, or `max_rounds` is reached. `stats` has a
+    `PassStats` per enabled pass.
+    """
+
+    def __init__(self, passes=DEFAULT_PASSES, max_rounds=8):
+        unknown = [name for name in passes if name not in PASSES]
+        if unknown:
+            raise ValueError(f'Unknown optimization pass: {", ".join(unknown)}')
+        self.passes = [name for name in PASSES if name in passes]
+        self.max_rounds = max_rounds
+        self.stats = {name: PassStats(name) for name in self.passes}
+        self.rounds = 0
+
+    def optimize(self, program):
+        for _ in range(self.max_rounds):
+            self.rounds += 1
+            changed = False
+            for name in self.passes:
+                optimization = PASSES[name]()
+                start = time.perf_counter()
+                optimization.run(program)
+                stats = self.stats[name]
+                stats.seconds += time.perf_counter() - start
+                stats.runs += 1
+                stats.changes += optimization.changes
+                changed = changed or optimization.changes > 0
+            if not changed:
+                break
+        return program
+
+
+def optimize(program, passes=DEFAULT_PASSES, disabled=()):
+    """Optimize `program` in place with `passes` except `disabled`; return
+    the `Optimizer`, for its stats.
+    """
+    unknown = [name for name in disabled if name not in PASSES]
+    if unknown:
+        raise ValueError(f'Unknown optimization pass: {", ".join(unknown)}')
+    optimizer = Optimizer([name for name in passes if name not in disabled])
+    optimizer.optimize(program)
+    return optimizer
@@ -0,0 +1,176 @@
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+from contextlib import contextmanager
+
+from lexer import RegexLexer
+from parser import PARSER_VERSION, Parser
+
+
+DEFAULT_CACHE_DIR = '__wmzlcache__'
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+ENTRY_SUFFIX = '.ast'
+
+
+@contextmanager
+def collection_paused():
+    """Keep the cyclic garbage collector out of bulk (un)pickling.
+
+    A tree is tens of thousands of fresh objects, which would otherwise
+    trigger many full collections that can find no garbage; pausing them
+    more than halves the load time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ParseCache:
+    """On-disk cache of parsed programs, the `__pycache__` of .wmzl files.
+
+    Entries are pickled `ProgramNode` trees named after the SHA-256 of the
+    source bytes and `PARSER_VERSION`, so a changed file or a new parser
+    simply misses and stale entries age out. Entries are written to a
+    temporary file and renamed into place, so a reader never sees half an
+    entry. When the directory grows past `max_bytes`, the least recently used
+    entries (by modification time, which a hit refreshes) are deleted.
+
+    Subclasses cache something else derived from the source by overriding
+    `build`, `read` and `write`, and `tag` and `suffix` to keep their
+    entries apart.
+    """
+
+    tag = 'wordmaze-parser'
+    suffix = ENTRY_SUFFIX
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 lexer_class=RegexLexer, version=PARSER_VERSION):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lexer_class = lexer_class
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, data):
+        digest = hashlib.sha256(f'{self.tag}-{self.version}\0'.encode('ascii'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def parse(self, text):
+        """Return the tree for source `text`, parsing it only on a miss."""
+        return self.parse_bytes(text.encode('utf-8'), text)
+
+    def parse_file(self, path, encoding='utf-8'):
+        """Return the tree for the file at `path`.
+
+        A hit only reads and hashes the file; it is not even decoded.
+        """
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        return self.parse_bytes(data, encoding=encoding)
+
+    def parse_bytes(self, data, text=None, encoding='utf-8'):
+        key = self.key(data)
+        program = self.load(key)
+        if program is not None:
+            self.hits += 1
+            return program
+
+        self.misses += 1
+        if text is None:
+            text = data.decode(encoding)
+        program = self.build(text)
+        try:
+            self.store(key, program)
+        except (OSError, RecursionError):
+            # Caching is best effort: a read-only directory or a tree too
+            # deep to pickle only costs the next run a parse.
+            pass
+        return program
+
+    def build(self, text):
+        return Parser(self.lexer_class(text)).parse()
+
+    def read(self, handle):
+        return pickle.load(handle)
+
+    def write(self, value, handle):
+        pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, key):
+        path = self.entry_path(key)
+        try:
+            with open(path, 'rb') as handle, collection_paused():
+                program = self.read(handle)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A damaged entry is a miss; the next store replaces it.
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return program
+
+    def store(self, key, program):
+        os.makedirs(self.directory, exist_ok=True)
+        handle = tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False)
+        try:
+            with handle, collection_paused():
+                self.write(program, handle)
+            os.replace(handle.name, self.entry_path(key))
+        except BaseException:
+            os.remove(handle.name)
+            raise
+        self.evict()
+
+    def entries(self):
+        """Return (mtime, size, path) for every entry, oldest first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if name.endswith(self.suffix):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -1,23 +1,100 @@
+import re
+
+from ast_nodes import (
+    ArrayAccessNode, AssignmentNode, BinaryOpNode, ForNode, FunctionCallNode,
+    FunctionDefinitionNode, IfNode, LiteralNode, PrintNode, ProgramNode,
+    ReturnNode, SourceOffset, TryCatchNode, UnaryOpNode, VariableNode, WhileNode,
+)
+from token_stream import TokenStream
+
+
+# Bump whenever the trees `Parser` builds change shape, so that cached trees
+# from older parsers (see parse_cache.py) are no longer used.
+PARSER_VERSION = 2
+
+# Escape sequences in string and character literals; any other escaped
+# character stands for itself.
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0'}
+ESCAPE_PATTERN = re.compile(r'\\(.)', re.DOTALL)
+
+
+def unescape(text):
+    if '\\' not in text:
+        return text
+    return ESCAPE_PATTERN.sub(lambda match: ESCAPES.get(match.group(1), match.group(1)), text)
+
+
+# Binding power of every binary operator token; higher binds tighter and all
+# operators are left-associative.
+BINARY_PRECEDENCE = {
+    'OR': 1,
+    'AND': 2,
+    'EQUALS_EQUALS': 3,
+    'NOT_EQUALS': 3,
+    'LESS_THAN': 4,
+    'LESS_THAN_EQUALS': 4,
+    'GREATER_THAN': 4,
+    'GREATER_THAN_EQUALS': 4,
+    'PLUS': 5,
+    'MINUS': 5,
+    'MULTIPLY': 6,
+    'DIVIDE': 6,
+    'MODULO': 6,
+}
+
 class Parser:
     def __init__(self, lexer):
         self.lexer = lexer
-        self.current_token = self.lexer.get_next_token()
+        self.tokens = TokenStream(lexer)
+        self.current_token = self.tokens.get_next_token()
+        # End offset of the last token eaten; nodes end there.
+        self.previous_end = self.current_token.start
+        # Node spans are relative to this (see SourceOffset); every
+        # top-level statement gets its own.
+        self.base = SourceOffset()
 
     def error(self):
         raise Exception(f'Invalid syntax with token {self.current_token.type} ({self.current_token.value})')
 
     def eat(self, token_type):
         if self.current_token.type == token_type:
-            self.current_token = self.lexer.get_next_token()
+            self.previous_end = self.current_token.end
+            self.current_token = self.tokens.get_next_token()
         else:
             self.error()
 
+    def finish(self, node, start):
+        """Give `node` the source span from `start` to the last token eaten."""
+        node.base = self.base
+        node.relative_start = start
+        node.relative_end = self.previous_end
+        return node
+
     def parse(self):
-        return ProgramNode(self.parse_statements())
+        start = self.current_token.start
+        program = ProgramNode(list(self.iter_statements()))
+        program.start = start
+        program.end = self.previous_end
+        return program
+
+    def iter_statements(self):
+        """Yield each top-level statement as soon as it has been parsed.
+
+        Nothing is kept once a statement is handed out, so together with a
+        `StreamLexer` a consumer can run through a program of any size in
+        constant memory. A syntax error is raised when the generator reaches
+        it, after the statements before it have been yielded.
+        """
+        while self.current_token.type != 'EOF':
+            yield self.parse_top_level_statement()
+
+    def parse_top_level_statement(self):
+        self.base = SourceOffset()
+        return self.parse_statement()
 
     def parse_statements(self):
         statements = []
-        while self.current_token.type != 'EOF':
+        while self.current_token.type not in ('EOF', 'RBRACE'):
             statements.append(self.parse_statement())
         return statements
 
@@ -52,15 +129,17 @@ class Parser:
             self.error()
 
     def parse_assignment(self):
+        start = self.current_token.start
         self.eat('LET')
         variable_name = self.current_token.value
         self.eat('WORD')
         self.eat('EQUALS')
         expression = self.parse_expression()
         self.eat('SEMICOLON')
-        return AssignmentNode(variable_name, expression)
+        return self.finish(AssignmentNode(variable_name, expression), start)
 
     def parse_if(self):
+        start = self.current_token.start
         self.eat('IF')
         self.eat('LPAREN')
         condition = self.parse_expression()
@@ -76,9 +155,10 @@ class Parser:
             else_body = self.parse_statements()
             self.eat('RBRACE')
 
-        return IfNode(condition, then_body, else_body)
+        return self.finish(IfNode(condition, then_body, else_body), start)
 
     def parse_while(self):
+        start = self.current_token.start
         self.eat('WHILE')
         self.eat('LPAREN')
         condition = self.parse_expression()
@@ -86,9 +166,10 @@ class Parser:
         self.eat('LBRACE')
         body = self.parse_statements()
         self.eat('RBRACE')
-        return WhileNode(condition, body)
+        return self.finish(WhileNode(condition, body), start)
 
     def parse_for(self):
+        start = self.current_token.start
         self.eat('FOR')
         self.eat('LPAREN')
         init_statement = self.parse_assignment()
@@ -99,15 +180,17 @@ class Parser:
         self.eat('LBRACE')
         body = self.parse_statements()
         self.eat('RBRACE')
-        return ForNode(init_statement, condition, increment_statement, body)
+        return self.finish(ForNode(init_statement, condition, increment_statement, body), start)
 
     def parse_print(self):
+        start = self.current_token.start
         self.eat('PRINT')
         expression = self.parse_expression()
         self.eat('SEMICOLON')
-        return PrintNode(expression)
+        return self.finish(PrintNode(expression), start)
 
     def parse_try_catch(self):
+        start = self.current_token.start
         self.eat('TRY')
         self.eat('LBRACE')
         try_statements = self.parse_statements()
@@ -116,9 +199,10 @@ class Parser:
         self.eat('LBRACE')
         catch_statements = self.parse_statements()
         self.eat('RBRACE')
-        return TryCatchNode(try_statements, catch_statements)
+        return self.finish(TryCatchNode(try_statements, catch_statements), start)
 
     def parse_function_definition(self):
+        start = self.current_token.start
         self.eat('FUNCTION')
         function_name = self.current_token.value
         self.eat('WORD')
@@ -135,121 +219,94 @@ class Parser:
         self.eat('LBRACE')
         body = self.parse_statements()
         self.eat('RBRACE')
-        return FunctionDefinitionNode(function_name, parameters, body)
+        return self.finish(FunctionDefinitionNode(function_name, parameters, body), start)
 
     def parse_return(self):
+        start = self.current_token.start
         self.eat('RETURN')
-        expression = self.parse_expression()
+        expression = None if self.current_token.type == 'SEMICOLON' else self.parse_expression()
         self.eat('SEMICOLON')
-        return ReturnNode(expression)
+        return self.finish(ReturnNode(expression), start)
 
     def parse_expression(self):
-        return self.parse_logical_or()
-
-    def parse_logical_or(self):
-        node = self.parse_logical_and()
-
-        while self.current_token.type == 'OR':
-            token = self.current_token
-            self.eat('OR')
-            node = BinaryOpNode(node, token.value, self.parse_logical_and())
-
-        return node
-
-    def parse_logical_and(self):
-        node = self.parse_equality()
-
-        while self.current_token.type == 'AND':
-            token = self.current_token
-            self.eat('AND')
-            node = BinaryOpNode(node, token.value, self.parse_equality())
-
-        return node
-
-    def parse_equality(self):
-        node = self.parse_comparison()
-
-        while self.current_token.type in ['EQUALS_EQUALS', 'NOT_EQUALS']:
-            token = self.current_token
-            if token.type == 'EQUALS_EQUALS':
-                self.eat('EQUALS_EQUALS')
-            elif token.type == 'NOT_EQUALS':
-                self.eat('NOT_EQUALS')
-            node = BinaryOpNode(node, token.value, self.parse_comparison())
+        return self.parse_binary(self.parse_primary(), 1)
 
-        return node
-
-    def parse_comparison(self):
-        node = self.parse_term()
-
-        while self.current_token.type in ['LESS_THAN', 'GREATER_THAN']:
-            token = self.current_token
-            if token.type == 'LESS_THAN':
-                self.eat('LESS_THAN')
-            elif token.type == 'GREATER_THAN':
-                self.eat('GREATER_THAN')
-            node = BinaryOpNode(node, token.value, self.parse_term())
-
-        return node
-
-    def parse_term(self):
-        node = self.parse_factor()
-
-        while self.current_token.type in ['PLUS', 'MINUS']:
-            token = self.current_token
-            if token.type == 'PLUS':
-                self.eat('PLUS')
-            elif token.type == 'MINUS':
-                self.eat('MINUS')
-            node = BinaryOpNode(node, token.value, self.parse_factor())
-
-        return node
-
-    def parse_factor(self):
-        node = self.parse_primary()
-
-        while self.current_token.type in ['MULTIPLY', 'DIVIDE']:
+    def parse_binary(self, left, min_precedence):
+        # Precedence climbing over BINARY_PRECEDENCE: operators of equal
+        # precedence are folded left-to-right in this loop, and it only
+        # recurses when the next operator binds tighter, so an operand costs
+        # one parse_primary() call instead of a trip down every level.
+        token = self.current_token
+        precedence = BINARY_PRECEDENCE.get(token.type)
+
+        while precedence is not None and precedence >= min_precedence:
+            self.current_token = self.tokens.get_next_token()
+            right = self.parse_primary()
+            next_precedence = BINARY_PRECEDENCE.get(self.current_token.type)
+            while next_precedence is not None and next_precedence > precedence:
+                right = self.parse_binary(right, next_precedence)
+                next_precedence = BINARY_PRECEDENCE.get(self.current_token.type)
+            node = BinaryOpNode(left, token.value, right)
+            node.base = self.base
+            node.relative_start = left.relative_start
+            node.relative_end = right.relative_end
+            left = node
             token = self.current_token
-            if token.type == 'MULTIPLY':
-                self.eat('MULTIPLY')
-            elif token.type == 'DIVIDE':
-                self.eat('DIVIDE')
-            node = BinaryOpNode(node, token.value, self.parse_primary())
+            precedence = next_precedence
 
-        return node
+        return left
 
     def parse_primary(self):
         token = self.current_token
 
         if token.type == 'NUMBER':
             self.eat('NUMBER')
-            return LiteralNode(token.value)
+            return self.finish(LiteralNode(token.value), token.start)
+
+        elif token.type == 'STRING' or token.type == 'CHAR_LITERAL':
+            self.eat(token.type)
+            return self.finish(LiteralNode(unescape(token.value)), token.start)
+
+        elif token.type == 'TRUE' or token.type == 'FALSE':
+            self.eat(token.type)
+            return self.finish(LiteralNode(token.type == 'TRUE'), token.start)
 
         elif token.type == 'WORD':
             identifier = token.value
-            if self.peek_token().type == 'LPAREN':
+            next_type = self.peek_token().type
+            if next_type == 'LPAREN':
                 return self.parse_function_call(identifier)
-            elif self.peek_token().type == 'LBRACKET':
+            elif next_type == 'LBRACKET':
                 return self.parse_array_access(identifier)
             else:
                 self.eat('WORD')
-                return VariableNode(identifier)
+                return self.finish(VariableNode(identifier), token.start)
+
+        elif (token.type == 'INT' or token.type == 'FLOAT') and self.peek_token().type == 'LPAREN':
+            # The type keywords double as the names of the conversion builtins.
+            return self.parse_function_call(token.value)
 
         elif token.type == 'MINUS':
             self.eat('MINUS')
-            return UnaryOpNode('-', self.parse_primary())
+            return self.finish(UnaryOpNode('-', self.parse_primary()), token.start)
+
+        elif token.type == 'NOT':
+            self.eat('NOT')
+            return self.finish(UnaryOpNode('!', self.parse_primary()), token.start)
 
         elif token.type == 'LPAREN':
             self.eat('LPAREN')
             node = self.parse_expression()
             self.eat('RPAREN')
-            return node
+            # The parentheses belong to the span, so enclosing spans cover them.
+            return self.finish(node, token.start)
 
         else:
             self.error()
 
     def parse_function_call(self, identifier):
-        self.eat('WORD')
+        start = self.current_token.start
+        self.eat(self.current_token.type)
         self.eat('LPAREN')
         arguments = []
         if self.current_token.type != 'RPAREN':
@@ -258,14 +315,15 @@ class Parser:
                 self.eat('COMMA')
                 arguments.append(self.parse_expression())
         self.eat('RPAREN')
-        return FunctionCallNode(identifier, arguments)
+        return self.finish(FunctionCallNode(identifier, arguments), start)
 
     def parse_array_access(self, identifier):
+        start = self.current_token.start
         self.eat('WORD')
         self.eat('LBRACKET')
         index = self.parse_expression()
         self.eat('RBRACKET')
-        return ArrayAccessNode(identifier, index)
+        return self.finish(ArrayAccessNode(identifier, index), start)
 
-    def peek_token(self):
-        return self.lexer.peek_token()
+    def peek_token(self, k=1):
+        return self.tokens.peek(k)
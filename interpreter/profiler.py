@@ -0,0 +1,375 @@
+"""Profile WordMaze programs in terms of their own code: nodes, source lines
+and functions, rather than the `visit_*` methods that run them.
+
+`profile()` traces a run on the tree-walking engine: it counts every node
+evaluated and times it, inclusive of the nodes below it and exclusive of
+them. That makes the run several times slower. `sample()` instead
+looks at the Python stack of the running program every `interval`
+seconds from another thread, and maps the frames of the engine back to
+the nodes and functions they are running. That costs the program next to
+nothing, on the tree engine (nodes, lines and functions) or the closure
+engine (functions only).
+
+Either way the result is a `Profile`, which renders a report, collapsed
+stacks for flamegraph tools and JSON.
+
+Usage: python profiler.py [--sample] [--engine E] [--collapsed FILE] [--json FILE] script.wmzl
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+from ast_nodes import ProgramNode
+from closure_compiler import ClosureCompiler
+from interpreter import Interpreter, run_program
+from lexer import RegexLexer
+from parser import Parser
+from project import line_and_column, line_starts
+from runtime import Function
+
+
+PROGRAM = '<program>'
+
+# Seconds between samples: rare enough for the sampler to cost well
+# under 1% of the run, often enough for a run of a second or two.
+SAMPLE_INTERVAL = 0.005
+
+
+class Stats:
+    """How often something ran, and the time (or samples) spent in it,
+    with and without what it ran in turn. A line runs each time evaluation
+    moves onto it from another line. A recursive function or line counts
+    each stretch of time once in `inclusive`.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.inclusive = 0
+        self.exclusive = 0
+
+    def as_json(self):
+        return {'count': self.count, 'inclusive': self.inclusive, 'exclusive': self.exclusive}
+
+
+class NodeStats(Stats):
+    def __init__(self, node, line, column):
+        super().__init__()
+        self.node = node
+        self.line = line
+        self.column = column
+
+    def as_json(self):
+        return {'type': type(self.node).__name__, 'line': self.line, 'column': self.column, **super().as_json()}
+
+
+class Profile:
+    """What a profiled run spent, in `unit`: 'seconds' for traced runs,
+    'samples' for sampled ones, which do not know counts and leave them 0.
+
+    `nodes` maps the ids of the nodes that ran to their `NodeStats`,
+    `lines` and `functions` line numbers and names to `Stats`, and `stacks`
+    each chain of active functions, outermost first, to the exclusive time
+    spent in it. Lines are only known when the profile is given the
+    program's `source`.
+    """
+
+    def __init__(self, unit, source=None):
+        self.unit = unit
+        self.starts = line_starts(source) if source is not None else None
+        self.nodes = {}
+        self.lines = {}
+        self.functions = {}
+        self.stacks = {}
+
+    def node_stats(self, node):
+        stats = self.nodes.get(id(node))
+        if stats is None:
+            line = column = None
+            # The program's span starts on the first line, but is no more on it.
+            if self.starts is not None and node.start is not None and not isinstance(node, ProgramNode):
+                line, column = line_and_column(self.starts, node.start)
+            stats = self.nodes[id(node)] = NodeStats(node, line, column)
+        return stats
+
+    def line_stats(self, line):
+        stats = self.lines.get(line)
+        if stats is None:
+            stats = self.lines[line] = Stats()
+        return stats
+
+    def function_stats(self, name):
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = self.functions[name] = Stats()
+        return stats
+
+    def add_sample(self, nodes, functions):
+        """Count a sample of a run inside `nodes` and `functions`, outermost
+        first.
+        """
+        stack = (PROGRAM, *functions)
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        for name in set(stack):
+            self.function_stats(name).inclusive += 1
+        self.function_stats(stack[-1]).exclusive += 1
+        if not nodes:
+            return
+        for node in set(nodes):
+            self.node_stats(node).inclusive += 1
+        leaf = self.node_stats(nodes[-1])
+        leaf.exclusive += 1
+        lines = {self.node_stats(node).line for node in nodes} - {None}
+        for line in lines:
+            self.line_stats(line).inclusive += 1
+        if leaf.line is not None:
+            self.line_stats(leaf.line).exclusive += 1
+
+    def collapsed(self):
+        """The stacks in the collapsed format of flamegraph.pl and its
+        kin: `outer;inner value` per line, in microseconds or samples.
+        """
+        scale = 1e6 if self.unit == 'seconds' else 1
+        lines = []
+        for stack, value in sorted(self.stacks.items()):
+            value = round(value * scale)
+            if value > 0:
+                lines.append(f'{";".join(stack)} {value}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def as_json(self):
+        nodes = sorted(self.nodes.values(), key=lambda stats: -stats.exclusive)
+        return {
+            'unit': self.unit,
+            'functions': {name: stats.as_json() for name, stats in self.functions.items()},
+            'lines': {str(line): stats.as_json() for line, stats in sorted(self.lines.items())},
+            'nodes': [stats.as_json() for stats in nodes],
+            'stacks': [{'stack': list(stack), 'exclusive': value} for stack, value in self.stacks.items()],
+        }
+
+    def report(self, limit=10):
+        """The functions and lines with the most exclusive time, as text."""
+        sections = []
+        for title, table in [('function', self.functions), ('line', self.lines)]:
+            if not table:
+                continue
+            rows = sorted(table.items(), key=lambda item: -item[1].exclusive)[:limit]
+            total = sum(stats.exclusive for stats in table.values()) or 1
+            lines = [f'{title:<24} {"count":>9} {"inclusive":>12} {"exclusive":>12}      ({self.unit})']
+            for key, stats in rows:
+                lines.append(f'{key!s:<24} {stats.count:>9} {format_amount(stats.inclusive):>12} '
+                             f'{format_amount(stats.exclusive):>12} {stats.exclusive / total:6.1%}')
+            sections.append('\n'.join(lines))
+        return '\n\n'.join(sections)
+
+
+def format_amount(value):
+    return f'{value:.6f}' if isinstance(value, float) else str(value)
+
+
+class ProfilingInterpreter(Interpreter):
+    """An `Interpreter` timing every node it evaluates into a `Profile`.
+
+    Quickened operations would read their operands without visiting them,
+    hiding those from the profile, so none are. The nodes of a deep
+    expression below its top one are stepped rather than visited: their
+    time is that of the top node.
+    """
+
+    quicken_after = None
+
+    def __init__(self, parser, output=None, profile=None):
+        super().__init__(parser, output)
+        self.profile = profile if profile is not None else Profile('seconds')
+        # The time the nodes below the one being evaluated have taken so far.
+        self.below = 0.0
+        self.stack = (PROGRAM,)
+        self.line = None
+        # The lines under way and how many calls of each function are, to
+        # count recursion into them once in `inclusive`.
+        self.active_lines = set()
+        self.active_functions = {PROGRAM: 1}
+
+    def visit(self, node):
+        stats = self.profile.node_stats(node)
+        line = stats.line
+        saved_line = self.line
+        entered = line is not None and line != saved_line
+        outermost = entered and line not in self.active_lines
+        if entered:
+            self.line = line
+            if outermost:
+                self.active_lines.add(line)
+        saved_below = self.below
+        self.below = 0.0
+        start = time.perf_counter()
+        try:
+            return getattr(self, 'visit_' + type(node).__name__, self.generic_visit)(node)
+        finally:
+            elapsed = time.perf_counter() - start
+            exclusive = elapsed - self.below
+            self.below = saved_below + elapsed
+            stats.count += 1
+            stats.inclusive += elapsed
+            stats.exclusive += exclusive
+            stacks = self.profile.stacks
+            stacks[self.stack] = stacks.get(self.stack, 0.0) + exclusive
+            if line is not None:
+                line_stats = self.profile.line_stats(line)
+                line_stats.exclusive += exclusive
+                if entered:
+                    self.line = saved_line
+                    line_stats.count += 1
+                    if outermost:
+                        self.active_lines.discard(line)
+                        line_stats.inclusive += elapsed
+
+    def run_function(self, function, arguments):
+        name = function.name
+        stats = self.profile.function_stats(name)
+        stats.count += 1
+        outermost = not self.active_functions.get(name)
+        self.active_functions[name] = self.active_functions.get(name, 0) + 1
+        saved_stack = self.stack
+        self.stack = saved_stack + (name,)
+        # Each statement of the body is a line entered, even on the line of the call.
+        saved_line = self.line
+        self.line = None
+        start = time.perf_counter()
+        try:
+            return super().run_function(function, arguments)
+        finally:
+            if outermost:
+                stats.inclusive += time.perf_counter() - start
+            self.active_functions[name] -= 1
+            self.stack = saved_stack
+            self.line = saved_line
+
+
+def profile(program, output=None, source=None):
+    """Run a parsed program on the tree engine, tracing it; return its
+    `Profile`. `source` is the program's text, to attribute time to lines.
+    """
+    result = Profile('seconds', source)
+    start = time.perf_counter()
+    ProfilingInterpreter(None, output, result).visit(program)
+    stats = result.function_stats(PROGRAM)
+    stats.count = 1
+    stats.inclusive = time.perf_counter() - start
+    # A function's exclusive time is that of the stacks it tops.
+    for stack, exclusive in result.stacks.items():
+        result.function_stats(stack[-1]).exclusive += exclusive
+    return result
+
+
+# The engine frames a sample maps back to the program: the frame of an
+# `Interpreter.visit` holds the node it evaluates, that of `run_function`
+# or of a compiled call the function it runs.
+VISIT_CODE = Interpreter.visit.__code__
+RUN_FUNCTION_CODE = Interpreter.run_function.__code__
+CALL_CODES = frozenset(constant for constant in ClosureCompiler.compile_FunctionCallNode.__code__.co_consts
+                       if hasattr(constant, 'co_name') and constant.co_name in ('call', 'budgeted_call'))
+
+
+def frames_of(frame):
+    """The nodes and functions `frame` and its callers are running,
+    outermost first.
+    """
+    nodes = []
+    functions = []
+    while frame is not None:
+        code = frame.f_code
+        if code is VISIT_CODE:
+            node = frame.f_locals.get('node')
+            if node is not None:
+                nodes.append(node)
+        elif code is RUN_FUNCTION_CODE or code in CALL_CODES:
+            function = frame.f_locals.get('function')
+            if type(function) is Function:
+                functions.append(function.name)
+        frame = frame.f_back
+    nodes.reverse()
+    functions.reverse()
+    return nodes, functions
+
+
+class Sampler:
+    """Samples what the thread that creates it runs, from a thread of its
+    own, every `interval` seconds between `start()` and `stop()`.
+    """
+
+    def __init__(self, profile, interval=SAMPLE_INTERVAL):
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        self.profile = profile
+        self.interval = interval
+        self.target = threading.get_ident()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            if frame is not None:
+                self.profile.add_sample(*frames_of(frame))
+            del frame
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def sample(program, engine='closure', output=None, source=None, interval=SAMPLE_INTERVAL):
+    """Run a parsed program on the tree or closure engine, sampling it;
+    return its `Profile`.
+    """
+    if engine not in ('tree', 'closure'):
+        raise ValueError(f'The {engine} engine cannot be sampled')
+    result = Profile('samples', source)
+    with Sampler(result, interval):
+        run_program(program, engine, output)
+    return result
+
+
+def main(argv):
+    arguments = argparse.ArgumentParser(description='Run a WordMaze script and report where it spends its time.')
+    arguments.add_argument('script')
+    arguments.add_argument('--sample', action='store_true', help='sample the run instead of tracing it')
+    arguments.add_argument('--engine', choices=['tree', 'closure'], default='closure',
+                           help='engine a sampled run uses (traced runs use the tree engine)')
+    arguments.add_argument('--interval', type=float, default=SAMPLE_INTERVAL, help='seconds between samples')
+    arguments.add_argument('--collapsed', help='write collapsed stacks for flamegraph tools to this file')
+    arguments.add_argument('--json', help='write the whole profile as JSON to this file')
+    arguments.add_argument('--top', type=int, default=10, help='rows of the report per table')
+    options = arguments.parse_args(argv[1:])
+
+    with open(options.script, encoding='utf-8') as handle:
+        source = handle.read()
+    program = Parser(RegexLexer(source)).parse()
+    if options.sample:
+        result = sample(program, options.engine, source=source, interval=options.interval)
+    else:
+        result = profile(program, source=source)
+    if options.collapsed:
+        with open(options.collapsed, 'w', encoding='utf-8') as handle:
+            handle.write(result.collapsed())
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as handle:
+            json.dump(result.as_json(), handle, indent=1)
+    print(result.report(options.top), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
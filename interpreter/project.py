@@ -0,0 +1,154 @@
+"""Check every WordMaze source in a project, in parallel.
+
+Usage: python project.py [--jobs N] [--timings] [path ...]
+"""
+import argparse
+import os
+import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from ast_nodes import ProgramNode
+from lexer import RegexLexer
+from parser import Parser
+from resolver import resolve
+
+
+SOURCE_SUFFIX = '.wmzl'
+SKIPPED_DIRECTORIES = {'__pycache__', '__wmzlcache__'}
+
+
+class Diagnostic:
+    def __init__(self, path, line, column, message):
+        self.path = path
+        self.line = line
+        self.column = column
+        self.message = message
+
+    def __str__(self):
+        return f'{self.path}:{self.line}:{self.column}: {self.message}'
+
+
+class FileReport:
+    """What checking one file found, and how long it took."""
+
+    def __init__(self, path, diagnostics, statement_count, seconds):
+        self.path = path
+        self.diagnostics = diagnostics
+        self.statement_count = statement_count
+        self.seconds = seconds
+
+
+def discover_sources(paths):
+    """Return the .wmzl files under `paths`, sorted and without duplicates.
+
+    Files named explicitly are taken whatever their suffix; directories are
+    searched recursively, skipping hidden and cache directories.
+    """
+    sources = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, files in os.walk(path):
+                subdirectories[:] = [name for name in subdirectories
+                                     if not name.startswith('.') and name not in SKIPPED_DIRECTORIES]
+                sources.update(os.path.join(directory, name) for name in files if name.endswith(SOURCE_SUFFIX))
+        else:
+            sources.add(path)
+    return sorted(sources)
+
+
+def line_starts(text):
+    starts = [0]
+    position = text.find('\n')
+    while position != -1:
+        starts.append(position + 1)
+        position = text.find('\n', position + 1)
+    return starts
+
+
+def line_and_column(starts, offset):
+    """1-based line and column of `offset`, given the `line_starts()` of its text."""
+    line = bisect_right(starts, offset)
+    return line, offset - starts[line - 1] + 1
+
+
+def check_source(path, text):
+    """Parse `text`; report its syntax error, or else the names it reads
+    that nothing binds.
+    """
+    statements = []
+    parser = None
+    try:
+        parser = Parser(RegexLexer(text))
+        statements.extend(parser.iter_statements())
+    except Exception as error:
+        # Syntax errors are reported at the token where parsing stopped.
+        offset = parser.current_token.start if parser is not None else 0
+        return [Diagnostic(path, *line_and_column(line_starts(text), offset), str(error))], len(statements)
+    unresolved = resolve(ProgramNode(statements))
+    starts = line_starts(text) if unresolved else None
+    diagnostics = [Diagnostic(path, *line_and_column(starts, node.start), message) for node, message in unresolved]
+    return diagnostics, len(statements)
+
+
+def check_file(path):
+    """Read, parse and check one file. Runs in a worker process."""
+    start = time.perf_counter()
+    try:
+        with open(path, encoding='utf-8') as handle:
+            text = handle.read()
+    except (OSError, UnicodeDecodeError) as error:
+        diagnostics, statement_count = [Diagnostic(path, 0, 0, str(error))], 0
+    else:
+        diagnostics, statement_count = check_source(path, text)
+    return FileReport(path, diagnostics, statement_count, time.perf_counter() - start)
+
+
+def check_project(paths, jobs=None):
+    """Yield a `FileReport` for every source under `paths`, in path order.
+
+    Files are checked across `jobs` worker processes (all cores by
+    default); reports stream back as soon as every file before them is done.
+    """
+    sources = discover_sources(paths)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(sources) < 2:
+        yield from map(check_file, sources)
+        return
+    # Workers open the files themselves, so only paths and reports cross
+    # process boundaries. Chunks amortize that traffic while leaving enough
+    # of them for the load to even out between workers.
+    chunksize = max(1, len(sources) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(check_file, sources, chunksize=chunksize)
+
+
+def main(argv):
+    arguments = argparse.ArgumentParser(description='Parse and check WordMaze sources.')
+    arguments.add_argument('paths', nargs='*', default=['.'])
+    arguments.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: all cores)')
+    arguments.add_argument('--timings', action='store_true', help='print the time taken by every file')
+    options = arguments.parse_args(argv[1:])
+
+    start = time.perf_counter()
+    file_count = 0
+    diagnostic_count = 0
+    busy = 0.0
+    for report in check_project(options.paths, options.jobs):
+        file_count += 1
+        diagnostic_count += len(report.diagnostics)
+        busy += report.seconds
+        for diagnostic in report.diagnostics:
+            print(diagnostic)
+        if options.timings:
+            print(f'{report.path}: {report.statement_count} statements in {report.seconds * 1000:.1f} ms')
+    elapsed = time.perf_counter() - start
+
+    print(f'Checked {file_count} files in {elapsed:.2f} s ({busy:.2f} s of checking), '
+          f'{diagnostic_count} problems', file=sys.stderr)
+    return 1 if diagnostic_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
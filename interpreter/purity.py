@@ -0,0 +1,104 @@
+from ast_nodes import (
+    ArrayAccessNode, AssignmentNode, FunctionCallNode, FunctionDefinitionNode, PrintNode, VariableNode,
+    iter_child_nodes, walk,
+)
+from resolver import resolve
+
+
+# Results each memoized function keeps.
+MEMO_SIZE = 1024
+
+# Builtins whose result depends on nothing but their arguments. `array`
+# is left out: each call must return a new array.
+PURE_BUILTINS = frozenset({'abs', 'float', 'int', 'len', 'max', 'min', 'str'})
+
+
+def top_level_bindings(program):
+    """How many times each name is bound outside function bodies."""
+    counts = {}
+    stack = list(program.statements)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, AssignmentNode):
+            counts[node.target] = counts.get(node.target, 0) + 1
+        elif isinstance(node, FunctionDefinitionNode):
+            counts[node.function_name] = counts.get(node.function_name, 0) + 1
+            continue
+        stack.extend(iter_child_nodes(node))
+    return counts
+
+
+def pure_functions(program):
+    """Return the top-level `FunctionDefinitionNode`s of a resolved
+    `program` that are pure, by name.
+
+    A function is pure when its result depends on nothing but its
+    arguments: it prints nothing, reads no variable but its own bound
+    locals, defines no functions, and calls only pure builtins and pure
+    functions. A `let` in a function binds a local, so none writes a
+    global. Called functions must be top-level definitions whose name
+    nothing else binds, so that the name always means that function.
+    """
+    bindings = top_level_bindings(program)
+    candidates = {}
+    for statement in program.statements:
+        if isinstance(statement, FunctionDefinitionNode) and bindings[statement.function_name] == 1:
+            candidates[statement.function_name] = statement
+
+    calls = {}
+    for name, definition in list(candidates.items()):
+        callees = function_callees(definition, bindings)
+        if callees is None:
+            del candidates[name]
+        else:
+            calls[name] = callees
+
+    # Drop the functions calling one that is not pure, until none does.
+    changed = True
+    while changed:
+        changed = False
+        for name in list(candidates):
+            if not calls[name] <= candidates.keys():
+                del candidates[name]
+                changed = True
+    return candidates
+
+
+def function_callees(definition, bindings):
+    """The names of the user functions `definition` calls, or None if its
+    body does anything else a pure function cannot.
+    """
+    callees = set()
+    for body_statement in definition.body:
+        for node in walk(body_statement):
+            if isinstance(node, (PrintNode, FunctionDefinitionNode)):
+                return None
+            if isinstance(node, (VariableNode, ArrayAccessNode)):
+                if node.slot is None or not node.bound:
+                    return None
+            elif isinstance(node, FunctionCallNode):
+                if node.slot is not None:
+                    return None
+                if node.callee in bindings:
+                    callees.add(node.callee)
+                elif node.callee not in PURE_BUILTINS:
+                    return None
+    return callees
+
+
+def memoize(program, size=MEMO_SIZE, exclude=()):
+    """Give the pure functions of `program`, but those named in `exclude`,
+    a result cache of `size` entries when they are defined; return their
+    names.
+    """
+    resolve(program)
+    memoized = set()
+    pure = pure_functions(program) if size > 0 else {}
+    for node in walk(program):
+        if isinstance(node, FunctionDefinitionNode):
+            if pure.get(node.function_name) is node and node.function_name not in exclude:
+                node.memo_size = size
+                memoized.add(node.function_name)
+            else:
+                node.memo_size = 0
+    return memoized
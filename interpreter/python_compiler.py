@@ -0,0 +1,472 @@
+import ast
+import hashlib
+import marshal
+import sys
+
+from ast_nodes import ASTVisitor, BinaryOpNode, UnaryOpNode
+from lexer import RegexLexer
+from parse_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ParseCache, collection_paused
+from parser import PARSER_VERSION, Parser
+from resolver import resolve
+from runtime import (
+    BUILTINS, LOGICAL_OPERATORS, UNSET, format_value, not_a_function,
+    undefined_function, undefined_variable, wrong_argument_count,
+)
+from traversal import run
+
+
+def source_hash(paths):
+    """A short digest of the files at `paths`."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as handle:
+            digest.update(handle.read())
+    return digest.hexdigest()[:16]
+
+
+# The generated code follows this module and the resolver's slots, checks
+# and deep expressions, so any edit to either makes cached code miss.
+PYTHON_CODE_VERSION = source_hash([__file__, resolve.__code__.co_filename])
+
+FILENAME = '<wordmaze>'
+
+# WordMaze names get a prefix in the generated code, so they can clash with
+# neither Python keywords nor the helpers, whose names start with '_'.
+PREFIX = 'w_'
+
+BINARY_OPS = {'+': ast.Add, '-': ast.Sub, '*': ast.Mult, '/': ast.Div, '%': ast.Mod}
+COMPARE_OPS = {'==': ast.Eq, '!=': ast.NotEq, '<': ast.Lt, '<=': ast.LtE, '>': ast.Gt, '>=': ast.GtE}
+
+# What `PythonProgram.sites` records for a line of the generated code.
+CALL_SITE = 'call'
+VARIABLE_SITE = 'variable'
+
+# The builtins of the generated code, so that calls find them after the
+# globals as in the other engines.
+BUILTIN_NAMESPACE = {PREFIX + name: function for name, function in BUILTINS.items()}
+
+
+class TopLevelReturn(BaseException):
+    """Raised by a `return` outside a function, past any try/catch."""
+
+
+def return_outside_function(value):
+    raise TopLevelReturn()
+
+
+def name(identifier, position, context=ast.Load):
+    return ast.Name(id=identifier, ctx=context(), **position)
+
+
+def call(position, function, *arguments):
+    return ast.Call(func=function, args=list(arguments), keywords=[], **position)
+
+
+class PythonCodeVisitor(ASTVisitor):
+    """Lowers a tree into a Python `ast.Module`, for `compile()` to turn into
+    CPython bytecode.
+
+    Expressions lower to an `ast.expr`, statements to a list of `ast.stmt`.
+    WordMaze functions become Python functions whose locals are the slots
+    `resolve` assigns, so they are fast locals; nested functions declare
+    everything else `global`, as WordMaze scopes do not nest. A local that may
+    be read before it is bound starts out as `UNSET` and its reads fall back to
+    the globals, as in the other engines.
+
+    Every lowered node is placed on a line of its own, and `sites` records
+    for each line whether it is a call or a variable read. `PythonProgram`
+    uses this to turn Python's NameError and TypeError into the errors the
+    other engines raise.
+
+    A deep expression (see resolver.py) would be too deep for `compile()`:
+    its deep nodes lower to statements instead, each assigning a temporary,
+    by `step_<ClassName>` methods on traversal.py's explicit stack.
+    """
+
+    def __init__(self):
+        self.sites = []
+        # The globals the function being lowered uses; None at top level.
+        self.globals = None
+        # The statements a deep expression being lowered runs, so far.
+        self.statements = None
+        self.temporaries = 0
+
+    def position(self, kind=None, identifier=None, count=0):
+        """Return the location attributes of a new line for `sites`."""
+        self.sites.append((kind, identifier, count))
+        line = len(self.sites)
+        return {'lineno': line, 'end_lineno': line, 'col_offset': 0, 'end_col_offset': 0}
+
+    def body(self, statements):
+        lowered = []
+        for statement in statements:
+            lowered.extend(statement.accept(self))
+        return lowered or [ast.Pass(**self.position())]
+
+    def load(self, node, identifier, position):
+        kind = self.sites[position['lineno'] - 1][0]
+        mangled = PREFIX + identifier
+        if node.slot is not None:
+            if node.bound:
+                return name(mangled, position)
+            fallback = '_global' if kind == VARIABLE_SITE else '_function'
+            return ast.IfExp(
+                test=ast.Compare(left=name(mangled, position), ops=[ast.IsNot()],
+                                 comparators=[name('_UNSET', position)], **position),
+                body=name(mangled, position),
+                orelse=call(position, name(fallback, position), ast.Constant(identifier, **position)),
+                **position)
+        if kind == VARIABLE_SITE and identifier in BUILTINS:
+            # Variables never fall back to the builtins.
+            return call(position, name('_global', position), ast.Constant(identifier, **position))
+        if self.globals is not None:
+            self.globals.add(mangled)
+        return name(mangled, position)
+
+    def condition(self, node):
+        """Lower an expression of which only the truth is used."""
+        if isinstance(node, BinaryOpNode) and node.operator in LOGICAL_OPERATORS:
+            operator = ast.And() if node.operator == '&&' else ast.Or()
+            values = [self.condition(node.left), self.condition(node.right)]
+            return ast.BoolOp(op=operator, values=values, **self.position())
+        if isinstance(node, UnaryOpNode) and node.operator == '!':
+            return ast.UnaryOp(op=ast.Not(), operand=self.condition(node.operand), **self.position())
+        return node.accept(self)
+
+    def expression(self, node):
+        """Lower an expression: the statements to run first, which only a
+        deep one has, and an `ast.expr`."""
+        if node.deep:
+            return self.lower_deep(node)
+        return [], node.accept(self)
+
+    def test(self, node):
+        """`expression` for an expression of which only the truth is used."""
+        if node.deep:
+            return self.lower_deep(node)
+        return [], self.condition(node)
+
+    def lower_deep(self, node):
+        saved = self.statements
+        self.statements = []
+        try:
+            value = run(node, self.lower_step)
+            return self.statements, value
+        finally:
+            self.statements = saved
+
+    def lower_step(self, node):
+        if node.deep:
+            return getattr(self, 'step_' + type(node).__name__)(node)
+        return node.accept(self)
+
+    def temporary(self, value=None):
+        """Return the name of a new temporary, assigned `value` if given."""
+        identifier = f'_t{self.temporaries}'
+        self.temporaries += 1
+        if value is not None:
+            self.assign(identifier, value)
+        return identifier
+
+    def assign(self, identifier, value):
+        position = self.position()
+        self.statements.append(ast.Assign(targets=[name(identifier, position, ast.Store)], value=value, **position))
+
+    def read(self, identifier):
+        return name(identifier, self.position())
+
+    def step_BinaryOpNode(self, node):
+        left = yield node.left
+        if node.operator in LOGICAL_OPERATORS:
+            # `t = a; if t: t = b` for `a && b`, `if not t:` for `||`; then
+            # `t = not not t`.
+            result = self.temporary(left)
+            outer, self.statements = self.statements, []
+            self.assign(result, (yield node.right))
+            test = self.read(result)
+            if node.operator == '||':
+                test = ast.UnaryOp(op=ast.Not(), operand=test, **self.position())
+            outer.append(ast.If(test=test, body=self.statements, orelse=[], **self.position()))
+            self.statements = outer
+            position = self.position()
+            operand = ast.UnaryOp(op=ast.Not(), operand=self.read(result), **position)
+            self.assign(result, ast.UnaryOp(op=ast.Not(), operand=operand, **position))
+            return self.read(result)
+        if node.right.deep and not node.left.deep:
+            # Read before the right operand's statements run.
+            left = self.read(self.temporary(left))
+        right = yield node.right
+        if node.operator in COMPARE_OPS:
+            value = ast.Compare(left=left, ops=[COMPARE_OPS[node.operator]()], comparators=[right],
+                                **self.position())
+        else:
+            value = ast.BinOp(left=left, op=BINARY_OPS[node.operator](), right=right, **self.position())
+        return self.read(self.temporary(value))
+
+    def step_UnaryOpNode(self, node):
+        operand = yield node.operand
+        operator = ast.Not() if node.operator == '!' else ast.USub()
+        return self.read(self.temporary(ast.UnaryOp(op=operator, operand=operand, **self.position())))
+
+    def step_ArrayAccessNode(self, node):
+        array = self.temporary(self.load(node, node.name, self.position(VARIABLE_SITE, node.name)))
+        index = yield node.index
+        value = ast.Subscript(value=self.read(array), slice=index, ctx=ast.Load(), **self.position())
+        return self.read(self.temporary(value))
+
+    def step_FunctionCallNode(self, node):
+        position = self.position(CALL_SITE, node.callee, len(node.arguments))
+        callee = self.temporary(self.load(node, node.callee, position))
+        last_deep = max((index for index, argument in enumerate(node.arguments) if argument.deep), default=-1)
+        arguments = []
+        for index, argument in enumerate(node.arguments):
+            value = yield argument
+            if index < last_deep and not argument.deep:
+                value = self.read(self.temporary(value))
+            arguments.append(value)
+        return self.read(self.temporary(call(position, name(callee, position), *arguments)))
+
+    def loop(self, condition, body):
+        """A while loop; one whose condition has statements runs them at
+        the top of every iteration, as `while True:` with a break."""
+        statements, test = self.test(condition)
+        body = self.body(body)
+        position = self.position()
+        if not statements:
+            return ast.While(test=test, body=body, orelse=[], **position)
+        exit_loop = ast.If(test=ast.UnaryOp(op=ast.Not(), operand=test, **position), body=[ast.Break(**position)],
+                           orelse=[], **position)
+        return ast.While(test=ast.Constant(True, **position), body=statements + [exit_loop] + body, orelse=[],
+                         **position)
+
+    def visit_program_node(self, node):
+        return ast.Module(body=self.body(node.statements), type_ignores=[])
+
+    def visit_expression_node(self, node):
+        return ast.Constant(node.value, **self.position())
+
+    visit_literal_node = visit_expression_node
+
+    def visit_variable_node(self, node):
+        return self.load(node, node.name, self.position(VARIABLE_SITE, node.name))
+
+    def visit_binary_op_node(self, node):
+        if node.operator in LOGICAL_OPERATORS:
+            # `bool(a && b)`, as `not not (a and b)`.
+            position = self.position()
+            operand = ast.UnaryOp(op=ast.Not(), operand=self.condition(node), **position)
+            return ast.UnaryOp(op=ast.Not(), operand=operand, **position)
+        left = node.left.accept(self)
+        right = node.right.accept(self)
+        if node.operator in COMPARE_OPS:
+            return ast.Compare(left=left, ops=[COMPARE_OPS[node.operator]()], comparators=[right],
+                               **self.position())
+        return ast.BinOp(left=left, op=BINARY_OPS[node.operator](), right=right, **self.position())
+
+    def visit_unary_op_node(self, node):
+        if node.operator == '!':
+            return self.condition(node)
+        return ast.UnaryOp(op=ast.USub(), operand=node.operand.accept(self), **self.position())
+
+    def visit_function_call_node(self, node):
+        position = self.position(CALL_SITE, node.callee, len(node.arguments))
+        callee = self.load(node, node.callee, position)
+        return call(position, callee, *[argument.accept(self) for argument in node.arguments])
+
+    def visit_array_access_node(self, node):
+        array = self.load(node, node.name, self.position(VARIABLE_SITE, node.name))
+        return ast.Subscript(value=array, slice=node.index.accept(self), ctx=ast.Load(), **self.position())
+
+    def visit_assignment_node(self, node):
+        statements, value = self.expression(node.value)
+        position = self.position()
+        return statements + [ast.Assign(targets=[name(PREFIX + node.target, position, ast.Store)], value=value,
+                                        **position)]
+
+    def visit_if_node(self, node):
+        statements, test = self.test(node.condition)
+        then_body = self.body(node.then_body)
+        else_body = self.body(node.else_body)
+        return statements + [ast.If(test=test, body=then_body, orelse=else_body if node.else_body else [],
+                                    **self.position())]
+
+    def visit_while_node(self, node):
+        return [self.loop(node.condition, node.body)]
+
+    def visit_for_node(self, node):
+        init = node.init.accept(self)
+        return init + [self.loop(node.condition, node.body + [node.increment])]
+
+    def visit_print_node(self, node):
+        statements, value = self.expression(node.expression)
+        position = self.position()
+        return statements + [ast.Expr(call(position, name('_print', position), value), **position)]
+
+    def visit_try_catch_node(self, node):
+        try_body = self.body(node.try_body)
+        catch_body = self.body(node.catch_body)
+        position = self.position()
+        handler = ast.ExceptHandler(type=name('_Exception', position), name=None, body=catch_body, **position)
+        return [ast.Try(body=try_body, handlers=[handler], orelse=[], finalbody=[], **position)]
+
+    def visit_function_definition_node(self, node):
+        nested = self.globals is not None
+        saved = self.globals
+        self.globals = set()
+        try:
+            body = self.body(node.body)
+            used_globals = self.globals
+        finally:
+            self.globals = saved
+
+        position = self.position()
+        prologue = []
+        if nested and used_globals:
+            prologue.append(ast.Global(names=sorted(used_globals), **position))
+        for identifier in sorted(node.unset_names):
+            prologue.append(ast.Assign(targets=[name(PREFIX + identifier, position, ast.Store)],
+                                       value=name('_UNSET', position), **position))
+        parameters = [ast.arg(arg=PREFIX + parameter, **position) for parameter in node.parameters]
+        arguments = ast.arguments(posonlyargs=[], args=parameters, kwonlyargs=[], kw_defaults=[], defaults=[])
+        function = ast.FunctionDef(name=PREFIX + node.function_name, args=arguments, body=prologue + body,
+                                   decorator_list=[], returns=None, **position)
+        return [function]
+
+    def visit_return_node(self, node):
+        position = self.position()
+        statements, value = [], ast.Constant(None, **position)
+        if node.value is not None:
+            statements, value = self.expression(node.value)
+        if self.globals is None:
+            return statements + [ast.Expr(call(position, name('_return_outside_function', position), value),
+                                          **position)]
+        return statements + [ast.Return(value=value, **position)]
+
+
+class PythonProgram:
+    """A program compiled to a CPython code object, ready to run any number
+    of times. Runs start from empty globals.
+
+    `sites` describes each line of the code (see `PythonCodeVisitor`); it is
+    plain data, so a program can be marshalled with its code.
+    """
+
+    def __init__(self, code, sites):
+        self.code = code
+        self.sites = sites
+
+    def run(self, output=None):
+        """Run the program and return its global scope."""
+        output = output if output is not None else sys.stdout
+        namespace = {}
+
+        def global_value(identifier):
+            try:
+                return namespace[PREFIX + identifier]
+            except KeyError:
+                raise undefined_variable(identifier) from None
+
+        def function_value(identifier):
+            try:
+                return namespace[PREFIX + identifier]
+            except KeyError:
+                pass
+            try:
+                return BUILTINS[identifier]
+            except KeyError:
+                raise undefined_function(identifier) from None
+
+        def print_(value):
+            output.write(format_value(value) + '\n')
+
+        namespace.update(__builtins__=BUILTIN_NAMESPACE, _UNSET=UNSET, _global=global_value,
+                         _function=function_value, _print=print_, _Exception=Exception,
+                         _return_outside_function=return_outside_function)
+        try:
+            exec(self.code, namespace)
+        except TopLevelReturn:
+            raise Exception("'return' outside a function") from None
+        except (NameError, TypeError) as error:
+            translated = self.translate(error)
+            if translated is None:
+                raise
+            raise translated from None
+        return {key[len(PREFIX):]: value for key, value in namespace.items() if key.startswith(PREFIX)}
+
+    def translate(self, error):
+        """Return the error the other engines raise instead of `error`, or
+        None if they raise the same one.
+        """
+        frame = line = None
+        traceback = error.__traceback__
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == FILENAME:
+                frame, line = traceback.tb_frame, traceback.tb_lineno
+            traceback = traceback.tb_next
+        if frame is None or not 0 < line <= len(self.sites):
+            return None
+
+        kind, identifier, count = self.sites[line - 1]
+        if kind == VARIABLE_SITE and isinstance(error, NameError):
+            return undefined_variable(identifier)
+        if kind != CALL_SITE:
+            return None
+        if isinstance(error, NameError):
+            return undefined_function(identifier)
+        mangled = PREFIX + identifier
+        function = frame.f_locals.get(mangled, UNSET)
+        if function is UNSET:
+            function = frame.f_globals.get(mangled, frame.f_builtins.get(mangled))
+        if not callable(function):
+            return not_a_function(identifier)
+        code = getattr(function, '__code__', None)
+        if code is not None and code.co_filename == FILENAME and code.co_argcount != count:
+            return wrong_argument_count(function.__name__[len(PREFIX):], code.co_argcount, count)
+        return None
+
+
+def compile_python(program):
+    resolve(program)
+    visitor = PythonCodeVisitor()
+    # The Python tree is several objects per WordMaze node, all alive until
+    # compile() is done with them: nothing for the collector to find.
+    with collection_paused():
+        module = program.accept(visitor)
+        code = compile(module, FILENAME, 'exec')
+    return PythonProgram(code, tuple(visitor.sites))
+
+
+def run_python(program, output=None):
+    return compile_python(program).run(output)
+
+
+class CodeCache(ParseCache):
+    """On-disk cache of `PythonProgram`s, so that starting an unchanged
+    program skips lexing, parsing and code generation alike.
+
+    Entries are the marshalled code and sites. Marshal data, like the
+    bytecode in it, belongs to one Python version, so that is part of the key.
+    """
+
+    tag = 'wordmaze-python'
+    suffix = '.pyc'
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, lexer_class=RegexLexer,
+                 version=f'{PARSER_VERSION}.{PYTHON_CODE_VERSION}.{sys.implementation.cache_tag}'):
+        super().__init__(directory, max_bytes, lexer_class, version)
+
+    def compile(self, text):
+        return self.parse(text)
+
+    def compile_file(self, path, encoding='utf-8'):
+        return self.parse_file(path, encoding)
+
+    def build(self, text):
+        return compile_python(Parser(self.lexer_class(text)).parse())
+
+    def read(self, handle):
+        code, sites = marshal.load(handle)
+        return PythonProgram(code, sites)
+
+    def write(self, program, handle):
+        marshal.dump((program.code, program.sites), handle)
@@ -0,0 +1,157 @@
+"""Quickening of the binary operations the tree-walking `Interpreter`
+evaluates.
+
+A `BinaryOpNode` starts out on the generic path of `visit_BinaryOpNode`,
+which branches on the operator and looks it up on every evaluation. Once
+its operands have had one type among `QUICKENED_TYPES` for `QUICKEN_AFTER`
+evaluations in a row, the node is quickened: its `quickened` annotation
+becomes a `Site`, a fast path for that operator and operand type. The site
+reads literal and local-variable operands directly rather than visiting
+them, and checks the operands' types before it applies the operator. When
+that guard fails, the site deoptimizes: the node goes back to the generic
+path, where it may be quickened again, reusing its site for a type it had
+before. A node that has deoptimized `MAX_DEOPTS` times is megamorphic and
+stays generic, so operands that keep changing type do not keep it
+switching.
+
+Every site counts the evaluations its guard let through (`hits`) and the
+one that failed it (`misses`); `counters` adds them up by operator and
+type. The resolver drops the sites of a tree each time it resolves it, so a
+run starts generic and its sites belong to its own interpreter.
+"""
+from ast_nodes import LiteralNode, VariableNode
+
+
+QUICKEN_AFTER = 8
+
+MAX_DEOPTS = 4
+
+# bool is left out: its operators mostly return ints.
+QUICKENED_TYPES = frozenset({int, float, str})
+
+
+def read_bound_local(interpreter, node):
+    """The value of a local that is certainly bound where `node` reads it."""
+    return interpreter.local_scope[node.slot]
+
+
+def read_variable(interpreter, node):
+    return interpreter.lookup(node, node.name)
+
+
+class Site:
+    """The fast path of a quickened `BinaryOpNode` for operands of type
+    `kind`, read by `read_left` and `read_right`.
+    """
+
+    __slots__ = ('node', 'kind', 'operation', 'read_left', 'read_right', 'hits', 'misses')
+
+    def __init__(self, node, kind, operation, read_left, read_right):
+        self.node = node
+        self.kind = kind
+        self.operation = operation
+        self.read_left = read_left
+        self.read_right = read_right
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, interpreter):
+        node = self.node
+        left = self.read_left(interpreter, node.left)
+        right = self.read_right(interpreter, node.right)
+        kind = self.kind
+        if type(left) is kind and type(right) is kind:
+            self.hits += 1
+            return self.operation(left, right)
+        return self.deoptimize(left, right)
+
+    def deoptimize(self, left, right):
+        """Send the node back to the generic path, finishing with it the
+        evaluation that failed the guard."""
+        self.misses += 1
+        self.node.quickened = None
+        return self.operation(left, right)
+
+    def __repr__(self):
+        name = self.kind.__name__
+        return f'<{name} {self.node.operator} {name} site: {self.hits} hits, {self.misses} misses>'
+
+
+class ConstantLeftSite(Site):
+    """A `Site` whose left operand is a literal of its type."""
+
+    __slots__ = ('constant',)
+
+    def __init__(self, node, kind, operation, read_left, read_right):
+        super().__init__(node, kind, operation, read_left, read_right)
+        self.constant = node.left.value
+
+    def evaluate(self, interpreter):
+        right = self.read_right(interpreter, self.node.right)
+        if type(right) is self.kind:
+            self.hits += 1
+            return self.operation(self.constant, right)
+        return self.deoptimize(self.constant, right)
+
+
+class ConstantRightSite(Site):
+    """A `Site` whose right operand is a literal of its type."""
+
+    __slots__ = ('constant',)
+
+    def __init__(self, node, kind, operation, read_left, read_right):
+        super().__init__(node, kind, operation, read_left, read_right)
+        self.constant = node.right.value
+
+    def evaluate(self, interpreter):
+        left = self.read_left(interpreter, self.node.left)
+        if type(left) is self.kind:
+            self.hits += 1
+            return self.operation(left, self.constant)
+        return self.deoptimize(left, self.constant)
+
+
+def reader(interpreter, node):
+    """The cheapest way for a site of `interpreter` to evaluate `node`."""
+    if isinstance(node, VariableNode):
+        if node.slot is not None and node.bound:
+            return read_bound_local
+        return read_variable
+    return type(interpreter).visit
+
+
+def quicken(interpreter, node, kind):
+    """Give `node` its `Site` for operands of type `kind`, made the first
+    time; return it, or None when the node is megamorphic."""
+    sites = node.sites
+    if sites is None:
+        sites = node.sites = {}
+    elif sum(site.misses for site in sites.values()) >= MAX_DEOPTS:
+        return None
+    site = sites.get(kind)
+    if site is None:
+        operation = interpreter.binary_operators[node.operator]
+        if isinstance(node.left, LiteralNode):
+            site_class = ConstantLeftSite
+        elif isinstance(node.right, LiteralNode):
+            site_class = ConstantRightSite
+        else:
+            site_class = Site
+        site = site_class(node, kind, operation, reader(interpreter, node.left), reader(interpreter, node.right))
+        sites[kind] = site
+        interpreter.sites.append(site)
+    node.quickened = site
+    return site
+
+
+def counters(sites):
+    """Hits, misses and number of `sites` for each specialized operation,
+    keyed like 'int + int'."""
+    totals = {}
+    for site in sites:
+        name = site.kind.__name__
+        total = totals.setdefault(f'{name} {site.node.operator} {name}', {'sites': 0, 'hits': 0, 'misses': 0})
+        total['sites'] += 1
+        total['hits'] += site.hits
+        total['misses'] += site.misses
+    return totals
@@ -0,0 +1,226 @@
+from ast_nodes import AssignmentNode, FunctionDefinitionNode, iter_child_nodes
+from runtime import BUILTINS, undefined_function, undefined_variable
+from traversal import run
+from vectorize import vector_loop
+
+
+# Expressions more than this many nodes tall are deep: the engines evaluate
+# them on an explicit stack instead of with a Python call per node.
+DEEP_HEIGHT = 64
+
+def local_names(parameters, body):
+    """Names a function body may bind in its own scope."""
+    names = set(parameters)
+    stack = list(body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, AssignmentNode):
+            names.add(node.target)
+        elif isinstance(node, FunctionDefinitionNode):
+            # The body of a nested function has a scope of its own.
+            names.add(node.function_name)
+            continue
+        stack.extend(iter_child_nodes(node))
+    return names
+
+
+class FunctionScope:
+    def __init__(self, slots, parameters):
+        self.slots = slots
+        # Locals certainly bound at the statement being resolved, and those
+        # read somewhere they may not be.
+        self.assigned = set(parameters)
+        self.unset = set()
+
+
+class Resolver:
+    """Assigns every local of a function a fixed slot in a list-backed frame,
+    and finds the names that nothing in the program binds.
+
+    The tree is annotated in place:
+
+    - `FunctionDefinitionNode.slot_names`: the function's locals in slot
+      order, parameters first, so a frame is the argument list padded with
+      `UNSET`; `unset_names`: the locals some read may find still `UNSET`.
+    - `VariableNode`, `ArrayAccessNode` and `FunctionCallNode` (for the name
+      they read) and `AssignmentNode` and `FunctionDefinitionNode` (for the
+      name they bind): `slot`, the slot of a local or None for a global, and
+      on reads `bound`, whether that slot certainly holds a value by then.
+      A read that finds its slot `UNSET` falls back to the globals.
+    - `ForNode.vector_loop`: the loop's `VectorLoop` of vectorize.py, or
+      None if it cannot run as whole-array operations.
+    - `BinaryOpNode.quickened` and `warmth` go back to generic: the
+      quickening.py sites of earlier runs are dropped.
+    - `BinaryOpNode`, `UnaryOpNode`, `ArrayAccessNode` and
+      `FunctionCallNode`: `deep`, whether the expression is more than
+      `DEEP_HEIGHT` nodes tall. Above a deep node, every node is deep.
+
+    Scoping is the engines' own: a function's locals are its parameters and
+    whatever it binds anywhere in its body; nested functions see the
+    globals, not the locals around them.
+
+    The `resolve_<ClassName>` methods yield the nodes below them to
+    traversal.py's `run`, so trees of any depth resolve.
+    """
+
+    def __init__(self):
+        self.global_names = set()
+        self.function = None
+        # (node, message) for reads nothing can bind, in source order.
+        self.diagnostics = []
+
+    def resolve_program(self, program):
+        self.global_names = local_names((), program.statements)
+        run(self.resolve_body(program.statements), self.resolve)
+        return self.diagnostics
+
+    def resolve(self, node):
+        method = getattr(self, 'resolve_' + type(node).__name__, None)
+        if method is None:
+            raise Exception(f'No resolve_{type(node).__name__} method')
+        return method(node)
+
+    def resolve_body(self, statements):
+        for statement in statements:
+            yield statement
+
+    def resolve_branch(self, statements):
+        """Resolve statements that may not run to the end; return the locals
+        bound once they have.
+        """
+        function = self.function
+        if function is None:
+            yield from self.resolve_body(statements)
+            return None
+        saved = function.assigned
+        function.assigned = set(saved)
+        try:
+            yield from self.resolve_body(statements)
+            return function.assigned
+        finally:
+            function.assigned = saved
+
+    def merge(self, *branches):
+        """Mark bound the locals every one of `branches` binds."""
+        if self.function is not None:
+            self.function.assigned |= set.intersection(*branches)
+
+    def reference(self, node, name, undefined, fallback):
+        function = self.function
+        if function is not None and name in function.slots:
+            node.slot = function.slots[name]
+            node.bound = name in function.assigned
+            if not node.bound:
+                function.unset.add(name)
+            return
+        node.slot = None
+        node.bound = False
+        if name not in self.global_names and name not in fallback:
+            self.diagnostics.append((node, str(undefined(name))))
+
+    def bind(self, node, name):
+        function = self.function
+        if function is None:
+            node.slot = None
+            return
+        node.slot = function.slots[name]
+        function.assigned.add(name)
+
+    def height(self, node, *children):
+        """Mark `node` deep or not, from the heights of its `children`;
+        return its own.
+        """
+        height = 1 + max(children, default=0)
+        node.deep = height > DEEP_HEIGHT
+        return height
+
+    # The methods of expressions return their height.
+
+    def resolve_LiteralNode(self, node):
+        return 1
+
+    resolve_ExpressionNode = resolve_LiteralNode
+
+    def resolve_VariableNode(self, node):
+        self.reference(node, node.name, undefined_variable, ())
+        return 1
+
+    def resolve_BinaryOpNode(self, node):
+        node.quickened = None
+        node.warmth = 0
+        node.sites = None
+        left = yield node.left
+        right = yield node.right
+        height = (left if left > right else right) + 1
+        node.deep = height > DEEP_HEIGHT
+        return height
+
+    def resolve_UnaryOpNode(self, node):
+        return self.height(node, (yield node.operand))
+
+    def resolve_ArrayAccessNode(self, node):
+        self.reference(node, node.name, undefined_variable, ())
+        return self.height(node, (yield node.index))
+
+    def resolve_FunctionCallNode(self, node):
+        self.reference(node, node.callee, undefined_function, BUILTINS)
+        heights = []
+        for argument in node.arguments:
+            heights.append((yield argument))
+        return self.height(node, *heights)
+
+    def resolve_AssignmentNode(self, node):
+        yield node.value
+        self.bind(node, node.target)
+
+    def resolve_FunctionDefinitionNode(self, node):
+        parameters = list(node.parameters)
+        slot_names = parameters + sorted(local_names(parameters, node.body) - set(parameters))
+        # With a repeated parameter the last one wins, as with dict(zip(...)).
+        slots = {name: slot for slot, name in enumerate(slot_names)}
+        saved = self.function
+        self.function = FunctionScope(slots, parameters)
+        try:
+            yield from self.resolve_body(node.body)
+            unset = self.function.unset
+        finally:
+            self.function = saved
+        node.slot_names = tuple(slot_names)
+        node.unset_names = frozenset(unset)
+        self.bind(node, node.function_name)
+
+    def resolve_ReturnNode(self, node):
+        if node.value is not None:
+            yield node.value
+
+    def resolve_IfNode(self, node):
+        yield node.condition
+        then_assigned = yield from self.resolve_branch(node.then_body)
+        else_assigned = yield from self.resolve_branch(node.else_body)
+        self.merge(then_assigned, else_assigned)
+
+    def resolve_WhileNode(self, node):
+        yield node.condition
+        yield from self.resolve_branch(node.body)
+
+    def resolve_ForNode(self, node):
+        yield node.init
+        yield node.condition
+        # The increment only runs after a whole pass of the body.
+        yield from self.resolve_branch(node.body + [node.increment])
+        node.vector_loop = vector_loop(node)
+
+    def resolve_PrintNode(self, node):
+        yield node.expression
+
+    def resolve_TryCatchNode(self, node):
+        try_assigned = yield from self.resolve_branch(node.try_body)
+        catch_assigned = yield from self.resolve_branch(node.catch_body)
+        self.merge(try_assigned, catch_assigned)
+
+
+def resolve(program):
+    """Annotate `program` with frame slots; return (node, message) for every
+    name nothing in it binds.
+    """
+    return Resolver().resolve_program(program)
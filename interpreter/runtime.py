@@ -0,0 +1,166 @@
+import operator
+from collections import OrderedDict
+
+
+# What every binary and unary operator does, shared by all execution engines
+# so that they agree on the result (and the error) of every operation.
+# '&&' and '||' short-circuit, so engines evaluate them themselves.
+BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+LOGICAL_OPERATORS = {'&&', '||'}
+
+UNARY_OPERATORS = {
+    '-': operator.neg,
+    '!': operator.not_,
+}
+
+
+class Function:
+    """A WordMaze function value. `body` is whatever the engine that defined
+    the function runs: statement nodes for the tree-walker, a compiled
+    callable for the others. Engines with list-backed frames (see
+    resolver.py) record the number of slots in `frame_size`. `cache` is the
+    `MemoCache` of a function purity.py found pure, or None.
+    """
+
+    def __init__(self, name, parameters, body, frame_size=None, cache=None):
+        self.name = name
+        self.parameters = parameters
+        self.body = body
+        self.frame_size = frame_size
+        self.cache = cache
+
+    def __repr__(self):
+        return f'<function {self.name}>'
+
+
+class MemoCache:
+    """The results of a pure function's latest calls, keyed by their
+    arguments: at most `size` of them, dropping the least recently used.
+
+    Calls with an array argument are not cached, and keys tell apart
+    arguments that are equal but print differently: 1, 1.0 and true, or
+    0.0 and -0.0.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, arguments):
+        """The key of a call with `arguments`, or None if it is not cached."""
+        key = []
+        for argument in arguments:
+            kind = type(argument)
+            if kind is list:
+                return None
+            key.append(argument.hex() if kind is float else argument)
+            key.append(kind)
+        return tuple(key)
+
+    def lookup(self, key):
+        """Return the result cached for `key`, or `UNSET`."""
+        result = self.results.get(key, UNSET)
+        if result is UNSET:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.results.move_to_end(key)
+        return result
+
+    def store(self, key, result):
+        self.results[key] = result
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+    def __repr__(self):
+        return f'<cache of {len(self.results)}/{self.size}: {self.hits} hits, {self.misses} misses>'
+
+
+class Unset:
+    def __repr__(self):
+        return '<unset>'
+
+
+# What a frame slot holds until its local is first bound.
+UNSET = Unset()
+
+
+def check_arguments(function, arguments):
+    if len(arguments) != len(function.parameters):
+        raise wrong_argument_count(function.name, len(function.parameters), len(arguments))
+
+
+def check_callable(name, value):
+    if not callable(value):
+        raise not_a_function(name)
+
+
+def format_value(value):
+    """Return the text `print` shows for `value`."""
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return 'null'
+    if isinstance(value, list):
+        return '[' + ', '.join(format_value(item) for item in value) + ']'
+    return str(value)
+
+
+def make_array(size, fill=0):
+    return [fill] * size
+
+
+# Functions every program can call without defining them. User definitions
+# of the same name take precedence.
+BUILTINS = {
+    'abs': abs,
+    'array': make_array,
+    'float': float,
+    'int': int,
+    'len': len,
+    'max': max,
+    'min': min,
+    'str': format_value,
+}
+
+
+# How deep calls may nest in the engines that keep them off the Python
+# stack, which would otherwise run until memory runs out.
+MAX_CALL_DEPTH = 100000
+
+
+def call_depth_exceeded(limit):
+    return Exception(f'Call depth limit of {limit} exceeded')
+
+
+def undefined_variable(name):
+    return Exception(f'Undefined variable: {name}')
+
+
+def undefined_function(name):
+    return Exception(f'Undefined function: {name}')
+
+
+def wrong_argument_count(name, expected, given):
+    return Exception(f'{name}() takes {expected} arguments but {given} were given')
+
+
+def not_a_function(name):
+    return Exception(f'{name} is not a function')
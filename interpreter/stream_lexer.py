@@ -0,0 +1,94 @@
+import codecs
+import os
+
+from lexer import TOKEN_PATTERN, TRIVIA_PATTERN, WHITESPACE, tokens_from_matches
+
+
+LOOKAHEAD = 2
+
+class StreamLexer:
+    """Lexer front end that reads a WordMaze program incrementally.
+
+    `source` is a file path or any binary stream with a `read(size)` method
+    (an open file, a socket file, an `mmap.mmap`, ...). The source is decoded
+    and tokenized `chunk_size` bytes at a time, so peak memory stays around
+    one chunk plus the longest single token, however large the file is.
+    The `Token` stream is the same one `Lexer` produces for the whole text,
+    with offsets counted in characters from the start of the source.
+    """
+
+    def __init__(self, source, chunk_size=1 << 16, encoding='utf-8'):
+        if isinstance(source, (str, bytes, os.PathLike)):
+            self.stream = open(source, 'rb')
+            self.owns_stream = True
+        else:
+            self.stream = source
+            self.owns_stream = False
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.peak_buffer_size = 0
+        # Offset of the current buffer within the decoded source, and how
+        # many characters have been decoded so far.
+        self.base = 0
+        self.decoded = 0
+        self.tokens = tokens_from_matches(self.iter_matches())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.owns_stream:
+            self.stream.close()
+
+    def get_next_token(self):
+        token = next(self.tokens)
+        token.start += self.base
+        token.end += self.base
+        return token
+
+    def iter_matches(self):
+        buffer = ''
+        pos = 0
+        eof = False
+        while True:
+            safe_end = len(buffer) - LOOKAHEAD
+            for match in TOKEN_PATTERN.finditer(buffer, pos):
+                # The pattern may look up to LOOKAHEAD characters past a match
+                # ('1' of '1.5', '=' of '=='), and a lone quote is the start of
+                # a literal that closes in a later chunk, so such matches are
+                # only trusted once the whole input has been read.
+                if not eof and (match.end() > safe_end or match.lastgroup == 'MISMATCH'
+                                and match.group('MISMATCH') in '"\''):
+                    break
+                yield match
+                if match.lastgroup == 'EOF':
+                    self.close()
+                    return
+                pos = match.end()
+            buffer, eof = self.refill(buffer[pos:])
+            pos = 0
+
+    def refill(self, tail):
+        # Drop whitespace and comments that are already complete. If the
+        # buffer ends inside a comment, a bare '#' stands in for it so the
+        # rest of the comment is still skipped without being kept around.
+        trivia_end = TRIVIA_PATTERN.match(tail).end()
+        if trivia_end == len(tail):
+            line = tail[tail.rfind('\n') + 1:].lstrip(WHITESPACE)
+            tail = '#' if line[:1] == '#' or line[:2] == '//' else ''
+        else:
+            tail = tail[trivia_end:]
+
+        while True:
+            data = self.stream.read(self.chunk_size)
+            text = self.decoder.decode(data, final=not data)
+            if text or not data:
+                break
+        self.base = self.decoded - len(tail)
+        self.decoded += len(text)
+        buffer = tail + text
+        self.peak_buffer_size = max(self.peak_buffer_size, len(buffer))
+        return buffer, not data
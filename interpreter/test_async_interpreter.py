@@ -0,0 +1,94 @@
+import asyncio
+import io
+import unittest
+
+from async_interpreter import run_async
+from lexer import Lexer
+from parser import Parser
+from test_interpreter import ERRORS, PROGRAMS
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+def run(source, **options):
+    output = io.StringIO()
+    asyncio.run(run_async(parse(source), output, **options))
+    return output.getvalue()
+
+
+class Lines:
+    """An output recording which program printed each line."""
+
+    def __init__(self, lines, name):
+        self.lines = lines
+        self.name = name
+
+    def write(self, text):
+        self.lines.append((self.name, text.strip()))
+
+
+class TestAsyncInterpreter(unittest.TestCase):
+    def test_programs(self):
+        for source, expected in PROGRAMS:
+            self.assertEqual(run(source), expected, source)
+            self.assertEqual(run(source, yield_every=1), expected, source)
+
+    def test_errors(self):
+        for source, message in ERRORS:
+            with self.assertRaises(Exception) as context:
+                run(source)
+            self.assertEqual(str(context.exception), message, source)
+
+    def test_awaitable_builtins_and_output(self):
+        async def fetch(key):
+            await asyncio.sleep(0)
+            return key * 2
+
+        class AsyncOutput:
+            def __init__(self):
+                self.text = ''
+
+            async def write(self, text):
+                await asyncio.sleep(0)
+                self.text += text
+
+        source = ('function twice(k) { return fetch(k) + fetch(k); } let total = 0; '
+                  'for (let i = 0; i < 3; let i = i + 1;) { let total = total + twice(i); } print total; '
+                  'try { print fetch(); } catch { print "failed"; }')
+        output = AsyncOutput()
+        scope = asyncio.run(run_async(parse(source), output, {'fetch': fetch}))
+        self.assertEqual(output.text, '12\nfailed\n')
+        self.assertEqual(scope['total'], 12)
+
+    def test_programs_interleave(self):
+        lines = []
+        source = 'for (let i = 0; i < 3; let i = i + 1;) { print i; }'
+
+        async def main():
+            await asyncio.gather(*(run_async(parse(source), Lines(lines, name), yield_every=3) for name in 'ab'))
+        asyncio.run(main())
+        self.assertEqual(lines, [('a', '0'), ('b', '0'), ('a', '1'), ('b', '1'), ('a', '2'), ('b', '2')])
+
+    def test_busy_programs_do_not_starve_others(self):
+        async def main():
+            spinning = asyncio.ensure_future(run_async(parse('while (true) { }')))
+            output = io.StringIO()
+            sources = [f'function f(n) {{ if (n == 0) {{ return {k}; }} return f(n - 1); }} print f(20);'
+                       for k in range(1000)]
+            await asyncio.gather(*(run_async(parse(source), output) for source in sources))
+            self.assertFalse(spinning.done())
+            spinning.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await spinning
+            return output.getvalue()
+        self.assertEqual(sorted(map(int, asyncio.run(main()).split())), list(range(1000)))
+
+    def test_arguments(self):
+        with self.assertRaises(ValueError):
+            run('print 1;', yield_every=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import unittest
+
+from budget import Budget, LimitExceeded
+from interpreter import BUDGETED_ENGINES, run_program
+from lexer import Lexer
+from parser import Parser
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+FIB = 'function fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); } '
+
+
+class TestBudget(unittest.TestCase):
+    def run_source(self, source, engine, budget):
+        output = io.StringIO()
+        run_program(parse(source), engine, output, budget=budget, memo_size=0)
+        return output.getvalue()
+
+    def limit_exceeded(self, source, engine, budget):
+        with self.assertRaises(LimitExceeded) as context:
+            self.run_source(source, engine, budget)
+        return context.exception
+
+    def test_steps(self):
+        loop = 'let s = 0; for (let i = 0; i < 100; let i = i + 1;) { let s = s + i; } print s;'
+        for engine in BUDGETED_ENGINES:
+            self.assertEqual(self.run_source(loop, engine, Budget(max_steps=100)), '4950\n', engine)
+            error = self.limit_exceeded(loop, engine, Budget(max_steps=99))
+            self.assertEqual((error.limit, str(error)), ('steps', 'Step limit of 99 exceeded'), engine)
+            # fib(10) makes 177 calls, each of them a step.
+            self.assertEqual(self.run_source(FIB + 'print fib(10);', engine, Budget(max_steps=177)), '55\n')
+            self.assertEqual(self.limit_exceeded(FIB + 'print fib(10);', engine, Budget(max_steps=176)).limit,
+                             'steps', engine)
+
+    def test_scripts_cannot_catch_their_way_past(self):
+        source = 'let n = 0; while (true) { try { while (true) { let n = n + 1; } } catch { print n; } }'
+        for engine in BUDGETED_ENGINES:
+            output = io.StringIO()
+            with self.assertRaises(LimitExceeded):
+                run_program(parse(source), engine, output, budget=Budget(max_steps=1000))
+            self.assertEqual(output.getvalue(), '999\n', engine)
+            self.assertEqual(self.limit_exceeded(source, engine, Budget(seconds=0.05)).limit, 'seconds', engine)
+
+    def test_depth(self):
+        source = 'function down(n) { if (n == 0) { return 0; } return down(n - 1); } print down(50);'
+        for engine in BUDGETED_ENGINES:
+            self.assertEqual(self.run_source(source, engine, Budget(max_depth=51)), '0\n', engine)
+            error = self.limit_exceeded(source, engine, Budget(max_depth=50))
+            self.assertEqual((error.limit, str(error)), ('depth', 'Call depth limit of 50 exceeded'), engine)
+
+    def test_allocation(self):
+        budget = Budget(max_allocation=1000)
+        for engine in BUDGETED_ENGINES:
+            self.assertEqual(self.run_source('let a = array(1000, 0); print len(a) + 1;', engine, budget), '1001\n')
+            self.assertEqual(self.limit_exceeded('let a = array(1001, 0);', engine, budget).limit, 'allocation')
+            error = self.limit_exceeded('let s = "ab"; while (true) { let s = s + s; }', engine, budget)
+            self.assertEqual(str(error), 'Allocation of 1024 elements exceeds the limit of 1000', engine)
+            self.assertEqual(self.limit_exceeded('let s = 600 * "ab";', engine, budget).limit, 'allocation')
+            self.assertEqual(self.run_source('let s = 1 + 2 * 3; print s;', engine, budget), '7\n')
+
+    def test_budgets_restart_with_each_run(self):
+        budget = Budget(max_steps=10)
+        source = 'for (let i = 0; i < 10; let i = i + 1;) { }'
+        for engine in BUDGETED_ENGINES:
+            for _ in range(3):
+                self.run_source(source, engine, budget)
+                self.assertEqual(budget.steps, 10)
+
+    def test_arguments(self):
+        with self.assertRaises(ValueError):
+            Budget(max_steps=-1)
+        with self.assertRaises(ValueError):
+            run_program(parse('print 1;'), 'bytecode', io.StringIO(), budget=Budget(max_steps=10))
+
+
+if __name__ == '__main__':
+    unittest.main()
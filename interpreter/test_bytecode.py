@@ -0,0 +1,99 @@
+import io
+import sys
+import unittest
+
+from bytecode import JUMP_OPS, compile_bytecode, disassemble
+from lexer import Lexer
+from parser import Parser
+from vm import VM
+
+
+def compile_source(source):
+    return compile_bytecode(Parser(Lexer(source)).parse())
+
+
+def run(source):
+    output = io.StringIO()
+    VM(output).run(compile_source(source))
+    return output.getvalue()
+
+
+class TestBytecode(unittest.TestCase):
+    def test_disassemble(self):
+        code = compile_source('function f(n) { return n * 2; } let x = 1; while (x < 9) { let x = f(x); } print x;')
+        self.assertEqual(disassemble(code), '\n'.join([
+            'code <program>:',
+            '      0 MAKE_FUNCTION  0    (<code f>)',
+            '      2 STORE_NAME     0    (f)',
+            '      4 LOAD_CONST     1    (1)',
+            '      6 STORE_NAME     1    (x)',
+            '      8 LOAD_GLOBAL    1    (x)',
+            '     10 LOAD_CONST     2    (9)',
+            '     12 BINARY_OP      7    (<)',
+            '     14 JUMP_IF_FALSE  26   (to 26)',
+            '     16 LOAD_FUNCTION  0    (f)',
+            '     18 LOAD_GLOBAL    1    (x)',
+            '     20 CALL           1    (1 arguments to f)',
+            '     22 STORE_NAME     1    (x)',
+            '     24 JUMP           8    (to 8)',
+            '     26 LOAD_GLOBAL    1    (x)',
+            '     28 PRINT',
+            '     30 HALT',
+            '',
+            'code f(n):',
+            '      0 LOAD_NAME      0    (n)',
+            '      2 LOAD_CONST     0    (2)',
+            '      4 BINARY_OP      2    (*)',
+            '      6 RETURN',
+            '      8 LOAD_CONST     1    (None)',
+            '     10 RETURN',
+        ]))
+
+    def test_constant_pool(self):
+        code = compile_source('print 1; print 1.0; print true; print 1;')
+        self.assertEqual([(type(value), value) for value in code.constants],
+                         [(int, 1), (float, 1.0), (bool, True)])
+
+    def test_jump_targets_are_instructions(self):
+        code = compile_source('for (let i = 0; i < 3; let i = i + 1;) { try { print i || 0; } catch { print 0; } }')
+        instructions = code.instructions
+        for slot in range(0, len(instructions), 2):
+            if instructions[slot] in JUMP_OPS:
+                target = instructions[slot + 1]
+                self.assertEqual(target % 2, 0)
+                self.assertLess(target, len(instructions))
+
+    def test_recursion_does_not_use_the_python_stack(self):
+        depth = sys.getrecursionlimit() * 2
+        source = f'function down(n) {{ if (n == 0) {{ return 0; }} return down(n - 1) + 1; }} print down({depth});'
+        self.assertEqual(run(source), f'{depth}\n')
+
+    def test_exceptions_unwind_call_frames(self):
+        source = '''
+            function fail(n) { if (n == 0) { return 1 / 0; } return fail(n - 1); }
+            function guarded() { try { let r = fail(3); } catch { return "caught"; } return "missed"; }
+            print guarded();
+            let x = 1;
+            try { print fail(2); } catch { let x = 2; }
+            print x;
+        '''
+        self.assertEqual(run(source), 'caught\n2\n')
+
+    def test_call_depth_is_limited(self):
+        class ShallowVM(VM):
+            max_depth = 50
+
+        code = compile_source('function down(n) { if (n == 0) { return 0; } return down(n - 1) + 1; } '
+                              'print down(49); print down(50);')
+        output = io.StringIO()
+        with self.assertRaises(Exception) as context:
+            ShallowVM(output).run(code)
+        self.assertEqual((output.getvalue(), str(context.exception)), ('49\n', 'Call depth limit of 50 exceeded'))
+
+    def test_runs_leave_globals(self):
+        scope = VM(io.StringIO()).run(compile_source('function f() { return 1; } let n = f() + 1;'))
+        self.assertEqual(scope['n'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
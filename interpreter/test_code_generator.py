@@ -0,0 +1,34 @@
+import unittest
+
+from ast_nodes import dump
+from code_generator import generate_code
+from lexer import Lexer
+from parser import Parser
+
+
+SOURCE = '''let a = 1;
+if (a < 2) { print -a; while (!a) { let a = a - 1; } } else { print f(a, b[2]); }
+for (let i = 0; i < 3 || a; let i = i + 1;) { print i % 2; }
+try { print 1.5; } catch { }
+function f(x, y) { return x * (y + 2) / 4; }
+function g() { print 1; return; }
+print "tab\\t \\"quoted\\" \\\\ end" + 'c'; let t = true && !false;
+'''
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+class TestCodeGenerator(unittest.TestCase):
+    def test_round_trip(self):
+        code = ''.join(generate_code(parse(SOURCE).statements))
+        self.assertEqual(dump(parse(code)), dump(parse(SOURCE)))
+
+    def test_layout(self):
+        code = ''.join(generate_code(Parser(Lexer('while (x) { if (y) { print 1; } } let z = -x;')).iter_statements()))
+        self.assertEqual(code, 'while (x) {\n    if (y) {\n        print 1;\n    }\n}\nlet z = (-x);\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from ast_nodes import dump
+from incremental import IncrementalParser, statement_at
+from lexer import Lexer
+from parser import Parser
+
+
+SOURCE = '''let a = 1;
+if (a < 2) { print a; }
+# let c = 0;
+while (a) { let a = a - 1; }
+function f(x) { return x * 2; }
+print f(3);
+'''
+
+
+def full_parse(text):
+    return dump(Parser(Lexer(text)).parse(), spans=True)
+
+
+class TestIncrementalParser(unittest.TestCase):
+    def test_edit_reuses_untouched_statements(self):
+        parser = IncrementalParser(SOURCE)
+        old = list(parser.program.statements)
+        start = SOURCE.index('a - 1')
+        program = parser.edit(start, start + 1, 'count')
+        self.assertEqual(dump(program, spans=True), full_parse(parser.text))
+        self.assertIs(program.statements[0], old[0])
+        self.assertIs(program.statements[-1], old[-1])
+        self.assertEqual(program.statements[-1].start, SOURCE.index('print f') + 4)
+        self.assertEqual((parser.reparsed, parser.reused), (2, 3))
+
+    def test_edit_can_extend_previous_statement(self):
+        parser = IncrementalParser(SOURCE)
+        end = SOURCE.index('}') + 1
+        program = parser.edit(end, end, ' else { print 0; }')
+        self.assertEqual(program.statements[1].else_body[0].expression.value, 0)
+        self.assertEqual(dump(program, spans=True), full_parse(parser.text))
+
+    def test_edit_inside_comment(self):
+        parser = IncrementalParser(SOURCE)
+        start = SOURCE.index('# let c')
+        program = parser.edit(start, start + 1, '')
+        self.assertEqual(program.statements[2].target, 'c')
+        self.assertEqual(dump(program, spans=True), full_parse(parser.text))
+        program = parser.edit(start, start, '#')
+        self.assertEqual(dump(program, spans=True), full_parse(SOURCE))
+
+    def test_failed_edit_keeps_old_tree(self):
+        parser = IncrementalParser(SOURCE)
+        program = parser.program
+        with self.assertRaises(Exception):
+            parser.edit(0, 3, 'lt')
+        self.assertIs(parser.program, program)
+        self.assertEqual(parser.text, SOURCE)
+
+    def test_random_edits_match_full_parse(self):
+        rng = random.Random(7)
+        pieces = ['let q = 3;', ' else { print 1; }', '#', '\n', '"', 'x', ';', '}', '{', ' ', '+ 1', '']
+        for _ in range(200):
+            parser = IncrementalParser(SOURCE)
+            for _ in range(5):
+                start = rng.randrange(len(parser.text) + 1)
+                end = min(len(parser.text), start + rng.randrange(4))
+                replacement = rng.choice(pieces)
+                text = parser.text[:start] + replacement + parser.text[end:]
+                try:
+                    expected = full_parse(text)
+                except Exception:
+                    continue
+                self.assertEqual(dump(parser.edit(start, end, replacement), spans=True), expected, text)
+
+    def test_statement_at(self):
+        program = IncrementalParser(SOURCE).program
+        self.assertIs(statement_at(program, SOURCE.index('return')), program.statements[3])
+        self.assertIsNone(statement_at(program, SOURCE.index('# let c')))
@@ -0,0 +1,112 @@
+import io
+import unittest
+
+from closure_compiler import compile_program
+from interpreter import EXECUTION_ENGINES, Interpreter, run_program
+from lexer import Lexer
+from optimizer import DEFAULT_PASSES
+from parser import Parser
+
+
+PROGRAMS = [
+    ('print 1 + 2 * 3; print 7 / 2; print 7 % 3; print -2 - -3;', '7\n3.5\n1\n1\n'),
+    ('print 1 < 2 && 2 < 1; print 1 || x; print !0; print 3 == 3.0;', 'false\ntrue\ntrue\ntrue\n'),
+    ('print "a\\tb" + \'c\'; print "say \\"hi\\"";', 'a\tbc\nsay "hi"\n'),
+    ('print true; print false != true; print len("abc");', 'true\ntrue\n3\n'),
+    # `int` and `float` are type keywords, and the conversion builtins too.
+    ('print int(2.5); print int(-7.9); print float(3) / 4; print int("12") + 1;', '2\n-7\n0.75\n13\n'),
+    ('let i = 0; let total = 0; while (i < 5) { let total = total + i; let i = i + 1; } print total;', '10\n'),
+    ('for (let i = 0; i < 3; let i = i + 1;) { if (i % 2 == 0) { print i; } else { print -i; } }',
+     '0\n-1\n2\n'),
+    ('function fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); } print fib(15);', '610\n'),
+    ('function first(a) { let i = 0; while (1) { if (a[i] > 2) { return i; } let i = i + 1; } } '
+     'let data = array(5, 3); print first(data); print data;', '0\n[3, 3, 3, 3, 3]\n'),
+    # Functions see their own scope, then the globals; `let` binds locally.
+    ('let x = 1; function f(y) { let x = x + y; return x; } print f(10); print x;', '11\n1\n'),
+    ('function outer() { function inner() { return 2; } return inner() * 3; } print outer();', '6\n'),
+    ('function noop() { let a = 1; } print noop();', 'null\n'),
+    ('function g(n) { if (n) { return; } return n; } print g(1); print g(0);', 'null\n0\n'),
+    ('let len = 5; print len; function abs(x) { return 42; } print abs(-1);', '5\n42\n'),
+    ('try { print 1; print 1 / 0; print 2; } catch { print 3; }', '1\n3\n'),
+    ('function f() { try { return 1; } catch { return 2; } } print f();', '1\n'),
+    ('try { print undefined; } catch { print "caught"; }', 'caught\n'),
+    ('function f(n) { return f(n + 1); } try { print f(0); } catch { print "caught"; }', 'caught\n'),
+    # Scopes do not nest: `inner` sees the global `n`, not the one of `outer`.
+    ('let n = 5; function outer() { let n = 1; function inner() { return n; } return inner() + n; } print outer();',
+     '6\n'),
+    ('let i = 7; function f(c) { if (c) { let i = 1; } return i; } print f(0); print f(1);', '7\n1\n'),
+]
+
+ERRORS = [
+    ('print x;', 'Undefined variable: x'),
+    ('print f(1);', 'Undefined function: f'),
+    ('function f(a) { return a; } print f(1, 2);', 'f() takes 1 arguments but 2 were given'),
+    ('let f = 1; print f();', 'f is not a function'),
+    ('return 1;', "'return' outside a function"),
+    ('print abs;', 'Undefined variable: abs'),
+    ('function f(a) { return a; } function g() { return f(); } print g();', 'f() takes 1 arguments but 0 were given'),
+    ('function g() { let h = 2; return h(1); } print g();', 'h is not a function'),
+    ('function g() { return h(); } print g();', 'Undefined function: h'),
+    # The left operand fails before the right one runs.
+    ('function g(x) { print "side effect"; return x; } print i + g(1);', 'Undefined variable: i'),
+    ('print (i + ("s" - 1));', 'Undefined variable: i'),
+]
+
+
+def run(source, engine, optimizations=()):
+    output = io.StringIO()
+    run_program(Parser(Lexer(source)).parse(), engine, output, optimizations)
+    return output.getvalue()
+
+
+class TestInterpreter(unittest.TestCase):
+    def test_programs(self):
+        for engine in EXECUTION_ENGINES:
+            for source, expected in PROGRAMS:
+                self.assertEqual(run(source, engine), expected, (engine, source))
+
+    def test_errors(self):
+        for engine in EXECUTION_ENGINES:
+            for source, message in ERRORS:
+                with self.assertRaises(Exception) as context:
+                    run(source, engine)
+                self.assertEqual(str(context.exception), message, (engine, source))
+
+    def test_errors_stop_the_expression(self):
+        source = 'function g(x) { print "side effect"; return x; } print i + g(1);'
+        for engine in EXECUTION_ENGINES:
+            output = io.StringIO()
+            with self.assertRaises(Exception):
+                run_program(Parser(Lexer(source)).parse(), engine, output)
+            self.assertEqual(output.getvalue(), '', engine)
+
+    def test_optimized_programs(self):
+        for engine in EXECUTION_ENGINES:
+            for source, expected in PROGRAMS:
+                self.assertEqual(run(source, engine, DEFAULT_PASSES), expected, (engine, source))
+            for source, message in ERRORS:
+                with self.assertRaises(Exception) as context:
+                    run(source, engine, DEFAULT_PASSES)
+                self.assertEqual(str(context.exception), message, (engine, source))
+
+    def test_interpret(self):
+        output = io.StringIO()
+        interpreter = Interpreter(Parser(Lexer('let x = 2; print x * x;')), output)
+        interpreter.interpret()
+        self.assertEqual(output.getvalue(), '4\n')
+        self.assertEqual(interpreter.global_scope, {'x': 2})
+
+    def test_compiled_program_reruns_from_scratch(self):
+        program = compile_program(Parser(Lexer('let n = 0; function f() { return 1; } let n = n + f(); print n;')).parse())
+        for _ in range(2):
+            output = io.StringIO()
+            self.assertEqual(program.run(output)['n'], 1)
+            self.assertEqual(output.getvalue(), '1\n')
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            run_program(Parser(Lexer('')).parse(), 'jit')
+
+
+if __name__ == '__main__':
+    unittest.main()
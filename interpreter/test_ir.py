@@ -0,0 +1,226 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+
+from cpp_backend import build_executable, generate_cpp
+from interpreter import run_program
+from ir import dominators, format_function, lower_program, natural_loops
+from ir_interpreter import IRInterpreter
+from ir_passes import DEFAULT_IR_PASSES, IROptimizer, optimize_ir
+from lexer import Lexer
+from parser import Parser
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+def listing(source, passes=()):
+    function = lower_program(parse(source))
+    optimize_ir(function, passes)
+    return format_function(function)
+
+
+def run_ir(source, passes):
+    output = io.StringIO()
+    function = lower_program(parse(source))
+    optimize_ir(function, passes)
+    IRInterpreter(output).run(function)
+    return output.getvalue()
+
+
+LOOP = 'let n = 5; let s = 0; for (let i = 0; i < n; let i = i + 1;) { let s = s + i * 3 + (n + 1) * (n + 1); } print s;'
+
+
+class TestLowering(unittest.TestCase):
+    def test_functions_and_short_circuits(self):
+        self.assertEqual(listing('function f(x) { if (x && y) { print "a"; } } print f(1);'), '''\
+function <program>():
+  B0:
+    f = define f
+    %1 = function f
+    %2 = call %1(1)
+    print %2
+    halt
+
+function f(x):
+  B0:
+    branch x, B1, B2
+  B1:
+    %2 = global y
+    %1 = truth %2
+    jump B3
+  B2:
+    %1 = false
+    jump B3
+  B3:
+    branch %1, B4, B5
+  B4:
+    print "a"
+    jump B5
+  B5:
+    return null''')
+
+    def test_loops_are_rotated_behind_a_preheader(self):
+        function = lower_program(parse('let i = 0; while (i < 3) { let i = i + 1; } print i;'))
+        self.assertEqual(format_function(function), '''\
+function <program>():
+  B0:
+    i = 0
+    %1 = i
+    %2 = %1 < 3
+    branch %2, B1, B3
+  B1:
+    jump B2
+  B2:
+    %3 = i
+    i = %3 + 1
+    %5 = i
+    %6 = %5 < 3
+    branch %6, B2, B3
+  B3:
+    %7 = i
+    print %7
+    halt''')
+        [loop] = natural_loops(function)
+        self.assertEqual([block.label for block in loop.blocks], ['B2'])
+        self.assertEqual([block.label for block in dominators(function).of(function.blocks[3])], ['B3', 'B0'])
+
+    def test_try_blocks_record_their_handler(self):
+        self.assertEqual(listing('try { print 1 / 0; } catch { print 2; } function f() { return 1; print 3; }'), '''\
+function <program>():
+  B0:
+    jump B3
+  B1:
+    print 2
+    jump B2
+  B2:
+    f = define f
+    halt
+  B3:  (catch: B1)
+    %1 = 1 / 0
+    print %1
+    jump B2
+
+function f():
+  B0:
+    return 1''')
+
+
+class TestIRPasses(unittest.TestCase):
+    def test_loop_passes(self):
+        self.assertEqual(listing(LOOP, DEFAULT_IR_PASSES), '''\
+function <program>():
+  B0:
+    n = 5
+    s = 0
+    i = 0
+    %3 = i < n
+    branch %3, B1, B3
+  B1:
+    %9 = n + 1
+    %12 = %9 * %9
+    %20 = i * 3
+    jump B2
+  B2:
+    %7 = s + %20
+    s = %7 + %12
+    i = i + 1
+    %20 = %20 + 3
+    %18 = i < n
+    branch %18, B2, B3
+  B3:
+    print s
+    halt''')
+        self.assertEqual(run_ir(LOOP, ()), run_ir(LOOP, ['cse', 'licm', 'strength-reduction']))
+
+    def test_failing_code_stays_behind_what_it_follows(self):
+        # `1 / z` fails, but only after the first iteration's print.
+        source = 'let i = 0; while (i < 3) { print i; let x = 1 / z + 1; let i = i + 1; }'
+        self.assertIn('    print i\n    %4 = z\n    %5 = 1 / z', listing(source, ['copy-propagation', 'licm']))
+        with self.assertRaises(Exception) as context:
+            run_ir(source, ['licm'])
+        self.assertEqual(str(context.exception), 'Undefined variable: z')
+        # Known integers cannot fail, so the product moves past the print.
+        self.assertIn('  B1:\n    %5 = w\n    %6 = w * 2\n    jump B2',
+                      listing('let w = 3; let i = 0; while (i < 3) { print i; let i = i + w * 2; }',
+                              ['copy-propagation', 'licm']))
+
+    def test_strength_reduction_needs_integer_induction_variables(self):
+        for source in ['let i = 0.5; while (i < 3) { print i * 3; let i = i + 1; }',
+                       'let i = 0; while (i < 3) { print i * 3; let i = i + 0.5; }',
+                       'function f(i) { while (i < 3) { print i * 3; let i = i + 1; } return 0; }']:
+            self.assertNotIn('+ 3', listing(source, ['copy-propagation', 'strength-reduction']), source)
+        self.assertRegex(listing('let i = 0; while (i < 3) { print i * 3; let i = i + 2; }',
+                                 ['copy-propagation', 'strength-reduction']), r'(%\d+) = \1 \+ 6')
+
+    def test_cse_stays_linear(self):
+        # Quadratic, the 8000 duplicates took tens of seconds.
+        source = 'function f(a, b) { return ' + ' + '.join(['a * b'] * 8000) + '; } print f(2, 3);'
+        function = lower_program(parse(source))
+        start = time.perf_counter()
+        optimize_ir(function, ['cse'])
+        self.assertLess(time.perf_counter() - start, 2)
+        [body] = function.functions
+        self.assertEqual(format_function(body).count(' * '), 1)
+        output = io.StringIO()
+        IRInterpreter(output).run(function)
+        self.assertEqual(output.getvalue(), '48000\n')
+
+    def test_stats_and_unknown_passes(self):
+        optimizer = IROptimizer()
+        optimizer.optimize(lower_program(parse(LOOP)))
+        self.assertEqual({name: stats.changes for name, stats in optimizer.stats.items()},
+                         {'copy-propagation': 11, 'cse': 1, 'licm': 5, 'strength-reduction': 1, 'dead-code': 11})
+        with self.assertRaises(ValueError):
+            IROptimizer(['cse', 'gvn'])
+        with self.assertRaises(ValueError):
+            optimize_ir(lower_program(parse('')), disabled=['gvn'])
+
+
+@unittest.skipUnless(shutil.which('g++'), 'needs g++')
+class TestCppBackend(unittest.TestCase):
+    def run_executable(self, source):
+        with tempfile.TemporaryDirectory() as directory:
+            executable = build_executable(generate_cpp(parse(source)), os.path.join(directory, 'program'))
+            return subprocess.run([executable], capture_output=True, text=True)
+
+    def test_output_matches_the_interpreter(self):
+        source = '''
+            function fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }
+            function scale(x) { return x * factor; }
+            let factor = 0.1;
+            print fib(20); print scale(3); print 7 % -3; print -7.5 % 2; print 1 / 4;
+            print 10000000000000000.0; print 0.0001; print abs(-2) + max(1, 2.5, 2);
+            print 1 == 1.0; print fib; print int(-7.9) + float(2);
+        ''' + LOOP
+        expected = io.StringIO()
+        run_program(parse(source), 'tree', expected)
+        result = self.run_executable(source)
+        self.assertEqual((result.stdout, result.returncode), (expected.getvalue(), 0))
+
+    def test_errors_end_the_program(self):
+        result = self.run_executable('print 1; print 2 / 0; print 3;')
+        self.assertEqual((result.stdout, result.stderr, result.returncode), ('1\n', 'division by zero\n', 1))
+
+    def test_division_by_zero_fails_like_the_interpreter(self):
+        for source in ['print 1 / 0;', 'print 1.5 / 0;', 'print 7 % 0;', 'print 7.5 % 0;', 'print true / 0.0;']:
+            with self.assertRaises(ZeroDivisionError) as context:
+                run_program(parse(source), 'tree', io.StringIO())
+            result = self.run_executable(source)
+            self.assertEqual((result.stderr, result.returncode), (f'{context.exception}\n', 1), source)
+
+    def test_unsupported_programs(self):
+        for source in ['print "a";', 'try { print 1; } catch { }', 'let a = array(3);',
+                       'function f() { function g() { return 1; } return g(); }']:
+            with self.assertRaises(Exception, msg=source) as context:
+                generate_cpp(parse(source))
+            self.assertTrue(str(context.exception).startswith('The C++ backend does not support'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import unittest
+
+import build_lexer_tables
+from lexer import LEXER_ENGINES, Lexer, RegexLexer, TableLexer, create_lexer
+
+
+SAMPLE = '''
+# leading comment
+let x = 5 + 3.25 * (y_1 - 2) % 7;   // trailing comment
+if (x <= 10 && y >= 2 || !done) { print "hi \\"there\\""; }
+while (a != b) { let a = a[i] / 2; }
+function add(a, b) { return a + b; }
+try { let z = 1.; } catch { print z; }
+let w = a < b; let v = a > b; let c = 'c';
+elif do switch case default: break continue finally then class
+i++ j-- p->q .5 x.y true false int string void
+'''
+
+
+def token_stream(lexer):
+    tokens = []
+    while True:
+        token = lexer.get_next_token()
+        tokens.append((token.type, token.value))
+        if token.type == 'EOF':
+            return tokens
+
+
+def token_spans(lexer):
+    spans = []
+    while True:
+        token = lexer.get_next_token()
+        spans.append((token.type, token.start, token.end))
+        if token.type == 'EOF':
+            return spans
+
+
+def error_message(lexer):
+    try:
+        token_stream(lexer)
+    except Exception as error:
+        return str(error)
+
+
+class TestLexers(unittest.TestCase):
+    def test_same_token_stream(self):
+        expected = token_stream(Lexer(SAMPLE))
+        for lexer_class in [RegexLexer, TableLexer]:
+            self.assertEqual(token_stream(lexer_class(SAMPLE)), expected, lexer_class.__name__)
+
+    def test_same_token_spans(self):
+        expected = token_spans(Lexer(SAMPLE))
+        self.assertEqual(expected[:3], [('LET', 19, 22), ('WORD', 23, 24), ('EQUALS', 25, 26)])
+        self.assertEqual(expected[-1], ('EOF', len(SAMPLE), len(SAMPLE)))
+        for lexer_class in [RegexLexer, TableLexer]:
+            self.assertEqual(token_spans(lexer_class(SAMPLE)), expected, lexer_class.__name__)
+
+    def test_start_offset(self):
+        for lexer_class in LEXER_ENGINES.values():
+            self.assertEqual(token_spans(lexer_class('let x = 1; print x;', 11)),
+                             [('PRINT', 11, 16), ('WORD', 17, 18), ('SEMICOLON', 18, 19), ('EOF', 19, 19)])
+
+    def test_eof_after_trailing_comment(self):
+        for source in ['let x = 1; // c', 'let x = 1; # c', 'let x = 1; // c\n']:
+            for lexer_class in LEXER_ENGINES.values():
+                self.assertEqual(token_spans(lexer_class(source))[-1], ('EOF', len(source), len(source)),
+                                 (source, lexer_class.__name__))
+
+    def test_grammar_tokens(self):
+        self.assertEqual(token_stream(Lexer("i++ -> 1. .5 'c' [x] string")), [
+            ('WORD', 'i'), ('INCREMENT', '++'), ('ARROW', '->'), ('NUMBER', 1), ('DOT', '.'),
+            ('NUMBER', 0.5), ('CHAR_LITERAL', 'c'), ('LBRACKET', '['), ('WORD', 'x'),
+            ('RBRACKET', ']'), ('STRING_TYPE', 'string'), ('EOF', None)])
+
+    def test_empty_source(self):
+        for lexer_class in LEXER_ENGINES.values():
+            self.assertEqual(token_stream(lexer_class('')), [('EOF', None)])
+            self.assertEqual(token_stream(lexer_class('  # only a comment')), [('EOF', None)])
+
+    def test_same_errors(self):
+        for source in ['let x = @;', 'a & b', 'a |', '"unterminated', "'\\", 'é']:
+            expected = error_message(Lexer(source))
+            self.assertIsNotNone(expected, source)
+            for lexer_class in [RegexLexer, TableLexer]:
+                self.assertEqual(error_message(lexer_class(source)), expected, (source, lexer_class.__name__))
+
+    def test_create_lexer(self):
+        self.assertIsInstance(create_lexer('x', engine='regex'), RegexLexer)
+        self.assertIsInstance(create_lexer('x', engine='table'), TableLexer)
+        self.assertIsInstance(create_lexer('x'), Lexer)
+        with self.assertRaises(ValueError):
+            create_lexer('x', engine='nope')
+
+
+class TestLexerTables(unittest.TestCase):
+    def test_tables_match_grammar(self):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lexer_tables.py')
+        with open(path, encoding='utf-8') as handle:
+            self.assertEqual(handle.read(), build_lexer_tables.generate(),
+                             'lexer_tables.py is stale; run build_lexer_tables.py')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+from ast_nodes import dump
+from code_generator import generate_code
+from lexer import Lexer
+from optimizer import DEFAULT_PASSES, Optimizer, optimize
+from parser import Parser
+
+
+def optimized(source, passes=DEFAULT_PASSES, disabled=()):
+    program = Parser(Lexer(source)).parse()
+    optimize(program, passes, disabled)
+    return ''.join(generate_code(program.statements))
+
+
+class TestOptimizer(unittest.TestCase):
+    def test_constant_folding(self):
+        self.assertEqual(optimized('let x = 5 + 3 * 2; print -(1 - 3) / 4; print !(1 < 2) || y;', ['fold']),
+                         'let x = 11;\nprint 0.5;\nprint (false || y);\n')
+        self.assertEqual(optimized('print 0 && f(); print 1 || g(); print "a" + "b";', ['fold']),
+                         'print false;\nprint true;\nprint "ab";\n')
+
+    def test_failing_and_huge_operations_are_left_alone(self):
+        self.assertEqual(optimized('print 1 / 0; print "a" - 1; print "ab" * 100000;', ['fold']),
+                         'print (1 / 0);\nprint ("a" - 1);\nprint ("ab" * 100000);\n')
+
+    def test_folded_floats_generate_source_that_parses_back(self):
+        big = '1' + '0' * 300 + '.0'
+        source = (f'print 100000000000000000000.0 * 10.0; print 0.1 * 0.0000001; print -(0.5 * 0.0000001); '
+                  f'print {big} * {big}; print {big} * {big} - {big} * {big};')
+        program = Parser(Lexer(source)).parse()
+        optimize(program)
+        code = ''.join(generate_code(program.statements))
+        self.assertEqual(code.splitlines()[:3], ['print 1000000000000000000000.0;', 'print 0.00000001;',
+                                                 'print -0.00000005;'])
+        # A negative literal reads back as a negation, which folds again.
+        reparsed = Parser(Lexer(code)).parse()
+        optimize(reparsed)
+        self.assertEqual(dump(reparsed), dump(program))
+        # inf and nan are not folded, since no literal could hold them.
+        self.assertEqual(code.count(f'({big} * {big})'), 3)
+
+    def test_constant_propagation(self):
+        self.assertEqual(optimized('let x = 2; let y = x * 3; print y + x;'),
+                         'let x = 2;\nlet y = 6;\nprint 8;\n')
+        # Loops reassign, and globals can change before a function runs.
+        self.assertEqual(optimized('let i = 0; while (i < 3) { let i = i + 1; } print i; '
+                                   'let n = 1; function f() { let k = 2; return n + k; }'),
+                         'let i = 0;\nwhile ((i < 3)) {\n    let i = (i + 1);\n}\nprint i;\n'
+                         'let n = 1;\nfunction f() {\n    let k = 2;\n    return (n + 2);\n}\n')
+
+    def test_branches_merge_what_they_agree_on(self):
+        self.assertEqual(optimized('if (c) { let a = 1; let b = 2; } else { let a = 1; let b = 3; } print a + b;',
+                                   ['propagate']),
+                         'if (c) {\n    let a = 1;\n    let b = 2;\n} else {\n    let a = 1;\n    let b = 3;\n}\n'
+                         'print (1 + b);\n')
+        self.assertEqual(optimized('let t = 1; try { let t = 2; } catch { } print t;', ['propagate']),
+                         'let t = 1;\ntry {\n    let t = 2;\n} catch { }\nprint t;\n')
+
+    def test_dead_branches(self):
+        self.assertEqual(optimized('let debug = 0; if (debug) { print 1; } else { print 2; } '
+                                   'while (debug) { print 3; } for (let i = 0; debug; let i = i + 1;) { print i; }'),
+                         'let debug = 0;\nprint 2;\nlet i = 0;\n')
+
+    def test_unreachable_code(self):
+        self.assertEqual(optimized('function f(a) { if (a) { return 1; } else { return 2; } print 3; } '
+                                   'function g() { return 0; print 4; let x = 1; }', ['unreachable']),
+                         'function f(a) {\n    if (a) {\n        return 1;\n    } else {\n        return 2;\n    }\n}\n'
+                         'function g() {\n    return 0;\n}\n')
+
+    def test_passes_can_be_turned_off(self):
+        self.assertEqual(optimized('let x = 1 + 1; print x;', disabled=['propagate']), 'let x = 2;\nprint x;\n')
+        with self.assertRaises(ValueError):
+            optimize(Parser(Lexer('')).parse(), disabled=['inline'])
+        with self.assertRaises(ValueError):
+            Optimizer(['fold', 'inline'])
+
+    def test_stats(self):
+        optimizer = Optimizer()
+        optimizer.optimize(Parser(Lexer('let x = 2 * 3; if (x > 5) { print x; } return 0; print 1;')).parse())
+        self.assertEqual({name: stats.changes for name, stats in optimizer.stats.items()},
+                         {'propagate': 2, 'fold': 2, 'dead-branches': 1, 'unreachable': 1})
+        self.assertTrue(all(stats.runs == optimizer.rounds for stats in optimizer.stats.values()))
+
+    def test_folded_literals_keep_the_span(self):
+        program = Parser(Lexer('let x = 5 + 3 * 2;')).parse()
+        optimize(program)
+        value = program.statements[0].value
+        self.assertEqual((value.value, value.start, value.end), (11, 8, 17))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from ast_nodes import dump
+from lexer import RegexLexer
+from parse_cache import ParseCache
+from parser import Parser
+
+
+SOURCE = 'let x = 1 + 2 * y;\nif (x > 2) { print x; } else { print -x; }\n'
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp.name, 'cache')
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_hit_returns_same_tree(self):
+        cache = ParseCache(self.directory)
+        first = cache.parse(SOURCE)
+        second = ParseCache(self.directory).parse(SOURCE)
+        self.assertEqual(dump(second, spans=True), dump(first, spans=True))
+        self.assertEqual(dump(second), dump(Parser(RegexLexer(SOURCE)).parse()))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_parse_file(self):
+        path = os.path.join(self.temp.name, 'main.wmzl')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(SOURCE)
+        cache = ParseCache(self.directory)
+        cache.parse_file(path)
+        cache.parse_file(path)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_key_covers_source_and_version(self):
+        cache = ParseCache(self.directory)
+        cache.parse(SOURCE)
+        cache.parse(SOURCE + 'print 1;')
+        newer = ParseCache(self.directory, version='next')
+        newer.parse(SOURCE)
+        self.assertEqual((cache.misses, newer.misses), (2, 1))
+        self.assertEqual(len(cache.entries()), 3)
+
+    def test_damaged_entry_is_a_miss(self):
+        cache = ParseCache(self.directory)
+        cache.parse(SOURCE)
+        with open(cache.entry_path(cache.key(SOURCE.encode('utf-8'))), 'wb') as handle:
+            handle.write(b'not a pickle')
+        self.assertEqual(dump(cache.parse(SOURCE)), dump(Parser(RegexLexer(SOURCE)).parse()))
+        self.assertEqual(cache.misses, 2)
+        cache.parse(SOURCE)
+        self.assertEqual(cache.hits, 1)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ParseCache(self.directory)
+        sources = [f'let v{n} = {n};' for n in range(4)]
+        for n, source in enumerate(sources):
+            cache.parse(source)
+            os.utime(cache.entry_path(cache.key(source.encode('utf-8'))), ns=(n * 10 ** 9, n * 10 ** 9))
+        entry_size = cache.size() // 4
+        cache.max_bytes = entry_size * 3
+        cache.parse(sources[0])
+        os.utime(cache.entry_path(cache.key(sources[0].encode('utf-8'))), ns=(10 ** 10, 10 ** 10))
+        cache.parse('let w = 5;')
+        names = {path for _, _, path in cache.entries()}
+        self.assertIn(cache.entry_path(cache.key(sources[0].encode('utf-8'))), names)
+        self.assertNotIn(cache.entry_path(cache.key(sources[1].encode('utf-8'))), names)
+        self.assertLessEqual(cache.size(), cache.max_bytes)
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.tmp')], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from ast_nodes import BinaryOpNode, UnaryOpNode, VariableNode
+from lexer import Lexer
+from parser import Parser
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+def show(node):
+    if isinstance(node, BinaryOpNode):
+        return f'({show(node.left)} {node.operator} {show(node.right)})'
+    if isinstance(node, UnaryOpNode):
+        return f'({node.operator}{show(node.operand)})'
+    if isinstance(node, VariableNode):
+        return node.name
+    return str(node.value)
+
+
+class TestParser(unittest.TestCase):
+    def test_blocks(self):
+        program = parse('if (x < 5) { print x; let y = 1; } else { print y; } while (y) { let y = y - 1; }')
+        if_node, while_node = program.statements
+        self.assertEqual([type(node).__name__ for node in if_node.then_body], ['PrintNode', 'AssignmentNode'])
+        self.assertEqual(if_node.else_body[0].expression.name, 'y')
+        self.assertEqual(while_node.body[0].target, 'y')
+
+    def test_precedence_and_associativity(self):
+        expression = parse('let r = a || b && c == d < e + f * g - h % i / j;').statements[0].value
+        self.assertEqual(show(expression), '(a || (b && (c == (d < ((e + (f * g)) - ((h % i) / j))))))')
+        expression = parse('let r = 1 - 2 - 3 <= 4 >= 5 != !x;').statements[0].value
+        self.assertEqual(show(expression), '(((((1 - 2) - 3) <= 4) >= 5) != (!x))')
+
+    def test_unary_binds_tighter_than_binary(self):
+        expression = parse('let r = -a * -(b + c);').statements[0].value
+        self.assertEqual(show(expression), '((-a) * (-(b + c)))')
+
+    def test_node_spans(self):
+        source = 'let r = -a * (b + 1);\nprint f(r, x[2]);'
+        assignment, print_node = parse(source).statements
+        self.assertEqual(source[assignment.start:assignment.end], 'let r = -a * (b + 1);')
+        self.assertEqual(source[assignment.value.start:assignment.value.end], '-a * (b + 1)')
+        self.assertEqual(source[assignment.value.right.start:assignment.value.right.end], '(b + 1)')
+        call = print_node.expression
+        self.assertEqual(source[call.start:call.end], 'f(r, x[2])')
+        self.assertEqual(source[call.arguments[1].start:call.arguments[1].end], 'x[2]')
+
+    def test_iter_statements_is_lazy(self):
+        statements = Parser(Lexer('print 1; let x = 2; } print 3;')).iter_statements()
+        self.assertEqual(next(statements).expression.value, 1)
+        self.assertEqual(next(statements).target, 'x')
+        with self.assertRaises(Exception):
+            next(statements)
+
+    def test_stray_closing_brace(self):
+        with self.assertRaises(Exception):
+            parse('let x = 1; }')
+
+
+if __name__ == '__main__':
+    unittest.main()
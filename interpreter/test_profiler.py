@@ -0,0 +1,101 @@
+import io
+import json
+import unittest
+
+from lexer import Lexer
+from parser import Parser
+from profiler import PROGRAM, Profile, profile, sample
+
+
+SOURCE = '''function fib(n) {
+    if (n < 2) { return n; }
+    return fib(n - 1) + fib(n - 2);
+}
+print fib(10);
+'''
+
+# Calls with distinct arguments, so that memoizing `spin` saves nothing.
+SPIN = '''function spin(k) {
+    let i = 0;
+    while (i < k) { let i = i + 1; }
+    return i;
+}
+let j = 0;
+while (j < 40) { let r = spin(2000 + j); let j = j + 1; }
+'''
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.profile = profile(parse(SOURCE), self.output, SOURCE)
+
+    def test_counts(self):
+        self.assertEqual(self.output.getvalue(), '55\n')
+        self.assertEqual(self.profile.functions['fib'].count, 177)
+        self.assertEqual(self.profile.lines[2].count, 177)
+        self.assertEqual(self.profile.lines[3].count, 88)
+        self.assertEqual(self.profile.lines[5].count, 1)
+        # `n < 2`, and its `n`, which starts where it does.
+        at_comparison = sorted((type(stats.node).__name__, stats.count) for stats in self.profile.nodes.values()
+                               if (stats.line, stats.column) == (2, 9))
+        self.assertEqual(at_comparison, [('BinaryOpNode', 177), ('VariableNode', 177)])
+
+    def test_times(self):
+        functions = self.profile.functions
+        self.assertGreaterEqual(functions[PROGRAM].inclusive, functions['fib'].inclusive)
+        self.assertGreater(functions['fib'].exclusive, 0)
+        for stats in [*functions.values(), *self.profile.lines.values(), *self.profile.nodes.values()]:
+            self.assertGreaterEqual(stats.inclusive, stats.exclusive - 1e-9)
+        node_time = sum(stats.exclusive for stats in self.profile.nodes.values())
+        self.assertAlmostEqual(sum(self.profile.stacks.values()), node_time)
+        self.assertAlmostEqual(sum(stats.exclusive for stats in functions.values()), node_time)
+
+    def test_exports(self):
+        lines = self.profile.collapsed().splitlines()
+        stacks = {line.rsplit(' ', 1)[0] for line in lines}
+        self.assertIn('<program>;fib;fib', stacks)
+        self.assertTrue(all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines))
+        exported = json.loads(json.dumps(self.profile.as_json()))
+        self.assertEqual(exported['unit'], 'seconds')
+        self.assertEqual(exported['functions']['fib']['count'], 177)
+        self.assertEqual(exported['lines']['2']['count'], 177)
+        self.assertIn({'stack': ['<program>', 'fib', 'fib'], 'exclusive': self.profile.stacks[(PROGRAM, 'fib', 'fib')]},
+                      exported['stacks'])
+        self.assertIn('fib', self.profile.report())
+
+
+class TestSampling(unittest.TestCase):
+    def test_samples(self):
+        for engine in ['tree', 'closure']:
+            result = sample(parse(SPIN), engine, source=SPIN, interval=0.001)
+            self.assertGreater(result.functions['spin'].inclusive, 0, engine)
+            self.assertEqual(result.functions[PROGRAM].inclusive, sum(result.stacks.values()), engine)
+            if engine == 'tree':
+                self.assertGreater(result.lines[3].exclusive, 0)
+
+    def test_add_sample(self):
+        program = parse(SOURCE)
+        result = Profile('samples', SOURCE)
+        call = program.statements[1].expression
+        result.add_sample([program.statements[1], call], ['fib', 'fib'])
+        result.add_sample([program.statements[1]], [])
+        self.assertEqual(result.stacks, {(PROGRAM, 'fib', 'fib'): 1, (PROGRAM,): 1})
+        self.assertEqual((result.functions['fib'].inclusive, result.functions['fib'].exclusive), (1, 1))
+        self.assertEqual((result.lines[5].inclusive, result.lines[5].exclusive), (2, 2))
+        self.assertEqual(result.node_stats(call).exclusive, 1)
+        self.assertEqual(result.collapsed(), '<program> 1\n<program>;fib;fib 1\n')
+
+    def test_arguments(self):
+        with self.assertRaises(ValueError):
+            sample(parse(SPIN), 'bytecode')
+        with self.assertRaises(ValueError):
+            sample(parse(SPIN), interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
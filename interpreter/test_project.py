@@ -0,0 +1,76 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import project
+from project import check_project, discover_sources, line_and_column, line_starts
+
+
+class TestProject(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.root = self.temp.name
+        self.write('a.wmzl', 'let x = 1;\nprint x;\n')
+        self.write('names.wmzl', 'function f(a) {\n  return a + b + len(a);\n}\nprint f(x);\nprint g();\nlet x = 1;\n')
+        self.write('lib/b.wmzl', 'let y = 2;\nif (y) {\n  print y +;\n}\n')
+        self.write('lib/c.wmzl', 'let z = @;\n')
+        self.write('notes.txt', 'not a source')
+        self.write('.hidden/d.wmzl', 'let w = 3;')
+        self.write('__wmzlcache__/e.wmzl', 'let v = 4;')
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(text)
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def test_discover_sources(self):
+        self.assertEqual(discover_sources([self.root, self.path('notes.txt'), self.path('a.wmzl')]),
+                         sorted([self.path('a.wmzl'), self.path('lib/b.wmzl'), self.path('lib/c.wmzl'),
+                                 self.path('names.wmzl'), self.path('notes.txt')]))
+
+    def test_line_and_column(self):
+        starts = line_starts('ab\ncd\n\nef')
+        self.assertEqual([line_and_column(starts, offset) for offset in [0, 1, 3, 6, 7, 8]],
+                         [(1, 1), (1, 2), (2, 1), (3, 1), (4, 1), (4, 2)])
+
+    def test_reports_in_path_order(self):
+        for jobs in [1, 2]:
+            reports = list(check_project([self.root], jobs=jobs))
+            self.assertEqual([report.path for report in reports],
+                             [self.path('a.wmzl'), self.path('lib/b.wmzl'), self.path('lib/c.wmzl'),
+                              self.path('names.wmzl')])
+            self.assertEqual([len(report.diagnostics) for report in reports], [0, 1, 1, 2])
+            self.assertEqual(reports[0].statement_count, 2)
+            diagnostic = reports[1].diagnostics[0]
+            self.assertEqual((diagnostic.line, diagnostic.column), (3, 12))
+            self.assertEqual(str(diagnostic), f'{self.path("lib/b.wmzl")}:3:12: Invalid syntax with token SEMICOLON (;)')
+
+    def test_unresolved_names(self):
+        report = project.check_file(self.path('names.wmzl'))
+        self.assertEqual([str(diagnostic) for diagnostic in report.diagnostics], [
+            f'{self.path("names.wmzl")}:2:14: Undefined variable: b',
+            f'{self.path("names.wmzl")}:5:7: Undefined function: g',
+        ])
+        self.assertEqual(report.statement_count, 4)
+
+    def test_main_exit_status(self):
+        with redirect_stdout(io.StringIO()) as output, redirect_stderr(io.StringIO()) as summary:
+            status = project.main(['project.py', '--jobs', '1', '--timings', self.root])
+        self.assertEqual(status, 1)
+        self.assertIn('Invalid character: @', output.getvalue())
+        self.assertIn('Checked 4 files', summary.getvalue())
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            self.assertEqual(project.main(['project.py', self.path('a.wmzl')]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
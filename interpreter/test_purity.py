@@ -0,0 +1,111 @@
+import io
+import unittest
+
+from interpreter import run_program
+from lexer import Lexer
+from parser import Parser
+from purity import memoize, pure_functions
+from resolver import resolve
+from runtime import UNSET, MemoCache
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+def pure(source):
+    program = parse(source)
+    resolve(program)
+    return set(pure_functions(program))
+
+
+FIB = 'function fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); } '
+
+
+class TestPurity(unittest.TestCase):
+    def test_pure_functions(self):
+        self.assertEqual(pure(FIB), {'fib'})
+        self.assertEqual(pure('function f(x) { let y = abs(x); for (let i = 0; i < 3; let i = i + 1;) '
+                              '{ let y = y + i; } return max(y, 1); }'), {'f'})
+        self.assertEqual(pure('function even(n) { if (n == 0) { return true; } return odd(n - 1); } '
+                              'function odd(n) { if (n == 0) { return false; } return even(n - 1); }'),
+                         {'even', 'odd'})
+
+    def test_impure_functions(self):
+        for source in ['function f(x) { print x; return x; }',
+                       'let k = 2; function f(x) { return x * k; }',
+                       'function f(x) { let x = x + y; return x; }',
+                       'function f(x) { function g() { return 1; } return g(); }',
+                       'function f(n) { return array(n, 0); }',
+                       'function f(x) { return x; } let f = 1;',
+                       'function f(x) { return x; } function f(x) { return -x; }',
+                       'if (true) { function f(x) { return x; } }']:
+            self.assertEqual(pure(source), set(), source)
+
+    def test_impure_callees(self):
+        source = ('function log(x) { print x; return x; } function f(x) { return log(x) + 1; } '
+                  'function g(x) { return f(x) * 2; } function h(x) { return x + 1; }')
+        self.assertEqual(pure(source), {'h'})
+
+    def test_memoize_opt_out(self):
+        program = parse(FIB + 'function sq(x) { return x * x; }')
+        self.assertEqual(memoize(program, exclude={'sq'}), {'fib'})
+        self.assertEqual([statement.memo_size for statement in program.statements], [1024, 0])
+        self.assertEqual(memoize(program, size=0), set())
+
+
+class TestCaching(unittest.TestCase):
+    def run_source(self, source, engine, **options):
+        output = io.StringIO()
+        globals = run_program(parse(source), engine, output, **options)
+        return output.getvalue(), globals
+
+    def test_hits_and_misses(self):
+        for engine in ['tree', 'closure']:
+            output, globals = self.run_source(FIB + 'print fib(60); print fib(60);', engine)
+            self.assertEqual(output, '1548008755920\n1548008755920\n', engine)
+            cache = globals['fib'].cache
+            self.assertEqual((cache.hits, cache.misses), (59, 61), engine)
+
+    def test_opt_out_and_other_engines(self):
+        for engine, options in [('tree', {'unmemoized': {'fib'}}), ('closure', {'memo_size': 0}),
+                                ('bytecode', {}), ('python', {}), ('ir', {})]:
+            output, globals = self.run_source(FIB + 'print fib(15);', engine, **options)
+            self.assertEqual(output, '610\n', engine)
+            if engine in ('tree', 'closure'):
+                self.assertIsNone(globals['fib'].cache, engine)
+
+    def test_uncached_arguments_and_errors(self):
+        source = ('function at(a, i) { return a[i]; } function inv(x) { return 1 / x; } '
+                  'function show(x) { return str(x); } '
+                  'let a = array(2, 1); print at(a, 0); let a = array(2, 5); print at(a, 0); '
+                  'print show(0.0); print show(-0.0); '
+                  'try { print inv(0); } catch { print "error"; } try { print inv(0); } catch { print "again"; }')
+        for engine in ['tree', 'closure']:
+            output, globals = self.run_source(source, engine)
+            self.assertEqual(output, '1\n5\n0.0\n-0.0\nerror\nagain\n', engine)
+            self.assertEqual(globals['at'].cache.misses, 0, engine)
+            self.assertEqual(globals['show'].cache.misses, 2, engine)
+            self.assertEqual(globals['inv'].cache.misses, 2, engine)
+
+
+class TestMemoCache(unittest.TestCase):
+    def test_keys(self):
+        cache = MemoCache(4)
+        self.assertEqual(len({cache.key([1]), cache.key([1.0]), cache.key([True])}), 3)
+        self.assertNotEqual(cache.key([0.0]), cache.key([-0.0]))
+        self.assertIsNone(cache.key([1, [2]]))
+
+    def test_least_recently_used_eviction(self):
+        cache = MemoCache(2)
+        cache.store(cache.key([1]), 'one')
+        cache.store(cache.key([2]), 'two')
+        self.assertEqual(cache.lookup(cache.key([1])), 'one')
+        cache.store(cache.key([3]), 'three')
+        self.assertIs(cache.lookup(cache.key([2])), UNSET)
+        self.assertEqual(cache.lookup(cache.key([1])), 'one')
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import os
+import tempfile
+import types
+import unittest
+
+from lexer import Lexer
+from parser import Parser
+from python_compiler import PYTHON_CODE_VERSION, CodeCache, compile_python, source_hash
+
+
+SOURCE = '''
+function count_up(n) { let d = 0; while (d < n) { let d = d + 1; } return d; }
+function shadow(n) { if (n) { let total = 1; } let total = total + n; return total; }
+let total = 10;
+print count_up(3);
+print shadow(0);
+print shadow(2);
+'''
+
+
+def compile_source(source):
+    return compile_python(Parser(Lexer(source)).parse())
+
+
+def function_code(program, name):
+    for constant in program.code.co_consts:
+        if isinstance(constant, types.CodeType) and constant.co_name == 'w_' + name:
+            return constant
+    raise KeyError(name)
+
+
+class TestPythonCompiler(unittest.TestCase):
+    def test_functions_are_python_functions(self):
+        output = io.StringIO()
+        scope = compile_source(SOURCE).run(output)
+        self.assertEqual(output.getvalue(), '3\n10\n3\n')
+        self.assertIsInstance(scope['count_up'], types.FunctionType)
+        self.assertEqual(scope['total'], 10)
+
+    def test_locals_are_fast_locals(self):
+        program = compile_source(SOURCE)
+        count_up = function_code(program, 'count_up')
+        self.assertEqual(count_up.co_varnames, ('w_n', 'w_d'))
+        self.assertNotIn('_UNSET', count_up.co_names)
+        # `total` may be read before `shadow` binds it, so that read checks.
+        self.assertIn('_UNSET', function_code(program, 'shadow').co_names)
+
+    def test_runs_start_from_scratch(self):
+        program = compile_source('let n = 0; let n = n + 1; print n;')
+        for _ in range(2):
+            output = io.StringIO()
+            self.assertEqual(program.run(output), {'n': 1})
+            self.assertEqual(output.getvalue(), '1\n')
+
+    def test_errors_keep_their_python_type_when_not_translated(self):
+        with self.assertRaises(TypeError):
+            compile_source('print 1 + "a";').run(io.StringIO())
+        with self.assertRaises(TypeError):
+            compile_source('print len(5);').run(io.StringIO())
+
+
+class TestCodeCache(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp.name, 'cache')
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_hit_skips_code_generation(self):
+        path = os.path.join(self.temp.name, 'main.wmzl')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(SOURCE)
+        cache = CodeCache(self.directory)
+        cache.compile_file(path)
+        program = CodeCache(self.directory).compile_file(path)
+        output = io.StringIO()
+        program.run(output)
+        self.assertEqual(output.getvalue(), '3\n10\n3\n')
+        self.assertEqual(program.sites, compile_source(SOURCE).sites)
+        self.assertTrue(all(path.endswith('.pyc') for _, _, path in cache.entries()))
+
+    def test_errors_are_translated_after_a_hit(self):
+        cache = CodeCache(self.directory)
+        source = 'function f(a) { return a; } print f();'
+        cache.compile(source)
+        program = CodeCache(self.directory).compile(source)
+        with self.assertRaises(Exception) as context:
+            program.run(io.StringIO())
+        self.assertEqual(str(context.exception), 'f() takes 1 arguments but 0 were given')
+
+    def test_key_covers_python_version(self):
+        cache = CodeCache(self.directory)
+        cache.compile(SOURCE)
+        other = CodeCache(self.directory, version='other')
+        other.compile(SOURCE)
+        self.assertEqual((cache.misses, other.misses, other.hits), (1, 1, 0))
+
+    def test_key_covers_the_compiler_source(self):
+        path = os.path.join(self.temp.name, 'compiler.py')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write('PREFIX = "w_"\n')
+        before = source_hash([path])
+        with open(path, 'a', encoding='utf-8') as handle:
+            handle.write('# edited\n')
+        self.assertNotEqual(source_hash([path]), before)
+        self.assertIn(PYTHON_CODE_VERSION, CodeCache(self.directory).version)
+
+
+if __name__ == '__main__':
+    unittest.main()
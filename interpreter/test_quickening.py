@@ -0,0 +1,120 @@
+import io
+import unittest
+
+from budget import Budget, LimitExceeded
+from interpreter import BudgetedInterpreter, Interpreter
+from lexer import Lexer
+from parser import Parser
+from quickening import MAX_DEOPTS, QUICKEN_AFTER, counters
+from test_interpreter import ERRORS, PROGRAMS
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+class EagerInterpreter(Interpreter):
+    """Quickens every operation on its first evaluation."""
+
+    quicken_after = 1
+
+
+def run(source, interpreter_class=EagerInterpreter):
+    output = io.StringIO()
+    interpreter = interpreter_class(None, output)
+    interpreter.visit(parse(source))
+    return output.getvalue(), interpreter
+
+
+class TestQuickening(unittest.TestCase):
+    def test_programs(self):
+        for source, expected in PROGRAMS:
+            self.assertEqual(run(source)[0], expected, source)
+
+    def test_errors(self):
+        for source, message in ERRORS:
+            with self.assertRaises(Exception) as context:
+                run(source)
+            self.assertEqual(str(context.exception), message, source)
+
+    def test_counters(self):
+        # A while loop: the vectorizer would run a for loop like this one as
+        # whole-array operations, without evaluating its operations.
+        source = ('function f(n) { let total = 0; let i = 0; '
+                  'while (i < n) { let total = total + i * 2; let i = i + 1; } return total; } print f(100);')
+        output, interpreter = run(source, Interpreter)
+        self.assertEqual(output, '9900\n')
+        evaluations = 100 - QUICKEN_AFTER
+        self.assertEqual(counters(interpreter.sites), {
+            'int < int': {'sites': 1, 'hits': evaluations + 1, 'misses': 0},
+            'int + int': {'sites': 2, 'hits': 2 * evaluations, 'misses': 0},
+            'int * int': {'sites': 1, 'hits': evaluations, 'misses': 0},
+        })
+
+    def test_guard_failure_deoptimizes(self):
+        # `x + x` adds ints, then floats, then strings: each change of type
+        # fails the guard of the site for the one before.
+        source = ('let x = 1; let y = 0; let i = 0; while (i < 30) { '
+                  'if (i == 10) { let x = 0.5; } if (i == 20) { let x = "a"; } let y = x + x; let i = i + 1; } print y;')
+        program = parse(source)
+        interpreter = Interpreter(None, io.StringIO())
+        interpreter.visit(program)
+        self.assertEqual(interpreter.output.getvalue(), 'aa\n')
+        addition = program.statements[3].body[2].value
+        sites = [(site.kind, site.hits, site.misses) for site in interpreter.sites if site.node is addition]
+        # The evaluation failing a guard is the deoptimized site's last, not
+        # one towards the next.
+        self.assertEqual(sites, [(int, 10 - QUICKEN_AFTER, 1), (float, 9 - QUICKEN_AFTER, 1),
+                                 (str, 9 - QUICKEN_AFTER, 0)])
+        self.assertIs(addition.quickened, interpreter.sites[-1])
+
+    def test_nodes_switching_types_become_megamorphic(self):
+        # `x` is an int for eight iterations, then a float for one: each
+        # float fails the guard of the int site.
+        source = ('let y = 0; let i = 0; while (i < 2000) { '
+                  'let x = 1; if (i % 9 == 8) { let x = 0.5; } let y = x + x; let i = i + 1; } print y;')
+        program = parse(source)
+        interpreter = Interpreter(None, io.StringIO())
+        interpreter.visit(program)
+        self.assertEqual(interpreter.output.getvalue(), '2\n')
+        addition = program.statements[2].body[2].value
+        sites = [site for site in interpreter.sites if site.node is addition]
+        self.assertEqual([(site.kind, site.misses) for site in sites], [(int, MAX_DEOPTS)])
+        self.assertIsNone(addition.quickened)
+
+    def test_mixed_operands_stay_generic(self):
+        source = 'let t = 0; let i = 0; while (i < 20) { let t = t + 0.5 * i; let i = i + 1; } print t;'
+        program = parse(source)
+        interpreter = EagerInterpreter(None, io.StringIO())
+        interpreter.visit(program)
+        self.assertEqual(interpreter.output.getvalue(), '95.0\n')
+        product = program.statements[2].body[0].value.right
+        self.assertIsNone(product.quickened)
+        self.assertNotIn(product, [site.node for site in interpreter.sites])
+        # `t` is an int only the first time round.
+        self.assertEqual(counters(interpreter.sites)['float + float']['hits'], 18)
+
+    def test_sites_belong_to_one_run(self):
+        program = parse('let t = 0; for (let i = 0; i < 20; let i = i + 1;) { let t = t + i; } print t;')
+        first = Interpreter(None, io.StringIO())
+        first.visit(program)
+        second = Interpreter(None, io.StringIO())
+        second.visit(program)
+        self.assertEqual(counters(first.sites), counters(second.sites))
+        self.assertTrue(second.sites)
+        self.assertFalse({id(site) for site in first.sites} & {id(site) for site in second.sites})
+
+    def test_budgeted_sites_check_allocation(self):
+        class EagerBudgetedInterpreter(BudgetedInterpreter):
+            quicken_after = 1
+
+        budget = Budget(max_allocation=1000)
+        budget.start()
+        interpreter = EagerBudgetedInterpreter(None, io.StringIO(), budget)
+        with self.assertRaises(LimitExceeded):
+            interpreter.visit(parse('let s = "ab"; while (true) { let s = s + s; }'))
+        self.assertEqual(counters(interpreter.sites)['str + str']['sites'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from ast_nodes import dump, walk
+from lexer import Lexer
+from parser import Parser
+from resolver import resolve
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+def reads(program, name):
+    """(slot, bound) of every read of `name`, in source order."""
+    nodes = [node for node in walk(program)
+             if getattr(node, 'name', getattr(node, 'callee', None)) == name and hasattr(node, 'bound')]
+    return [(node.slot, node.bound) for node in sorted(nodes, key=lambda node: node.start)]
+
+
+class TestResolver(unittest.TestCase):
+    def test_slots_put_parameters_first(self):
+        program = parse('function f(b, a) { let z = a; let c = b; function g() { return 1; } }')
+        resolve(program)
+        function = program.statements[0]
+        self.assertEqual(function.slot_names, ('b', 'a', 'c', 'g', 'z'))
+        self.assertIsNone(function.slot)
+        self.assertEqual([statement.slot for statement in function.body], [4, 2, 3])
+
+    def test_reads_are_bound_once_every_path_binds(self):
+        program = parse('''
+            function f(c) {
+                print x;
+                if (c) { let x = 1; let y = 1; } else { let x = 2; }
+                print x + y;
+                while (c) { print w; let w = 1; }
+                try { let v = 1; } catch { let v = 2; }
+                print v;
+            }
+            let x = 0; let y = 0; let w = 0;
+        ''')
+        resolve(program)
+        # Slots: c, then v, w, x, y.
+        self.assertEqual(reads(program, 'x'), [(3, False), (3, True)])
+        self.assertEqual(reads(program, 'y'), [(4, False)])
+        self.assertEqual(reads(program, 'w'), [(2, False)])
+        self.assertEqual(reads(program, 'v'), [(1, True)])
+        self.assertEqual(program.statements[0].unset_names, {'x', 'y', 'w'})
+
+    def test_nested_functions_do_not_see_enclosing_locals(self):
+        program = parse('function outer(n) { function inner() { return n; } return inner(); }')
+        self.assertEqual([message for _, message in resolve(program)], ['Undefined variable: n'])
+        self.assertEqual(reads(program, 'n'), [(None, False)])
+
+    def test_unresolved_names(self):
+        program = parse('print len(a); function f() { return g() + b; } let a = 1; print abs; print h(f());')
+        self.assertEqual([(type(node).__name__, message) for node, message in resolve(program)], [
+            ('FunctionCallNode', 'Undefined function: g'),
+            ('VariableNode', 'Undefined variable: b'),
+            ('VariableNode', 'Undefined variable: abs'),
+            ('FunctionCallNode', 'Undefined function: h'),
+        ])
+
+    def test_annotations_stay_out_of_dump(self):
+        program = parse('function f(a) { return a; } print f(1);')
+        before = dump(program)
+        resolve(program)
+        self.assertEqual(dump(program), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
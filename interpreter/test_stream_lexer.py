@@ -0,0 +1,43 @@
+import io
+import os
+import tempfile
+import unittest
+
+from lexer import RegexLexer
+from stream_lexer import StreamLexer
+from test_lexer import SAMPLE, token_spans, token_stream
+
+
+class TestStreamLexer(unittest.TestCase):
+    def test_tokens_across_chunk_boundaries(self):
+        source = SAMPLE + '\nlet s = "a long \\"string\\" literal";  // comment\n# another\na == b && c || d; 1.5 .25 x->y'
+        expected = token_stream(RegexLexer(source))
+        for chunk_size in [1, 2, 3, 5, 8, 64, 4096]:
+            lexer = StreamLexer(io.BytesIO(source.encode('utf-8')), chunk_size=chunk_size)
+            self.assertEqual(token_stream(lexer), expected, chunk_size)
+
+    def test_offsets_across_chunk_boundaries(self):
+        source = SAMPLE + '\n# comment spanning chunks\nlet s = "multi\nline"; x.y'
+        expected = token_spans(RegexLexer(source))
+        for chunk_size in [1, 3, 7, 4096]:
+            lexer = StreamLexer(io.BytesIO(source.encode('utf-8')), chunk_size=chunk_size)
+            self.assertEqual(token_spans(lexer), expected, chunk_size)
+
+    def test_reads_from_path(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.wmzl', encoding='utf-8', delete=False) as handle:
+            handle.write('let x = 1;\n')
+        try:
+            with StreamLexer(handle.name, chunk_size=4) as lexer:
+                self.assertEqual(token_stream(lexer)[:3], [('LET', 'let'), ('WORD', 'x'), ('EQUALS', '=')])
+        finally:
+            os.remove(handle.name)
+
+    def test_buffer_stays_bounded(self):
+        source = '# ' + 'x' * 100000 + '\n' + 'let y = 2;\n' * 10000
+        lexer = StreamLexer(io.BytesIO(source.encode('utf-8')), chunk_size=256)
+        self.assertEqual(len(token_stream(lexer)), 50001)
+        self.assertLess(lexer.peak_buffer_size, 2 * 256)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from ast_nodes import dump
+from lexer import RegexLexer
+from parser import Parser
+from test_lexer import SAMPLE, error_message, token_spans, token_stream
+from token_buffer import KIND_NAMES, TokenBuffer
+
+
+class TestTokenBuffer(unittest.TestCase):
+    def test_same_token_stream(self):
+        self.assertEqual(token_stream(TokenBuffer(SAMPLE)), token_stream(RegexLexer(SAMPLE)))
+        self.assertEqual(token_spans(TokenBuffer(SAMPLE)), token_spans(RegexLexer(SAMPLE)))
+
+    def test_packed_columns(self):
+        buffer = TokenBuffer('let x = 12.5;')
+        self.assertEqual([KIND_NAMES[buffer.kind(i)] for i in range(len(buffer))],
+                         ['LET', 'WORD', 'EQUALS', 'NUMBER', 'SEMICOLON', 'EOF'])
+        self.assertEqual(buffer.value(3), 12.5)
+        self.assertEqual(buffer.nbytes, len(buffer) * 9)
+
+    def test_same_errors(self):
+        for source in ['let x = @;', 'a & b', '"open', 'é']:
+            with self.assertRaises(Exception) as context:
+                TokenBuffer(source)
+            self.assertEqual(str(context.exception), error_message(RegexLexer(source)))
+
+    def test_parser_reads_buffer(self):
+        source = 'let x = (1 + 2.5) * 3 - 4 / 5; let y = 1 < 2 && 3 > 4 || 5 == 6;'
+        self.assertEqual(dump(Parser(TokenBuffer(source)).parse()), dump(Parser(RegexLexer(source)).parse()))
+
+    def test_peek_token(self):
+        program = Parser(TokenBuffer('let y = f(1, 2) + x;')).parse()
+        call = program.statements[0].value.left
+        self.assertEqual((call.callee, len(call.arguments)), ('f', 2))
+        self.assertEqual(program.statements[0].value.right.name, 'x')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from lexer import Lexer
+from parser import Parser
+from token_stream import TokenStream
+
+
+class CountingLexer(Lexer):
+    def __init__(self, text):
+        super().__init__(text)
+        self.calls = 0
+
+    def get_next_token(self):
+        self.calls += 1
+        return super().get_next_token()
+
+
+class TestTokenStream(unittest.TestCase):
+    def test_peek_does_not_consume(self):
+        lexer = CountingLexer('a b c d e f g h i j')
+        stream = TokenStream(lexer, capacity=2)
+        self.assertEqual(stream.peek(1).value, 'a')
+        self.assertEqual(stream.peek(7).value, 'g')
+        self.assertEqual(stream.peek(3).value, 'c')
+        self.assertEqual(lexer.calls, 7)
+        self.assertEqual([stream.get_next_token().value for _ in range(4)], ['a', 'b', 'c', 'd'])
+        self.assertEqual(stream.peek(5).value, 'i')
+        self.assertEqual([stream.get_next_token().value for _ in range(7)], ['e', 'f', 'g', 'h', 'i', 'j', None])
+        self.assertEqual(lexer.calls, 11)
+
+    def test_parser_identifiers(self):
+        program = Parser(Lexer('let r = a + f(b, g(c)) * arr[i + 1];')).parse()
+        expression = program.statements[0].value
+        self.assertEqual(expression.left.name, 'a')
+        call = expression.right.left
+        self.assertEqual((call.callee, call.arguments[1].callee), ('f', 'g'))
+        access = expression.right.right
+        self.assertEqual((access.name, access.index.left.name), ('arr', 'i'))
+
+
+if __name__ == '__main__':
+    unittest.main()
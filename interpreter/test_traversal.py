@@ -0,0 +1,123 @@
+import io
+import sys
+import unittest
+
+from ast_nodes import ASTVisitor, ProgramNode, dump
+from code_generator import CodeGeneratorVisitor
+from interpreter import EXECUTION_ENGINES, run_program
+from lexer import Lexer
+from optimizer import DEFAULT_PASSES, optimize
+from parser import Parser
+from traversal import run, traverse
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+class Sum(ASTVisitor):
+    """Adds up the literals of an expression, failing on variables."""
+
+    def visit_literal_node(self, node):
+        return node.value
+
+    def visit_variable_node(self, node):
+        raise Exception(f'Unknown: {node.name}')
+
+    def visit_binary_op_node(self, node):
+        left = yield node.left
+        right = yield node.right
+        return left + right
+
+    def visit_unary_op_node(self, node):
+        try:
+            return -(yield node.operand)
+        except Exception:
+            return 0
+
+
+class TestRun(unittest.TestCase):
+    def test_results_and_hooks(self):
+        events = []
+        expression = parse('print 1 + (2 + 4);').statements[0].expression
+        result = traverse(expression, Sum(), enter=lambda node: events.append(('enter', dump(node))),
+                          leave=lambda node, result: events.append(('leave', result)))
+        self.assertEqual(result, 7)
+        self.assertEqual(events, [
+            ('enter', ('BinaryOpNode', ('LiteralNode', 1), '+', ('BinaryOpNode', ('LiteralNode', 2), '+',
+                                                                  ('LiteralNode', 4)))),
+            ('enter', ('LiteralNode', 1)), ('leave', 1),
+            ('enter', ('BinaryOpNode', ('LiteralNode', 2), '+', ('LiteralNode', 4))),
+            ('enter', ('LiteralNode', 2)), ('leave', 2), ('enter', ('LiteralNode', 4)), ('leave', 4),
+            ('leave', 6), ('leave', 7)])
+
+    def test_errors_unwind_to_a_handler(self):
+        expression = parse('print 1 + -(2 + x);').statements[0].expression
+        self.assertEqual(traverse(expression, Sum()), 1)
+        with self.assertRaises(Exception) as context:
+            traverse(parse('print 1 + (2 + x);').statements[0].expression, Sum())
+        self.assertEqual(str(context.exception), 'Unknown: x')
+
+    def test_generators_run_as_nested_steps(self):
+        def count(node):
+            return 1 + (yield sum_of(node.statements))
+
+        def sum_of(statements):
+            total = 0
+            for statement in statements:
+                total += yield statement
+            return total
+
+        def dispatch(node):
+            return count(node) if isinstance(node, ProgramNode) else 1
+
+        self.assertEqual(run(parse('print 1; print 2;'), dispatch), 3)
+
+
+class TestDeepTrees(unittest.TestCase):
+    DEPTH = sys.getrecursionlimit() * 5
+    SOURCE = 'let a = 1; let total = ' + ' + '.join(['a'] * DEPTH) + '; print total;'
+
+    def test_code_generation(self):
+        code = CodeGeneratorVisitor().generate(parse(self.SOURCE))
+        chain = '(' * (self.DEPTH - 1) + 'a' + ' + a)' * (self.DEPTH - 1)
+        self.assertEqual(code, f'let a = 1;\nlet total = {chain};\nprint total;\n')
+
+    def test_dump(self):
+        tree = dump(parse(self.SOURCE).statements[1].value)
+        height = 1
+        while tree[0] == 'BinaryOpNode':
+            self.assertEqual(tree[2:], ('+', ('VariableNode', 'a')))
+            tree = tree[1]
+            height += 1
+        self.assertEqual((tree, height), (('VariableNode', 'a'), self.DEPTH))
+
+    def test_running(self):
+        for engine in EXECUTION_ENGINES:
+            for optimizations in [(), DEFAULT_PASSES]:
+                output = io.StringIO()
+                run_program(parse(self.SOURCE), engine, output, optimizations)
+                self.assertEqual(output.getvalue(), f'{self.DEPTH}\n', (engine, optimizations))
+
+    def test_running_deep_operands(self):
+        chain = ' + '.join(['a'] * self.DEPTH)
+        programs = [
+            ('function id(x) { return x; } print id(' + chain + ');', f'{self.DEPTH}\n'),
+            ('let xs = array(2, 6); print xs[' + ' - '.join(['a'] * self.DEPTH) + f' + {self.DEPTH - 1}];', '6\n'),
+            ('try { print ' + chain + ' + b; } catch { print "caught"; }', 'caught\n'),
+            ('print ' + ' && '.join(['a > 0'] * self.DEPTH) + ';', 'true\n'),
+        ]
+        for source, expected in programs:
+            for engine in EXECUTION_ENGINES:
+                output = io.StringIO()
+                run_program(parse('let a = 1; ' + source), engine, output)
+                self.assertEqual(output.getvalue(), expected, (engine, source[:40]))
+
+    def test_optimizing(self):
+        program = parse('let total = ' + ' + '.join(['1'] * self.DEPTH) + ';')
+        optimize(program)
+        self.assertEqual(dump(program), ('ProgramNode', [('AssignmentNode', 'total', ('LiteralNode', self.DEPTH))]))
+
+
+if __name__ == '__main__':
+    unittest.main()
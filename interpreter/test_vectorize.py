@@ -0,0 +1,91 @@
+import io
+import unittest
+
+import vectorize
+from interpreter import run_program
+from lexer import Lexer
+from parser import Parser
+from resolver import resolve
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+def loops(source):
+    program = parse(source)
+    resolve(program)
+    return [statement.vector_loop for statement in program.statements if hasattr(statement, 'vector_loop')]
+
+
+def run(source, engine):
+    output = io.StringIO()
+    try:
+        run_program(parse(source), engine, output)
+    except Exception as error:
+        return output.getvalue(), str(error)
+    return output.getvalue(), None
+
+
+SETUP = 'let n = 1000; let a = array(n, 1.5); let b = array(n, 3); let k = 2; let s = 0; let t = 0.0; '
+
+
+class TestRecognition(unittest.TestCase):
+    def test_element_wise_sums(self):
+        for body in ['let s = s + a[i] * b[i];',
+                     'let s = s + (a[i] - k) / b[i] % 4 + -i; let t = t + b[i] * 0.5;']:
+            source = SETUP + 'for (let i = 1; i <= n - 1; let i = i + 1;) { ' + body + ' }'
+            [loop] = loops(source)
+            self.assertIsNotNone(loop, body)
+
+    def test_loops_with_other_dependencies_are_not_vectorized(self):
+        for loop in ['for (let i = 0; i < n; let i = i + 1;) { let s = s + a[i + 1]; }',
+                     'for (let i = 0; i < n; let i = i + 1;) { let s = s * 2 + a[i]; }',
+                     'for (let i = 0; i < n; let i = i + 1;) { let s = s + t; let t = t + a[i]; }',
+                     'for (let i = 0; i < n; let i = i + 1;) { let s = s + a[i]; let s = s + 1; }',
+                     'for (let i = 0; i < n; let i = i + 1;) { let s = s + abs(a[i]); }',
+                     'for (let i = 0; i < n; let i = i + 1;) { let s = s + a[i]; print s; }',
+                     'for (let i = 0; i < n; let i = i + 1;) { let s = s + a[i]; let n = n - 1; }',
+                     'for (let i = 0; i < n; let i = i + 2;) { let s = s + a[i]; }',
+                     'for (let i = 0; i > n; let i = i + 1;) { let s = s + a[i]; }',
+                     'for (let i = 0; i < n; let i = i + 1;) { let s = s + a[i]; let a = b; }',
+                     'for (let i = 0; i < n; let i = i + 1;) { let s = s + (a[i] < 2); }']:
+            self.assertEqual(loops(SETUP + loop), [None], loop)
+
+
+class TestVectorLoops(unittest.TestCase):
+    PROGRAMS = [
+        'for (let i = 0; i < n; let i = i + 1;) { let s = s + b[i] * i % 7; let t = t + a[i] / b[i]; }',
+        'for (let i = 3; i <= n - 1; let i = i + 1;) { let t = t + a[i] * 0.1 - k; }',
+        'let s = 0.1; for (let i = 0; i < n; let i = i + 1;) { let s = s + a[i] * 0.1; }',
+        # Too short, out of range, a division by zero and an overflowing int64.
+        'for (let i = 0; i < 10; let i = i + 1;) { let s = s + b[i]; }',
+        'for (let i = 0; i <= n; let i = i + 1;) { let s = s + b[i]; }',
+        'for (let i = 0; i < n; let i = i + 1;) { let s = s + b[i] / (i - 500); }',
+        'let k = 4611686018427387904; for (let i = 0; i < n; let i = i + 1;) { let s = s + b[i] * k; }',
+        'for (let i = 0; i < n; let i = i + 1;) { let s = s + b[i] * missing; }',
+        'function f(m) { let x = 0; for (let j = 0; j < m; let j = j + 1;) { let x = x + a[j] * j; } '
+        'return x + j; } print f(n);',
+    ]
+
+    def test_engines_agree_with_and_without_numpy(self):
+        for program in self.PROGRAMS:
+            source = SETUP + program + ' print s; print t;'
+            expected = run(source, 'bytecode')
+            for engine in ['tree', 'closure']:
+                self.assertEqual(run(source, engine), expected, (engine, program))
+
+    @unittest.skipUnless(vectorize.numpy, 'needs numpy')
+    def test_loops_run_vectorized(self):
+        source = SETUP + self.PROGRAMS[0] + self.PROGRAMS[3] + ' print s; print t; print i;'
+        for engine in ['tree', 'closure']:
+            program = parse(source)
+            output = io.StringIO()
+            run_program(program, engine, output)
+            vector, short = program.statements[-5].vector_loop, program.statements[-4].vector_loop
+            self.assertEqual((vector.vectorized, vector.fallbacks, short.vectorized, short.fallbacks), (1, 0, 0, 1))
+            self.assertEqual(output.getvalue(), run(source, 'bytecode')[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from budget import Budget
+from worker_pool import WorkerPool, serve, submit_to
+
+
+class TestWorkerPool(unittest.TestCase):
+    def test_results_and_errors(self):
+        with WorkerPool(2) as pool:
+            futures = [pool.submit(f'let n = {n}; let a = array(2, n); print n * 2;') for n in range(6)]
+            failed = pool.submit('print 1; print 1 / 0;', engine='tree')
+            self.assertEqual([future.result().output for future in futures], [f'{n * 2}\n' for n in range(6)])
+            self.assertEqual(futures[3].result().values, {'n': 3, 'a': [3, 3]})
+            result = failed.result()
+            self.assertEqual((result.output, result.error), ('1\n', 'division by zero'))
+            self.assertTrue(pool.run('let x = ;').error.startswith('Invalid syntax'))
+            with self.assertRaises(ValueError):
+                pool.submit('print 1;', engine='jit')
+
+    def test_timeouts_replace_the_worker(self):
+        with WorkerPool(1, timeout=0.2) as pool:
+            hung = pool.run('print 1; while (true) { }')
+            self.assertEqual((hung.output, hung.error), ('', 'Timed out after 0.2 s'))
+            self.assertEqual(pool.run('while (true) { }', timeout=0.1).error, 'Timed out after 0.1 s')
+            self.assertEqual(pool.run('print 2;').output, '2\n')
+            self.assertEqual(pool.timeouts, 2)
+
+    def test_budgets_keep_the_worker(self):
+        with WorkerPool(1) as pool:
+            first = pool.run('print 1; while (true) { }', budget=Budget(max_steps=10000))
+            self.assertEqual((first.output, first.error), ('1\n', 'Step limit of 10000 exceeded'))
+            self.assertEqual(pool.run('print 2;').worker, first.worker)
+            with self.assertRaises(ValueError):
+                pool.submit('print 1;', engine='ir', budget=Budget(max_steps=10))
+
+    def test_recycling(self):
+        with WorkerPool(1, max_jobs=2) as pool:
+            workers = [pool.run('print 1;').worker for _ in range(5)]
+            self.assertEqual(pool.recycled, 2)
+        self.assertEqual(workers[0], workers[1])
+        self.assertEqual(workers[2], workers[3])
+        self.assertEqual(len(set(workers)), 3)
+        self.assertNotIn(os.getpid(), workers)
+
+
+class TestServer(unittest.TestCase):
+    def test_socket_jobs(self):
+        with tempfile.TemporaryDirectory() as directory, WorkerPool(1) as pool:
+            path = os.path.join(directory, 'jobs.sock')
+            with serve(path, pool) as server:
+                thread = threading.Thread(target=server.serve_forever, daemon=True)
+                thread.start()
+                try:
+                    result = submit_to(path, 'let s = "a" + "b"; print s;', engine='bytecode')
+                    self.assertEqual((result.output, result.values), ('ab\n', {'s': 'ab'}))
+                    self.assertEqual(submit_to(path, 'print x;').error, 'Undefined variable: x')
+                    self.assertEqual(submit_to(path, 'function f() { return f(); } print f();',
+                                               budget={'max_depth': 20}).error, 'Call depth limit of 20 exceeded')
+                    with self.assertRaises(ValueError):
+                        submit_to(path, 'print 1;', engine='jit')
+                finally:
+                    server.shutdown()
+                    thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
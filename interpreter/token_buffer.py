@@ -0,0 +1,118 @@
+import sys
+from array import array
+
+from lexer import KEYWORDS, OPERATORS, TOKEN_PATTERN, Token, lex_error
+
+
+# Token kinds are small integers; KIND_NAMES maps them back to the `Token.type`
+# strings the parser compares against.
+KIND_NAMES = tuple(sys.intern(name) for name in dict.fromkeys(
+    ['EOF', 'NUMBER', 'STRING', 'CHAR_LITERAL', 'WORD', *KEYWORDS.values(), *OPERATORS.values()]))
+KIND_CODES = {name: code for code, name in enumerate(KIND_NAMES)}
+
+EOF = KIND_CODES['EOF']
+NUMBER = KIND_CODES['NUMBER']
+STRING = KIND_CODES['STRING']
+CHAR_LITERAL = KIND_CODES['CHAR_LITERAL']
+WORD = KIND_CODES['WORD']
+
+WORD_CODES = {word: KIND_CODES[kind] for word, kind in KEYWORDS.items()}
+OPERATOR_CODES = {text: KIND_CODES[kind] for text, kind in OPERATORS.items()}
+
+
+class TokenBuffer:
+    """Packed token stream for a whole source text.
+
+    Each token is a one-byte kind code plus start/end offsets into the source,
+    stored in three `array`s instead of one `Token` object per token. Values
+    are only decoded (numbers converted, string quotes stripped) when a token
+    is asked for.
+
+    The buffer also acts as a lexer: `Parser(TokenBuffer(text))` works, and
+    since tokens are random access, `peek_token()` is free.
+
+    The integer kinds stay inside the buffer: the parser reads every lexer
+    through `Token`s, so `get_next_token()` still builds one per token with
+    the kind's name as its `type`. What the codes save is the buffer's
+    memory. The names are interned, so the parser's comparisons against
+    them stop at identity.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        typecode = 'I' if len(text) < 2 ** 32 else 'Q'
+        kinds = array('B')
+        starts = array(typecode)
+        ends = array(typecode)
+
+        for match in TOKEN_PATTERN.finditer(text):
+            kind = match.lastgroup
+            start, end = match.span(kind)
+
+            if kind == 'WORD':
+                kinds.append(WORD_CODES.get(text[start:end], WORD))
+            elif kind == 'OPERATOR':
+                kinds.append(OPERATOR_CODES[text[start:end]])
+            elif kind == 'NUMBER':
+                kinds.append(NUMBER)
+            elif kind == 'STRING':
+                kinds.append(STRING)
+            elif kind == 'CHAR_LITERAL':
+                kinds.append(CHAR_LITERAL)
+            elif kind == 'MISMATCH':
+                raise lex_error(match)
+            else:
+                kinds.append(EOF)
+                starts.append(start)
+                ends.append(end)
+                break
+
+            starts.append(start)
+            ends.append(end)
+
+        self.kinds = kinds
+        self.starts = starts
+        self.ends = ends
+        self.index = 0
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def nbytes(self):
+        return sum(len(column) * column.itemsize for column in (self.kinds, self.starts, self.ends))
+
+    def kind(self, index):
+        return self.kinds[index]
+
+    def value(self, index):
+        kind = self.kinds[index]
+        if kind == EOF:
+            return None
+        text = self.text[self.starts[index]:self.ends[index]]
+        if kind == NUMBER:
+            return float(text) if '.' in text else int(text)
+        if kind == STRING or kind == CHAR_LITERAL:
+            return text[1:-1]
+        return text
+
+    def token(self, index):
+        return Token(KIND_NAMES[self.kinds[index]], self.value(index), self.starts[index], self.ends[index])
+
+    def get_next_token(self):
+        index = self.index
+        kind = self.kinds[index]
+        start = self.starts[index]
+        end = self.ends[index]
+        if kind == EOF:
+            return Token(KIND_NAMES[EOF], None, start, end)
+        self.index = index + 1
+        if kind == NUMBER or kind == STRING or kind == CHAR_LITERAL:
+            return Token(KIND_NAMES[kind], self.value(index), start, end)
+        return Token(KIND_NAMES[kind], self.text[start:end], start, end)
+
+    def peek_token(self):
+        return self.token(self.index)
+
+    def rewind(self):
+        self.index = 0
@@ -0,0 +1,49 @@
+class TokenStream:
+    """Ring buffer of upcoming tokens between a lexer and the `Parser`.
+
+    Tokens are pulled from the lexer exactly once. `peek(k)` returns the k-th
+    token after the one last handed out by `get_next_token()` without
+    consuming anything, in O(1) once the token has been lexed. The ring grows
+    (doubling) if a caller ever looks further ahead than its capacity.
+
+    While nothing is buffered, `get_next_token` is the lexer's own bound
+    method, so the common no-lookahead path costs no extra call.
+    """
+
+    def __init__(self, lexer, capacity=4):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.lexer = lexer
+        self.ring = [None] * size
+        self.mask = size - 1
+        self.head = 0
+        self.count = 0
+        self.get_next_token = lexer.get_next_token
+
+    def pop(self):
+        token = self.ring[self.head]
+        self.ring[self.head] = None
+        self.head = (self.head + 1) & self.mask
+        self.count -= 1
+        if not self.count:
+            self.get_next_token = self.lexer.get_next_token
+        return token
+
+    def peek(self, k=1):
+        if k < 1:
+            raise ValueError('peek() looks at least one token ahead')
+        while self.count < k:
+            if self.count > self.mask:
+                self.grow()
+            self.ring[(self.head + self.count) & self.mask] = self.lexer.get_next_token()
+            self.count += 1
+            self.get_next_token = self.pop
+        return self.ring[(self.head + k - 1) & self.mask]
+
+    def grow(self):
+        pending = [self.ring[(self.head + i) & self.mask] for i in range(self.count)]
+        size = 2 * len(self.ring)
+        self.ring = pending + [None] * (size - len(pending))
+        self.mask = size - 1
+        self.head = 0
@@ -0,0 +1,88 @@
+"""Tree traversals on an explicit stack instead of Python's, for trees
+deeper than the recursion limit: `a + b + c + ...` parses to a left-deep
+tree with a node per operator.
+
+A traversal is written as methods that yield where a recursive one would
+call: `left = yield node.left` hands the child to the traversal's dispatch
+function and resumes with its result. What a method does before its first
+yield is its pre-order work, after its last its post-order work, and in
+between it can work between children (say, patch a jump between the
+operands of `&&`). A method that yields nothing is a plain function and
+costs no generator. Yielding a generator instead of a node runs it as a
+nested step, for helpers that take more than the node.
+"""
+from types import GeneratorType
+
+
+def run(root, dispatch, enter=None, leave=None):
+    """Return the result of `root`: a node, which goes to `dispatch(node)`,
+    or a generator. Either may yield more nodes or generators in turn.
+
+    `enter(node)` is called before a node is dispatched and
+    `leave(node, result)` once it has its result, around every node.
+    Exceptions travel up through the generators in between, so their
+    `try`/`finally` blocks run as they would when recursing.
+    """
+    if enter is not None or leave is not None:
+        return run(root, hooked(dispatch, enter, leave))
+    if type(root) is not GeneratorType:
+        root = dispatch(root)
+        if type(root) is not GeneratorType:
+            return root
+    # The generators waiting on `generator`, innermost last.
+    stack = []
+    generator = root
+    value = None
+    error = None
+    while True:
+        try:
+            if error is None:
+                child = generator.send(value)
+            else:
+                raised, error = error, None
+                child = generator.throw(raised)
+        except StopIteration as stop:
+            if not stack:
+                return stop.value
+            generator = stack.pop()
+            value = stop.value
+            continue
+        except BaseException as exception:
+            if not stack:
+                raise
+            generator = stack.pop()
+            error = exception
+            continue
+        if type(child) is not GeneratorType:
+            try:
+                child = dispatch(child)
+            except BaseException as exception:
+                error = exception
+                continue
+            if type(child) is not GeneratorType:
+                value = child
+                continue
+        stack.append(generator)
+        generator = child
+        value = None
+
+
+def hooked(dispatch, enter, leave):
+    """`dispatch`, with `enter` and `leave` (either may be None) called
+    around each node.
+    """
+    def dispatch_hooked(node):
+        if enter is not None:
+            enter(node)
+        result = dispatch(node)
+        if type(result) is GeneratorType:
+            result = yield result
+        if leave is not None:
+            leave(node, result)
+        return result
+    return dispatch_hooked
+
+
+def traverse(node, visitor, enter=None, leave=None):
+    """Run an `ASTVisitor` whose methods yield children, from `node`."""
+    return run(node, lambda child: child.accept(visitor), enter, leave)
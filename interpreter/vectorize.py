@@ -0,0 +1,289 @@
+try:
+    import numpy
+except ImportError:  # Every loop runs one iteration at a time without it.
+    numpy = None
+
+from ast_nodes import (
+    ArrayAccessNode, AssignmentNode, BinaryOpNode, LiteralNode, UnaryOpNode, VariableNode, walk,
+)
+from traversal import run
+
+
+# Shorter loops are faster run one iteration at a time than converted.
+MIN_VECTOR_LENGTH = 64
+
+# Integer results must stay within this, so that int64 never overflows
+# where Python's integers would have grown.
+MAX_EXACT_INTEGER = 2 ** 62
+
+# Integers are converted to floats exactly up to this.
+MAX_EXACT_FLOAT_INTEGER = 2 ** 53
+
+ELEMENT_OPERATORS = {'+', '-', '*', '/', '%'}
+
+NUMBER_TYPES = (int, float)
+
+
+class Fallback(Exception):
+    """Raised while preparing a vectorized run that would not give exactly
+    what the scalar loop gives; the scalar loop runs instead.
+    """
+
+
+class VectorLoop:
+    """A counted loop that sums element-wise expressions over arrays:
+
+        for (let i = START; i < END; let i = i + 1;) {
+            let total = total + a[i] * b[i] - i;
+            let other = other + ...;
+        }
+
+    Each sum adds terms to itself or subtracts them, and each term combines
+    `a[i]` (indexed by the loop variable itself), `i`, number literals and
+    variables the loop does not assign with `+ - * / %` and unary minus. No
+    term reads any of the sums, so nothing but the sums themselves depends
+    on the previous iteration. START and END are expressions of literals and variables the
+    loop does not assign.
+
+    `run` computes the whole loop with NumPy and assigns the sums and the
+    loop variable, or returns False, having changed nothing, when it cannot
+    do so with the scalar loop's exact result: NumPy is missing, the loop
+    is short, an array is not all ints or all floats, an index is out of
+    range, a division by zero, or an integer that could overflow int64.
+    Sums are accumulated in order, so floats round as in the scalar loop.
+    """
+
+    def __init__(self, node, sums):
+        self.node = node
+        self.variable = node.init.target
+        self.inclusive = node.condition.operator == '<='
+        # (assignment, variable node read for the sum's start, [(operator, term)])
+        self.sums = sums
+        self.vectorized = 0
+        self.fallbacks = 0
+
+    def run(self, evaluate, lookup_array, assign):
+        """Run the loop; `evaluate(node)` evaluates an expression node,
+        `lookup_array(node)` reads the array an `ArrayAccessNode` indexes and
+        `assign(node, value)` performs an `AssignmentNode` with `value`.
+        """
+        if numpy is None:
+            return False
+        try:
+            start, stop, results = self.compute(evaluate, lookup_array)
+        except Fallback:
+            self.fallbacks += 1
+            return False
+        for (assignment, _, _), result in zip(self.sums, results):
+            assign(assignment, result)
+        assign(self.node.init, max(start, stop))
+        self.vectorized += 1
+        return True
+
+    def compute(self, evaluate, lookup_array):
+        start = evaluate_scalar(evaluate, self.node.init.value, int)
+        stop = evaluate_scalar(evaluate, self.node.condition.right, int) + self.inclusive
+        if stop - start < MIN_VECTOR_LENGTH:
+            raise Fallback()
+        context = VectorContext(self.variable, start, stop, evaluate, lookup_array)
+        results = []
+        for _, initial, terms in self.sums:
+            total = evaluate_scalar(evaluate, initial, NUMBER_TYPES)
+            columns = [run(term, context.compute) for _, term in terms]
+            columns = [(-values if operator == '-' else values, kind, bound)
+                       for (operator, _), (values, kind, bound) in zip(terms, columns)]
+            results.append(accumulate(total, columns, stop - start))
+        return start, stop, results
+
+    def scalar_nodes(self):
+        """The expression nodes `run` passes to `evaluate`."""
+        nodes = [self.node.init.value, self.node.condition.right]
+        for _, initial, terms in self.sums:
+            nodes.append(initial)
+            nodes.extend(node for _, term in terms for node in walk(term) if isinstance(node, LiteralNode) or (
+                isinstance(node, VariableNode) and node.name != self.variable))
+        return nodes
+
+    def array_nodes(self):
+        """The `ArrayAccessNode`s `run` passes to `lookup_array`."""
+        return [node for _, _, terms in self.sums for _, term in terms for node in walk(term)
+                if isinstance(node, ArrayAccessNode)]
+
+
+def evaluate_scalar(evaluate, node, types):
+    try:
+        value = evaluate(node)
+    except Exception:
+        # Let the scalar loop fail, where and how it would.
+        raise Fallback() from None
+    if type(value) not in (types if isinstance(types, tuple) else (types,)):
+        raise Fallback()
+    return value
+
+
+class VectorContext:
+    """Evaluates element expressions for i in range(start, stop) as
+    (value, kind, bound): an array or a Python number, int or float, and for
+    ints a bound on their magnitude.
+    """
+
+    def __init__(self, variable, start, stop, evaluate, lookup_array):
+        self.variable = variable
+        self.start = start
+        self.stop = stop
+        self.evaluate = evaluate
+        self.lookup_array = lookup_array
+        self.arrays = {}
+
+    def compute(self, node):
+        if isinstance(node, VariableNode) and node.name == self.variable:
+            return numpy.arange(self.start, self.stop, dtype=numpy.int64), int, max(abs(self.start), abs(self.stop))
+        if isinstance(node, (LiteralNode, VariableNode)):
+            value = evaluate_scalar(self.evaluate, node, NUMBER_TYPES)
+            return value, type(value), abs(value) if type(value) is int else 0
+        if isinstance(node, ArrayAccessNode):
+            return self.array(node)
+        if isinstance(node, UnaryOpNode):
+            values, kind, bound = yield node.operand
+            return -values, kind, bound
+        left, left_kind, left_bound = yield node.left
+        right, right_kind, right_bound = yield node.right
+        operator = node.operator
+        if operator in ('/', '%') and numpy.any(numpy.asarray(right) == 0):
+            raise Fallback()
+        if operator == '/':
+            if max(left_bound, right_bound) > MAX_EXACT_FLOAT_INTEGER:
+                raise Fallback()
+            return numpy.true_divide(left, right), float, 0
+        kind = int if left_kind is int and right_kind is int else float
+        if kind is float and max(left_bound, right_bound) > MAX_EXACT_FLOAT_INTEGER:
+            raise Fallback()
+        if operator == '*':
+            bound = left_bound * right_bound
+        elif operator == '%':
+            bound = right_bound
+        else:
+            bound = left_bound + right_bound
+        if bound > MAX_EXACT_INTEGER:
+            raise Fallback()
+        operation = {'+': numpy.add, '-': numpy.subtract, '*': numpy.multiply, '%': numpy.remainder}[operator]
+        return operation(left, right), kind, bound
+
+    def array(self, node):
+        if node.name in self.arrays:
+            return self.arrays[node.name]
+        try:
+            array = self.lookup_array(node)
+        except Exception:
+            raise Fallback() from None
+        if type(array) is not list or self.start < 0 or self.stop > len(array):
+            raise Fallback()
+        elements = array[self.start:self.stop]
+        kinds = set(map(type, elements))
+        if kinds == {int}:
+            bound = max(max(elements), -min(elements))
+            if bound > MAX_EXACT_INTEGER:
+                raise Fallback()
+            converted = numpy.array(elements, dtype=numpy.int64), int, bound
+        elif kinds == {float}:
+            converted = numpy.array(elements, dtype=numpy.float64), float, 0
+        else:
+            raise Fallback()
+        self.arrays[node.name] = converted
+        return converted
+
+
+def accumulate(total, columns, count):
+    """`total` plus, for each of `count` iterations, each column's value in
+    turn, added in that order.
+    """
+    if any(bound > MAX_EXACT_INTEGER for _, _, bound in columns):
+        raise Fallback()
+    columns = [(numpy.broadcast_to(values, (count,)), kind, bound) for values, kind, bound in columns]
+    int_bound = sum(bound for _, kind, bound in columns if kind is int)
+    if type(total) is int and all(kind is int for _, kind, _ in columns):
+        if abs(total) + int_bound * count > MAX_EXACT_INTEGER:
+            raise Fallback()
+        return total + sum(int(values.sum(dtype=numpy.int64)) for values, _, _ in columns)
+    # An int start stays an int until the first float is added to it.
+    if type(total) is int and abs(total) + int_bound > MAX_EXACT_FLOAT_INTEGER:
+        raise Fallback()
+    terms = numpy.stack([values.astype(numpy.float64) for values, _, _ in columns], axis=1).ravel()
+    sums = numpy.add.accumulate(numpy.concatenate(([float(total)], terms)))
+    return float(sums[-1])
+
+
+def assigned_names(statements):
+    return {node.target for statement in statements for node in walk(statement) if isinstance(node, AssignmentNode)}
+
+
+def is_invariant(node, assigned):
+    """Whether `node` is made of literals, and of variables in none of
+    `assigned`, with arithmetic.
+    """
+    for part in walk(node):
+        if isinstance(part, VariableNode):
+            if part.name in assigned:
+                return False
+        elif isinstance(part, BinaryOpNode):
+            if part.operator not in ELEMENT_OPERATORS:
+                return False
+        elif not isinstance(part, (LiteralNode, UnaryOpNode)):
+            return False
+    return True
+
+
+def is_element_expression(node, variable, assigned):
+    for part in walk(node):
+        if isinstance(part, LiteralNode):
+            if type(part.value) not in NUMBER_TYPES:
+                return False
+        elif isinstance(part, VariableNode):
+            if part.name != variable and part.name in assigned:
+                return False
+        elif isinstance(part, ArrayAccessNode):
+            index = part.index
+            if part.name in assigned or not (isinstance(index, VariableNode) and index.name == variable):
+                return False
+        elif isinstance(part, UnaryOpNode):
+            if part.operator != '-':
+                return False
+        elif not (isinstance(part, BinaryOpNode) and part.operator in ELEMENT_OPERATORS):
+            return False
+    return True
+
+
+def vector_loop(node):
+    """Return a `VectorLoop` for the `ForNode` `node`, or None if it is not
+    one that can be vectorized.
+    """
+    init, condition, increment = node.init, node.condition, node.increment
+    variable = init.target
+    if not (isinstance(condition, BinaryOpNode) and condition.operator in ('<', '<=')
+            and isinstance(condition.left, VariableNode) and condition.left.name == variable):
+        return None
+    step = increment.value
+    if not (increment.target == variable and isinstance(step, BinaryOpNode) and step.operator == '+'
+            and isinstance(step.left, VariableNode) and step.left.name == variable
+            and isinstance(step.right, LiteralNode) and type(step.right.value) is int and step.right.value == 1):
+        return None
+    assigned = assigned_names(node.body) | {variable}
+    if not node.body or not is_invariant(init.value, {variable}) or not is_invariant(condition.right, assigned):
+        return None
+    sums = []
+    for statement in node.body:
+        if not isinstance(statement, AssignmentNode) or statement.target == variable:
+            return None
+        value = statement.value
+        terms = []
+        while isinstance(value, BinaryOpNode) and value.operator in ('+', '-'):
+            if not is_element_expression(value.right, variable, assigned):
+                return None
+            terms.append((value.operator, value.right))
+            value = value.left
+        if not terms or not (isinstance(value, VariableNode) and value.name == statement.target):
+            return None
+        sums.append((statement, value, terms[::-1]))
+    if len({statement.target for statement, _, _ in sums}) != len(sums):
+        return None
+    return VectorLoop(node, sums)
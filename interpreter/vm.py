@@ -0,0 +1,183 @@
+import sys
+
+from bytecode import (
+    BINARY_FUNCTIONS, BINARY_OP, CALL, CALL_COUNT_MASK, CALL_NAME_SHIFT, HALT, INDEX, JUMP, JUMP_IF_FALSE,
+    JUMP_IF_TRUE, LOAD_CONST, LOAD_FUNCTION, LOAD_GLOBAL, LOAD_NAME,
+    MAKE_FUNCTION, OPNAMES, POP_TRY, PRINT, RETURN, SETUP_TRY, STORE_NAME,
+    UNARY_FUNCTIONS, UNARY_OP, compile_bytecode,
+)
+from runtime import (
+    BUILTINS, MAX_CALL_DEPTH, Function, call_depth_exceeded, check_arguments, check_callable, format_value,
+    undefined_function, undefined_variable,
+)
+
+
+class ReturnOutsideFunction(Exception):
+    pass
+
+
+class VM:
+    """Stack machine for the bytecode of bytecode.py.
+
+    WordMaze calls do not recurse in Python: each call pushes the caller's
+    state onto `frames` and switches to the callee's code, so the dispatch
+    loop below is the only Python frame. The current frame's code, constants,
+    names, value stack and scope are kept in local variables. Calls nest at
+    most `max_depth` deep; a call past that raises an error like any other,
+    which a try/catch can catch.
+    """
+
+    max_depth = MAX_CALL_DEPTH
+
+    def __init__(self, output=None):
+        self.output = output
+        self.global_scope = {}
+
+    def run(self, code):
+        """Run the `CodeObject` of a program; return the global scope."""
+        output = self.output if self.output is not None else sys.stdout
+        global_scope = self.global_scope
+        instructions = code.instructions
+        constants = code.constants
+        names = code.names
+        frame = global_scope
+        stack = []
+        # try/catch handlers of the current frame: (target, stack depth).
+        handlers = []
+        # Suspended callers: (code, pc, stack, scope, handlers).
+        frames = []
+        max_depth = self.max_depth
+        pc = 0
+
+        while True:
+            try:
+                while True:
+                    opcode = instructions[pc]
+                    argument = instructions[pc + 1]
+                    pc += 2
+
+                    if opcode == LOAD_NAME:
+                        name = names[argument]
+                        try:
+                            stack.append(frame[name])
+                        except KeyError:
+                            try:
+                                stack.append(global_scope[name])
+                            except KeyError:
+                                raise undefined_variable(name) from None
+
+                    elif opcode == LOAD_GLOBAL:
+                        try:
+                            stack.append(global_scope[names[argument]])
+                        except KeyError:
+                            raise undefined_variable(names[argument]) from None
+
+                    elif opcode == LOAD_CONST:
+                        stack.append(constants[argument])
+
+                    elif opcode == STORE_NAME:
+                        frame[names[argument]] = stack.pop()
+
+                    elif opcode == BINARY_OP:
+                        right = stack.pop()
+                        stack[-1] = BINARY_FUNCTIONS[argument](stack[-1], right)
+
+                    elif opcode == JUMP_IF_FALSE:
+                        if not stack.pop():
+                            pc = argument
+
+                    elif opcode == JUMP:
+                        pc = argument
+
+                    elif opcode == LOAD_FUNCTION:
+                        name = names[argument]
+                        if name in frame:
+                            stack.append(frame[name])
+                        elif name in global_scope:
+                            stack.append(global_scope[name])
+                        elif name in BUILTINS:
+                            stack.append(BUILTINS[name])
+                        else:
+                            raise undefined_function(name)
+
+                    elif opcode == CALL:
+                        count = argument & CALL_COUNT_MASK
+                        arguments = stack[len(stack) - count:]
+                        del stack[len(stack) - count:]
+                        function = stack.pop()
+                        if type(function) is Function:
+                            callee = function.body
+                            if count != len(callee.parameters):
+                                check_arguments(function, arguments)
+                            if len(frames) >= max_depth:
+                                raise call_depth_exceeded(max_depth)
+                            frames.append((code, pc, stack, frame, handlers))
+                            code = callee
+                            instructions = code.instructions
+                            constants = code.constants
+                            names = code.names
+                            frame = dict(zip(callee.parameters, arguments))
+                            stack = []
+                            handlers = []
+                            pc = 0
+                        else:
+                            check_callable(names[argument >> CALL_NAME_SHIFT], function)
+                            stack.append(function(*arguments))
+
+                    elif opcode == RETURN:
+                        value = stack.pop()
+                        if not frames:
+                            raise ReturnOutsideFunction()
+                        code, pc, stack, frame, handlers = frames.pop()
+                        instructions = code.instructions
+                        constants = code.constants
+                        names = code.names
+                        stack.append(value)
+
+                    elif opcode == JUMP_IF_TRUE:
+                        if stack.pop():
+                            pc = argument
+
+                    elif opcode == INDEX:
+                        index = stack.pop()
+                        stack[-1] = stack[-1][index]
+
+                    elif opcode == UNARY_OP:
+                        stack[-1] = UNARY_FUNCTIONS[argument](stack[-1])
+
+                    elif opcode == PRINT:
+                        output.write(format_value(stack.pop()) + '\n')
+
+                    elif opcode == MAKE_FUNCTION:
+                        callee = constants[argument]
+                        stack.append(Function(callee.name, callee.parameters, callee))
+
+                    elif opcode == SETUP_TRY:
+                        handlers.append((argument, len(stack)))
+
+                    elif opcode == POP_TRY:
+                        handlers.pop()
+
+                    elif opcode == HALT:
+                        return global_scope
+
+                    else:
+                        raise Exception(f'Unknown opcode {OPNAMES[opcode] if opcode < len(OPNAMES) else opcode}')
+
+            except ReturnOutsideFunction:
+                raise Exception("'return' outside a function") from None
+            except Exception:
+                # Unwind to the innermost try/catch, in this call or a caller.
+                while not handlers:
+                    if not frames:
+                        raise
+                    code, pc, stack, frame, handlers = frames.pop()
+                instructions = code.instructions
+                constants = code.constants
+                names = code.names
+                pc, depth = handlers.pop()
+                del stack[depth:]
+
+
+def run_bytecode(program, output=None):
+    return VM(output).run(compile_bytecode(program))
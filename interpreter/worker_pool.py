@@ -0,0 +1,314 @@
+"""Run WordMaze scripts on a pool of pre-forked, warm worker processes.
+
+A fresh process per script pays for starting Python and importing the
+lexer, parser and engines before it parses a line. The workers pay that
+once: they are forked from a process that has everything imported, and
+then run job after job. Scripts come in through `WorkerPool.submit()`,
+or over a Unix socket from `serve()`. A job that runs past its timeout
+has its worker killed and replaced. A worker is also replaced after
+`max_jobs` jobs, so whatever a long-lived process accumulates goes away
+with it. A job can also carry a `Budget` (see budget.py), which stops a
+runaway script with an error without losing its worker.
+
+Usage: python worker_pool.py [--workers N] [--max-jobs N] [--timeout S] socket
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+from budget import Budget
+from interpreter import BUDGETED_ENGINES, EXECUTION_ENGINES, run_program
+from lexer import RegexLexer
+from parser import Parser
+
+
+DEFAULT_MAX_JOBS = 1000
+PLAIN_TYPES = (bool, int, float, str, type(None))
+
+
+class JobResult:
+    """What running one script produced: everything it printed, the message
+    of the error that stopped it (None if it ran to the end), its globals
+    that are plain values, the seconds it took and the pid of the worker
+    that ran it.
+    """
+
+    def __init__(self, output, error, values, seconds, worker):
+        self.output = output
+        self.error = error
+        self.values = values
+        self.seconds = seconds
+        self.worker = worker
+
+    def as_dict(self):
+        return {'output': self.output, 'error': self.error, 'values': self.values,
+                'seconds': self.seconds, 'worker': self.worker}
+
+    def __repr__(self):
+        status = 'ok' if self.error is None else f'error {self.error!r}'
+        return f'<JobResult {status}, {len(self.output)} characters of output, {self.seconds * 1000:.1f} ms>'
+
+
+def is_plain(value):
+    if isinstance(value, list):
+        return all(is_plain(item) for item in value)
+    return isinstance(value, PLAIN_TYPES)
+
+
+def run_job(source, engine, budget=None):
+    """Parse and run `source`, capturing its output. Runs in a worker."""
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        scope = run_program(Parser(RegexLexer(source)).parse(), engine, output, budget=budget)
+    except Exception as error:
+        values, message = {}, str(error)
+    else:
+        values = {name: value for name, value in scope.items() if is_plain(value)}
+        message = None
+    return JobResult(output.getvalue(), message, values, time.perf_counter() - start, os.getpid())
+
+
+def serve_jobs(connection):
+    """A worker's loop: run each (source, engine, budget) job received until None."""
+    while True:
+        try:
+            job = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if job is None:
+            return
+        connection.send(run_job(*job))
+
+
+def default_context():
+    # Forked workers start with the modules of the pool's process imported;
+    # where there is no fork, the spawned ones import them on start.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+class Worker:
+    """One worker process and the pipe jobs go through."""
+
+    def __init__(self, context):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=serve_jobs, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs = 0
+
+    def run(self, job, timeout):
+        """Return the `JobResult` of `job`, or an error message if the
+        worker took longer than `timeout` seconds or died.
+        """
+        self.jobs += 1
+        try:
+            self.connection.send(job)
+            if self.connection.poll(timeout):
+                return self.connection.recv()
+        except (EOFError, OSError):
+            self.process.join()
+            return f'Worker exited with code {self.process.exitcode}'
+        return f'Timed out after {timeout} s'
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """`workers` warm processes (one per core by default) running scripts.
+
+    `submit()` queues a script and returns a `concurrent.futures.Future` of
+    its `JobResult`; scripts that fail still produce one, with their error.
+    Jobs run for at most `timeout` seconds (None for no limit), and workers
+    are replaced after `max_jobs` jobs. `recycled` and `timeouts` count the
+    workers replaced for each reason.
+    """
+
+    def __init__(self, workers=None, max_jobs=DEFAULT_MAX_JOBS, timeout=None, engine='closure', context=None):
+        if max_jobs < 1:
+            raise ValueError('max_jobs must be at least 1')
+        self.max_jobs = max_jobs
+        self.timeout = timeout
+        self.engine = engine
+        self.context = context or default_context()
+        self.jobs = queue.SimpleQueue()
+        self.recycled = 0
+        self.timeouts = 0
+        self.lock = threading.Lock()
+        self.closed = False
+        # Start every worker before the threads feeding them, so that the
+        # first ones are forked from a single-threaded process.
+        workers = [Worker(self.context) for _ in range(workers or os.cpu_count() or 1)]
+        self.threads = [threading.Thread(target=self.feed, args=(worker,), daemon=True) for worker in workers]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, source, engine=None, timeout=None, budget=None):
+        """Queue `source` to run on `engine` for at most `timeout` seconds
+        (the pool's defaults if None), within `budget` if given; return a
+        Future of its `JobResult`.
+        """
+        engine = engine or self.engine
+        if engine not in EXECUTION_ENGINES:
+            raise ValueError(f'Unknown execution engine: {engine}')
+        if budget is not None and engine not in BUDGETED_ENGINES:
+            raise ValueError(f'The {engine} engine cannot run within a budget')
+        if self.closed:
+            raise Exception('The worker pool is closed')
+        future = Future()
+        self.jobs.put((future, (source, engine, budget), timeout if timeout is not None else self.timeout))
+        return future
+
+    def run(self, source, engine=None, timeout=None, budget=None):
+        """Run `source` and wait for its `JobResult`."""
+        return self.submit(source, engine, timeout, budget).result()
+
+    def feed(self, worker):
+        """Pass queued jobs to `worker`, replacing it as needed."""
+        while True:
+            item = self.jobs.get()
+            if item is None:
+                worker.stop()
+                return
+            future, job, timeout = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            start = time.perf_counter()
+            result = worker.run(job, timeout)
+            if isinstance(result, str):
+                # The worker hung or died: what it printed is lost with it.
+                worker.kill()
+                worker = Worker(self.context)
+                if result.startswith('Timed out'):
+                    with self.lock:
+                        self.timeouts += 1
+                result = JobResult('', result, {}, time.perf_counter() - start, None)
+            elif worker.jobs >= self.max_jobs:
+                worker.stop()
+                worker = Worker(self.context)
+                with self.lock:
+                    self.recycled += 1
+            future.set_result(result)
+
+    def close(self):
+        """Stop the workers once the jobs already submitted have run."""
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """Answers each line of JSON, {"source": ..., "engine": ..., "timeout": ...,
+    "budget": {...}} with only "source" required, with a line of JSON with
+    the fields of its `JobResult`, or {"error": ...} for a request that is
+    not valid. "budget" holds the arguments of a `Budget`.
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                budget = Budget(**request['budget']) if 'budget' in request else None
+                future = self.server.pool.submit(request['source'], request.get('engine'), request.get('timeout'),
+                                                 budget)
+            except (ValueError, KeyError, TypeError) as error:
+                response = {'error': f'Bad request: {error}'}
+            else:
+                response = future.result().as_dict()
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class JobServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, pool):
+        self.pool = pool
+        super().__init__(path, JobHandler)
+
+
+def serve(path, pool):
+    """Return a `JobServer` taking jobs for `pool` on the Unix socket at
+    `path`; call its `serve_forever()` to start answering.
+    """
+    if os.path.exists(path):
+        os.unlink(path)
+    return JobServer(path, pool)
+
+
+def submit_to(path, source, engine=None, timeout=None, budget=None):
+    """Run `source` on the server listening at `path`; return its
+    `JobResult`. `budget` is a dict of `Budget` arguments.
+    """
+    request = {'source': source}
+    if engine is not None:
+        request['engine'] = engine
+    if timeout is not None:
+        request['timeout'] = timeout
+    if budget is not None:
+        request['budget'] = budget
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        connection.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with connection.makefile('rb') as responses:
+            response = json.loads(responses.readline())
+    if set(response) == {'error'}:
+        raise ValueError(response['error'])
+    return JobResult(**response)
+
+
+def main(argv):
+    arguments = argparse.ArgumentParser(description='Run WordMaze scripts sent to a Unix socket on warm workers.')
+    arguments.add_argument('socket', help='path of the socket to listen on')
+    arguments.add_argument('--workers', '-j', type=int, default=None, help='worker processes (default: all cores)')
+    arguments.add_argument('--max-jobs', type=int, default=DEFAULT_MAX_JOBS, help='jobs before a worker is replaced')
+    arguments.add_argument('--timeout', type=float, default=None, help='seconds a job may run')
+    arguments.add_argument('--engine', choices=sorted(EXECUTION_ENGINES), default='closure')
+    options = arguments.parse_args(argv[1:])
+
+    with WorkerPool(options.workers, options.max_jobs, options.timeout, options.engine) as pool:
+        with serve(options.socket, pool) as server:
+            print(f'Serving on {options.socket}', file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.unlink(options.socket)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))